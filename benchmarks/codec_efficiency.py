@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Benchmark: Codec-Effizienz (Bitrate bei gleicher Qualität)
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Codiert denselben Clip mit den Encoder-Fragmenten des Streams
+(StreamManager.build_video_encoder - identische Presets, zerolatency,
+Keyframe-Abstand) bei mehreren Bitraten und misst die Qualität als
+PSNR gegen das unkomprimierte Original:
+
+    H.264 Baseline (bisheriger Stream-Pfad)  vs.  HEVC (x265enc)
+
+Aus den Rate-Qualitäts-Kurven wird die BD-Rate berechnet: die mittlere
+Bitrate-Ersparnis von HEVC bei gleicher PSNR (negativ = HEVC spart).
+Die Kurven werden stückweise linear über log(Bitrate) interpoliert.
+
+Benötigt ffmpeg (psnr-Filter) für die Qualitätsmessung.
+
+Aufruf:
+    python3 benchmarks/codec_efficiency.py [--input clip.mp4] [--seconds 10] [--json ergebnis.json]
+
+Ohne --input wird ein bewegtes Testbild erzeugt; für aussagekräftige
+Werte einen typischen Mitschnitt (Bildschirm, Kamera) verwenden.
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import Gst
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+from src.core.stream_manager import StreamManager
+from stream_throughput import get_version
+
+
+CODECS = ['h264', 'hevc']
+BITRATES = [1000, 1500, 2500, 4000]
+RESOLUTION = '1280x720'
+FPS = 30
+KEYFRAME_SECONDS = 2
+
+PSNR_RE = re.compile(r"average:([\d.]+|inf)")
+
+
+def run_pipeline(description: str, timeout: float = 600) -> Optional[str]:
+    """
+    Lässt eine Pipeline bis EOS laufen.
+
+    Returns:
+        Fehlermeldung oder None
+    """
+    pipeline = Gst.parse_launch(description)
+    pipeline.set_state(Gst.State.PLAYING)
+    try:
+        msg = pipeline.get_bus().timed_pop_filtered(
+            int(timeout * Gst.SECOND), Gst.MessageType.EOS | Gst.MessageType.ERROR
+        )
+        if msg is None:
+            return "Timeout"
+        if msg.type == Gst.MessageType.ERROR:
+            return msg.parse_error()[0].message
+        return None
+    finally:
+        pipeline.set_state(Gst.State.NULL)
+
+
+def make_reference(path: str, source: Optional[str], seconds: float) -> Optional[str]:
+    """Schreibt den Referenz-Clip als unkomprimiertes Y4M (I420, feste Größe/Rate)."""
+    width, height = RESOLUTION.split('x')
+    frames = int(seconds * FPS)
+    if source:
+        src = f"filesrc location=\"{source}\" ! decodebin ! videoconvert ! videoscale ! videorate"
+    else:
+        # Bewegung + feine Details, damit die Inter-Prädiktion etwas zu tun hat
+        src = "videotestsrc pattern=smpte horizontal-speed=4 ! timeoverlay font-desc=\"Sans 48\""
+    return run_pipeline(
+        f"{src} ! video/x-raw,format=I420,width={width},height={height},framerate={FPS}/1 ! "
+        f"identity eos-after={frames} ! y4menc ! filesink location=\"{path}\""
+    )
+
+
+def encode(reference: str, output: str, codec: str, bitrate: int, preset: str) -> Dict[str, Any]:
+    """Codiert die Referenz mit dem Stream-Encoder; misst CPU-Zeit und Größe."""
+    encoder = StreamManager.build_video_encoder(
+        codec, bitrate, preset, FPS * KEYFRAME_SECONDS, name='venc'
+    )
+    cpu_start = time.process_time()
+    wall_start = time.monotonic()
+    error = run_pipeline(
+        f"filesrc location=\"{reference}\" ! y4mdec ! {encoder}"
+        f"matroskamux ! filesink location=\"{output}\""
+    )
+    return {
+        'error': error,
+        'cpu_s': time.process_time() - cpu_start,
+        'wall_s': time.monotonic() - wall_start,
+        'bytes': os.path.getsize(output) if error is None else 0,
+    }
+
+
+def measure_psnr(encoded: str, reference: str) -> Optional[float]:
+    """PSNR (Mittel über alle Frames, YUV gewichtet) per ffmpeg."""
+    result = subprocess.run(
+        ['ffmpeg', '-hide_banner', '-nostats', '-i', encoded, '-i', reference,
+         '-lavfi', '[0:v][1:v]psnr', '-f', 'null', '-'],
+        capture_output=True, text=True
+    )
+    match = PSNR_RE.search(result.stderr)
+    if match is None:
+        return None
+    return float('inf') if match.group(1) == 'inf' else float(match.group(1))
+
+
+def bd_rate(anchor: List[Tuple[float, float]], test: List[Tuple[float, float]]) -> Optional[float]:
+    """
+    Bjøntegaard-Delta-Rate: mittlere Bitrate-Differenz bei gleicher Qualität.
+
+    Args:
+        anchor: [(kbps, psnr), ...] des Referenz-Codecs
+        test: [(kbps, psnr), ...] des getesteten Codecs
+
+    Returns:
+        Prozent (negativ = test braucht weniger Bitrate) oder None
+        ohne überlappenden PSNR-Bereich
+    """
+    def curve(points: List[Tuple[float, float]]) -> List[Tuple[float, float]]:
+        # (psnr, log-rate), nach PSNR sortiert, nur endliche Werte
+        return sorted((q, math.log(r)) for r, q in points if r > 0 and math.isfinite(q))
+
+    def interpolate(points: List[Tuple[float, float]], q: float) -> float:
+        for (q0, r0), (q1, r1) in zip(points, points[1:]):
+            if q0 <= q <= q1:
+                return r0 if q1 == q0 else r0 + (r1 - r0) * (q - q0) / (q1 - q0)
+        raise ValueError(q)
+
+    a, t = curve(anchor), curve(test)
+    if len(a) < 2 or len(t) < 2:
+        return None
+    low, high = max(a[0][0], t[0][0]), min(a[-1][0], t[-1][0])
+    if high <= low:
+        return None
+
+    # Mittelwert der log-Raten-Differenz über den gemeinsamen PSNR-Bereich
+    steps = 100
+    total = 0.0
+    for i in range(steps + 1):
+        q = low + (high - low) * i / steps
+        weight = 0.5 if i in (0, steps) else 1.0
+        total += weight * (interpolate(t, q) - interpolate(a, q))
+    mean = total / steps
+    return (math.exp(mean) - 1) * 100
+
+
+def main() -> int:
+    """Einstiegspunkt."""
+    parser = argparse.ArgumentParser(description="Bitrate-Ersparnis HEVC vs. H.264 Baseline (PSNR)")
+    parser.add_argument('--input', help="Eigener Clip (sonst Testbild)")
+    parser.add_argument('--seconds', type=float, default=10.0, help="Clip-Länge (s)")
+    parser.add_argument('--bitrates', nargs='+', type=int, default=BITRATES, help="Ziel-Bitraten (kbps)")
+    parser.add_argument('--codecs', nargs='+', default=CODECS, choices=list(StreamManager.VIDEO_CODECS))
+    parser.add_argument('--preset', default='superfast', choices=StreamManager.X264_PRESETS)
+    parser.add_argument('--json', metavar='DATEI', help="Ergebnis als JSON speichern")
+    parser.add_argument('--keep', action='store_true', help="Codierte Dateien behalten")
+    args = parser.parse_args()
+
+    if shutil.which('ffmpeg') is None:
+        print("❌ ffmpeg nicht gefunden (wird für die PSNR-Messung benötigt)")
+        return 1
+
+    Gst.init(None)
+    for codec in args.codecs:
+        encoder = StreamManager.VIDEO_CODECS[codec]['encoder']
+        if Gst.ElementFactory.find(encoder) is None:
+            print(f"❌ GStreamer-Element fehlt: {encoder}")
+            return 1
+
+    workdir = tempfile.mkdtemp(prefix="tuxrtmpilot-codec-")
+    reference = os.path.join(workdir, "reference.y4m")
+
+    print(f"🔹 Referenz ({args.seconds:g} s, {RESOLUTION}@{FPS}) ...", flush=True)
+    error = make_reference(reference, args.input, args.seconds)
+    if error:
+        print(f"❌ Referenz fehlgeschlagen: {error}")
+        return 1
+
+    results: List[Dict[str, Any]] = []
+    for codec in args.codecs:
+        for bitrate in args.bitrates:
+            print(f"🔹 {codec} {bitrate} kbps ...", flush=True)
+            output = os.path.join(workdir, f"{codec}_{bitrate}.mkv")
+            encoded = encode(reference, output, codec, bitrate, args.preset)
+            result: Dict[str, Any] = {'codec': codec, 'target_kbps': bitrate, 'error': encoded['error']}
+            if encoded['error'] is None:
+                result.update({
+                    'kbps': round(encoded['bytes'] * 8 / 1000 / args.seconds, 1),
+                    'psnr_db': measure_psnr(output, reference),
+                    'encode_fps': round(args.seconds * FPS / encoded['wall_s'], 1),
+                    'cpu_s': round(encoded['cpu_s'], 2),
+                })
+            results.append(result)
+
+    if not args.keep:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print()
+    print(f"{'Codec':<6} {'Ziel':>6} {'kbps':>8} {'PSNR dB':>8} {'Enc-FPS':>8} {'CPU s':>7}")
+    for r in results:
+        if r['error']:
+            print(f"{r['codec']:<6} {r['target_kbps']:>6} ❌ {r['error']}")
+            continue
+        psnr = f"{r['psnr_db']:.2f}" if r['psnr_db'] is not None else '–'
+        print(f"{r['codec']:<6} {r['target_kbps']:>6} {r['kbps']:>8} {psnr:>8} "
+              f"{r['encode_fps']:>8} {r['cpu_s']:>7}")
+
+    curves = {
+        codec: [(r['kbps'], r['psnr_db']) for r in results
+                if r['codec'] == codec and not r['error'] and r['psnr_db'] is not None]
+        for codec in args.codecs
+    }
+    savings = {}
+    anchor = args.codecs[0]
+    for codec in args.codecs[1:]:
+        savings[codec] = bd_rate(curves[anchor], curves[codec])
+        value = f"{savings[codec]:+.1f} %" if savings[codec] is not None else "– (keine Überlappung)"
+        print(f"\nBD-Rate {codec} gegenüber {anchor}: {value}")
+
+    if args.json:
+        report = {
+            'benchmark': 'codec_efficiency',
+            'version': get_version(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'gstreamer': Gst.version_string(),
+            'input': args.input or 'videotestsrc',
+            'seconds': args.seconds,
+            'preset': args.preset,
+            'results': results,
+            'bd_rate_percent': savings,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    return 0 if all(r['error'] is None for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
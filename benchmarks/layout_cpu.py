@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Benchmark: CPU-Last pro Szenen-Layout
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Misst die CPU-Last der Video-Stage (Quellen → compositor → x264enc)
+für jedes Layout bei 720p und 1080p. Die Quellen werden durch live
+videotestsrc ersetzt (gleiche Formate wie PipeWire bzw. Webcam), die
+Pipeline selbst baut die echte SceneEngine.
+
+Layouts:
+    screen    - nur Bildschirm (direkter Pfad, kein compositor)
+    webcam    - nur Webcam (direkter Pfad)
+    pip       - Bildschirm + Webcam-Ecke, Webcam klein an der Quelle (I420)
+    pip-rgba  - Vergleich: Webcam in voller Größe, Skalierung und
+                Blending im compositor in RGBA (der naive Weg)
+
+Aufruf:
+    python3 benchmarks/layout_cpu.py [--duration 10] [--no-encode] [--json]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import Gst
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.core.scene_engine import SceneEngine
+
+
+RESOLUTIONS = [(1280, 720), (1920, 1080)]
+LAYOUTS = ['screen', 'webcam', 'pip', 'pip-rgba']
+FPS = 30
+
+# Simulierte Webcam liefert höchstens 720p (typische USB-Kamera)
+WEBCAM_MAX = (1280, 720)
+
+
+def build_test_source(device: str, width: int, height: int, fps: int) -> str:
+    """
+    Ersatz-Quellen für SceneEngine (gleiche Rohformate wie die echten Geräte).
+
+    Bildschirm: BGRx in Ausgabegröße (pipewiresrc)
+    Webcam: YUY2 im angeforderten Modus, begrenzt auf WEBCAM_MAX
+    """
+    if device == 'screen':
+        return (
+            f"videotestsrc is-live=true pattern=smpte ! "
+            f"video/x-raw,format=BGRx,width={width},height={height},framerate={fps}/1"
+        )
+
+    width, height = min(width, WEBCAM_MAX[0]), min(height, WEBCAM_MAX[1])
+    return (
+        f"videotestsrc is-live=true pattern=ball ! "
+        f"video/x-raw,format=YUY2,width={width},height={height},framerate={fps}/1"
+    )
+
+
+def build_video_stage(layout: str, width: int, height: int) -> str:
+    """Baut die Video-Stage für ein Layout."""
+    engine = SceneEngine(build_test_source)
+
+    if layout in ('screen', 'webcam'):
+        engine.set_single_source('screen' if layout == 'screen' else 'webcam')
+        return engine.build_video_stage(width, height, FPS)
+
+    if layout == 'pip':
+        engine.set_scenes(
+            {'pip': SceneEngine.pip_layout('screen', 'webcam', width, height)}, 'pip'
+        )
+        return engine.build_video_stage(width, height, FPS)
+
+    # pip-rgba: beide Quellen in voller Größe nach RGBA, compositor skaliert
+    pip = SceneEngine.pip_layout('screen', 'webcam', width, height)[1]
+    return (
+        f"compositor name=comp background=black "
+        f"sink_1::xpos={pip['x']} sink_1::ypos={pip['y']} "
+        f"sink_1::width={pip['width']} sink_1::height={pip['height']} ! "
+        f"videoconvert ! "
+        f"video/x-raw,format=I420,width={width},height={height},framerate={FPS}/1 "
+        f"{build_test_source('screen', width, height, FPS)} ! "
+        f"videoconvert ! video/x-raw,format=RGBA ! queue ! comp.sink_0 "
+        f"{build_test_source('webcam', *WEBCAM_MAX, FPS)} ! "
+        f"videoconvert ! video/x-raw,format=RGBA ! queue ! comp.sink_1"
+    )
+
+
+def run_case(layout: str, width: int, height: int, duration: float, encode: bool) -> Dict[str, Any]:
+    """
+    Lässt eine Pipeline laufen und misst CPU-Zeit des Prozesses.
+
+    Die ersten 2 Sekunden (Negotiation, Encoder-Init) werden nicht gemessen.
+
+    Returns:
+        Dict mit layout, resolution, cpu_percent, fps, frames
+    """
+    stage = build_video_stage(layout, width, height)
+    tail = (
+        "x264enc speed-preset=ultrafast tune=zerolatency bitrate=4500 ! fakesink name=out sync=false"
+        if encode else
+        "fakesink name=out sync=false"
+    )
+    pipeline = Gst.parse_launch(f"{stage} ! {tail}")
+
+    frames = [0]
+
+    def on_buffer(pad: Gst.Pad, info: Gst.PadProbeInfo) -> Gst.PadProbeReturn:
+        frames[0] += 1
+        return Gst.PadProbeReturn.OK
+
+    pipeline.get_by_name('out').get_static_pad('sink').add_probe(
+        Gst.PadProbeType.BUFFER, on_buffer
+    )
+
+    bus = pipeline.get_bus()
+    pipeline.set_state(Gst.State.PLAYING)
+    error = None
+
+    try:
+        # Warmup
+        msg = bus.timed_pop_filtered(2 * Gst.SECOND, Gst.MessageType.ERROR)
+        if msg:
+            error = msg.parse_error()[0].message
+        else:
+            frames_start = frames[0]
+            cpu_start = time.process_time()
+            wall_start = time.monotonic()
+
+            msg = bus.timed_pop_filtered(int(duration * Gst.SECOND), Gst.MessageType.ERROR)
+            if msg:
+                error = msg.parse_error()[0].message
+
+            cpu = time.process_time() - cpu_start
+            wall = time.monotonic() - wall_start
+            counted = frames[0] - frames_start
+    finally:
+        pipeline.set_state(Gst.State.NULL)
+
+    result: Dict[str, Any] = {'layout': layout, 'resolution': f"{width}x{height}", 'error': error}
+    if error is None:
+        result.update({
+            'cpu_percent': round(cpu / wall * 100, 1),
+            'fps': round(counted / wall, 1),
+            'frames': counted,
+        })
+    return result
+
+
+def main() -> int:
+    """Einstiegspunkt."""
+    parser = argparse.ArgumentParser(description="CPU-Last pro Szenen-Layout")
+    parser.add_argument('--duration', type=float, default=10.0, help="Messdauer pro Fall (s)")
+    parser.add_argument('--layouts', nargs='+', default=LAYOUTS, choices=LAYOUTS)
+    parser.add_argument('--no-encode', action='store_true', help="Nur Compositing, ohne x264enc")
+    parser.add_argument('--json', action='store_true', help="Ergebnis als JSON ausgeben")
+    args = parser.parse_args()
+
+    Gst.init(None)
+
+    results: List[Dict[str, Any]] = []
+    for width, height in RESOLUTIONS:
+        for layout in args.layouts:
+            if not args.json:
+                print(f"🔹 {layout} @ {width}x{height} ...", flush=True)
+            results.append(run_case(layout, width, height, args.duration, not args.no_encode))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print()
+    print(f"{'Layout':<10} {'Auflösung':<10} {'CPU %':>7} {'FPS':>6}")
+    for r in results:
+        if r['error']:
+            print(f"{r['layout']:<10} {r['resolution']:<10} ❌ {r['error']}")
+        else:
+            print(f"{r['layout']:<10} {r['resolution']:<10} {r['cpu_percent']:>7} {r['fps']:>6}")
+    print("\nCPU % bezogen auf einen Kern (100% = ein voll ausgelasteter Kern)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
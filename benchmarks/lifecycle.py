@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Benchmark: Lifecycle-Operationen des StreamManagers
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Misst die Dauer der Lifecycle-Operationen mit den Testquellen
+('test' = videotestsrc/audiotestsrc) gegen den lokalen RTMP-Ingest:
+
+    build             - Pipeline-String bauen + Gst.parse_launch()
+    start             - start_stream() bis 'live' (NULL → PLAYING im Worker)
+    preview_to_stream - start_stream() bei laufender Preview bis 'live'
+    stop              - stop_stream() bis 'idle'
+    record_finalize   - stop_recording() (EOS, Segment schließen, fsync)
+
+Pro Operation: Median und Minimum über --runs Durchläufe sowie der
+RSS-Spitzenwert während der Operation (Sampler-Thread, /proc).
+
+Baselines:
+    python3 benchmarks/lifecycle.py --save-baseline          # aktuellen Stand festhalten
+    python3 benchmarks/lifecycle.py                          # gegen Baseline prüfen
+
+Liegt eine Operation mehr als --threshold (Default 25%) und mehr als
+--min-delta-ms über der Baseline, endet der Lauf mit Exit-Code 1.
+Baselines sind maschinenabhängig - pro Rechner eine eigene Datei.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import Gst
+
+from PyQt6.QtCore import QCoreApplication
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+from src.core.stream_manager import StreamManager
+from src.core.stream_lifecycle import StreamLifecycle
+from src.core.device_manager import DeviceManager
+from rtmp_ingest import RtmpIngest
+from stream_throughput import get_version, stop_and_wait, wait_until
+
+
+OPERATIONS = ['build', 'start', 'preview_to_stream', 'stop', 'record_finalize']
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / f"lifecycle_{platform.node()}.json"
+
+RESOLUTION = '1280x720'
+BITRATE = 2500
+FPS = 30
+TEST = DeviceManager.TEST_SOURCE
+
+
+class RssSampler:
+    """Misst den RSS-Spitzenwert während eines Zeitraums (Thread, 5 ms Takt)."""
+
+    PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+
+    def __init__(self):
+        self.peak = 0
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def current(cls) -> int:
+        """Aktueller RSS in Bytes."""
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * cls.PAGE_SIZE
+
+    def __enter__(self) -> 'RssSampler':
+        self.peak = self.current()
+        self._running = True
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._running = False
+        self._thread.join()
+        self.peak = max(self.peak, self.current())
+
+    def _sample(self) -> None:
+        while self._running:
+            self.peak = max(self.peak, self.current())
+            time.sleep(0.005)
+
+
+class LifecycleBench:
+    """Führt die Operationen aus; jede Methode liefert ihre Dauer in Sekunden."""
+
+    def __init__(self, app: QCoreApplication):
+        self.app = app
+        self.manager = StreamManager()
+        # Keine Nachbearbeitung: weder Jobs des Benutzers noch der Testaufnahmen
+        self.manager.postprocess_queue.shutdown()
+        for key, value in (('postprocess_remux', False), ('postprocess_thumbnail', False),
+                           ('postprocess_transcode_kbps', 0)):
+            self.manager.config.set(key, value)
+        self.ingest = RtmpIngest()
+        self.ingest.start()
+        self.output_dir = tempfile.mkdtemp(prefix="tuxrtmpilot_bench_")
+
+    def close(self) -> None:
+        """Räumt auf (laufender Stream, Ingest, Testaufnahmen)."""
+        self._reset()
+        self.ingest.stop()
+        for name in os.listdir(self.output_dir):
+            os.remove(os.path.join(self.output_dir, name))
+        os.rmdir(self.output_dir)
+
+    # ---------- Hilfen ----------
+
+    def _reset(self) -> None:
+        """Stoppt alles Laufende (nicht gemessen) und wartet, bis der Lifecycle ruht."""
+        if self.manager.is_recording:
+            self.manager.stop_recording()
+        stop_and_wait(self.app, self.manager)
+        if self.manager.is_preview_active:
+            self.manager.stop_preview()
+        wait_until(self.app, lambda: not self.manager.lifecycle.is_transitioning(), 15.0)
+
+    def _start_stream(self) -> bool:
+        return self.manager.start_stream(TEST, TEST, self.ingest.url, 'bench', RESOLUTION, BITRATE, FPS)
+
+    def _wait_live(self) -> None:
+        """Verarbeitet Qt-Events, bis der Worker den Start gemeldet hat ('live')."""
+        lifecycle = self.manager.lifecycle
+        wait_until(self.app, lambda: lifecycle.state != StreamLifecycle.STARTING
+                   and not lifecycle.is_transitioning(), 15.0)
+        if lifecycle.state != StreamLifecycle.LIVE:
+            raise RuntimeError(f"Stream nicht live ({lifecycle.state})")
+
+    def _settle(self, seconds: float) -> None:
+        wait_until(self.app, lambda: False, seconds)
+
+    # ---------- Operationen ----------
+
+    def op_build(self) -> float:
+        manager = self.manager
+        manager.scene_engine.set_single_source(TEST)
+        manager.audio_mixer.set_primary_source(TEST)
+        manager.current_config = {
+            'video_source': TEST, 'audio_source': TEST, 'rtmp_url': self.ingest.url,
+            'stream_key': 'bench', 'resolution': RESOLUTION, 'bitrate': BITRATE, 'fps': FPS,
+        }
+        manager._negotiate_audio_path()
+
+        start = time.perf_counter()
+        pipeline = Gst.parse_launch(manager._build_pipeline_string())
+        elapsed = time.perf_counter() - start
+
+        pipeline.set_state(Gst.State.NULL)
+        return elapsed
+
+    def op_start(self) -> float:
+        start = time.perf_counter()
+        if not self._start_stream():
+            raise RuntimeError("start_stream fehlgeschlagen")
+        self._wait_live()
+        elapsed = time.perf_counter() - start
+        self._settle(1.0)
+        self._reset()
+        return elapsed
+
+    def op_preview_to_stream(self) -> float:
+        if not self.manager.start_preview(TEST, RESOLUTION, FPS):
+            raise RuntimeError("start_preview fehlgeschlagen")
+        self._settle(1.0)
+
+        start = time.perf_counter()
+        if not self._start_stream():
+            raise RuntimeError("start_stream fehlgeschlagen")
+        self._wait_live()
+        elapsed = time.perf_counter() - start
+        self._settle(1.0)
+        self._reset()
+        return elapsed
+
+    def op_stop(self) -> float:
+        if not self._start_stream():
+            raise RuntimeError("start_stream fehlgeschlagen")
+        self._wait_live()
+        self._settle(2.0)
+
+        start = time.perf_counter()
+        if not stop_and_wait(self.app, self.manager):
+            raise RuntimeError("Stream nicht rechtzeitig gestoppt")
+        elapsed = time.perf_counter() - start
+        self._reset()
+        return elapsed
+
+    def op_record_finalize(self) -> float:
+        if not self.manager.start_recording(TEST, TEST, RESOLUTION, BITRATE, FPS, self.output_dir):
+            raise RuntimeError("start_recording fehlgeschlagen")
+        self._settle(3.0)
+
+        start = time.perf_counter()
+        self.manager.stop_recording()
+        elapsed = time.perf_counter() - start
+        self._reset()
+        return elapsed
+
+
+def run(bench: LifecycleBench, operations: List[str], runs: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Führt jede Operation runs-mal aus.
+
+    Returns:
+        Operation → {'median_ms', 'min_ms', 'rss_peak_mb', 'runs'} oder {'error'}
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    for name in operations:
+        operation: Callable[[], float] = getattr(bench, f"op_{name}")
+        times: List[float] = []
+        peak = 0
+        print(f"🔹 {name} ...", flush=True)
+
+        try:
+            for _ in range(runs):
+                with RssSampler() as rss:
+                    times.append(operation())
+                peak = max(peak, rss.peak)
+        except Exception as e:
+            bench._reset()
+            results[name] = {'error': str(e)}
+            continue
+
+        results[name] = {
+            'median_ms': round(statistics.median(times) * 1000, 2),
+            'min_ms': round(min(times) * 1000, 2),
+            'rss_peak_mb': round(peak / (1024 * 1024), 1),
+            'runs': runs,
+        }
+    return results
+
+
+def check_regressions(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Any],
+    threshold: float,
+    min_delta_ms: float
+) -> List[str]:
+    """
+    Vergleicht mit der Baseline.
+
+    Returns:
+        Liste der Regressionen (leer = alles im Rahmen)
+    """
+    regressions = []
+    for name, result in results.items():
+        before = baseline.get('operations', {}).get(name)
+        if before is None or 'error' in before:
+            continue
+        if 'error' in result:
+            regressions.append(f"{name}: {result['error']}")
+            continue
+
+        limit = max(before['median_ms'] * (1 + threshold), before['median_ms'] + min_delta_ms)
+        if result['median_ms'] > limit:
+            regressions.append(
+                f"{name}: {result['median_ms']} ms > {limit:.1f} ms (Baseline {before['median_ms']} ms)"
+            )
+
+        rss_limit = before['rss_peak_mb'] * (1 + threshold)
+        if result['rss_peak_mb'] > rss_limit:
+            regressions.append(
+                f"{name}: RSS {result['rss_peak_mb']} MB > {rss_limit:.1f} MB (Baseline {before['rss_peak_mb']} MB)"
+            )
+    return regressions
+
+
+def main() -> int:
+    """Einstiegspunkt."""
+    parser = argparse.ArgumentParser(description="Lifecycle-Benchmarks des StreamManagers")
+    parser.add_argument('--runs', type=int, default=5, help="Durchläufe pro Operation")
+    parser.add_argument('--operations', nargs='+', default=OPERATIONS, choices=OPERATIONS)
+    parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help="Baseline-Datei (JSON)")
+    parser.add_argument('--save-baseline', action='store_true', help="Ergebnis als neue Baseline speichern")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Erlaubte Abweichung (0.25 = 25%%)")
+    parser.add_argument('--min-delta-ms', type=float, default=5.0, help="Erlaubte absolute Abweichung (ms)")
+    parser.add_argument('--json', metavar='DATEI', help="Ergebnis zusätzlich als JSON speichern")
+    args = parser.parse_args()
+
+    Gst.init(None)
+    app = QCoreApplication(sys.argv)
+
+    bench = LifecycleBench(app)
+    try:
+        results = run(bench, args.operations, args.runs)
+    finally:
+        bench.close()
+
+    report = {
+        'benchmark': 'lifecycle',
+        'version': get_version(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'host': platform.node(),
+        'gstreamer': Gst.version_string(),
+        'operations': results,
+    }
+
+    print()
+    print(f"{'Operation':<18} {'Median ms':>10} {'Min ms':>8} {'RSS MB':>8}")
+    for name, r in results.items():
+        if 'error' in r:
+            print(f"{name:<18} ❌ {r['error']}")
+        else:
+            print(f"{name:<18} {r['median_ms']:>10} {r['min_ms']:>8} {r['rss_peak_mb']:>8}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    baseline_file = Path(args.baseline)
+    if args.save_baseline:
+        baseline_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(baseline_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Baseline gespeichert: {baseline_file}")
+        return 0
+
+    if not baseline_file.exists():
+        print(f"\nℹ️ Keine Baseline ({baseline_file}) - mit --save-baseline anlegen")
+        return 0
+
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regressions = check_regressions(results, baseline, args.threshold, args.min_delta_ms)
+    if regressions:
+        print(f"\n❌ Regressionen gegenüber {baseline.get('version', '?')}:")
+        for line in regressions:
+            print(f"   {line}")
+        return 1
+
+    print(f"\n✅ Keine Regression gegenüber {baseline.get('version', '?')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
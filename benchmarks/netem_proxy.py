@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Netzwerk-Störungs-Proxy (Loopback)
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+TCP-Proxy zwischen rtmpsink und dem lokalen Ingest, der ein schlechtes
+Netz nachstellt - ohne root, tc/netem oder echte Leitung:
+
+    bandwidth_kbps  - Bandbreiten-Deckel Richtung Server (Token-Bucket)
+    latency_ms      - Verzögerung jedes Pakets (beide Richtungen)
+    jitter_ms       - zufällige Zusatzverzögerung (Reihenfolge bleibt)
+    stall()         - Weiterleitung für N Sekunden anhalten
+    reset()         - alle Verbindungen hart abbrechen (TCP RST)
+
+Bedingungen lassen sich jederzeit ändern (set_conditions), ein
+Zeitplan kommt aus dem Szenario-Runner (benchmarks/network_scenarios.py).
+
+Aufruf (eigenständig, feste Bedingungen):
+    python3 benchmarks/netem_proxy.py --listen 1936 --upstream 127.0.0.1:1935 \\
+        --bandwidth 2000 --latency 80 --jitter 20
+"""
+
+import argparse
+import collections
+import random
+import socket
+import struct
+import sys
+import threading
+import time
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+class ImpairmentProxy:
+    """
+    Loopback-TCP-Proxy mit einstellbaren Netzstörungen.
+
+    Pro Verbindung und Richtung liest ein Thread vom Socket in eine
+    Verzögerungs-Warteschlange, ein zweiter gibt die Daten zum
+    Fälligkeitszeitpunkt und im Rahmen der Bandbreite weiter. Ist die
+    Warteschlange voll (max_queue_bytes), hört der Leser auf zu lesen -
+    der Sender spürt echten TCP-Rückstau wie bei einer vollen Leitung.
+    """
+
+    READ_SIZE = 16384
+
+    def __init__(
+        self,
+        upstream: Tuple[str, int],
+        listen: Tuple[str, int] = ('127.0.0.1', 0),
+        max_queue_bytes: int = 4 * 1024 * 1024,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialisiert den Proxy (bindet sofort, Port 0 = frei wählen).
+
+        Args:
+            upstream: Ziel (Host, Port), z.B. der lokale RTMP-Ingest
+            listen: Bind-Adresse
+            max_queue_bytes: Puffer pro Richtung (danach TCP-Rückstau)
+            seed: Zufallsstartwert für reproduzierbaren Jitter
+        """
+        self.upstream = upstream
+        self.max_queue_bytes = max_queue_bytes
+        self._random = random.Random(seed)
+
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind(listen)
+        self._server.listen(4)
+        self.host, self.port = self._server.getsockname()
+
+        self.conditions: Dict[str, float] = {'bandwidth_kbps': 0, 'latency_ms': 0, 'jitter_ms': 0}
+        self._stall_until = 0.0
+
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._connections: List['_ProxyConnection'] = []
+
+        self.stats = {'connections': 0, 'resets': 0, 'bytes_up': 0, 'bytes_down': 0}
+
+    def url(self, app: str = 'live') -> str:
+        """RTMP-URL über den Proxy (ohne Stream-Key)."""
+        return f"rtmp://{self.host}:{self.port}/{app}"
+
+    # ==================== STEUERUNG ====================
+
+    def start(self) -> None:
+        """Startet den Accept-Thread."""
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, name="netem-proxy", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Beendet Proxy und alle Verbindungen."""
+        self._running = False
+        self.reset(count=False)
+        try:
+            self._server.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._server.close()
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def set_conditions(
+        self,
+        bandwidth_kbps: Optional[float] = None,
+        latency_ms: Optional[float] = None,
+        jitter_ms: Optional[float] = None
+    ) -> None:
+        """
+        Ändert die Bedingungen (gilt sofort, auch für laufende Verbindungen).
+
+        Args:
+            bandwidth_kbps: Deckel Richtung Server (0 = unbegrenzt)
+            latency_ms: Grundverzögerung pro Richtung
+            jitter_ms: Zufällige Zusatzverzögerung (0..jitter_ms)
+        """
+        with self._lock:
+            for key, value in (('bandwidth_kbps', bandwidth_kbps), ('latency_ms', latency_ms),
+                               ('jitter_ms', jitter_ms)):
+                if value is not None:
+                    self.conditions[key] = max(0.0, float(value))
+
+    def stall(self, seconds: float) -> None:
+        """Hält die Weiterleitung in beide Richtungen an (Verbindung bleibt offen)."""
+        with self._lock:
+            self._stall_until = max(self._stall_until, time.monotonic() + seconds)
+
+    def reset(self, count: bool = True) -> None:
+        """Bricht alle Verbindungen hart ab (RST statt FIN)."""
+        with self._lock:
+            connections = list(self._connections)
+            self._connections = []
+            if count and connections:
+                self.stats['resets'] += 1
+        for connection in connections:
+            connection.close(abort=True)
+
+    # ==================== INTERN ====================
+
+    def _serve(self) -> None:
+        """Accept-Schleife."""
+        while self._running:
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                break
+            try:
+                server = socket.create_connection(self.upstream, timeout=5)
+                server.settimeout(None)
+            except OSError:
+                client.close()
+                continue
+
+            for sock in (client, server):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            connection = _ProxyConnection(self, client, server)
+            with self._lock:
+                self._connections.append(connection)
+                self.stats['connections'] += 1
+            connection.start()
+
+    def _delay(self) -> float:
+        """Verzögerung für ein neues Paket (Sekunden)."""
+        with self._lock:
+            latency = self.conditions['latency_ms']
+            jitter = self.conditions['jitter_ms']
+        return (latency + self._random.uniform(0, jitter)) / 1000
+
+    def _bandwidth(self) -> float:
+        with self._lock:
+            return self.conditions['bandwidth_kbps']
+
+    def _stalled(self) -> bool:
+        return time.monotonic() < self._stall_until
+
+    def _forget(self, connection: '_ProxyConnection') -> None:
+        with self._lock:
+            if connection in self._connections:
+                self._connections.remove(connection)
+
+
+class _ProxyConnection:
+    """Eine Client↔Server-Verbindung mit je einer verzögerten Richtung."""
+
+    def __init__(self, proxy: ImpairmentProxy, client: socket.socket, server: socket.socket):
+        self.proxy = proxy
+        self.client = client
+        self.server = server
+        self._closed = False
+
+    def start(self) -> None:
+        # Richtung Server: gedeckelt + verzögert, Richtung Client: nur verzögert
+        for src, dst, name, capped in ((self.client, self.server, 'up', True),
+                                       (self.server, self.client, 'down', False)):
+            _Direction(self, src, dst, name, capped).start()
+
+    def close(self, abort: bool = False) -> None:
+        """Schließt beide Seiten (abort: RST über SO_LINGER 0)."""
+        if self._closed:
+            return
+        self._closed = True
+        for sock in (self.client, self.server):
+            try:
+                if abort:
+                    # SHUT_RD weckt blockierte Leser ohne FIN, close() sendet dann RST
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+                    sock.shutdown(socket.SHUT_RD)
+                else:
+                    sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+        self.proxy._forget(self)
+
+
+class _Direction:
+    """Eine Richtung: Leser-Thread → Verzögerungs-Queue → Schreiber-Thread."""
+
+    def __init__(self, connection: _ProxyConnection, src: socket.socket, dst: socket.socket,
+                 name: str, capped: bool):
+        self.connection = connection
+        self.proxy = connection.proxy
+        self.src = src
+        self.dst = dst
+        self.name = name
+        self.capped = capped
+
+        # (fällig ab, Daten)
+        self.queue: Deque[Tuple[float, bytes]] = collections.deque()
+        self.queued_bytes = 0
+        self.cond = threading.Condition()
+        self.eof = False
+
+    def start(self) -> None:
+        threading.Thread(target=self._reader, name=f"netem-{self.name}-r", daemon=True).start()
+        threading.Thread(target=self._writer, name=f"netem-{self.name}-w", daemon=True).start()
+
+    def _reader(self) -> None:
+        last_due = 0.0
+        try:
+            while True:
+                with self.cond:
+                    while self.queued_bytes >= self.proxy.max_queue_bytes and not self.connection._closed:
+                        self.cond.wait(0.1)
+                data = self.src.recv(ImpairmentProxy.READ_SIZE)
+                if not data:
+                    break
+                # Jitter ohne Umsortieren: nie vor dem vorherigen Paket fällig
+                last_due = max(last_due, time.monotonic() + self.proxy._delay())
+                with self.cond:
+                    self.queue.append((last_due, data))
+                    self.queued_bytes += len(data)
+                    self.cond.notify()
+        except OSError:
+            pass
+        with self.cond:
+            self.eof = True
+            self.cond.notify()
+
+    def _writer(self) -> None:
+        # Token-Bucket in Bytes (max. 100 ms Guthaben → kein großer Burst)
+        tokens = 0.0
+        last = time.monotonic()
+        try:
+            while True:
+                with self.cond:
+                    while not self.queue and not self.eof:
+                        self.cond.wait(0.1)
+                    if not self.queue and self.eof:
+                        break
+                    due, data = self.queue[0]
+
+                now = time.monotonic()
+                if now < due or self.proxy._stalled():
+                    time.sleep(min(max(due - now, 0.001), 0.01))
+                    continue
+
+                kbps = self.proxy._bandwidth() if self.capped else 0
+                if kbps > 0:
+                    rate = kbps * 1000 / 8
+                    tokens = min(tokens + (now - last) * rate, rate * 0.1 + len(data))
+                    last = now
+                    if tokens < len(data):
+                        time.sleep(min((len(data) - tokens) / rate, 0.01))
+                        continue
+                    tokens -= len(data)
+                else:
+                    last = now
+
+                self.dst.sendall(data)
+                with self.cond:
+                    self.queue.popleft()
+                    self.queued_bytes -= len(data)
+                    self.cond.notify()
+                with self.proxy._lock:
+                    self.proxy.stats['bytes_' + self.name] += len(data)
+        except OSError:
+            pass
+        self.connection.close()
+
+
+def main() -> int:
+    """Einstiegspunkt: Proxy mit festen Bedingungen."""
+    parser = argparse.ArgumentParser(description="Netzwerk-Störungs-Proxy (Loopback)")
+    parser.add_argument('--listen', type=int, default=1936, help="Lokaler Port")
+    parser.add_argument('--upstream', default='127.0.0.1:1935', help="Ziel host:port")
+    parser.add_argument('--bandwidth', type=float, default=0, help="kbps Richtung Server (0 = unbegrenzt)")
+    parser.add_argument('--latency', type=float, default=0, help="ms pro Richtung")
+    parser.add_argument('--jitter', type=float, default=0, help="ms Zufallsanteil")
+    args = parser.parse_args()
+
+    host, port = args.upstream.rsplit(':', 1)
+    proxy = ImpairmentProxy((host, int(port)), ('127.0.0.1', args.listen))
+    proxy.set_conditions(args.bandwidth, args.latency, args.jitter)
+    proxy.start()
+    print(f"🔹 Proxy {proxy.url()} → {args.upstream}  (Strg+C beendet)")
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        proxy.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Netzwerk-Szenarien (Resilienz unter Störungen)
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Streamt mit dem echten StreamManager (Testquellen) über den
+Störungs-Proxy (benchmarks/netem_proxy.py) zum lokalen Ingest und
+spielt pro Szenario einen Zeitplan aus Bandbreiten-Deckel, Latenz,
+Jitter, Stalls und Verbindungsabbrüchen ab.
+
+Sekündlich aufgezeichnet: empfangene Bitrate, Rückstand (lag) am
+Ingest, ob Daten ankommen, ob der StreamManager noch streamt.
+Ausgewertet pro Phase (zwischen zwei Zeitplan-Schritten): mittlere
+Bitrate, Uptime, maximaler Rückstand - dazu Stream-Abbrüche und die
+Erholungszeit nach einem Reset.
+
+Aufruf:
+    python3 benchmarks/network_scenarios.py [--scenarios congestion reset] [--json ergebnis.json]
+    python3 benchmarks/network_scenarios.py --scenario-file eigene.json --auto-restart
+
+Szenario-Datei (JSON):
+    {"name": {"duration": 40, "steps": [
+        {"at": 10, "bandwidth_kbps": 1500},
+        {"at": 20, "latency_ms": 200, "jitter_ms": 50},
+        {"at": 25, "stall": 5},
+        {"at": 32, "reset": true}
+    ]}}
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import Gst
+
+from PyQt6.QtCore import QCoreApplication
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+from src.core.stream_manager import StreamManager
+from src.core.device_manager import DeviceManager
+from rtmp_ingest import RtmpIngest
+from netem_proxy import ImpairmentProxy
+from stream_throughput import get_version, stop_and_wait
+
+
+RESOLUTION = '1280x720'
+BITRATE = 2500
+FPS = 30
+TEST = DeviceManager.TEST_SOURCE
+RESTART_DELAY = 2.0
+
+SCENARIOS: Dict[str, Dict[str, Any]] = {
+    'clean': {'duration': 30, 'steps': []},
+    'congestion': {'duration': 50, 'steps': [
+        {'at': 10, 'bandwidth_kbps': BITRATE * 0.6},
+        {'at': 30, 'bandwidth_kbps': 0},
+    ]},
+    'latency': {'duration': 45, 'steps': [
+        {'at': 10, 'latency_ms': 150, 'jitter_ms': 50},
+        {'at': 25, 'latency_ms': 400, 'jitter_ms': 150},
+        {'at': 35, 'latency_ms': 0, 'jitter_ms': 0},
+    ]},
+    'stall': {'duration': 50, 'steps': [
+        {'at': 10, 'stall': 3},
+        {'at': 25, 'stall': 12},
+    ]},
+    'reset': {'duration': 45, 'steps': [
+        {'at': 10, 'reset': True},
+        {'at': 25, 'reset': True},
+    ]},
+    'flaky': {'duration': 60, 'steps': [
+        {'at': 5, 'latency_ms': 80, 'jitter_ms': 40},
+        {'at': 15, 'bandwidth_kbps': BITRATE * 0.8},
+        {'at': 25, 'stall': 4},
+        {'at': 35, 'reset': True},
+        {'at': 45, 'bandwidth_kbps': 0, 'latency_ms': 0, 'jitter_ms': 0},
+    ]},
+}
+
+
+class ScenarioRun:
+    """Ein Szenario: Stream starten, Zeitplan abspielen, Zeitreihe aufzeichnen."""
+
+    def __init__(self, app: QCoreApplication, manager: StreamManager, auto_restart: bool):
+        self.app = app
+        self.manager = manager
+        self.auto_restart = auto_restart
+        self.events: List[Dict[str, Any]] = []
+        self.timeline: List[Dict[str, Any]] = []
+        self._t0 = 0.0
+
+    def _now(self) -> float:
+        return round(time.monotonic() - self._t0, 2)
+
+    def _event(self, kind: str, **data: Any) -> None:
+        self.events.append(dict(data, t=self._now(), event=kind))
+
+    def run(self, name: str, scenario: Dict[str, Any]) -> Dict[str, Any]:
+        """Spielt ein Szenario ab und wertet es aus."""
+        ingest = RtmpIngest()
+        ingest.start()
+        proxy = ImpairmentProxy((ingest.host, ingest.port), seed=1)
+        proxy.start()
+
+        def on_error(message: str) -> None:
+            self._event('error', message=message)
+
+        def on_state(state: str) -> None:
+            self._event('state', state=state)
+
+        self.manager.error_signal.connect(on_error)
+        self.manager.state_changed_signal.connect(on_state)
+
+        steps = sorted(scenario.get('steps', []), key=lambda s: s['at'])
+        duration = float(scenario['duration'])
+        pending = list(steps)
+        stopped_at: Optional[float] = None
+
+        try:
+            self._t0 = time.monotonic()
+            self._start(proxy)
+            next_sample = 1.0
+            ingest.reset_stats()
+
+            while self._now() < duration:
+                self.app.processEvents()
+                now = self._now()
+
+                while pending and pending[0]['at'] <= now:
+                    self._apply(proxy, pending.pop(0))
+
+                if not self.manager.is_streaming:
+                    if stopped_at is None:
+                        stopped_at = now
+                        self._event('stream_stopped')
+                    elif self.auto_restart and now - stopped_at >= RESTART_DELAY:
+                        self._start(proxy)
+                        stopped_at = None
+                elif stopped_at is not None:
+                    stopped_at = None
+
+                if now >= next_sample:
+                    next_sample += 1.0
+                    self._sample(ingest, proxy)
+
+                time.sleep(0.01)
+        finally:
+            stop_and_wait(self.app, self.manager)
+            self.manager.error_signal.disconnect(on_error)
+            self.manager.state_changed_signal.disconnect(on_state)
+            proxy.stop()
+            ingest.stop()
+
+        return self._summarize(name, scenario, steps, proxy)
+
+    def _start(self, proxy: ImpairmentProxy) -> None:
+        ok = self.manager.start_stream(TEST, TEST, proxy.url(), 'netem', RESOLUTION, BITRATE, FPS)
+        self._event('start_stream', ok=ok)
+
+    def _apply(self, proxy: ImpairmentProxy, step: Dict[str, Any]) -> None:
+        """Führt einen Zeitplan-Schritt aus."""
+        proxy.set_conditions(step.get('bandwidth_kbps'), step.get('latency_ms'), step.get('jitter_ms'))
+        if step.get('stall'):
+            proxy.stall(float(step['stall']))
+        if step.get('reset'):
+            proxy.reset()
+        self._event('step', **{k: v for k, v in step.items() if k != 'at'})
+
+    def _sample(self, ingest: RtmpIngest, proxy: ImpairmentProxy) -> None:
+        """Eine Sekunde Zeitreihe (Ingest-Fenster wird danach zurückgesetzt)."""
+        stats = ingest.get_stats()
+        ingest.reset_stats()
+        self.timeline.append({
+            't': self._now(),
+            'video_kbps': round(stats['video_kbps'], 1),
+            'fps': round(stats['fps_wall'], 1),
+            'receiving': stats['video_frames'] > 0,
+            'lag_ms': round(stats['max_lag_ms'], 1) if stats['max_lag_ms'] is not None else None,
+            'streaming': self.manager.is_streaming,
+            'connections': stats['connections'],
+            'conditions': dict(proxy.conditions),
+        })
+
+    def _summarize(
+        self,
+        name: str,
+        scenario: Dict[str, Any],
+        steps: List[Dict[str, Any]],
+        proxy: ImpairmentProxy
+    ) -> Dict[str, Any]:
+        """Auswertung gesamt und pro Phase."""
+        boundaries = [0.0] + [float(s['at']) for s in steps] + [float(scenario['duration'])]
+        phases = []
+        for index, (start, end) in enumerate(zip(boundaries, boundaries[1:])):
+            samples = [s for s in self.timeline if start < s['t'] <= end]
+            phases.append(dict(self._aggregate(samples), **{
+                'from': start,
+                'to': end,
+                'step': {k: v for k, v in steps[index - 1].items() if k != 'at'} if index else {},
+            }))
+
+        # Erholung: Reset/Stall-Ende → wieder Frames am Ingest
+        recoveries = []
+        for step in steps:
+            if not (step.get('reset') or step.get('stall')):
+                continue
+            begin = float(step['at']) + float(step.get('stall', 0))
+            back = next((s['t'] for s in self.timeline if s['t'] > begin + 1 and s['receiving']), None)
+            recoveries.append({
+                'at': step['at'],
+                'kind': 'reset' if step.get('reset') else 'stall',
+                'recovery_s': round(back - begin, 1) if back is not None else None,
+            })
+
+        summary = dict(self._aggregate(self.timeline), **{
+            'scenario': name,
+            'stream_stops': sum(1 for e in self.events if e['event'] == 'stream_stopped'),
+            'restarts': max(0, sum(1 for e in self.events if e['event'] == 'start_stream') - 1),
+            'connections': proxy.stats['connections'],
+            'recoveries': recoveries,
+            'errors': [e['message'] for e in self.events if e['event'] == 'error'],
+            'phases': phases,
+            'timeline': self.timeline,
+            'events': self.events,
+        })
+        return summary
+
+    @staticmethod
+    def _aggregate(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+        if not samples:
+            return {'avg_kbps': 0.0, 'uptime_pct': 0.0, 'max_lag_ms': None}
+        lags = [s['lag_ms'] for s in samples if s['lag_ms'] is not None]
+        return {
+            'avg_kbps': round(sum(s['video_kbps'] for s in samples) / len(samples), 1),
+            'uptime_pct': round(100 * sum(1 for s in samples if s['receiving']) / len(samples), 1),
+            'max_lag_ms': max(lags) if lags else None,
+        }
+
+
+def main() -> int:
+    """Einstiegspunkt."""
+    parser = argparse.ArgumentParser(description="Stream-Verhalten unter Netzstörungen")
+    parser.add_argument('--scenarios', nargs='+', help="Auswahl (Default: alle)")
+    parser.add_argument('--scenario-file', help="Eigene Szenarien (JSON)")
+    parser.add_argument('--auto-restart', action='store_true',
+                        help=f"Abgebrochenen Stream nach {RESTART_DELAY:g}s neu starten (wie ein Benutzer)")
+    parser.add_argument('--json', metavar='DATEI', help="Ergebnis als JSON speichern")
+    args = parser.parse_args()
+
+    scenarios = dict(SCENARIOS)
+    if args.scenario_file:
+        with open(args.scenario_file, 'r', encoding='utf-8') as f:
+            scenarios.update(json.load(f))
+
+    names = args.scenarios or list(scenarios)
+    unknown = [n for n in names if n not in scenarios]
+    if unknown:
+        parser.error(f"Unbekannte Szenarien: {', '.join(unknown)}")
+
+    Gst.init(None)
+    app = QCoreApplication(sys.argv)
+    manager = StreamManager()
+    # Keine Nachbearbeitungs-Jobs des Benutzers im Messprozess
+    manager.postprocess_queue.shutdown()
+
+    results = []
+    for name in names:
+        print(f"🔹 Szenario {name} ({scenarios[name]['duration']} s) ...", flush=True)
+        results.append(ScenarioRun(app, manager, args.auto_restart).run(name, scenarios[name]))
+
+    print()
+    print(f"{'Szenario':<12} {'kbps':>7} {'Uptime %':>9} {'Max-Lag ms':>11} {'Abbrüche':>9} {'Erholung s':>11}")
+    for r in results:
+        recovery = [str(x['recovery_s']) if x['recovery_s'] is not None else '–' for x in r['recoveries']]
+        lag = r['max_lag_ms'] if r['max_lag_ms'] is not None else '–'
+        print(f"{r['scenario']:<12} {r['avg_kbps']:>7} {r['uptime_pct']:>9} {lag:>11} "
+              f"{r['stream_stops']:>9} {', '.join(recovery) or '–':>11}")
+        for phase in r['phases']:
+            lag = phase['max_lag_ms'] if phase['max_lag_ms'] is not None else '–'
+            print(f"   {phase['from']:>5.0f}–{phase['to']:<5.0f} {phase['avg_kbps']:>7} "
+                  f"{phase['uptime_pct']:>9} {lag:>11}  {phase['step'] or ''}")
+
+    if args.json:
+        report = {
+            'benchmark': 'network_scenarios',
+            'version': get_version(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'bitrate_kbps': BITRATE,
+            'auto_restart': args.auto_restart,
+            'results': results,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
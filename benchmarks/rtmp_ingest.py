@@ -0,0 +1,583 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Lokaler RTMP-Ingest (Testserver)
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Minimaler RTMP-Empfänger auf Loopback als Ersatz für Twitch/YouTube:
+Handshake, Chunk-Stream, die Befehle eines Publishers (connect,
+releaseStream, FCPublish, createStream, publish) und Empfang der
+Audio-/Video-Nachrichten. Kein Playback, keine Authentifizierung.
+
+Gemessen wird, was wirklich ankommt: Bytes pro Nachrichtentyp,
+Video-Frames (Wanduhr und Stream-Zeitstempel), Keyframes und die
+Zeit bis zum ersten Medien-Byte. Optional wird alles als FLV
+geschrieben (zum Nachprüfen mit gst-play / ffprobe).
+
+Aufruf (eigenständig):
+    python3 benchmarks/rtmp_ingest.py [--port 1935] [--flv empfang.flv]
+    → rtmp://127.0.0.1:1935/live + beliebiger Stream-Key
+"""
+
+import argparse
+import os
+import socket
+import struct
+import sys
+import threading
+import time
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+
+# RTMP-Nachrichtentypen
+MSG_SET_CHUNK_SIZE = 1
+MSG_ABORT = 2
+MSG_ACK = 3
+MSG_USER_CONTROL = 4
+MSG_WINDOW_ACK_SIZE = 5
+MSG_SET_PEER_BANDWIDTH = 6
+MSG_AUDIO = 8
+MSG_VIDEO = 9
+MSG_DATA_AMF3 = 15
+MSG_COMMAND_AMF3 = 17
+MSG_DATA_AMF0 = 18
+MSG_COMMAND_AMF0 = 20
+
+HANDSHAKE_SIZE = 1536
+SERVER_CHUNK_SIZE = 4096
+SERVER_WINDOW = 2500000
+
+# AMF0-String '@setDataFrame' (vor onMetaData in RTMP-Datennachrichten)
+SET_DATA_FRAME = b'\x02\x00\x0d@setDataFrame'
+
+
+# ==================== AMF0 ====================
+
+def amf0_encode(value: Any) -> bytes:
+    """Kodiert einen Python-Wert als AMF0 (None → null, dict → Object)."""
+    if value is None:
+        return b'\x05'
+    if isinstance(value, bool):
+        return b'\x01' + (b'\x01' if value else b'\x00')
+    if isinstance(value, (int, float)):
+        return b'\x00' + struct.pack('>d', float(value))
+    if isinstance(value, str):
+        data = value.encode('utf-8')
+        return b'\x02' + struct.pack('>H', len(data)) + data
+    if isinstance(value, dict):
+        out = b'\x03'
+        for key, item in value.items():
+            name = key.encode('utf-8')
+            out += struct.pack('>H', len(name)) + name + amf0_encode(item)
+        return out + b'\x00\x00\x09'
+    raise TypeError(f"AMF0: Typ nicht unterstützt: {type(value)}")
+
+
+def amf0_decode_all(data: bytes) -> List[Any]:
+    """Dekodiert alle AMF0-Werte einer Nachricht (bricht bei Unbekanntem ab)."""
+    values = []
+    pos = 0
+    while pos < len(data):
+        try:
+            value, pos = _amf0_decode(data, pos)
+        except (ValueError, IndexError, struct.error):
+            break
+        values.append(value)
+    return values
+
+
+def _amf0_decode(data: bytes, pos: int) -> Tuple[Any, int]:
+    """Dekodiert einen AMF0-Wert ab pos → (Wert, neue Position)."""
+    marker = data[pos]
+    pos += 1
+    if marker == 0x00:
+        return struct.unpack_from('>d', data, pos)[0], pos + 8
+    if marker == 0x01:
+        return data[pos] != 0, pos + 1
+    if marker == 0x02:
+        length = struct.unpack_from('>H', data, pos)[0]
+        return data[pos + 2:pos + 2 + length].decode('utf-8', 'replace'), pos + 2 + length
+    if marker in (0x03, 0x08):
+        if marker == 0x08:
+            pos += 4  # ECMA-Array: Anzahl (nur Hinweis)
+        obj = {}
+        while True:
+            length = struct.unpack_from('>H', data, pos)[0]
+            pos += 2
+            if length == 0 and data[pos] == 0x09:
+                return obj, pos + 1
+            key = data[pos:pos + length].decode('utf-8', 'replace')
+            obj[key], pos = _amf0_decode(data, pos + length)
+    if marker in (0x05, 0x06):
+        return None, pos
+    if marker == 0x0A:
+        count = struct.unpack_from('>I', data, pos)[0]
+        pos += 4
+        items = []
+        for _ in range(count):
+            item, pos = _amf0_decode(data, pos)
+            items.append(item)
+        return items, pos
+    raise ValueError(f"AMF0-Marker nicht unterstützt: {marker:#x}")
+
+
+# ==================== SERVER ====================
+
+class RtmpIngest:
+    """
+    RTMP-Testserver für einen Publisher (Verbindungen nacheinander).
+
+    Läuft in einem eigenen Thread. get_stats() liefert jederzeit eine
+    Momentaufnahme, reset_stats() startet ein neues Messfenster (z.B.
+    nach dem Warmup), ohne die Verbindung zu trennen.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, flv_path: Optional[str] = None):
+        """
+        Initialisiert den Server (bindet sofort, Port 0 = frei wählen).
+
+        Args:
+            host: Bind-Adresse (Loopback)
+            port: TCP-Port
+            flv_path: Optional: empfangene Medien als FLV speichern
+        """
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((host, port))
+        self._server.listen(1)
+        self.host, self.port = self._server.getsockname()
+
+        self.flv_path = flv_path
+        self._flv: Optional[BinaryIO] = None
+
+        self._thread: Optional[threading.Thread] = None
+        self._conn: Optional[socket.socket] = None
+        self._running = False
+        self._lock = threading.Lock()
+        self._origin: Optional[Tuple[float, int]] = None
+        self.stats: Dict[str, Any] = {}
+        self.reset_stats()
+
+    @property
+    def url(self) -> str:
+        """RTMP-URL ohne Stream-Key."""
+        return f"rtmp://{self.host}:{self.port}/live"
+
+    # ==================== STEUERUNG ====================
+
+    def start(self) -> None:
+        """Startet den Accept-Thread."""
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, name="rtmp-ingest", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Beendet Server und laufende Verbindung."""
+        self._running = False
+        for sock in (self._conn, self._server):
+            if sock is None:
+                continue
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def reset_stats(self) -> None:
+        """Startet ein neues Messfenster (Verbindungs-Zeitpunkte bleiben erhalten)."""
+        with self._lock:
+            previous = self.stats
+            self.stats = {
+                'connected_at': previous.get('connected_at'),
+                'publish_at': previous.get('publish_at'),
+                'first_media_at': previous.get('first_media_at'),
+                'first_keyframe_at': previous.get('first_keyframe_at'),
+                'stream_name': previous.get('stream_name'),
+                'metadata': previous.get('metadata', {}),
+                'window_start': time.monotonic(),
+                'bytes': {'audio': 0, 'video': 0, 'data': 0},
+                'video_frames': 0,
+                'keyframes': 0,
+                'audio_frames': 0,
+                'first_video_ts': None,
+                'last_video_ts': None,
+                'disconnected': previous.get('disconnected', False),
+                'connections': previous.get('connections', 0),
+                'connection_media_at': previous.get('connection_media_at'),
+                'lag_ms': previous.get('lag_ms'),
+                'max_lag_ms': None,
+            }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Momentaufnahme des aktuellen Messfensters.
+
+        'lag_ms' ist der Rückstand der Ankunft gegenüber den Stream-
+        Zeitstempeln seit dem ersten Frame der Verbindung (wächst, wenn
+        sich beim Sender oder im Netz etwas staut).
+
+        Returns:
+            Dict mit Roh-Zählern plus 'elapsed', 'fps_wall', 'fps_stream',
+            'video_kbps', 'audio_kbps', 'total_kbps'
+        """
+        with self._lock:
+            stats = dict(self.stats, bytes=dict(self.stats['bytes']))
+
+        elapsed = time.monotonic() - stats['window_start']
+        stats['elapsed'] = elapsed
+        stats['fps_wall'] = stats['video_frames'] / elapsed if elapsed > 0 else 0.0
+
+        span_ms = None
+        if stats['first_video_ts'] is not None and stats['last_video_ts'] is not None:
+            span_ms = stats['last_video_ts'] - stats['first_video_ts']
+        stats['fps_stream'] = (
+            (stats['video_frames'] - 1) / (span_ms / 1000) if span_ms else 0.0
+        )
+
+        for kind in ('video', 'audio'):
+            stats[f'{kind}_kbps'] = stats['bytes'][kind] * 8 / 1000 / elapsed if elapsed > 0 else 0.0
+        stats['total_kbps'] = stats['video_kbps'] + stats['audio_kbps']
+        return stats
+
+    # ==================== VERBINDUNG ====================
+
+    def _serve(self) -> None:
+        """Accept-Schleife: eine Verbindung nach der anderen."""
+        while self._running:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                break
+
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._conn = conn
+            with self._lock:
+                self.stats['connected_at'] = time.monotonic()
+                self.stats['disconnected'] = False
+                self.stats['connections'] += 1
+                self.stats['connection_media_at'] = None
+                self._origin = None
+
+            if self.flv_path:
+                self._flv = open(self.flv_path, 'wb')
+                self._flv.write(b'FLV\x01\x05\x00\x00\x00\x09' + b'\x00\x00\x00\x00')
+
+            try:
+                _Connection(self, conn).run()
+            except (ConnectionError, OSError):
+                pass
+            finally:
+                conn.close()
+                self._conn = None
+                if self._flv:
+                    self._flv.close()
+                    self._flv = None
+                with self._lock:
+                    self.stats['disconnected'] = True
+
+    def _on_media(self, msg_type: int, timestamp: int, payload: bytes) -> None:
+        """Zählt eine Audio-/Video-/Daten-Nachricht (Connection-Thread)."""
+        now = time.monotonic()
+        with self._lock:
+            stats = self.stats
+            if msg_type == MSG_VIDEO and payload:
+                stats['bytes']['video'] += len(payload)
+                if payload[0] & 0x80:
+                    # Enhanced RTMP: ExHeader | Frame-Typ | Pakettyp (1/3 = Frames), dann FourCC
+                    keyframe = (payload[0] >> 4) & 0x07 == 1
+                    is_frame = payload[0] & 0x0F in (1, 3)
+                else:
+                    # FLV-Video: Frame-Typ (1 = Keyframe) | Codec; AVC-Pakettyp 1 = NALU
+                    keyframe = payload[0] >> 4 == 1
+                    is_frame = len(payload) < 2 or payload[1] == 1 or (payload[0] & 0x0F) != 7
+                if is_frame:
+                    stats['video_frames'] += 1
+                    if stats['first_video_ts'] is None:
+                        stats['first_video_ts'] = timestamp
+                    stats['last_video_ts'] = timestamp
+
+                    # Rückstand gegenüber der Stream-Zeit (pro Verbindung)
+                    if self._origin is None:
+                        self._origin = (now, timestamp)
+                    lag = (now - self._origin[0]) * 1000 - (timestamp - self._origin[1])
+                    stats['lag_ms'] = lag
+                    stats['max_lag_ms'] = lag if stats['max_lag_ms'] is None else max(stats['max_lag_ms'], lag)
+                    if keyframe:
+                        stats['keyframes'] += 1
+                        if stats['first_keyframe_at'] is None:
+                            stats['first_keyframe_at'] = now
+            elif msg_type == MSG_AUDIO and payload:
+                stats['bytes']['audio'] += len(payload)
+                # AAC: Pakettyp 1 = Rohdaten (0 = AudioSpecificConfig)
+                if (payload[0] >> 4) != 10 or (len(payload) > 1 and payload[1] == 1):
+                    stats['audio_frames'] += 1
+            else:
+                stats['bytes']['data'] += len(payload)
+
+            if msg_type in (MSG_AUDIO, MSG_VIDEO):
+                if stats['first_media_at'] is None:
+                    stats['first_media_at'] = now
+                if stats['connection_media_at'] is None:
+                    stats['connection_media_at'] = now
+
+        if self._flv:
+            if msg_type in (MSG_AUDIO, MSG_VIDEO):
+                tag_type = msg_type
+            else:
+                # Skript-Tag: '@setDataFrame' gehört nur zu RTMP, nicht ins FLV
+                tag_type = MSG_DATA_AMF0
+                if payload.startswith(SET_DATA_FRAME):
+                    payload = payload[len(SET_DATA_FRAME):]
+            header = (
+                bytes([tag_type]) + len(payload).to_bytes(3, 'big')
+                + (timestamp & 0xFFFFFF).to_bytes(3, 'big') + bytes([(timestamp >> 24) & 0xFF])
+                + b'\x00\x00\x00'
+            )
+            self._flv.write(header + payload + struct.pack('>I', len(header) + len(payload)))
+
+    def _on_publish(self, name: str) -> None:
+        """publish empfangen (Connection-Thread)."""
+        with self._lock:
+            self.stats['publish_at'] = time.monotonic()
+            self.stats['stream_name'] = name
+
+    def _on_metadata(self, metadata: Dict[str, Any]) -> None:
+        """onMetaData empfangen (Connection-Thread)."""
+        with self._lock:
+            self.stats['metadata'] = metadata
+
+
+class _Connection:
+    """Zustand einer RTMP-Verbindung (Chunk-Stream-Parser + Befehle)."""
+
+    def __init__(self, ingest: RtmpIngest, sock: socket.socket):
+        self.ingest = ingest
+        self.sock = sock
+        self._buffer = bytearray()
+
+        self.in_chunk_size = 128
+        self.out_chunk_size = 128
+
+        # csid → letzter Header + halbfertige Nachricht
+        self.chunk_streams: Dict[int, Dict[str, Any]] = {}
+
+        # Acknowledgements (wenn der Client ein Fenster setzt)
+        self.window = 0
+        self.received = 0
+        self.acked = 0
+
+    # ---------- I/O ----------
+
+    def _read(self, size: int) -> bytes:
+        """Liest genau size Bytes (gepuffert)."""
+        while len(self._buffer) < size:
+            data = self.sock.recv(65536)
+            if not data:
+                raise ConnectionError("Verbindung geschlossen")
+            self._buffer += data
+            self.received += len(data)
+        chunk = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return chunk
+
+    def _send_message(self, csid: int, msg_type: int, stream_id: int, payload: bytes) -> None:
+        """Sendet eine Nachricht (fmt 0, danach fmt-3-Fortsetzungen)."""
+        header = bytes([csid & 0x3F]) + struct.pack(
+            '>3s3sB', b'\x00\x00\x00', len(payload).to_bytes(3, 'big'), msg_type
+        ) + struct.pack('<I', stream_id)
+
+        out = bytearray(header)
+        for offset in range(0, len(payload), self.out_chunk_size):
+            if offset:
+                out.append(0xC0 | (csid & 0x3F))
+            out += payload[offset:offset + self.out_chunk_size]
+        self.sock.sendall(bytes(out))
+
+    def _send_command(self, stream_id: int, *values: Any) -> None:
+        """Sendet einen AMF0-Befehl."""
+        payload = b''.join(amf0_encode(v) for v in values)
+        self._send_message(3 if stream_id == 0 else 5, MSG_COMMAND_AMF0, stream_id, payload)
+
+    # ---------- Ablauf ----------
+
+    def run(self) -> None:
+        """Handshake, dann Nachrichten bis zum Verbindungsende."""
+        self._handshake()
+        while True:
+            message = self._read_chunk()
+            if message is not None:
+                self._handle_message(*message)
+
+            if self.window and self.received - self.acked >= self.window:
+                self.acked = self.received
+                self._send_message(2, MSG_ACK, 0, struct.pack('>I', self.received & 0xFFFFFFFF))
+
+    def _handshake(self) -> None:
+        """Einfacher Handshake (C0/C1 → S0/S1/S2 → C2), ohne Digest."""
+        c0c1 = self._read(1 + HANDSHAKE_SIZE)
+        if c0c1[0] != 3:
+            raise ConnectionError(f"RTMP-Version {c0c1[0]} nicht unterstützt")
+
+        s1 = struct.pack('>II', int(time.monotonic() * 1000) & 0xFFFFFFFF, 0) + os.urandom(HANDSHAKE_SIZE - 8)
+        self.sock.sendall(b'\x03' + s1 + c0c1[1:])
+        self._read(HANDSHAKE_SIZE)
+
+    def _read_chunk(self) -> Optional[Tuple[int, int, int, bytes]]:
+        """
+        Liest einen Chunk.
+
+        Returns:
+            (Typ, Zeitstempel, Stream-ID, Payload) wenn eine Nachricht
+            vollständig ist, sonst None
+        """
+        first = self._read(1)[0]
+        fmt, csid = first >> 6, first & 0x3F
+        if csid == 0:
+            csid = 64 + self._read(1)[0]
+        elif csid == 1:
+            low, high = self._read(2)
+            csid = 64 + low + high * 256
+
+        state = self.chunk_streams.setdefault(csid, {
+            'timestamp': 0, 'delta': 0, 'length': 0, 'type': 0,
+            'stream_id': 0, 'extended': False, 'payload': bytearray(),
+        })
+        new_message = not state['payload']
+
+        if fmt <= 2:
+            ts = int.from_bytes(self._read(3), 'big')
+            if fmt <= 1:
+                state['length'] = int.from_bytes(self._read(3), 'big')
+                state['type'] = self._read(1)[0]
+                if fmt == 0:
+                    state['stream_id'] = struct.unpack('<I', self._read(4))[0]
+            state['extended'] = ts == 0xFFFFFF
+            if state['extended']:
+                ts = struct.unpack('>I', self._read(4))[0]
+            if fmt == 0:
+                state['timestamp'] = ts
+                state['delta'] = 0
+            else:
+                state['delta'] = ts
+                state['timestamp'] += ts
+        else:
+            if state['extended']:
+                self._read(4)
+            if new_message:
+                state['timestamp'] += state['delta']
+
+        remaining = state['length'] - len(state['payload'])
+        state['payload'] += self._read(min(self.in_chunk_size, remaining))
+
+        if len(state['payload']) < state['length']:
+            return None
+
+        payload = bytes(state['payload'])
+        state['payload'] = bytearray()
+        return state['type'], state['timestamp'], state['stream_id'], payload
+
+    def _handle_message(self, msg_type: int, timestamp: int, stream_id: int, payload: bytes) -> None:
+        """Verarbeitet eine vollständige Nachricht."""
+        if msg_type == MSG_SET_CHUNK_SIZE:
+            self.in_chunk_size = struct.unpack('>I', payload[:4])[0] & 0x7FFFFFFF
+        elif msg_type == MSG_WINDOW_ACK_SIZE:
+            self.window = struct.unpack('>I', payload[:4])[0]
+        elif msg_type in (MSG_AUDIO, MSG_VIDEO):
+            self.ingest._on_media(msg_type, timestamp, payload)
+        elif msg_type in (MSG_DATA_AMF0, MSG_DATA_AMF3):
+            self._handle_data(payload[1:] if msg_type == MSG_DATA_AMF3 else payload)
+            self.ingest._on_media(msg_type, timestamp, payload)
+        elif msg_type in (MSG_COMMAND_AMF0, MSG_COMMAND_AMF3):
+            self._handle_command(stream_id, payload[1:] if msg_type == MSG_COMMAND_AMF3 else payload)
+
+    def _handle_data(self, payload: bytes) -> None:
+        """@setDataFrame / onMetaData."""
+        values = amf0_decode_all(payload)
+        metadata = next((v for v in values if isinstance(v, dict)), None)
+        if metadata is not None:
+            self.ingest._on_metadata(metadata)
+
+    def _handle_command(self, stream_id: int, payload: bytes) -> None:
+        """Beantwortet die Befehle eines Publishers."""
+        values = amf0_decode_all(payload)
+        if len(values) < 2:
+            return
+        name, txn = values[0], values[1]
+
+        if name == 'connect':
+            self._send_message(2, MSG_WINDOW_ACK_SIZE, 0, struct.pack('>I', SERVER_WINDOW))
+            self._send_message(2, MSG_SET_PEER_BANDWIDTH, 0, struct.pack('>IB', SERVER_WINDOW, 2))
+            self._send_message(2, MSG_SET_CHUNK_SIZE, 0, struct.pack('>I', SERVER_CHUNK_SIZE))
+            self.out_chunk_size = SERVER_CHUNK_SIZE
+            self._send_command(
+                0, '_result', txn,
+                {'fmsVer': 'FMS/3,0,1,123', 'capabilities': 31},
+                {'level': 'status', 'code': 'NetConnection.Connect.Success',
+                 'description': 'Connection succeeded.', 'objectEncoding': 0}
+            )
+        elif name == 'createStream':
+            self._send_command(0, '_result', txn, None, 1)
+        elif name == 'publish':
+            publish_name = values[3] if len(values) > 3 else ''
+            self.ingest._on_publish(str(publish_name))
+            # StreamBegin (User Control, Event 0) für Stream 1
+            self._send_message(2, MSG_USER_CONTROL, 0, struct.pack('>HI', 0, 1))
+            self._send_command(
+                1, 'onStatus', 0, None,
+                {'level': 'status', 'code': 'NetStream.Publish.Start',
+                 'description': f'{publish_name} is now published.'}
+            )
+        elif name == 'FCPublish':
+            self._send_command(0, 'onFCPublish', 0, None, {'code': 'NetStream.Publish.Start'})
+        elif name in ('deleteStream', 'FCUnpublish', 'closeStream'):
+            pass
+        elif isinstance(txn, float) and txn > 0:
+            # releaseStream & Co.: neutral bestätigen
+            self._send_command(0, '_result', txn, None)
+
+
+# ==================== EIGENSTÄNDIG ====================
+
+def main() -> int:
+    """Einstiegspunkt: Server starten und Empfang sekündlich anzeigen."""
+    parser = argparse.ArgumentParser(description="Lokaler RTMP-Ingest (Testserver)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=1935)
+    parser.add_argument('--flv', help="Empfangene Medien als FLV speichern")
+    args = parser.parse_args()
+
+    ingest = RtmpIngest(args.host, args.port, args.flv)
+    ingest.start()
+    print(f"🔹 RTMP-Ingest läuft: {ingest.url}/<beliebiger-key>  (Strg+C beendet)")
+
+    try:
+        while True:
+            time.sleep(1)
+            stats = ingest.get_stats()
+            if stats['connected_at'] is None:
+                continue
+            print(
+                f"{stats['stream_name'] or '-':<12} "
+                f"{stats['fps_wall']:5.1f} fps  "
+                f"{stats['video_kbps']:7.0f} kbps Video  "
+                f"{stats['audio_kbps']:5.0f} kbps Audio  "
+                f"{stats['keyframes']} Keyframes",
+                flush=True
+            )
+            ingest.reset_stats()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        ingest.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Soak-Test: Langzeitlauf mit Leck-Suche
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Lässt den StreamManager stundenlang Zyklen aus Preview, Stream (gegen
+den lokalen RTMP-Ingest), angehängter und eigenständiger Aufnahme
+durchlaufen - mit den Testquellen, ohne Hardware.
+
+Gesammelt wird:
+    RSS            - Verlauf (alle --sample-interval s) + Anstieg in MB/h
+    tracemalloc    - Python-Allokationen mit dem größten Zuwachs (Datei:Zeile)
+    gc             - Python-Objekttypen mit dem größten Zuwachs
+    leaks-Tracer   - GStreamer-Objekte, die am Zyklus-Ende (alles
+                     gestoppt) noch leben, nach Typ (GstBuffer, GstPad, ...)
+    queues         - Füllstand aller queue-Elemente (Name → Max.)
+    UI-Log         - Zeichen/Blöcke im Log-Widget (nur mit --with-ui)
+
+Der erste Zyklus ist Warmup (Caches, Plugin-Laden) und zählt nicht.
+
+Aufruf:
+    python3 benchmarks/soak.py --hours 6 [--with-ui] [--json bericht.json]
+    python3 benchmarks/soak.py --cycles 20 --cycle-seconds 30   # kurzer Lauf
+
+Exit-Code 1, wenn der RSS-Anstieg über --max-growth-mb-h liegt oder
+der leaks-Tracer Objekte zwischen den Zyklen wachsen sieht.
+"""
+
+import os
+import sys
+
+# Muss vor Gst.init() gesetzt sein
+if '--no-gst-leaks' not in sys.argv:
+    os.environ.setdefault('GST_TRACERS', 'leaks')
+if '--with-ui' in sys.argv:
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+import argparse
+import collections
+import gc
+import json
+import platform
+import re
+import shutil
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import Gst
+
+from PyQt6.QtCore import QCoreApplication
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+from src.core.stream_manager import StreamManager
+from src.core.device_manager import DeviceManager
+from rtmp_ingest import RtmpIngest
+from lifecycle import RssSampler
+from stream_throughput import get_version, stop_and_wait, wait_until
+
+
+RESOLUTION = '1280x720'
+BITRATE = 2500
+FPS = 30
+TEST = DeviceManager.TEST_SOURCE
+
+# leaks-Tracer Checkpoint: "object-created, type-name=(string)GstBuffer, address=(gpointer)0x..."
+CHECKPOINT_RE = re.compile(
+    r'object-(created|removed), type-name=\(string\)(\w+), address=\(gpointer\)(0x[0-9a-fA-F]+)'
+)
+
+
+class GstLeakTracker:
+    """
+    Wertet den GStreamer-leaks-Tracer über Checkpoints aus.
+
+    Zwischen zwei Checkpoints erzeugte und nicht wieder freigegebene
+    Objekte werden pro Adresse geführt - was am Zyklus-Ende (alles
+    gestoppt) noch lebt, ist ein Kandidat für ein Leck.
+    """
+
+    def __init__(self):
+        self.tracer = None
+        self.alive: Dict[str, str] = {}  # Adresse → Typ
+
+        tracers = Gst.tracing_get_active_tracers() if hasattr(Gst, 'tracing_get_active_tracers') else []
+        for tracer in tracers:
+            if tracer.get_factory() and tracer.get_factory().get_name() == 'leaks':
+                self.tracer = tracer
+
+    @property
+    def available(self) -> bool:
+        return self.tracer is not None
+
+    def start(self) -> None:
+        """Beginnt die Erfassung (nach dem Warmup)."""
+        if self.tracer:
+            self.tracer.emit('activity-start-tracking')
+            self.alive = {}
+
+    def checkpoint(self) -> collections.Counter:
+        """
+        Übernimmt die Änderungen seit dem letzten Checkpoint.
+
+        Returns:
+            Lebende Objekte pro Typ (seit start())
+        """
+        if self.tracer:
+            structure = self.tracer.emit('activity-get-checkpoint')
+            if structure is not None:
+                for kind, type_name, address in CHECKPOINT_RE.findall(structure.to_string()):
+                    if kind == 'created':
+                        self.alive[address] = type_name
+                    else:
+                        self.alive.pop(address, None)
+        return collections.Counter(self.alive.values())
+
+
+class Soak:
+    """Ein Soak-Lauf: Zyklen ausführen, Proben sammeln, Bericht erstellen."""
+
+    def __init__(self, app: QCoreApplication, args: argparse.Namespace):
+        self.app = app
+        self.args = args
+        self.window = None
+
+        if args.with_ui:
+            from src.ui.main_window import MainWindow
+            self.window = MainWindow()
+            self.manager = self.window.stream_manager
+        else:
+            self.manager = StreamManager()
+
+        # Keine Nachbearbeitung: weder Jobs des Benutzers noch der Testaufnahmen
+        self.manager.postprocess_queue.shutdown()
+        for key, value in (('postprocess_remux', False), ('postprocess_thumbnail', False),
+                           ('postprocess_transcode_kbps', 0)):
+            self.manager.config.set(key, value)
+
+        self.ingest = RtmpIngest()
+        self.ingest.start()
+        self.output_dir = tempfile.mkdtemp(prefix="tuxrtmpilot_soak_")
+
+        # Replays landen im Aufnahme-Pfad - nur im Speicher umbiegen
+        self.manager.config.set('recording_path', self.output_dir)
+
+        self.leaks = GstLeakTracker()
+        self.started = time.monotonic()
+        self.warmup_end: Optional[float] = None
+        self.next_sample = 0.0
+
+        self.rss_samples: List[Dict[str, float]] = []
+        self.gst_alive: List[Dict[str, Any]] = []
+        self.queue_levels: Dict[str, Dict[str, int]] = {}
+        self.log_samples: List[Dict[str, int]] = []
+        self.errors: List[str] = []
+        self.manager.error_signal.connect(self._on_error)
+
+        self._tracemalloc_base = None
+        self._gc_base: Optional[collections.Counter] = None
+
+    def _on_error(self, message: str) -> None:
+        self.errors.append(message)
+
+    # ---------- Ablauf ----------
+
+    def run(self) -> Dict[str, Any]:
+        """Führt alle Zyklen aus und liefert den Bericht."""
+        deadline = self.started + self.args.hours * 3600 if self.args.hours else None
+        cycle = 0
+
+        try:
+            while True:
+                self._cycle(cycle)
+
+                if cycle == 0:
+                    # Warmup vorbei: Referenzpunkte setzen
+                    self.warmup_end = time.monotonic() - self.started
+                    gc.collect()
+                    tracemalloc.start(self.args.traceback_depth)
+                    self._tracemalloc_base = tracemalloc.take_snapshot()
+                    self._gc_base = self._count_objects()
+                    self.leaks.start()
+                else:
+                    gc.collect()
+                    alive = self.leaks.checkpoint()
+                    self.gst_alive.append({'cycle': cycle, 'total': sum(alive.values()), 'by_type': dict(alive)})
+
+                cycle += 1
+                print(f"🔹 Zyklus {cycle} fertig, RSS {RssSampler.current() / 2**20:.1f} MB", flush=True)
+
+                if self.args.cycles and cycle >= self.args.cycles + 1:
+                    break
+                if deadline and time.monotonic() >= deadline:
+                    break
+        finally:
+            self._reset()
+            self.ingest.stop()
+            shutil.rmtree(self.output_dir, ignore_errors=True)
+
+        return self._report(cycle)
+
+    def _cycle(self, cycle: int) -> None:
+        """Preview → Stream (+ Aufnahme) → Stop → eigenständige Aufnahme."""
+        step = self.args.cycle_seconds / 5
+        manager = self.manager
+
+        if not self.args.no_preview:
+            manager.start_preview(TEST, RESOLUTION, FPS)
+            self._settle(step)
+
+        manager.start_stream(TEST, TEST, self.ingest.url, 'soak', RESOLUTION, BITRATE, FPS)
+        self._settle(step)
+
+        manager.start_recording(TEST, TEST, RESOLUTION, BITRATE, FPS, self.output_dir)
+        self._settle(step)
+        manager.stop_recording()
+        self._settle(step / 2)
+        manager.save_replay()
+        self._settle(step / 2)
+
+        self._reset()
+
+        manager.start_recording(TEST, TEST, RESOLUTION, BITRATE, FPS, self.output_dir)
+        self._settle(step)
+        self._reset()
+
+        # Testaufnahmen sofort löschen (Platte soll nicht volllaufen)
+        for name in os.listdir(self.output_dir):
+            os.remove(os.path.join(self.output_dir, name))
+
+    def _reset(self) -> None:
+        """Stoppt alles Laufende."""
+        manager = self.manager
+        if manager.is_recording:
+            manager.stop_recording()
+        stop_and_wait(self.app, manager)
+        if manager.is_preview_active:
+            manager.stop_preview()
+        wait_until(self.app, lambda: not manager.lifecycle.is_transitioning(), 15.0)
+
+    def _settle(self, seconds: float) -> None:
+        """Lässt Qt laufen und nimmt fällige Proben."""
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            self.app.processEvents()
+            if time.monotonic() >= self.next_sample:
+                self.next_sample = time.monotonic() + self.args.sample_interval
+                self._sample()
+            time.sleep(0.02)
+
+    # ---------- Proben ----------
+
+    def _sample(self) -> None:
+        """RSS, Queue-Füllstände und UI-Log erfassen."""
+        elapsed = time.monotonic() - self.started
+        self.rss_samples.append({'t': round(elapsed, 1), 'rss_mb': round(RssSampler.current() / 2**20, 2)})
+
+        pipeline = self.manager.pipeline
+        if pipeline is not None:
+            iterator = pipeline.iterate_recurse()
+            while True:
+                result, element = iterator.next()
+                if result != Gst.IteratorResult.OK:
+                    break
+                factory = element.get_factory()
+                if factory is None or factory.get_name() != 'queue':
+                    continue
+                levels = self.queue_levels.setdefault(element.get_name(), {'max_bytes': 0, 'max_buffers': 0})
+                levels['max_bytes'] = max(levels['max_bytes'], element.get_property('current-level-bytes'))
+                levels['max_buffers'] = max(levels['max_buffers'], element.get_property('current-level-buffers'))
+
+        if self.window is not None:
+            document = self.window.stream_tab.log_text.document()
+            self.log_samples.append({
+                't': round(elapsed, 1),
+                'characters': document.characterCount(),
+                'blocks': document.blockCount(),
+            })
+
+    @staticmethod
+    def _count_objects() -> collections.Counter:
+        """Lebende Python-Objekte pro Typ (Modul.Name)."""
+        return collections.Counter(
+            f"{type(obj).__module__}.{type(obj).__qualname__}" for obj in gc.get_objects()
+        )
+
+    # ---------- Bericht ----------
+
+    def _report(self, cycles: int) -> Dict[str, Any]:
+        """Fasst alle Proben zusammen (Zuwachs seit Ende des Warmups)."""
+        top = self.args.top
+        report: Dict[str, Any] = {
+            'benchmark': 'soak',
+            'version': get_version(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'host': platform.node(),
+            'gstreamer': Gst.version_string(),
+            'duration_h': round((time.monotonic() - self.started) / 3600, 3),
+            'cycles': max(0, cycles - 1),
+            'errors': collections.Counter(self.errors).most_common(top),
+        }
+
+        # RSS: Anstieg als Regressionsgerade über alle Proben nach dem Warmup
+        warm = [s for s in self.rss_samples if self.warmup_end is not None and s['t'] >= self.warmup_end]
+        slope = self._slope([(s['t'] / 3600, s['rss_mb']) for s in warm])
+        report['rss'] = {
+            'start_mb': self.rss_samples[0]['rss_mb'] if self.rss_samples else None,
+            'end_mb': self.rss_samples[-1]['rss_mb'] if self.rss_samples else None,
+            'max_mb': max((s['rss_mb'] for s in self.rss_samples), default=None),
+            'growth_mb_per_h': round(slope, 2),
+            'samples': self.rss_samples,
+        }
+
+        # Python: tracemalloc-Zuwachs pro Zeile, gc-Zuwachs pro Typ
+        if self._tracemalloc_base is not None:
+            snapshot = tracemalloc.take_snapshot().filter_traces([
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ])
+            stats = snapshot.compare_to(self._tracemalloc_base, 'traceback')
+            report['python_allocations'] = [
+                {
+                    'size_diff_kb': round(stat.size_diff / 1024, 1),
+                    'count_diff': stat.count_diff,
+                    'where': [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+                }
+                for stat in stats[:top] if stat.size_diff > 0
+            ]
+            tracemalloc.stop()
+
+            gc.collect()
+            growth = self._count_objects()
+            growth.subtract(self._gc_base)
+            report['python_objects'] = [
+                {'type': name, 'count_diff': diff}
+                for name, diff in growth.most_common(top) if diff > 0
+            ]
+
+        # GStreamer: lebende Objekte am Zyklus-Ende (alles gestoppt)
+        if self.leaks.available:
+            totals = [entry['total'] for entry in self.gst_alive]
+            last = self.gst_alive[-1]['by_type'] if self.gst_alive else {}
+            report['gst_objects'] = {
+                'alive_per_cycle': totals,
+                'growing': len(totals) >= 3 and totals[-1] > totals[len(totals) // 2] > totals[0],
+                'by_type': sorted(last.items(), key=lambda item: item[1], reverse=True)[:top],
+            }
+        else:
+            report['gst_objects'] = None
+
+        report['queues'] = sorted(
+            ({'name': name, **levels} for name, levels in self.queue_levels.items()),
+            key=lambda q: q['max_bytes'], reverse=True
+        )[:top]
+
+        if self.log_samples:
+            report['ui_log'] = {
+                'start': self.log_samples[0],
+                'end': self.log_samples[-1],
+            }
+
+        return report
+
+    @staticmethod
+    def _slope(points: List[tuple]) -> float:
+        """Steigung der Regressionsgeraden (y pro x)."""
+        if len(points) < 2:
+            return 0.0
+        n = len(points)
+        mean_x = sum(p[0] for p in points) / n
+        mean_y = sum(p[1] for p in points) / n
+        var_x = sum((p[0] - mean_x) ** 2 for p in points)
+        if var_x == 0:
+            return 0.0
+        return sum((p[0] - mean_x) * (p[1] - mean_y) for p in points) / var_x
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Lesbare Zusammenfassung."""
+    rss = report['rss']
+    print()
+    print(f"⏱️  {report['duration_h']} h, {report['cycles']} Zyklen (ohne Warmup)")
+    print(f"🧠 RSS: {rss['start_mb']} → {rss['end_mb']} MB (max {rss['max_mb']}), "
+          f"Anstieg {rss['growth_mb_per_h']} MB/h")
+
+    if report.get('python_allocations'):
+        print("\n🐍 Python-Allokationen mit Zuwachs:")
+        for entry in report['python_allocations']:
+            print(f"   {entry['size_diff_kb']:>9} KB  {entry['count_diff']:>+7}  {entry['where'][-1]}")
+
+    if report.get('python_objects'):
+        print("\n🐍 Python-Objekte mit Zuwachs:")
+        for entry in report['python_objects']:
+            print(f"   {entry['count_diff']:>+7}  {entry['type']}")
+
+    gst = report.get('gst_objects')
+    if gst is None:
+        print("\nℹ️ leaks-Tracer nicht aktiv (GStreamer ≥ 1.18 und GST_TRACERS=leaks nötig)")
+    else:
+        trend = "⚠️ wachsend" if gst['growing'] else "stabil"
+        print(f"\n🎞️ GStreamer-Objekte am Zyklus-Ende: {gst['alive_per_cycle'][-5:]} ({trend})")
+        for type_name, count in gst['by_type']:
+            print(f"   {count:>7}  {type_name}")
+
+    if report['queues']:
+        print("\n📦 Queue-Füllstände (Maximum):")
+        for queue in report['queues']:
+            print(f"   {queue['max_bytes'] / 1024:>9.1f} KB  {queue['max_buffers']:>5} Buffer  {queue['name']}")
+
+    if report.get('ui_log'):
+        log = report['ui_log']
+        print(f"\n📝 UI-Log: {log['start']['characters']} → {log['end']['characters']} Zeichen, "
+              f"{log['start']['blocks']} → {log['end']['blocks']} Zeilen")
+
+    if report['errors']:
+        print("\n❌ Fehlermeldungen:")
+        for message, count in report['errors']:
+            print(f"   {count:>5}×  {message}")
+
+
+def main() -> int:
+    """Einstiegspunkt."""
+    parser = argparse.ArgumentParser(description="Soak-Test mit Leck-Suche")
+    parser.add_argument('--hours', type=float, default=0.0, help="Laufzeit in Stunden")
+    parser.add_argument('--cycles', type=int, default=0, help="Alternativ: Anzahl Zyklen")
+    parser.add_argument('--cycle-seconds', type=float, default=60.0, help="Dauer eines Zyklus")
+    parser.add_argument('--sample-interval', type=float, default=10.0, help="RSS-Proben-Intervall (s)")
+    parser.add_argument('--traceback-depth', type=int, default=5, help="tracemalloc-Tiefe")
+    parser.add_argument('--top', type=int, default=15, help="Einträge pro Bericht-Abschnitt")
+    parser.add_argument('--max-growth-mb-h', type=float, default=20.0, help="Erlaubter RSS-Anstieg")
+    parser.add_argument('--with-ui', action='store_true', help="Mit Hauptfenster (offscreen, inkl. Log-Widget)")
+    parser.add_argument('--no-preview', action='store_true', help="Ohne Preview (kein Videoausgang nötig)")
+    parser.add_argument('--no-gst-leaks', action='store_true', help="Ohne GStreamer-leaks-Tracer")
+    parser.add_argument('--json', metavar='DATEI', help="Bericht als JSON speichern")
+    args = parser.parse_args()
+
+    if not args.hours and not args.cycles:
+        args.cycles = 10
+
+    Gst.init(None)
+    if args.with_ui:
+        from PyQt6.QtWidgets import QApplication
+        app = QApplication(sys.argv)
+    else:
+        app = QCoreApplication(sys.argv)
+
+    report = Soak(app, args).run()
+    print_report(report)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    growing = report['gst_objects'] is not None and report['gst_objects']['growing']
+    return 1 if report['rss']['growth_mb_per_h'] > args.max_growth_mb_h or growing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - SRT-Loopback-Test
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Streamt mit dem echten StreamManager (Testquellen) per SRT an einen
+lokalen Empfänger (srtsrc ! tsdemux) und prüft beide Modi:
+
+    caller    - StreamManager verbindet sich zum lauschenden Empfänger
+    listener  - StreamManager lauscht, der Empfänger verbindet sich
+
+Gemessen am Empfänger: Zeit bis zum ersten Keyframe, FPS, Video-/
+Audio-Bitrate; vom Sender die SRT-Statistik aus get_stream_stats()
+(RTT, Neuübertragungen, Sendepuffer).
+
+Aufruf:
+    python3 benchmarks/srt_loopback.py [--modes caller listener] [--duration 10] [--latency 120]
+"""
+
+import argparse
+import socket
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import Gst
+
+from PyQt6.QtCore import QCoreApplication
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+from src.core.stream_manager import StreamManager
+from src.core.device_manager import DeviceManager
+from stream_throughput import stop_and_wait, wait_until
+
+
+RESOLUTION = '1280x720'
+BITRATE = 2500
+FPS = 30
+CONNECT_TIMEOUT = 10.0
+
+
+def free_udp_port() -> int:
+    """Freier UDP-Port auf Loopback."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class SrtReceiver:
+    """Lokaler SRT-Empfänger: zählt Video-Frames, Keyframes und Bytes."""
+
+    def __init__(self, port: int, mode: str, latency_ms: int):
+        """
+        Args:
+            port: UDP-Port
+            mode: 'listener' (wartet) oder 'caller' (verbindet sich)
+            latency_ms: SRT-Latenz des Empfängers
+        """
+        host = '' if mode == 'listener' else '127.0.0.1'
+        self.pipeline = Gst.parse_launch(
+            f"srtsrc uri=\"srt://{host}:{port}\" mode={mode} latency={latency_ms} ! "
+            f"tsdemux name=demux "
+            f"demux. ! video/x-h264 ! queue ! h264parse ! fakesink name=vsink sync=false "
+            f"demux. ! audio/mpeg ! queue ! fakesink name=asink sync=false"
+        )
+        self._lock = threading.Lock()
+        self.reset_stats()
+        self.first_keyframe_at: Optional[float] = None
+
+        for name, kind in (('vsink', 'video'), ('asink', 'audio')):
+            pad = self.pipeline.get_by_name(name).get_static_pad('sink')
+            pad.add_probe(Gst.PadProbeType.BUFFER, self._on_buffer, kind)
+
+    def start(self) -> None:
+        self.pipeline.set_state(Gst.State.PLAYING)
+
+    def stop(self) -> None:
+        self.pipeline.set_state(Gst.State.NULL)
+
+    def reset_stats(self) -> None:
+        """Startet ein neues Messfenster."""
+        with self._lock:
+            self.window_start = time.monotonic()
+            self.bytes = {'video': 0, 'audio': 0}
+            self.video_frames = 0
+            self.keyframes = 0
+
+    def get_stats(self) -> Dict[str, float]:
+        with self._lock:
+            elapsed = time.monotonic() - self.window_start
+            return {
+                'fps': self.video_frames / elapsed if elapsed > 0 else 0.0,
+                'video_kbps': self.bytes['video'] * 8 / 1000 / elapsed if elapsed > 0 else 0.0,
+                'audio_kbps': self.bytes['audio'] * 8 / 1000 / elapsed if elapsed > 0 else 0.0,
+                'keyframes': self.keyframes,
+            }
+
+    def error(self) -> Optional[str]:
+        """Letzter Fehler des Empfängers (nicht blockierend)."""
+        message = self.pipeline.get_bus().pop_filtered(Gst.MessageType.ERROR)
+        if message is None:
+            return None
+        err, _ = message.parse_error()
+        return f"Empfänger: {err.message}"
+
+    def _on_buffer(self, pad: Gst.Pad, info: Gst.PadProbeInfo, kind: str) -> Gst.PadProbeReturn:
+        """Pad-Probe (Streaming-Thread)."""
+        buffer = info.get_buffer()
+        with self._lock:
+            self.bytes[kind] += buffer.get_size()
+            if kind == 'video':
+                self.video_frames += 1
+                if not buffer.has_flags(Gst.BufferFlags.DELTA_UNIT):
+                    self.keyframes += 1
+                    if self.first_keyframe_at is None:
+                        self.first_keyframe_at = time.monotonic()
+        return Gst.PadProbeReturn.OK
+
+
+def run_mode(
+    app: QCoreApplication,
+    manager: StreamManager,
+    mode: str,
+    latency_ms: int,
+    duration: float
+) -> Dict[str, Any]:
+    """Ein Durchlauf: Sender im angegebenen Modus, Empfänger im Gegenmodus."""
+    result: Dict[str, Any] = {'mode': mode, 'latency_ms': latency_ms, 'error': None}
+    errors: List[str] = []
+
+    def on_error(message: str) -> None:
+        errors.append(message)
+
+    manager.error_signal.connect(on_error)
+    manager.config.set('srt_mode', mode)
+    manager.config.set('srt_latency_ms', latency_ms)
+
+    port = free_udp_port()
+    receiver = SrtReceiver(port, 'listener' if mode == 'caller' else 'caller', latency_ms)
+    url = f"srt://127.0.0.1:{port}" if mode == 'caller' else f"srt://:{port}"
+
+    try:
+        # Die lauschende Seite zuerst starten
+        if mode == 'caller':
+            receiver.start()
+        started = time.monotonic()
+        if not manager.start_stream(
+            DeviceManager.TEST_SOURCE, DeviceManager.TEST_SOURCE,
+            url, '', RESOLUTION, BITRATE, FPS
+        ):
+            result['error'] = errors[-1] if errors else "start_stream fehlgeschlagen"
+            return result
+        if mode == 'listener':
+            wait_until(app, lambda: False, 0.5)
+            receiver.start()
+
+        def failed() -> Optional[str]:
+            error = receiver.error()
+            if error:
+                errors.append(error)
+            return errors[-1] if errors else None
+
+        if not wait_until(app, lambda: receiver.first_keyframe_at is not None or failed(), CONNECT_TIMEOUT) \
+                or receiver.first_keyframe_at is None:
+            result['error'] = failed() or "Kein Keyframe am Empfänger (Timeout)"
+            return result
+        result['ttff_ms'] = round((receiver.first_keyframe_at - started) * 1000, 1)
+
+        receiver.reset_stats()
+        wait_until(app, lambda: bool(failed()) or not manager.is_streaming, duration)
+        if errors or not manager.is_streaming:
+            result['error'] = errors[-1] if errors else "Stream beendet"
+            return result
+
+        stats = receiver.get_stats()
+        sender = manager.get_stream_stats()
+        result.update({
+            'fps': round(stats['fps'], 2),
+            'video_kbps': round(stats['video_kbps'], 1),
+            'audio_kbps': round(stats['audio_kbps'], 1),
+            'keyframes': stats['keyframes'],
+            'srt_connected': sender.get('srt_connected'),
+            'srt_rtt_ms': sender.get('srt_rtt_ms'),
+            'srt_retransmitted': sender.get('srt_packets_retransmitted'),
+            'srt_send_buffer_ms': sender.get('srt_send_buffer_ms'),
+        })
+        return result
+
+    finally:
+        stop_and_wait(app, manager)
+        manager.error_signal.disconnect(on_error)
+        receiver.stop()
+
+
+def main() -> int:
+    """Einstiegspunkt."""
+    parser = argparse.ArgumentParser(description="SRT-Ausgang gegen lokalen srtsrc-Empfänger")
+    parser.add_argument('--modes', nargs='+', default=['caller', 'listener'], choices=['caller', 'listener'])
+    parser.add_argument('--duration', type=float, default=10.0, help="Messdauer pro Modus (s)")
+    parser.add_argument('--latency', type=int, default=120, help="SRT-Latenz (ms)")
+    args = parser.parse_args()
+
+    Gst.init(None)
+    for factory in ('srtsink', 'srtsrc', 'mpegtsmux', 'tsdemux'):
+        if Gst.ElementFactory.find(factory) is None:
+            print(f"❌ GStreamer-Element fehlt: {factory}")
+            return 1
+
+    app = QCoreApplication(sys.argv)
+    manager = StreamManager()
+    # Keine Nachbearbeitungs-Jobs des Benutzers im Messprozess
+    manager.postprocess_queue.shutdown()
+
+    results = []
+    for mode in args.modes:
+        print(f"🔹 SRT {mode} ...", flush=True)
+        results.append(run_mode(app, manager, mode, args.latency, args.duration))
+
+    print()
+    print(f"{'Modus':<10} {'TTFF ms':>8} {'FPS':>6} {'kbps':>8} {'RTT ms':>7} {'Retrans':>8} {'Puffer ms':>10}")
+    for r in results:
+        if r['error']:
+            print(f"{r['mode']:<10} ❌ {r['error']}")
+            continue
+        print(
+            f"{r['mode']:<10} {r['ttff_ms']:>8} {r['fps']:>6} {r['video_kbps']:>8} "
+            f"{r['srt_rtt_ms'] if r['srt_rtt_ms'] is not None else '–':>7} "
+            f"{r['srt_retransmitted'] if r['srt_retransmitted'] is not None else '–':>8} "
+            f"{r['srt_send_buffer_ms'] if r['srt_send_buffer_ms'] is not None else '–':>10}"
+        )
+
+    return 0 if all(r['error'] is None for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
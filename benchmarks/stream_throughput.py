@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Benchmark: Stream-Durchsatz Ende-zu-Ende
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Startet den echten StreamManager mit den Testquellen ('test' =
+videotestsrc/audiotestsrc) gegen den lokalen RTMP-Ingest
+(benchmarks/rtmp_ingest.py) und misst am Empfänger:
+
+    ttfb_ms        - start_stream() bis zum ersten Medien-Byte
+    ttff_ms        - start_stream() bis zum ersten Keyframe
+    fps            - empfangene Video-Frames pro Sekunde (Wanduhr)
+    video_kbps     - empfangene Video-Bitrate
+    bitrate_ratio  - video_kbps / Ziel-Bitrate (1.0 = exakt)
+    cpu_percent    - CPU-Zeit des Prozesses (100% = ein Kern)
+
+pro Auflösung × x264-Preset. Die ersten Sekunden nach dem ersten
+Keyframe (Warmup, Rate-Control) werden nicht gemessen.
+
+Aufruf:
+    python3 benchmarks/stream_throughput.py [--duration 15] [--json ergebnis.json]
+    python3 benchmarks/stream_throughput.py --compare alt.json   # Vergleich mit Vorversion
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import Gst
+
+from PyQt6.QtCore import QCoreApplication
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+from src.core.stream_manager import StreamManager
+from src.core.device_manager import DeviceManager
+from rtmp_ingest import RtmpIngest
+
+
+RESOLUTIONS = ['1280x720', '1920x1080']
+PRESETS = ['ultrafast', 'superfast', 'veryfast']
+BITRATES = {'1280x720': 2500, '1920x1080': 4500}
+FPS = 30
+WARMUP = 3.0
+CONNECT_TIMEOUT = 15.0
+
+
+def wait_until(app: QCoreApplication, condition, timeout: float) -> bool:
+    """Verarbeitet Qt-Events, bis condition() wahr ist oder timeout abläuft."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        app.processEvents()
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def stop_and_wait(app: QCoreApplication, manager: StreamManager, timeout: float = 15.0) -> bool:
+    """Stoppt den Stream und wartet, bis der Abbau im Worker durch ist ('idle')."""
+    if manager.is_streaming:
+        manager.stop_stream()
+    return wait_until(
+        app, lambda: not manager.is_streaming and not manager.lifecycle.is_transitioning(), timeout
+    )
+
+
+def run_case(
+    app: QCoreApplication,
+    manager: StreamManager,
+    resolution: str,
+    preset: str,
+    duration: float
+) -> Dict[str, Any]:
+    """
+    Ein Messlauf: Stream starten, Warmup, messen, stoppen.
+
+    Returns:
+        Ergebnis-Dict (bei Fehler mit 'error')
+    """
+    bitrate = BITRATES.get(resolution, 2500)
+    result: Dict[str, Any] = {
+        'resolution': resolution,
+        'preset': preset,
+        'target_kbps': bitrate,
+        'target_fps': FPS,
+        'error': None,
+    }
+
+    errors: List[str] = []
+
+    def on_error(message: str) -> None:
+        errors.append(message)
+
+    manager.error_signal.connect(on_error)
+    manager.config.set('encoder_preset', preset)
+
+    ingest = RtmpIngest()
+    ingest.start()
+
+    try:
+        started = time.monotonic()
+        if not manager.start_stream(
+            DeviceManager.TEST_SOURCE, DeviceManager.TEST_SOURCE,
+            ingest.url, 'bench', resolution, bitrate, FPS
+        ):
+            result['error'] = errors[-1] if errors else "start_stream fehlgeschlagen"
+            return result
+
+        if not wait_until(app, lambda: ingest.get_stats()['first_keyframe_at'] is not None, CONNECT_TIMEOUT):
+            result['error'] = errors[-1] if errors else "Kein Keyframe am Ingest (Timeout)"
+            return result
+
+        stats = ingest.get_stats()
+        result['ttfb_ms'] = round((stats['first_media_at'] - started) * 1000, 1)
+        result['ttff_ms'] = round((stats['first_keyframe_at'] - started) * 1000, 1)
+
+        wait_until(app, lambda: False, WARMUP)
+        ingest.reset_stats()
+        cpu_start = time.process_time()
+        wall_start = time.monotonic()
+
+        wait_until(app, lambda: ingest.get_stats()['disconnected'] or bool(errors), duration)
+
+        cpu = time.process_time() - cpu_start
+        wall = time.monotonic() - wall_start
+        stats = ingest.get_stats()
+
+        if stats['disconnected'] or errors:
+            result['error'] = errors[-1] if errors else "Verbindung abgebrochen"
+            return result
+
+        result.update({
+            'fps': round(stats['fps_wall'], 2),
+            'fps_stream': round(stats['fps_stream'], 2),
+            'video_kbps': round(stats['video_kbps'], 1),
+            'audio_kbps': round(stats['audio_kbps'], 1),
+            'bitrate_ratio': round(stats['video_kbps'] / bitrate, 3),
+            'keyframes': stats['keyframes'],
+            'cpu_percent': round(cpu / wall * 100, 1),
+        })
+        return result
+
+    finally:
+        stop_and_wait(app, manager)
+        manager.error_signal.disconnect(on_error)
+        ingest.stop()
+
+
+def get_version() -> str:
+    """Git-Stand des Repos (zum Zuordnen der Ergebnisse)."""
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty'],
+            cwd=Path(__file__).parent, capture_output=True, text=True, timeout=5
+        ).stdout.strip() or 'unbekannt'
+    except (OSError, subprocess.TimeoutExpired):
+        return 'unbekannt'
+
+
+def compare(results: List[Dict[str, Any]], baseline_file: str) -> None:
+    """Gibt die Abweichungen zu einem älteren Ergebnis aus."""
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    old = {(r['resolution'], r['preset']): r for r in baseline.get('results', [])}
+    print(f"\nVergleich mit {baseline.get('version', '?')} ({baseline_file}):")
+    print(f"{'Auflösung':<10} {'Preset':<10} {'CPU %':>14} {'FPS':>14} {'kbps-Ratio':>16} {'TTFB ms':>16}")
+
+    for r in results:
+        before = old.get((r['resolution'], r['preset']))
+        if before is None or r['error'] or before.get('error'):
+            continue
+        cells = []
+        for key, width in (('cpu_percent', 14), ('fps', 14), ('bitrate_ratio', 16), ('ttfb_ms', 16)):
+            delta = r[key] - before[key]
+            cells.append(f"{before[key]:g}→{r[key]:g} ({delta:+.1f})".rjust(width))
+        print(f"{r['resolution']:<10} {r['preset']:<10} " + " ".join(cells))
+
+
+def main() -> int:
+    """Einstiegspunkt."""
+    parser = argparse.ArgumentParser(description="Stream-Durchsatz gegen lokalen RTMP-Ingest")
+    parser.add_argument('--duration', type=float, default=15.0, help="Messdauer pro Fall (s)")
+    parser.add_argument('--resolutions', nargs='+', default=RESOLUTIONS)
+    parser.add_argument('--presets', nargs='+', default=PRESETS, choices=StreamManager.X264_PRESETS)
+    parser.add_argument('--json', metavar='DATEI', help="Ergebnis als JSON speichern")
+    parser.add_argument('--compare', metavar='DATEI', help="Mit früherem JSON-Ergebnis vergleichen")
+    args = parser.parse_args()
+
+    Gst.init(None)
+    app = QCoreApplication(sys.argv)
+
+    manager = StreamManager()
+    # Keine Nachbearbeitungs-Jobs des Benutzers im Messprozess
+    manager.postprocess_queue.shutdown()
+
+    results = []
+    for resolution in args.resolutions:
+        for preset in args.presets:
+            print(f"🔹 {resolution} {preset} ...", flush=True)
+            results.append(run_case(app, manager, resolution, preset, args.duration))
+
+    report = {
+        'benchmark': 'stream_throughput',
+        'version': get_version(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'gstreamer': Gst.version_string(),
+        'python': platform.python_version(),
+        'cpu_count': os.cpu_count(),
+        'duration': args.duration,
+        'results': results,
+    }
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    print()
+    print(f"{'Auflösung':<10} {'Preset':<10} {'CPU %':>7} {'FPS':>6} {'kbps':>8} {'Ratio':>6} {'TTFB':>7} {'TTFF':>7}")
+    for r in results:
+        if r['error']:
+            print(f"{r['resolution']:<10} {r['preset']:<10} ❌ {r['error']}")
+            continue
+        print(
+            f"{r['resolution']:<10} {r['preset']:<10} {r['cpu_percent']:>7} {r['fps']:>6} "
+            f"{r['video_kbps']:>8} {r['bitrate_ratio']:>6} {r['ttfb_ms']:>7} {r['ttff_ms']:>7}"
+        )
+    print("\nCPU % bezogen auf einen Kern, Zeiten in ms ab start_stream()")
+
+    if args.compare:
+        compare(results, args.compare)
+
+    return 0 if all(r['error'] is None for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,469 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Audio Mixer
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import Gst
+
+import threading
+from typing import Any, Callable, Dict, List, Optional
+
+
+class AudioMixer:
+    """
+    Audio-Stage mit audiomixer und einem volume-Element pro Quelle.
+
+    Aufbau:
+        quelle_1 ! audioconvert ! [audioresample !] caps ! volume ! level ! queue ! amix.
+        quelle_n ! ...                                                      ! amix.
+        audiomixer name=amix ! audioconvert ! volume (Master) ! level ! ...
+
+    Gain- und Mute-Änderungen setzen nur Properties der volume-Elemente -
+    die Pipeline wird dafür nie neu gebaut. Quellen können auch während
+    eines laufenden Streams hinzugefügt und entfernt werden.
+    """
+
+    MIXER_NAME = "amix"
+    MASTER_VOLUME_NAME = "vol_master"
+    MASTER_LEVEL_NAME = "lvl_master"
+
+    # Die im Stream-Tab gewählte Hauptquelle
+    PRIMARY_ID = "main"
+
+    # Maximale Wartezeit auf den Leerlauf eines Quell-Zweigs beim Entfernen
+    DETACH_TIMEOUT_S = 1.0
+
+    def __init__(self, device_manager):
+        """
+        Initialisiert AudioMixer.
+
+        Args:
+            device_manager: DeviceManager für die Source-Elemente
+        """
+        self.device_manager = device_manager
+
+        # source_id → {'device', 'volume', 'mute'}
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        self.master_volume = 1.0
+        self.master_mute = False
+
+        # Messintervall der level-Elemente (VU-Meter)
+        self.level_interval_ms = 50
+
+        # Einheitliche Rate vor dem Mixer (audiomixer braucht gleiche Caps)
+        self.mix_rate = 48000
+        self.resample_quality = 4  # audioresample: 0 (schnell) - 10 (beste)
+
+        # Native Raten (device → Rate): einmal je Aushandlung bzw. vorab beim Planen
+        self.known_rates: Dict[str, Optional[int]] = {}
+
+        # Laufende Pipeline (für Live-Änderungen)
+        self.pipeline: Optional[Gst.Pipeline] = None
+
+        # Zweige live anhängen/lösen im Hintergrund (command, task) - der
+        # StreamManager reicht sie an den Lifecycle-Worker; None = direkt
+        self.run_task: Optional[Callable[[str, Callable[[], Optional[str]]], None]] = None
+
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    # ==================== QUELLEN ====================
+
+    def get_primary_device(self) -> str:
+        """Device-String der Hauptquelle ('default' wenn keine gesetzt)."""
+        primary = self.sources.get(self.PRIMARY_ID)
+        return primary['device'] if primary else 'default'
+
+    def set_primary_source(self, device: str) -> None:
+        """
+        Setzt die Hauptquelle (Audio-Auswahl im Stream-Tab).
+
+        Läuft bereits eine Pipeline, wird die Quelle live ausgetauscht.
+
+        Args:
+            device: Device-String (z.B. 'default' oder 'monitor')
+        """
+        current = self.sources.get(self.PRIMARY_ID)
+        if current and current['device'] == device:
+            return
+
+        volume = current['volume'] if current else 1.0
+        mute = current['mute'] if current else False
+
+        if current:
+            self.remove_source(self.PRIMARY_ID)
+        self._add_source(self.PRIMARY_ID, device, volume, mute)
+
+    def add_source(self, device: str, volume: float = 1.0, mute: bool = False) -> str:
+        """
+        Fügt eine weitere Quelle zum Mix hinzu (auch zur Laufzeit).
+
+        Args:
+            device: Device-String
+            volume: Gain (1.0 = unverändert)
+            mute: Stummgeschaltet starten
+
+        Returns:
+            ID der neuen Quelle
+        """
+        with self._lock:
+            source_id = f"a{self._next_id}"
+            self._next_id += 1
+
+        self._add_source(source_id, device, volume, mute)
+        return source_id
+
+    def remove_source(self, source_id: str) -> bool:
+        """
+        Entfernt eine Quelle aus dem Mix (auch zur Laufzeit).
+
+        Args:
+            source_id: ID der Quelle
+
+        Returns:
+            True wenn entfernt, False wenn unbekannt
+        """
+        with self._lock:
+            if self.sources.pop(source_id, None) is None:
+                return False
+
+        if self.pipeline:
+            self._remove_branch(source_id)
+        return True
+
+    def get_sources(self) -> List[Dict[str, Any]]:
+        """
+        Holt alle Quellen im Mix.
+
+        Returns:
+            Liste von Dicts mit 'id', 'device', 'volume', 'mute' (ggf. 'offset_ms')
+        """
+        with self._lock:
+            return [dict(state, id=source_id) for source_id, state in self.sources.items()]
+
+    # ==================== GAIN (LIVE) ====================
+
+    def set_volume(self, source_id: str, volume: float) -> None:
+        """
+        Setzt den Gain einer Quelle (live, ohne Rebuild).
+
+        Args:
+            source_id: ID der Quelle
+            volume: Gain (0.0 - 10.0, 1.0 = unverändert)
+        """
+        state = self.sources.get(source_id)
+        if state is None:
+            return
+        state['volume'] = max(0.0, min(volume, 10.0))
+        self._set_element_property(f"vol_{source_id}", 'volume', state['volume'])
+
+    def set_mute(self, source_id: str, mute: bool) -> None:
+        """
+        Schaltet eine Quelle stumm (live, ohne Rebuild).
+
+        Args:
+            source_id: ID der Quelle
+            mute: True = stumm
+        """
+        state = self.sources.get(source_id)
+        if state is None:
+            return
+        state['mute'] = mute
+        self._set_element_property(f"vol_{source_id}", 'mute', mute)
+
+    def set_offset(self, source_id: str, offset_ms: float) -> None:
+        """
+        Setzt einen manuellen Zeitversatz für eine Quelle (live).
+
+        Der Mixer richtet die Quellen nach Running-Time aus - ein
+        Pad-Offset vor dem Mixer verschiebt die Quelle relativ zu allen
+        anderen (z.B. für ein Mikrofon mit Bluetooth-Latenz).
+
+        Args:
+            source_id: ID der Quelle
+            offset_ms: Versatz in ms (positiv = später)
+        """
+        state = self.sources.get(source_id)
+        if state is None:
+            return
+        state['offset_ms'] = offset_ms
+        self._apply_offset(source_id)
+
+    def set_master_volume(self, volume: float) -> None:
+        """Setzt den Master-Gain nach dem Mixer (live)."""
+        self.master_volume = max(0.0, min(volume, 10.0))
+        self._set_element_property(self.MASTER_VOLUME_NAME, 'volume', self.master_volume)
+
+    def set_master_mute(self, mute: bool) -> None:
+        """Schaltet den gesamten Mix stumm (live)."""
+        self.master_mute = mute
+        self._set_element_property(self.MASTER_VOLUME_NAME, 'mute', mute)
+
+    # ==================== PIPELINE ====================
+
+    def build_stage(self) -> str:
+        """
+        Baut die Audio-Stage für Gst.parse_launch().
+
+        Das Fragment endet offen nach dem Master-Level - der Aufrufer
+        hängt Encoder/Muxer an. Die Quell-Zweige folgen danach und
+        linken sich selbst an 'amix.'.
+
+        Returns:
+            Pipeline-Fragment, z.B. "audiomixer name=amix ! ... ! level name=lvl_master"
+        """
+        stage = (
+            f"audiomixer name={self.MIXER_NAME} ! "
+            f"audioconvert ! "
+            f"volume name={self.MASTER_VOLUME_NAME} "
+            f"volume={self.master_volume} mute={str(self.master_mute).lower()} ! "
+            f"{self._build_level(self.MASTER_LEVEL_NAME)}"
+        )
+        return stage
+
+    def build_source_branches(self) -> str:
+        """
+        Baut die Quell-Zweige, die in 'amix.' münden.
+
+        Returns:
+            Pipeline-Fragment mit allen Quellen (mit abschließendem Leerzeichen)
+        """
+        with self._lock:
+            sources = list(self.sources.items())
+
+        if not sources:
+            # Ohne Quelle würde audiomixer nie Daten liefern
+            sources = [(self.PRIMARY_ID, {'device': 'default', 'volume': 1.0, 'mute': False})]
+
+        self.load_rates()
+        for _source_id, state in sources:
+            state['resample'] = self.needs_resample(state['device'])
+
+        return "".join(
+            f"{self._build_branch(source_id, state)} ! {self.MIXER_NAME}. "
+            for source_id, state in sources
+        )
+
+    def attach(self, pipeline: Gst.Pipeline) -> None:
+        """
+        Verbindet den Mixer mit einer laufenden Pipeline (für Live-Änderungen).
+
+        Args:
+            pipeline: Pipeline, die build_stage() enthält
+        """
+        self.pipeline = pipeline
+        for source_id in list(self.sources):
+            self._apply_offset(source_id)
+
+        # Gains aus dem aktuellen Zustand - die Beschreibung kann aus
+        # einem vorab gebauten Pipeline-Plan mit älteren Werten stammen
+        for source in self.get_sources():
+            self._set_element_property(f"vol_{source['id']}", 'volume', source['volume'])
+            self._set_element_property(f"vol_{source['id']}", 'mute', source['mute'])
+        self._set_element_property(self.MASTER_VOLUME_NAME, 'volume', self.master_volume)
+        self._set_element_property(self.MASTER_VOLUME_NAME, 'mute', self.master_mute)
+
+    def detach(self) -> None:
+        """Löst die Verbindung zur Pipeline (beim Stoppen)."""
+        self.pipeline = None
+        # Beim nächsten Start neu abfragen (Soundserver-Rate kann sich ändern)
+        self.known_rates = {}
+
+    def load_rates(self) -> None:
+        """Fragt die nativen Raten aller noch unbekannten Quellen gemeinsam ab (known_rates)."""
+        missing = [s['device'] for s in self.get_sources() if s['device'] not in self.known_rates]
+        if missing:
+            self.known_rates.update(self.device_manager.get_audio_source_rates(missing))
+
+    @property
+    def mix_caps(self) -> str:
+        """Caps aller Quellen vor dem Mixer."""
+        return f"audio/x-raw,rate={self.mix_rate},channels=2"
+
+    def needs_resample(self, device: str) -> bool:
+        """
+        Prüft ob eine Quelle auf die Mix-Rate resampelt werden muss.
+
+        Args:
+            device: Device-String
+
+        Returns:
+            False nur wenn die native Rate bekannt ist und passt
+        """
+        return self.source_rate(device) != self.mix_rate
+
+    def source_rate(self, device: str) -> Optional[int]:
+        """Native Rate einer Quelle (vorab ermittelte known_rates haben Vorrang)."""
+        if device in self.known_rates:
+            return self.known_rates[device]
+        return self.device_manager.get_audio_source_rate(device)
+
+    def _build_branch(self, source_id: str, state: Dict[str, Any]) -> str:
+        """Baut einen Quell-Zweig (ohne Link zum Mixer)."""
+        source = self.device_manager.get_audio_source_element(state['device'])
+
+        # Resampler nur wenn die Quelle nicht schon mit Mix-Rate liefert
+        resample = ""
+        if state.get('resample', True):
+            resample = f"audioresample name=ares_{source_id} quality={self.resample_quality} ! "
+
+        return (
+            f"{source} name=asrc_{source_id} ! "
+            f"audioconvert name=aconv_{source_id} ! "
+            f"{resample}"
+            f"capsfilter name=acaps_{source_id} caps=\"{self.mix_caps}\" ! "
+            f"volume name=vol_{source_id} "
+            f"volume={state['volume']} mute={str(state['mute']).lower()} ! "
+            f"{self._build_level(f'lvl_{source_id}')} ! "
+            f"queue name=aq_{source_id}"
+        )
+
+    def _build_level(self, name: str) -> str:
+        """Baut ein level-Element mit dem konfigurierten Intervall."""
+        interval_ns = int(self.level_interval_ms) * Gst.MSECOND
+        return f"level name={name} interval={interval_ns} post-messages=true"
+
+    @staticmethod
+    def _branch_element_names(source_id: str) -> List[str]:
+        """Namen aller Elemente eines Quell-Zweigs (Quelle zuerst)."""
+        return [
+            f"{prefix}_{source_id}"
+            for prefix in ('asrc', 'aconv', 'ares', 'acaps', 'vol', 'lvl', 'aq')
+        ]
+
+    def _add_source(self, source_id: str, device: str, volume: float, mute: bool) -> None:
+        """Trägt eine Quelle ein und hängt sie ggf. live an den Mixer."""
+        state = {'device': device, 'volume': volume, 'mute': mute}
+        if self.pipeline:
+            state['resample'] = self.needs_resample(device)
+        with self._lock:
+            self.sources[source_id] = state
+
+        if self.pipeline:
+            self._add_branch(source_id, state)
+
+    def _run_live(self, command: str, task: Callable[[], Optional[str]]) -> None:
+        """Führt eine Live-Änderung über run_task aus (in Aufruf-Reihenfolge) oder direkt."""
+        if self.run_task is None:
+            task()
+        else:
+            self.run_task(command, task)
+
+    def _add_branch(self, source_id: str, state: Dict[str, Any]) -> None:
+        """Fügt einen Quell-Zweig zur laufenden Pipeline hinzu (öffnet das Gerät im Hintergrund)."""
+        pipeline = self.pipeline
+
+        def add() -> None:
+            mixer = pipeline.get_by_name(self.MIXER_NAME)
+            if mixer is None:
+                return
+
+            try:
+                branch = Gst.parse_bin_from_description(self._build_branch(source_id, state), True)
+                branch.set_name(f"abin_{source_id}")
+                pipeline.add(branch)
+
+                # request_pad_simple() erst ab GStreamer 1.20
+                request_pad = getattr(mixer, 'request_pad_simple', None) or mixer.get_request_pad
+                sink_pad = request_pad('sink_%u')
+                branch.get_static_pad('src').link(sink_pad)
+                branch.sync_state_with_parent()
+                self._apply_offset(source_id)
+                print(f"🔹 Audio-Quelle live hinzugefügt: {state['device']}")
+            except Exception as e:
+                print(f"⚠️ Audio-Quelle konnte nicht hinzugefügt werden: {e}")
+
+        self._run_live(f"mixer_add_{source_id}", add)
+
+    def _remove_branch(self, source_id: str) -> None:
+        """
+        Entfernt einen Quell-Zweig aus der laufenden Pipeline.
+
+        Warten auf den Leerlauf, NULL und Entfernen laufen über run_task -
+        der Aufrufer (Qt-Thread) wartet nicht. Ein gleich danach wieder
+        hinzugefügter Zweig gleicher ID (Hauptquelle tauschen) folgt in
+        derselben Reihenfolge.
+        """
+        pipeline = self.pipeline
+
+        def remove() -> None:
+            # Live hinzugefügt → steckt komplett in einem Bin
+            branch = pipeline.get_by_name(f"abin_{source_id}")
+            if branch is not None:
+                elements = [branch]
+                src_pad = branch.get_static_pad('src')
+            else:
+                # Aus parse_launch → einzelne Elemente direkt in der Pipeline
+                elements = [
+                    element for element in (
+                        pipeline.get_by_name(name)
+                        for name in self._branch_element_names(source_id)
+                    ) if element is not None
+                ]
+                queue = pipeline.get_by_name(f"aq_{source_id}")
+                src_pad = queue.get_static_pad('src') if queue else None
+
+            sink_pad = src_pad.get_peer() if src_pad else None
+            queue = pipeline.get_by_name(f"aq_{source_id}")
+            queue_pad = queue.get_static_pad('src') if queue else None
+
+            # Vom Mixer trennen, während kein Buffer unterwegs ist (IDLE-Probe
+            # auf der Queue) - sonst not-linked-Fehler bzw. hängender Aggregator
+            unlink_lock = threading.Lock()
+            unlinked = threading.Event()
+
+            def unlink() -> None:
+                with unlink_lock:
+                    if unlinked.is_set():
+                        return
+                    if sink_pad:
+                        src_pad.unlink(sink_pad)
+                        sink_pad.get_parent_element().release_request_pad(sink_pad)
+                    unlinked.set()
+
+            def on_idle(pad: Gst.Pad, info: Gst.PadProbeInfo) -> Gst.PadProbeReturn:
+                # Bis zum NULL-State verwerfen statt ins Leere zu schieben
+                pad.add_probe(Gst.PadProbeType.DATA_DOWNSTREAM, lambda p, i: Gst.PadProbeReturn.DROP)
+                unlink()
+                return Gst.PadProbeReturn.REMOVE
+
+            if queue_pad:
+                queue_pad.add_probe(Gst.PadProbeType.IDLE, on_idle)
+                if not unlinked.wait(self.DETACH_TIMEOUT_S):
+                    print(f"⚠️ Audio-Quelle {source_id} nicht im Leerlauf - trenne trotzdem")
+            unlink()
+
+            # Erst nach dem Trennen anhalten (nicht im Streaming-Thread der Queue)
+            for element in elements:
+                element.set_state(Gst.State.NULL)
+                pipeline.remove(element)
+
+            print(f"🔹 Audio-Quelle entfernt: {source_id}")
+
+        self._run_live(f"mixer_remove_{source_id}", remove)
+
+    def _apply_offset(self, source_id: str) -> None:
+        """Setzt den Pad-Offset einer Quelle auf ihrer Queue vor dem Mixer."""
+        state = self.sources.get(source_id)
+        if not self.pipeline or state is None or 'offset_ms' not in state:
+            return
+        queue = self.pipeline.get_by_name(f"aq_{source_id}")
+        if queue:
+            queue.get_static_pad('src').set_offset(int(state['offset_ms'] * Gst.MSECOND))
+
+    def _set_element_property(self, name: str, prop: str, value: Any) -> None:
+        """Setzt eine Property auf einem Element der laufenden Pipeline."""
+        if not self.pipeline:
+            return
+        element = self.pipeline.get_by_name(name)
+        if element:
+            element.set_property(prop, value)
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - A/V Sync Monitor
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import Gst
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class AVSyncMonitor:
+    """
+    Misst den Audio/Video-Versatz am Muxer und korrigiert Drift.
+
+    Video (pipewiresrc do-timestamp) und Audio (pulsesrc/autoaudiosrc)
+    kommen aus verschiedenen Clock-Domains und laufen über Stunden
+    auseinander. Gemessen wird die Running-Time der Buffer an den
+    Muxer-Sink-Pads, bezogen auf die Wall-Clock des Eintreffens:
+
+        skew = (audio_rt - audio_wall) - (video_rt - video_wall)
+
+    Positiver Skew = Audio läuft Video voraus.
+
+    Der Skew enthält auch konstante Anteile (Encoder-Latenz, Queues).
+    Korrigiert wird deshalb nur die Drift gegenüber einer Baseline, die
+    nach einer Einschwingzeit erfasst wird.
+
+    Korrektur: Timestamp-Adjuster über Gst.Pad.set_offset() auf dem
+    Audio-Pad vor dem Muxer, in kleinen Schritten (kein hörbarer Sprung).
+    """
+
+    def __init__(
+        self,
+        auto_correct: bool = True,
+        threshold_ms: float = 30.0,
+        step_ms: float = 5.0,
+        smoothing: float = 0.05,
+        settle_s: float = 5.0
+    ):
+        """
+        Initialisiert den Monitor.
+
+        Args:
+            auto_correct: Drift automatisch ausgleichen
+            threshold_ms: Ab diesem Skew wird korrigiert
+            step_ms: Maximale Korrektur pro tick()
+            smoothing: EMA-Faktor für den Skew (0-1, klein = träge)
+            settle_s: Einschwingzeit bis zur Baseline-Erfassung
+        """
+        self.auto_correct = auto_correct
+        self.threshold_ms = threshold_ms
+        self.step_ms = step_ms
+        self.smoothing = smoothing
+        self.settle_s = settle_s
+
+        # Manueller Audio-Versatz (positiv = Audio später)
+        self.manual_offset_ms = 0.0
+        self.correction_ms = 0.0
+
+        self._audio_pad: Optional[Gst.Pad] = None
+        self._probes = []
+
+        # Letzte Messung pro Stream: (running_time_ns, wall_ns)
+        self._last: Dict[str, Optional[tuple]] = {'audio': None, 'video': None}
+        self._skew_ms: Optional[float] = None
+        self._baseline_ms: Optional[float] = None
+        self._max_drift_ms = 0.0
+        self._attached_at = 0.0
+        self._lock = threading.Lock()
+
+    def attach(self, mux: Gst.Element, pad_kinds: Optional[Dict[str, str]] = None) -> bool:
+        """
+        Hängt Mess-Probes an die Sink-Pads des Muxers.
+
+        Args:
+            mux: Muxer mit je einem Audio- und Video-Sink-Pad
+            pad_kinds: Pad-Name → 'video'/'audio' für Muxer mit neutralen
+                       Pad-Namen (z.B. mpegtsmux sink_%d); sonst nach
+                       Präfix 'video'/'audio'
+
+        Returns:
+            True wenn beide Pads gefunden wurden
+        """
+        self.detach()
+
+        pads = {}
+        for pad in mux.sinkpads:
+            name = pad.get_name()
+            if pad_kinds is not None:
+                if name in pad_kinds:
+                    pads[pad_kinds[name]] = pad
+            elif name.startswith('video'):
+                pads['video'] = pad
+            elif name.startswith('audio'):
+                pads['audio'] = pad
+
+        if len(pads) != 2:
+            return False
+
+        for kind, pad in pads.items():
+            probe_id = pad.add_probe(Gst.PadProbeType.BUFFER, self._on_buffer, kind)
+            self._probes.append((pad, probe_id))
+
+        # Offset auf dem Upstream-Pad setzen (wirkt auf die Running-Time)
+        self._audio_pad = pads['audio'].get_peer()
+        self._attached_at = time.monotonic()
+        self._apply_offset()
+        return True
+
+    def detach(self) -> None:
+        """Entfernt alle Probes (beim Stoppen der Pipeline)."""
+        for pad, probe_id in self._probes:
+            pad.remove_probe(probe_id)
+        self._probes = []
+        self._audio_pad = None
+
+        with self._lock:
+            self._last = {'audio': None, 'video': None}
+            self._skew_ms = None
+            self._baseline_ms = None
+            self._max_drift_ms = 0.0
+        self.correction_ms = 0.0
+
+    def set_manual_offset(self, offset_ms: float) -> None:
+        """
+        Setzt einen manuellen Audio-Versatz (live).
+
+        Args:
+            offset_ms: Versatz in ms (positiv = Audio später)
+        """
+        self.manual_offset_ms = offset_ms
+        self._apply_offset()
+
+    def tick(self) -> None:
+        """
+        Periodischer Aufruf (Qt-Thread, ~1 Hz): korrigiert Drift schrittweise.
+
+        Pro Aufruf wird höchstens step_ms korrigiert, damit der Ausgleich
+        ohne hörbare Sprünge erfolgt.
+        """
+        if self._audio_pad is None:
+            return
+
+        with self._lock:
+            if self._skew_ms is None:
+                return
+            if self._baseline_ms is None:
+                if time.monotonic() - self._attached_at < self.settle_s:
+                    return
+                self._baseline_ms = self._skew_ms
+            drift = self._skew_ms - self._baseline_ms
+            self._max_drift_ms = max(self._max_drift_ms, abs(drift))
+
+        if not self.auto_correct or abs(drift) < self.threshold_ms:
+            return
+
+        # Audio driftet voraus (drift > 0) → Audio verzögern
+        step = min(abs(drift), self.step_ms)
+        self.correction_ms += step if drift > 0 else -step
+        self._apply_offset()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Holt die aktuellen Sync-Werte.
+
+        Returns:
+            Dict mit 'av_skew_ms' (Drift seit Baseline), 'av_max_skew_ms',
+            'av_correction_ms', 'av_manual_offset_ms'
+        """
+        with self._lock:
+            if self._skew_ms is None or self._baseline_ms is None:
+                drift = None
+            else:
+                drift = self._skew_ms - self._baseline_ms
+            max_drift = self._max_drift_ms
+
+        return {
+            'av_skew_ms': round(drift, 1) if drift is not None else None,
+            'av_max_skew_ms': round(max_drift, 1),
+            'av_correction_ms': round(self.correction_ms, 1),
+            'av_manual_offset_ms': self.manual_offset_ms,
+        }
+
+    def _apply_offset(self) -> None:
+        """Setzt den Gesamt-Offset (manuell + Korrektur) auf dem Audio-Pad."""
+        if self._audio_pad is None:
+            return
+        offset_ns = int((self.manual_offset_ms + self.correction_ms) * Gst.MSECOND)
+        self._audio_pad.set_offset(offset_ns)
+
+    def _on_buffer(self, pad: Gst.Pad, info: Gst.PadProbeInfo, kind: str) -> Gst.PadProbeReturn:
+        """Pad-Probe (Streaming-Thread): merkt sich Running-Time + Wall-Clock."""
+        buffer = info.get_buffer()
+        if buffer is None or buffer.pts == Gst.CLOCK_TIME_NONE:
+            return Gst.PadProbeReturn.OK
+
+        event = pad.get_sticky_event(Gst.EventType.SEGMENT, 0)
+        if event is None:
+            return Gst.PadProbeReturn.OK
+
+        segment = event.parse_segment()
+        running_time = segment.to_running_time(Gst.Format.TIME, buffer.pts)
+        if running_time == Gst.CLOCK_TIME_NONE:
+            return Gst.PadProbeReturn.OK
+
+        wall = time.monotonic_ns()
+        with self._lock:
+            self._last[kind] = (running_time, wall)
+            audio, video = self._last['audio'], self._last['video']
+            if audio and video:
+                skew_ns = (audio[0] - audio[1]) - (video[0] - video[1])
+                skew_ms = skew_ns / Gst.MSECOND
+                if self._skew_ms is None:
+                    self._skew_ms = skew_ms
+                else:
+                    self._skew_ms += self.smoothing * (skew_ms - self._skew_ms)
+
+        return Gst.PadProbeReturn.OK
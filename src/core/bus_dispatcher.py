@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Bus Dispatcher
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import Gst
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class BusDispatcher:
+    """
+    Gemeinsamer Bus-Sync-Handler für Stream-, Preview- und Recording-Pipeline.
+
+    Läuft im Streaming-Thread, der die Message postet, und sortiert vor,
+    bevor etwas die GLib-Main-Loop (Bus-Watcher) oder den Qt-Thread erreicht:
+
+    - Element-Messages gehen an Abonnenten (z.B. LevelMeter, RecordingEngine)
+    - Warnungen werden pro (Element, Text) gezählt, QoS-Events pro Element -
+      beides wird verworfen und erst beim flush() gebündelt gemeldet
+    - State-Changes von Kind-Elementen werden verworfen (nur die der
+      Pipeline selbst sind interessant)
+    - Fehler, EOS und alles andere gehen unverändert an den Bus-Watcher
+
+    flush() läuft im Qt-Thread (Timer, FLUSH_INTERVAL_MS) und meldet je
+    Intervall höchstens MAX_LINES_PER_FLUSH Zeilen - ein Element, das
+    tausende Warnungen pro Sekunde postet, erzeugt eine Zeile mit Zähler.
+    """
+
+    FLUSH_INTERVAL_MS = 1000
+    MAX_LINES_PER_FLUSH = 5
+
+    def __init__(self, on_status: Callable[[str], None]):
+        """
+        Initialisiert BusDispatcher.
+
+        Args:
+            on_status: Ausgabe der gebündelten Meldungen (Qt-Thread)
+        """
+        self.on_status = on_status
+
+        # (handler, Element-Prefix oder None, verwerfen?)
+        self._subscribers: List[Tuple[Callable[[Gst.Message], bool], Optional[str], bool]] = []
+
+        self._lock = threading.Lock()
+        # (Element, Text) → {'count', 'debug'}
+        self._warnings: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # Element → {'events', 'dropped'}
+        self._qos: Dict[str, Dict[str, int]] = {}
+        # Summen seit reset() (für Statistik/Benchmarks)
+        self._totals = {'warnings': 0, 'qos_events': 0, 'qos_dropped': 0}
+
+        # Präfix der Warnungs-Zeilen (je nach Pipeline)
+        self.label = "Warnung"
+
+    def subscribe(
+        self,
+        handler: Callable[[Gst.Message], bool],
+        prefix: Optional[str] = None,
+        consume: bool = True
+    ) -> None:
+        """
+        Leitet Element-Messages an einen Abonnenten (Streaming-Thread!).
+
+        Args:
+            handler: Gibt True zurück, wenn die Message ihm gehörte
+            prefix: Nur Messages von Elementen mit diesem Namens-Präfix
+            consume: Behandelte Messages verwerfen (sonst weiter an den Watcher)
+        """
+        self._subscribers.append((handler, prefix, consume))
+
+    def attach(
+        self,
+        pipeline: Gst.Pipeline,
+        on_message: Callable[[Gst.Bus, Gst.Message], bool],
+        label: str = "Warnung"
+    ) -> None:
+        """
+        Richtet Sync-Handler und Bus-Watcher einer Pipeline ein.
+
+        Args:
+            pipeline: Pipeline
+            on_message: Watcher für die durchgelassenen Messages (Main-Loop)
+            label: Präfix der Warnungs-Zeilen (z.B. "Preview-Warnung")
+        """
+        self.reset()
+        self.label = label
+        bus = pipeline.get_bus()
+        bus.add_signal_watch()
+        bus.connect("message", on_message)
+        bus.set_sync_handler(self.sync_handler)
+
+    def detach(self, pipeline: Gst.Pipeline) -> None:
+        """Entfernt Watcher und Sync-Handler, meldet noch gezählte Warnungen."""
+        bus = pipeline.get_bus()
+        bus.remove_signal_watch()
+        bus.set_sync_handler(None)
+        self.flush()
+
+    def sync_handler(self, bus: Gst.Bus, message: Gst.Message) -> Gst.BusSyncReply:
+        """
+        Bus-Sync-Handler (Streaming-Thread).
+
+        Returns:
+            DROP für gezählte/konsumierte Messages, sonst PASS
+        """
+        msg_type = message.type
+
+        if msg_type == Gst.MessageType.ELEMENT:
+            name = message.src.get_name() if message.src is not None else ""
+            for handler, prefix, consume in self._subscribers:
+                if prefix is not None and not name.startswith(prefix):
+                    continue
+                if handler(message):
+                    return Gst.BusSyncReply.DROP if consume else Gst.BusSyncReply.PASS
+            return Gst.BusSyncReply.PASS
+
+        if msg_type == Gst.MessageType.WARNING:
+            self._count_warning(message)
+            return Gst.BusSyncReply.DROP
+
+        if msg_type == Gst.MessageType.QOS:
+            self._count_qos(message)
+            return Gst.BusSyncReply.DROP
+
+        if msg_type == Gst.MessageType.STATE_CHANGED and not isinstance(message.src, Gst.Pipeline):
+            return Gst.BusSyncReply.DROP
+
+        return Gst.BusSyncReply.PASS
+
+    def _count_warning(self, message: Gst.Message) -> None:
+        """Zählt eine Warnung (Streaming-Thread)."""
+        warn, debug = message.parse_warning()
+        key = (message.src.get_name() if message.src is not None else "?", warn.message)
+        with self._lock:
+            entry = self._warnings.get(key)
+            if entry is None:
+                entry = self._warnings[key] = {'count': 0, 'debug': debug}
+            entry['count'] += 1
+            self._totals['warnings'] += 1
+
+    def _count_qos(self, message: Gst.Message) -> None:
+        """Zählt ein QoS-Event samt verworfener Buffer (Streaming-Thread)."""
+        _, _, dropped = message.parse_qos_stats()
+        name = message.src.get_name() if message.src is not None else "?"
+        with self._lock:
+            entry = self._qos.setdefault(name, {'events': 0, 'dropped': 0})
+            entry['events'] += 1
+            self._totals['qos_events'] += 1
+            # dropped ist ein laufender Zähler des Elements (-1 = unbekannt)
+            if dropped > entry['dropped']:
+                self._totals['qos_dropped'] += dropped - entry['dropped']
+                entry['dropped'] = dropped
+
+    def flush(self) -> None:
+        """Meldet die seit dem letzten Aufruf gezählten Warnungen (Qt-Thread)."""
+        with self._lock:
+            warnings, self._warnings = self._warnings, {}
+            qos = {name: dict(entry) for name, entry in self._qos.items() if entry['events']}
+            for entry in self._qos.values():
+                entry['events'] = 0
+
+        # (Zeile, Debug-Text) - häufigste Warnungen zuerst
+        lines = []
+        for (element, text), entry in sorted(warnings.items(), key=lambda item: -item[1]['count']):
+            count = f" (×{entry['count']})" if entry['count'] > 1 else ""
+            lines.append((f"⚠️ {self.label}: {text}{count}", f"{element}: {entry['debug']}"))
+        for element, entry in qos.items():
+            lines.append((
+                f"⚠️ QoS: {element} kommt nicht nach ({entry['events']} Events, "
+                f"{entry['dropped']} Buffer verworfen insgesamt)", None
+            ))
+
+        if len(lines) > self.MAX_LINES_PER_FLUSH:
+            hidden = len(lines) - self.MAX_LINES_PER_FLUSH + 1
+            lines = lines[:self.MAX_LINES_PER_FLUSH - 1]
+            lines.append((f"⚠️ ... und {hidden} weitere Warnungen", None))
+        for line, debug in lines:
+            self.on_status(line)
+            if debug:
+                print(f"🔹 Debug ({debug})")
+
+    def reset(self) -> None:
+        """Verwirft alle Zähler (neue Pipeline)."""
+        with self._lock:
+            self._warnings.clear()
+            self._qos.clear()
+            self._totals = {'warnings': 0, 'qos_events': 0, 'qos_dropped': 0}
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Summen seit dem Start der Pipeline.
+
+        Returns:
+            Dict mit 'bus_warnings', 'bus_qos_events', 'bus_qos_dropped'
+        """
+        with self._lock:
+            return {f"bus_{key}": value for key, value in self._totals.items()}
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Device Capability Index
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import Gst
+
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+class DeviceCapabilityIndex:
+    """
+    Persistenter Index der nativen Capture-Modi pro Gerät.
+
+    Jeder Modus ist eine Kombination aus Format × Auflösung × Framerate,
+    die das Gerät ohne Skalierung liefert. Der Index wird einmalig pro
+    Gerät erstellt und über die Geräte-Identität (Serial bzw. Bus-Info)
+    gespeichert - /dev/videoX-Nummern ändern sich beim Umstecken.
+    """
+
+    INDEX_VERSION = 1
+
+    # V4L2-FourCC → (GStreamer-Media-Type, GStreamer-Format)
+    FOURCC_TO_CAPS = {
+        'YUYV': ('video/x-raw', 'YUY2'),
+        'UYVY': ('video/x-raw', 'UYVY'),
+        'NV12': ('video/x-raw', 'NV12'),
+        'YU12': ('video/x-raw', 'I420'),
+        'YV12': ('video/x-raw', 'YV12'),
+        'RGB3': ('video/x-raw', 'RGB'),
+        'BGR3': ('video/x-raw', 'BGR'),
+        'MJPG': ('image/jpeg', None),
+        'JPEG': ('image/jpeg', None),
+    }
+
+    def __init__(self, index_file: str = "device_capabilities.json"):
+        """
+        Initialisiert den Capability-Index.
+
+        Args:
+            index_file: Dateiname des Index (relativ zum Config-Dir)
+        """
+        self.index_dir = Path.home() / ".config" / "tuxrtmpilot"
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.index_dir / index_file
+
+        # Identität → {'name', 'bus_info', 'serial', 'modes', 'updated'}
+        self.devices: Dict[str, Dict[str, Any]] = {}
+
+        # Device-Pfad → Identität (nur für die laufende Sitzung)
+        self._identities: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        self.load_index()
+
+    # ==================== PERSISTENZ ====================
+
+    def load_index(self) -> None:
+        """Lädt den Index von der Festplatte."""
+        if not self.index_file.exists():
+            return
+
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.INDEX_VERSION:
+                self.devices = data.get('devices', {})
+            else:
+                print("ℹ️ Capability-Index veraltet, wird neu aufgebaut")
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"⚠️ Capability-Index defekt: {e}, wird neu aufgebaut")
+            self.devices = {}
+
+    def save_index(self) -> bool:
+        """
+        Speichert den Index (atomar über temporäre Datei).
+
+        Returns:
+            True bei Erfolg, False bei Fehler
+        """
+        tmp_file = self.index_file.with_suffix('.tmp')
+        try:
+            with self._lock:
+                data = {'version': self.INDEX_VERSION, 'devices': self.devices}
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_file, self.index_file)
+            return True
+        except OSError as e:
+            print(f"❌ Capability-Index speichern fehlgeschlagen: {e}")
+            return False
+
+    # ==================== ABFRAGE-API ====================
+
+    def get_identity(self, device_path: str) -> str:
+        """
+        Ermittelt die stabile Identität eines Geräts.
+
+        Priorität: USB-Serial > Bus-Info + Name > Device-Pfad
+
+        Args:
+            device_path: Pfad zum Device (z.B. /dev/video0)
+
+        Returns:
+            Identitäts-String (Schlüssel im Index)
+        """
+        if device_path in self._identities:
+            return self._identities[device_path]
+
+        info = self._read_device_info(device_path)
+        if info.get('serial'):
+            identity = f"serial:{info['serial']}"
+        elif info.get('bus_info'):
+            identity = f"bus:{info['bus_info']}|{info.get('name', '')}"
+        else:
+            identity = f"path:{device_path}"
+
+        self._identities[device_path] = identity
+        return identity
+
+    def is_identified(self, device_path: str) -> bool:
+        """True wenn get_identity() das Gerät schon kennt (blockiert dann nicht)."""
+        return device_path in self._identities
+
+    def ensure_device(self, device_path: str, refresh: bool = False) -> Dict[str, Any]:
+        """
+        Stellt sicher, dass ein Gerät im Index ist (enumeriert nur einmal).
+
+        Args:
+            device_path: Pfad zum Device
+            refresh: True erzwingt erneute Enumeration
+
+        Returns:
+            Index-Eintrag des Geräts
+        """
+        identity = self.get_identity(device_path)
+        entry = self.devices.get(identity)
+
+        if entry is not None and not refresh:
+            return entry
+
+        info = self._read_device_info(device_path)
+        modes = self._enumerate_modes(device_path)
+        entry = {
+            'name': info.get('name', device_path.split('/')[-1]),
+            'bus_info': info.get('bus_info', ''),
+            'serial': info.get('serial', ''),
+            'modes': modes,
+            'updated': int(time.time()),
+        }
+
+        with self._lock:
+            self.devices[identity] = entry
+        self.save_index()
+
+        print(f"🔹 Capabilities für {device_path}: {len(modes)} native Modi")
+        return entry
+
+    def get_modes(self, device_path: str) -> List[Dict[str, Any]]:
+        """
+        Holt alle nativen Modi eines Geräts.
+
+        Args:
+            device_path: Pfad zum Device
+
+        Returns:
+            Liste von Modus-Dicts mit 'media', 'format', 'width',
+            'height' und 'framerates' (GStreamer-Fractions als Strings)
+        """
+        return self.ensure_device(device_path).get('modes', [])
+
+    def get_resolutions(self, device_path: str) -> List[str]:
+        """
+        Holt alle nativen Auflösungen eines Geräts (absteigend sortiert).
+
+        Args:
+            device_path: Pfad zum Device
+
+        Returns:
+            Liste von Auflösungen (z.B. ["1920x1080", "1280x720"])
+        """
+        sizes = {(m['width'], m['height']) for m in self.get_modes(device_path)}
+        return [f"{w}x{h}" for w, h in sorted(sizes, key=lambda s: s[0] * s[1], reverse=True)]
+
+    def find_native_mode(
+        self,
+        device_path: str,
+        width: int,
+        height: int,
+        fps: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Wählt den günstigsten nativen Modus für die gewünschte Ausgabe.
+
+        Kosten-Modell: Hochskalieren wird vermieden, Raw-Formate sind
+        günstiger als MJPEG (kein Decoder), und exakte Größe spart
+        videoscale komplett.
+
+        Args:
+            device_path: Pfad zum Device
+            width: Ziel-Breite
+            height: Ziel-Höhe
+            fps: Ziel-Framerate
+
+        Returns:
+            Modus-Dict mit zusätzlichem 'framerate'-Key oder None
+        """
+        candidates = []
+        for mode in self.get_modes(device_path):
+            framerate = self._pick_framerate(mode.get('framerates', []), fps)
+            if framerate is None:
+                continue
+
+            pixels = mode['width'] * mode['height']
+            upscale = mode['width'] < width or mode['height'] < height
+            decode_cost = pixels * (2 if mode['media'] == 'image/jpeg' else 1)
+            scale_cost = 0 if (mode['width'], mode['height']) == (width, height) else width * height
+
+            # Beim Hochskalieren: möglichst große Quelle bevorzugen
+            cost = -pixels if upscale else decode_cost + scale_cost
+            candidates.append((upscale, cost, dict(mode, framerate=framerate)))
+
+        if not candidates:
+            return None
+
+        candidates.sort(key=lambda c: (c[0], c[1]))
+        return candidates[0][2]
+
+    @staticmethod
+    def mode_to_caps(mode: Dict[str, Any]) -> str:
+        """
+        Baut den Caps-String für einen Modus (mit 'framerate'-Key).
+
+        Args:
+            mode: Modus-Dict aus find_native_mode()
+
+        Returns:
+            Caps-String (z.B. "video/x-raw,format=YUY2,width=640,...")
+        """
+        caps = mode['media']
+        if mode.get('format') and mode['media'] == 'video/x-raw':
+            caps += f",format={mode['format']}"
+        caps += f",width={mode['width']},height={mode['height']}"
+        if mode.get('framerate'):
+            caps += f",framerate={mode['framerate']}"
+        return caps
+
+    # ==================== ENUMERATION ====================
+
+    def _read_device_info(self, device_path: str) -> Dict[str, str]:
+        """
+        Liest Name, Bus-Info und Serial eines Geräts.
+
+        Args:
+            device_path: Pfad zum Device
+
+        Returns:
+            Dict mit 'name', 'bus_info', 'serial' (soweit ermittelbar)
+        """
+        info: Dict[str, str] = {}
+
+        try:
+            result = subprocess.run(
+                ['v4l2-ctl', '--device', device_path, '--info'],
+                capture_output=True,
+                text=True,
+                timeout=2
+            )
+            for line in result.stdout.split('\n'):
+                if ':' not in line:
+                    continue
+                key, value = (part.strip() for part in line.split(':', 1))
+                if key == 'Card type':
+                    info['name'] = value
+                elif key == 'Bus info':
+                    info['bus_info'] = value
+                elif key == 'Serial':
+                    info['serial'] = value
+        except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
+            pass
+
+        if 'serial' not in info:
+            try:
+                result = subprocess.run(
+                    ['udevadm', 'info', '--query=property', f'--name={device_path}'],
+                    capture_output=True,
+                    text=True,
+                    timeout=2
+                )
+                for line in result.stdout.split('\n'):
+                    if line.startswith('ID_SERIAL='):
+                        info['serial'] = line.split('=', 1)[1].strip()
+                        break
+            except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
+                pass
+
+        return info
+
+    def _enumerate_modes(self, device_path: str) -> List[Dict[str, Any]]:
+        """
+        Enumeriert alle nativen Modi (v4l2-ctl, Fallback: GStreamer-Caps).
+
+        Args:
+            device_path: Pfad zum Device
+
+        Returns:
+            Liste von Modus-Dicts
+        """
+        modes = self._enumerate_modes_v4l2ctl(device_path)
+        if not modes:
+            modes = self._enumerate_modes_gst(device_path)
+        return modes
+
+    def _enumerate_modes_v4l2ctl(self, device_path: str) -> List[Dict[str, Any]]:
+        """Parst 'v4l2-ctl --list-formats-ext'."""
+        try:
+            result = subprocess.run(
+                ['v4l2-ctl', '--device', device_path, '--list-formats-ext'],
+                capture_output=True,
+                text=True,
+                timeout=5
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
+            return []
+
+        modes: List[Dict[str, Any]] = []
+        current_caps = None
+        current_mode: Optional[Dict[str, Any]] = None
+
+        for line in result.stdout.split('\n'):
+            fmt_match = re.search(r"\[\d+\]: '(\w+)'", line)
+            if fmt_match:
+                current_caps = self.FOURCC_TO_CAPS.get(fmt_match.group(1))
+                current_mode = None
+                continue
+
+            size_match = re.search(r"Size: Discrete (\d+)x(\d+)", line)
+            if size_match and current_caps:
+                media, fmt = current_caps
+                current_mode = {
+                    'media': media,
+                    'format': fmt,
+                    'width': int(size_match.group(1)),
+                    'height': int(size_match.group(2)),
+                    'framerates': [],
+                }
+                modes.append(current_mode)
+                continue
+
+            fps_match = re.search(r"\(([\d.]+) fps\)", line)
+            if fps_match and current_mode is not None:
+                fraction = self._fps_to_fraction(float(fps_match.group(1)))
+                if fraction not in current_mode['framerates']:
+                    current_mode['framerates'].append(fraction)
+
+        return [m for m in modes if m['framerates']]
+
+    def _enumerate_modes_gst(self, device_path: str) -> List[Dict[str, Any]]:
+        """Fragt die Caps über v4l2src im READY-State ab."""
+        modes: List[Dict[str, Any]] = []
+        try:
+            src = Gst.ElementFactory.make('v4l2src', None)
+            if src is None:
+                return modes
+            src.set_property('device', device_path)
+            src.set_state(Gst.State.READY)
+            src.get_state(2 * Gst.SECOND)
+
+            caps = src.get_static_pad('src').query_caps(None)
+            for i in range(caps.get_size()):
+                structure = caps.get_structure(i).to_string()
+                mode = self._parse_caps_structure(structure)
+                if mode:
+                    modes.append(mode)
+
+            src.set_state(Gst.State.NULL)
+        except Exception as e:
+            print(f"⚠️ Caps-Abfrage für {device_path} fehlgeschlagen: {e}")
+        return modes
+
+    def _parse_caps_structure(self, structure: str) -> Optional[Dict[str, Any]]:
+        """Parst eine feste Caps-Struktur (nur diskrete Größen)."""
+        media = structure.split(',', 1)[0]
+        if media not in ('video/x-raw', 'image/jpeg'):
+            return None
+
+        width = re.search(r"width=\(int\)(\d+)", structure)
+        height = re.search(r"height=\(int\)(\d+)", structure)
+        if not width or not height:
+            return None
+
+        fmt = re.search(r"format=\(string\)(\w+)", structure)
+        rates = re.search(r"framerate=\(fraction\)\{ ?([^}]*)\}", structure)
+        if rates:
+            framerates = [r.strip() for r in rates.group(1).split(',') if r.strip()]
+        else:
+            single = re.search(r"framerate=\(fraction\)(\d+/\d+)", structure)
+            framerates = [single.group(1)] if single else []
+
+        framerates = [r for r in framerates if not r.startswith('0/')]
+        if not framerates:
+            return None
+
+        return {
+            'media': media,
+            'format': fmt.group(1) if fmt and media == 'video/x-raw' else None,
+            'width': int(width.group(1)),
+            'height': int(height.group(1)),
+            'framerates': framerates,
+        }
+
+    # ==================== HELFER ====================
+
+    @staticmethod
+    def _fps_to_fraction(fps: float) -> str:
+        """Wandelt eine fps-Angabe in eine GStreamer-Fraction um."""
+        if abs(fps - round(fps)) < 0.01:
+            return f"{int(round(fps))}/1"
+        # NTSC-Raten (29.97, 59.94, ...)
+        return f"{int(round(fps * 1.001)) * 1000}/1001"
+
+    @staticmethod
+    def _pick_framerate(framerates: List[str], fps: int) -> Optional[str]:
+        """
+        Wählt die passende Framerate (exakt, sonst nächsthöhere).
+
+        Returns:
+            Fraction-String oder None wenn das Gerät zu langsam ist
+        """
+        parsed = []
+        for fraction in framerates:
+            num, _, den = fraction.partition('/')
+            try:
+                parsed.append((int(num) / int(den or 1), fraction))
+            except (ValueError, ZeroDivisionError):
+                continue
+
+        faster = sorted(p for p in parsed if p[0] >= fps - 0.1)
+        return faster[0][1] if faster else None
+
+
+# Convenience-Funktion für schnellen Zugriff
+_index_instance: Optional[DeviceCapabilityIndex] = None
+
+def get_capability_index() -> DeviceCapabilityIndex:
+    """
+    Gibt Singleton-Instanz des Capability-Index zurück.
+
+    Returns:
+        DeviceCapabilityIndex-Instanz
+    """
+    global _index_instance
+    if _index_instance is None:
+        _index_instance = DeviceCapabilityIndex()
+    return _index_instance
@@ -16,7 +16,16 @@ from gi.repository import Gst
 
 import subprocess
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Any
+
+try:
+    from src.core.device_capabilities import get_capability_index
+    from src.core.source_prober import SourceProber
+except ModuleNotFoundError:
+    import sys
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from src.core.device_capabilities import get_capability_index
+    from src.core.source_prober import SourceProber
 
 
 class DeviceManager:
@@ -27,12 +36,24 @@ class DeviceManager:
     - Screen Capture (PipeWire)
     - Webcams (V4L2)
     - Audio-Quellen (PulseAudio/PipeWire)
+
+    Zusätzlich gibt es die Testquelle 'test' (videotestsrc/audiotestsrc)
+    für Benchmarks und Tests ohne Hardware - sie wird nicht aufgelistet.
     """
+
+    TEST_SOURCE = 'test'
     
-    def __init__(self):
-        """Initialisiert DeviceManager."""
+    def __init__(self, probe_timeout: float = 3.0, probe_cache_ttl: float = 30.0):
+        """
+        Initialisiert DeviceManager.
+
+        Args:
+            probe_timeout: Maximale Zeit pro Quellen-Test (Sekunden)
+            probe_cache_ttl: Gültigkeit von Test-Ergebnissen (Sekunden)
+        """
         # GStreamer muss bereits initialisiert sein (passiert in main.py)
-        pass
+        self.capabilities = get_capability_index()
+        self.prober = SourceProber(timeout=probe_timeout, cache_ttl=probe_cache_ttl)
     
     def get_video_sources(self) -> List[Dict[str, str]]:
         """
@@ -87,6 +108,9 @@ class DeviceManager:
             device_name = self._get_webcam_name(device_str)
 
             if device_name:
+                # Native Modi einmalig enumerieren (danach aus dem Index)
+                self.capabilities.ensure_device(device_str)
+
                 webcams.append({
                     'name': f'Webcam ({device_name})',
                     'device': device_str,
@@ -145,6 +169,72 @@ class DeviceManager:
             # v4l2-ctl nicht installiert oder Device nicht verfügbar
             return device_path.split('/')[-1]
     
+    def get_device_modes(self, device: str) -> List[Dict[str, Any]]:
+        """
+        Holt die nativen Capture-Modi eines Geräts.
+
+        Args:
+            device: Device-String (z.B. '/dev/video0')
+
+        Returns:
+            Liste von Modus-Dicts (leer für Screen Capture)
+        """
+        if device == 'screen':
+            return []
+        return self.capabilities.get_modes(device)
+
+    def get_supported_resolutions(self, device: str) -> List[str]:
+        """
+        Holt die Auflösungen, die ein Gerät nativ liefert.
+
+        Args:
+            device: Device-String (z.B. '/dev/video0')
+
+        Returns:
+            Liste von Auflösungen (z.B. ["1280x720", "640x480"]),
+            leer für Screen Capture (beliebig skalierbar)
+        """
+        if device == 'screen':
+            return []
+        return self.capabilities.get_resolutions(device)
+
+    def find_native_mode(
+        self,
+        device: str,
+        width: int,
+        height: int,
+        fps: int
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Wählt den günstigsten nativen Modus für die Ziel-Ausgabe.
+
+        Args:
+            device: Device-String (z.B. '/dev/video0')
+            width: Ziel-Breite
+            height: Ziel-Höhe
+            fps: Ziel-Framerate
+
+        Returns:
+            Modus-Dict oder None (kein passender Modus bekannt)
+        """
+        if device == 'screen':
+            return None
+        return self.capabilities.find_native_mode(device, width, height, fps)
+
+    def refresh_capabilities(self, device: Optional[str] = None) -> None:
+        """
+        Enumeriert Capabilities neu (z.B. nach Firmware-Update).
+
+        Args:
+            device: Einzelnes Device oder None für alle Webcams
+        """
+        if device:
+            self.capabilities.ensure_device(device, refresh=True)
+            return
+
+        for webcam in self._detect_webcams():
+            self.capabilities.ensure_device(webcam['device'], refresh=True)
+
     def get_audio_sources(self) -> List[Dict[str, str]]:
         """
         Holt alle verfügbaren Audio-Quellen.
@@ -172,80 +262,250 @@ class DeviceManager:
             'type': 'pulse'
         })
         
-        # Weitere Quellen könnten über pactl erkannt werden
-        # Für Phase 1 reichen diese zwei
-        
+        # Weitere Quellen (Mikrofone, Interfaces, Monitore) über pactl
+        sources.extend(self._detect_pulse_sources())
+
+        return sources
+
+    def _detect_pulse_sources(self) -> List[Dict[str, str]]:
+        """
+        Erkennt PulseAudio/PipeWire-Quellen über 'pactl list sources'.
+
+        Returns:
+            Liste von Audio-Source-Dicts (leer wenn pactl fehlt)
+        """
+        try:
+            result = subprocess.run(
+                ['pactl', 'list', 'sources'],
+                capture_output=True,
+                text=True,
+                timeout=2
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
+            return []
+
+        sources = []
+        current: Dict[str, str] = {}
+
+        for line in result.stdout.split('\n') + ['Source #end']:
+            line = line.strip()
+            if line.startswith('Source #'):
+                if current.get('device'):
+                    sources.append(current)
+                current = {'type': 'pulse'}
+            elif line.startswith('Name:'):
+                current['device'] = line.split(':', 1)[1].strip()
+            elif line.startswith('Description:'):
+                description = line.split(':', 1)[1].strip()
+                if current.get('device', '').endswith('.monitor'):
+                    current['name'] = f'Desktop Audio ({description})'
+                else:
+                    current['name'] = f'Mikrofon ({description})'
+            elif line.startswith('Sample Specification:'):
+                # z.B. "s16le 2ch 48000Hz"
+                for part in line.split(':', 1)[1].split():
+                    if part.endswith('Hz') and part[:-2].isdigit():
+                        current['rate'] = part[:-2]
+
+        for source in sources:
+            source.setdefault('name', source['device'])
+
         return sources
     
+    def get_audio_source_rate(self, device: str) -> Optional[int]:
+        """
+        Ermittelt die native Samplerate einer Audio-Quelle.
+
+        PipeWire-Quellen laufen meist mit 48 kHz - jedes Resampling
+        auf eine andere Rate kostet CPU und Latenz.
+
+        Args:
+            device: Device-String (z.B. 'default', 'monitor' oder pactl-Name)
+
+        Returns:
+            Samplerate in Hz oder None wenn unbekannt
+        """
+        return self.get_audio_source_rates([device])[device]
+
+    def get_audio_source_rates(self, devices: List[str]) -> Dict[str, Optional[int]]:
+        """
+        Native Sampleraten mehrerer Quellen mit einer Abfrage.
+
+        Höchstens ein 'pactl info' (für 'default'/'monitor') und ein
+        'pactl list sources' für alle übrigen - nicht ein Aufruf pro Quelle.
+
+        Args:
+            devices: Device-Strings
+
+        Returns:
+            Dict device → Samplerate in Hz (None wenn unbekannt)
+        """
+        rates: Dict[str, Optional[int]] = {}
+        default_rate: Optional[int] = None
+        default_checked = False
+        pulse_rates: Optional[Dict[str, int]] = None
+
+        for device in devices:
+            if device in ('default', 'monitor'):
+                if not default_checked:
+                    default_rate = self._get_default_sample_rate()
+                    default_checked = True
+                rates[device] = default_rate
+            elif device == self.TEST_SOURCE:
+                rates[device] = 48000
+            else:
+                if pulse_rates is None:
+                    pulse_rates = {
+                        source['device']: int(source['rate'])
+                        for source in self._detect_pulse_sources() if source.get('rate')
+                    }
+                rates[device] = pulse_rates.get(device)
+        return rates
+
+    def _get_default_sample_rate(self) -> Optional[int]:
+        """Liest die Default-Samplerate des Soundservers ('pactl info')."""
+        try:
+            result = subprocess.run(
+                ['pactl', 'info'],
+                capture_output=True,
+                text=True,
+                timeout=2
+            )
+            for line in result.stdout.split('\n'):
+                if line.startswith('Default Sample Specification:'):
+                    for part in line.split(':', 1)[1].split():
+                        if part.endswith('Hz') and part[:-2].isdigit():
+                            return int(part[:-2])
+        except (subprocess.TimeoutExpired, FileNotFoundError, Exception):
+            pass
+        return None
+
+    def get_video_source_element(self, device: str) -> str:
+        """
+        Baut das GStreamer-Source-Fragment für eine Video-Quelle.
+
+        Args:
+            device: Device-String (z.B. 'screen' oder '/dev/video0')
+
+        Returns:
+            Source-Fragment (z.B. "v4l2src device=/dev/video0")
+        """
+        if device == 'screen':
+            return "pipewiresrc"
+        if device == self.TEST_SOURCE:
+            return "videotestsrc is-live=true pattern=smpte"
+        return f"v4l2src device={device}"
+
+    def get_audio_source_element(self, device: str) -> str:
+        """
+        Baut das GStreamer-Source-Fragment für eine Audio-Quelle.
+
+        Args:
+            device: Device-String (z.B. 'default' oder 'monitor')
+
+        Returns:
+            Source-Fragment (z.B. "pulsesrc device=@DEFAULT_MONITOR@")
+        """
+        if device == 'default':
+            return "autoaudiosrc"
+        if device == self.TEST_SOURCE:
+            return "audiotestsrc is-live=true wave=ticks"
+        if device == 'monitor':
+            return "pulsesrc device=@DEFAULT_MONITOR@"
+        return f"pulsesrc device=\"{device}\""
+
+    def probe_video_source(self, device: str, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Testet eine Video-Quelle (mit Timeout, Buffer-Fluss und TTFF).
+
+        Args:
+            device: Device-String (z.B. 'screen' oder '/dev/video0')
+            use_cache: False erzwingt einen neuen Test
+
+        Returns:
+            Probe-Ergebnis mit 'ok', 'ttff_ms' und 'error'
+        """
+        return self.prober.probe('video', device, self.get_video_source_element(device), use_cache)
+
+    def probe_audio_source(self, device: str, use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Testet eine Audio-Quelle (mit Timeout, Buffer-Fluss und TTFF).
+
+        Args:
+            device: Device-String (z.B. 'default' oder 'monitor')
+            use_cache: False erzwingt einen neuen Test
+
+        Returns:
+            Probe-Ergebnis mit 'ok', 'ttff_ms' und 'error'
+        """
+        return self.prober.probe('audio', device, self.get_audio_source_element(device), use_cache)
+
+    def probe_all_sources(
+        self,
+        include_screen: bool = False,
+        use_cache: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Testet alle erkannten Quellen gleichzeitig.
+
+        Args:
+            include_screen: Auch Screen Capture testen (öffnet Portal-Dialog!)
+            use_cache: False erzwingt neue Tests
+
+        Returns:
+            Liste von Probe-Ergebnissen (Video zuerst, dann Audio)
+        """
+        probes = []
+        for source in self.get_video_sources():
+            if source['device'] == 'screen' and not include_screen:
+                continue
+            probes.append(('video', source['device'], self.get_video_source_element(source['device'])))
+
+        for source in self.get_audio_sources():
+            probes.append(('audio', source['device'], self.get_audio_source_element(source['device'])))
+
+        results = self.prober.probe_many(probes, use_cache)
+        return [results[(kind, device)] for kind, device, _ in probes]
+
     def test_video_source(self, device: str) -> bool:
         """
         Testet ob eine Video-Quelle verfügbar ist.
-        
+
         Args:
             device: Device-String (z.B. 'screen' oder '/dev/video0')
-            
+
         Returns:
             True wenn verfügbar, False sonst
         """
-        try:
-            if device == 'screen':
-                # Test PipeWire Screen Capture
-                pipeline_str = "pipewiresrc ! fakesink"
-            else:
-                # Test V4L2 Webcam
-                pipeline_str = f"v4l2src device={device} ! fakesink"
-            
-            pipeline = Gst.parse_launch(pipeline_str)
-            pipeline.set_state(Gst.State.READY)
-            
-            # Warte kurz und check State
-            ret = pipeline.get_state(Gst.CLOCK_TIME_NONE)
-            success = ret[0] == Gst.StateChangeReturn.SUCCESS
-            
-            pipeline.set_state(Gst.State.NULL)
-            return success
-            
-        except Exception as e:
-            print(f"⚠️ Video-Source-Test fehlgeschlagen: {e}")
-            return False
-    
+        result = self.probe_video_source(device)
+        if not result['ok']:
+            print(f"⚠️ Video-Source-Test fehlgeschlagen: {result['error']}")
+        return result['ok']
+
     def test_audio_source(self, device: str) -> bool:
         """
         Testet ob eine Audio-Quelle verfügbar ist.
-        
+
         Args:
             device: Device-String (z.B. 'default' oder 'monitor')
-            
+
         Returns:
             True wenn verfügbar, False sonst
         """
-        try:
-            if device == 'default':
-                pipeline_str = "autoaudiosrc ! fakesink"
-            elif device == 'monitor':
-                pipeline_str = "pulsesrc ! fakesink"
-            else:
-                pipeline_str = "autoaudiosrc ! fakesink"
-            
-            pipeline = Gst.parse_launch(pipeline_str)
-            pipeline.set_state(Gst.State.READY)
-            
-            ret = pipeline.get_state(Gst.CLOCK_TIME_NONE)
-            success = ret[0] == Gst.StateChangeReturn.SUCCESS
-            
-            pipeline.set_state(Gst.State.NULL)
-            return success
-            
-        except Exception as e:
-            print(f"⚠️ Audio-Source-Test fehlgeschlagen: {e}")
-            return False
-    
+        result = self.probe_audio_source(device)
+        if not result['ok']:
+            print(f"⚠️ Audio-Source-Test fehlgeschlagen: {result['error']}")
+        return result['ok']
+
     def list_all_devices(self) -> None:
         """Debug-Funktion: Listet alle erkannten Geräte auf."""
         print("\n📹 Video-Quellen:")
         for source in self.get_video_sources():
             print(f"  - {source['name']} [{source['device']}]")
         
+            for resolution in self.get_supported_resolutions(source['device']):
+                print(f"      · {resolution}")
+
         print("\n🎤 Audio-Quellen:")
         for source in self.get_audio_sources():
             print(f"  - {source['name']} [{source['device']}]")
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Level Meter
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import Gst
+
+import math
+import threading
+from typing import Dict, List
+
+
+class LevelMeter:
+    """
+    Sammelt Peak/RMS-Werte der level-Elemente zwischen zwei UI-Updates.
+
+    Die level-Messages werden direkt im Streaming-Thread (Bus-Sync-Handler)
+    verarbeitet und nur hier zusammengefasst (Maximum seit dem letzten
+    flush()). Die UI holt die Werte mit fester, niedriger Rate ab - egal
+    wie viele Quellen oder wie kurz das level-Intervall ist.
+    """
+
+    # Untergrenze für Anzeige (level liefert -inf bei Stille)
+    SILENCE_DB = -90.0
+
+    # Prefix der level-Elemente in der Pipeline (z.B. "lvl_main")
+    ELEMENT_PREFIX = "lvl_"
+
+    def __init__(self):
+        """Initialisiert LevelMeter."""
+        # source_id → {'peak': dB, 'rms': dB}
+        self._levels: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def handle_message(self, message: Gst.Message) -> bool:
+        """
+        Verarbeitet eine Bus-Message, falls sie von einem level-Element stammt.
+
+        Args:
+            message: Bus-Message (beliebiger Typ)
+
+        Returns:
+            True wenn die Message eine level-Message war (konsumiert)
+        """
+        if message.type != Gst.MessageType.ELEMENT:
+            return False
+
+        structure = message.get_structure()
+        if structure is None or structure.get_name() != 'level':
+            return False
+
+        name = message.src.get_name()
+        if not name.startswith(self.ELEMENT_PREFIX):
+            return False
+
+        try:
+            peak = structure.get_value('peak')
+            rms = structure.get_value('rms')
+        except (TypeError, ValueError):
+            return True
+
+        self.update(name[len(self.ELEMENT_PREFIX):], peak or [], rms or [])
+        return True
+
+    def update(self, source_id: str, peak: List[float], rms: List[float]) -> None:
+        """
+        Trägt neue Werte ein (Maximum über alle Kanäle, Hold bis flush()).
+
+        Args:
+            source_id: ID der Quelle bzw. 'master'
+            peak: Peak-Werte pro Kanal in dB
+            rms: RMS-Werte pro Kanal in dB
+        """
+        peak_db = self._clamp(max(peak) if peak else self.SILENCE_DB)
+        rms_db = self._clamp(max(rms) if rms else self.SILENCE_DB)
+
+        with self._lock:
+            current = self._levels.get(source_id)
+            if current is None:
+                self._levels[source_id] = {'peak': peak_db, 'rms': rms_db}
+            else:
+                current['peak'] = max(current['peak'], peak_db)
+                current['rms'] = max(current['rms'], rms_db)
+
+    def flush(self) -> Dict[str, Dict[str, float]]:
+        """
+        Holt alle seit dem letzten Aufruf gesammelten Werte.
+
+        Returns:
+            Dict source_id → {'peak': dB, 'rms': dB} (leer wenn nichts Neues)
+        """
+        with self._lock:
+            levels = self._levels
+            self._levels = {}
+        return levels
+
+    def _clamp(self, value: float) -> float:
+        """Begrenzt dB-Werte auf den Anzeigebereich."""
+        if math.isnan(value) or value < self.SILENCE_DB:
+            return self.SILENCE_DB
+        return min(value, 0.0)
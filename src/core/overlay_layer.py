@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Overlay Layer
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import gi
+gi.require_version('Gst', '1.0')
+gi.require_version('GstVideo', '1.0')
+from gi.repository import Gst, GstVideo
+
+from PyQt6.QtCore import Qt, QRect
+from PyQt6.QtGui import QColor, QFont, QImage, QPainter
+
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+
+class OverlayLayer:
+    """
+    Statische Overlays (Logo, Bauchbinde, Text) über dem Video.
+
+    Jedes Overlay wird genau einmal in ein BGRA-Rechteck gerendert
+    (QImage → GstVideoOverlayRectangle) und erst bei Inhaltsänderung neu.
+    Sichtbarkeit umschalten baut nur die Composition neu zusammen,
+    ohne zu rendern.
+
+    Das Blending übernimmt overlaycomposition: nur die Fläche der
+    Rechtecke wird gemischt, die Konvertierung ins Video-Format (I420)
+    cacht GStreamer pro Rechteck - pro Frame fällt also kein Rendering
+    und keine Vollbild-RGBA-Mischung an.
+
+    Overlay-Format:
+        {'kind': 'image', 'path': '/pfad/logo.png', 'x': 16, 'y': 16, 'width': 160}
+        {'kind': 'text', 'text': 'Titel', 'x': 0, 'y': 620, 'font_size': 28}
+    """
+
+    ELEMENT_NAME = "ovl"
+
+    # QImage ARGB32_Premultiplied liegt auf Little-Endian als BGRA im Speicher
+    VIDEO_FORMAT = GstVideo.VideoFormat.BGRA if sys.byteorder == 'little' else GstVideo.VideoFormat.ARGB
+
+    def __init__(self):
+        """Initialisiert OverlayLayer."""
+        # overlay_id → Definition (+ 'visible')
+        self.overlays: Dict[str, Dict[str, Any]] = {}
+
+        # overlay_id → gerendertes Rechteck (Cache)
+        self._rectangles: Dict[str, GstVideo.VideoOverlayRectangle] = {}
+
+        # Fertige Composition (wird im Streaming-Thread nur gelesen)
+        self._composition: Optional[GstVideo.VideoOverlayComposition] = None
+        self._lock = threading.Lock()
+
+        self._element: Optional[Gst.Element] = None
+        self._handler_id: Optional[int] = None
+
+    # ==================== OVERLAYS ====================
+
+    def set_overlay(self, overlay_id: str, definition: Dict[str, Any], visible: bool = True) -> bool:
+        """
+        Legt ein Overlay an oder ändert seinen Inhalt (rendert neu).
+
+        Args:
+            overlay_id: Eindeutige ID (z.B. 'logo', 'title')
+            definition: Overlay-Definition (siehe Klassen-Docstring)
+            visible: Sofort anzeigen
+
+        Returns:
+            True wenn das Overlay gerendert werden konnte
+        """
+        rectangle = self._render(definition)
+        if rectangle is None:
+            return False
+
+        self.overlays[overlay_id] = dict(definition, visible=visible)
+        self._rectangles[overlay_id] = rectangle
+        self._rebuild_composition()
+        return True
+
+    def set_visible(self, overlay_id: str, visible: bool) -> None:
+        """
+        Blendet ein Overlay ein/aus (live, ohne neu zu rendern).
+
+        Args:
+            overlay_id: ID des Overlays
+            visible: Sichtbar
+        """
+        overlay = self.overlays.get(overlay_id)
+        if overlay is None or overlay['visible'] == visible:
+            return
+
+        overlay['visible'] = visible
+        self._rebuild_composition()
+
+    def remove_overlay(self, overlay_id: str) -> None:
+        """Entfernt ein Overlay."""
+        self.overlays.pop(overlay_id, None)
+        self._rectangles.pop(overlay_id, None)
+        self._rebuild_composition()
+
+    # ==================== PIPELINE ====================
+
+    def build_stage(self) -> str:
+        """
+        Pipeline-Fragment für die Overlay-Stufe (zwischen Video-Stage und Encoder).
+
+        Returns:
+            "overlaycomposition name=ovl ! " oder "" wenn das Element fehlt
+        """
+        if Gst.ElementFactory.find('overlaycomposition') is None:
+            return ""
+        return f"overlaycomposition name={self.ELEMENT_NAME} ! "
+
+    def attach(self, pipeline: Gst.Pipeline) -> None:
+        """
+        Verbindet den draw-Callback mit der Pipeline.
+
+        Args:
+            pipeline: Pipeline mit 'ovl' (optional)
+        """
+        self.detach()
+
+        element = pipeline.get_by_name(self.ELEMENT_NAME)
+        if element is None:
+            return
+
+        self._element = element
+        self._handler_id = element.connect('draw', self._on_draw)
+
+    def detach(self) -> None:
+        """Trennt den draw-Callback."""
+        if self._element is not None and self._handler_id is not None:
+            self._element.disconnect(self._handler_id)
+        self._element = None
+        self._handler_id = None
+
+    def _on_draw(self, element: Gst.Element, sample: Gst.Sample) -> Optional[GstVideo.VideoOverlayComposition]:
+        """draw-Signal (Streaming-Thread): liefert die gecachte Composition."""
+        with self._lock:
+            return self._composition
+
+    # ==================== RENDERING ====================
+
+    def _rebuild_composition(self) -> None:
+        """Fasst die Rechtecke aller sichtbaren Overlays zusammen (kein Rendering)."""
+        composition = None
+        for overlay_id, overlay in self.overlays.items():
+            if not overlay['visible']:
+                continue
+            rectangle = self._rectangles[overlay_id]
+            if composition is None:
+                composition = GstVideo.VideoOverlayComposition.new(rectangle)
+            else:
+                composition.add_rectangle(rectangle)
+
+        with self._lock:
+            self._composition = composition
+
+    def _render(self, definition: Dict[str, Any]) -> Optional[GstVideo.VideoOverlayRectangle]:
+        """
+        Rendert ein Overlay einmalig in ein BGRA-Rechteck.
+
+        Args:
+            definition: Overlay-Definition
+
+        Returns:
+            VideoOverlayRectangle oder None bei Fehler
+        """
+        kind = definition.get('kind')
+        if kind == 'image':
+            image = self._render_image(definition)
+        elif kind == 'text':
+            image = self._render_text(definition)
+        else:
+            print(f"⚠️ Unbekannter Overlay-Typ: {kind}")
+            return None
+
+        if image is None or image.isNull():
+            return None
+
+        width, height = image.width(), image.height()
+        data = image.constBits().asstring(image.sizeInBytes())
+        buffer = Gst.Buffer.new_wrapped(data)
+        GstVideo.buffer_add_video_meta(
+            buffer, GstVideo.VideoFrameFlags.NONE, self.VIDEO_FORMAT, width, height
+        )
+
+        return GstVideo.VideoOverlayRectangle.new_raw(
+            buffer,
+            int(definition.get('x', 0)),
+            int(definition.get('y', 0)),
+            width,
+            height,
+            GstVideo.VideoOverlayFormatFlags.PREMULTIPLIED_ALPHA
+        )
+
+    def _render_image(self, definition: Dict[str, Any]) -> Optional[QImage]:
+        """Lädt ein Bild (PNG mit Alpha) und skaliert es einmalig."""
+        image = QImage(definition.get('path', ''))
+        if image.isNull():
+            print(f"⚠️ Overlay-Bild nicht lesbar: {definition.get('path')}")
+            return None
+
+        width = definition.get('width')
+        if width:
+            image = image.scaledToWidth(int(width), Qt.TransformationMode.SmoothTransformation)
+
+        return image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+
+    def _render_text(self, definition: Dict[str, Any]) -> Optional[QImage]:
+        """Rendert Text auf halbtransparentem Balken (Bauchbinde)."""
+        text = definition.get('text', '')
+        if not text:
+            return None
+
+        font = QFont()
+        font.setPointSize(int(definition.get('font_size', 28)))
+        font.setBold(True)
+
+        # Größe aus Font-Metrik (einmal Probe-Painter)
+        probe = QImage(1, 1, QImage.Format.Format_ARGB32_Premultiplied)
+        painter = QPainter(probe)
+        painter.setFont(font)
+        text_rect = painter.boundingRect(QRect(0, 0, 4096, 1024), 0, text)
+        painter.end()
+
+        padding = int(definition.get('padding', 12))
+        width = int(definition.get('width') or text_rect.width() + 2 * padding)
+        height = text_rect.height() + 2 * padding
+
+        image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(QColor(definition.get('background', '#b0000000')))
+
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing)
+        painter.setFont(font)
+        painter.setPen(QColor(definition.get('color', '#ffffff')))
+        painter.drawText(
+            QRect(padding, padding, width - 2 * padding, text_rect.height()),
+            Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter,
+            text
+        )
+        painter.end()
+        return image
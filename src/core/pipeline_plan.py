@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Pipeline Plans
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class PipelinePlan:
+    """
+    Vorab geplante und geprüfte Stream-Pipeline eines Profils.
+
+    Enthält das Ergebnis der Planungsarbeit vor dem Go-Live: fertige
+    Pipeline-Beschreibungen (nur Stream / Stream + Preview), die
+    ausgehandelte Audio-Rate, den nativen Kamera-Modus und die
+    Encoder-Parameter. Der Stream-Key steht nur als Platzhalter in der
+    Beschreibung und wird erst beim Start eingesetzt.
+
+    Gültig ist ein Plan nur für genau die Eingaben, aus denen er
+    gebaut wurde (key) - ändert sich etwas (Quelle, Einstellung,
+    Kamera), plant start_stream() wie bisher neu.
+    """
+
+    # Platzhalter für den Stream-Key (Secret nie im Cache)
+    STREAM_KEY_PLACEHOLDER = "@@STREAM_KEY@@"
+
+    def __init__(
+        self,
+        name: str,
+        key: str,
+        descriptions: Dict[str, str],
+        audio_rate: int,
+        video_mode: Optional[Dict[str, Any]] = None,
+        encoder: str = "",
+        error: Optional[str] = None,
+        compile_ms: float = 0.0
+    ):
+        """
+        Initialisiert PipelinePlan.
+
+        Args:
+            name: Profil-Name
+            key: Fingerabdruck der Eingaben (PipelinePlanCache.make_key)
+            descriptions: 'stream' / 'combined' → Pipeline-Beschreibung
+            audio_rate: Ausgehandelte Mix-Rate (Hz)
+            video_mode: Nativer Kamera-Modus (None bei Screen/Testbild)
+            encoder: Encoder-Fragment (zur Anzeige)
+            error: Fehler bei Planung/Prüfung (Plan unbrauchbar)
+            compile_ms: Dauer der Planung
+        """
+        self.name = name
+        self.key = key
+        self.descriptions = descriptions
+        self.audio_rate = audio_rate
+        self.video_mode = video_mode
+        self.encoder = encoder
+        self.error = error
+        self.compile_ms = compile_ms
+        self.created_at = time.monotonic()
+
+    @property
+    def is_valid(self) -> bool:
+        """True wenn der Plan fehlerfrei geprüft wurde."""
+        return self.error is None and bool(self.descriptions)
+
+    def get_description(self, combined: bool, stream_key: str) -> str:
+        """
+        Pipeline-Beschreibung mit eingesetztem Stream-Key.
+
+        Args:
+            combined: Variante mit Preview-Zweig
+            stream_key: Stream-Key (oder "" bei SRT ohne Stream-ID)
+
+        Returns:
+            Pipeline-String für Gst.parse_launch()
+        """
+        description = self.descriptions['combined' if combined else 'stream']
+        return description.replace(self.STREAM_KEY_PLACEHOLDER, stream_key)
+
+    def summary(self) -> str:
+        """Kurzbeschreibung für Log/Statuszeile."""
+        if not self.is_valid:
+            return f"❌ {self.error}"
+        mode = ""
+        if self.video_mode:
+            mode = f", {self.video_mode['width']}x{self.video_mode['height']}@{self.video_mode['framerate']}"
+        return f"⚡ Plan bereit ({self.audio_rate} Hz{mode}, {self.compile_ms:.0f} ms)"
+
+
+class PipelinePlanCache:
+    """
+    Pläne pro Profil, gefunden über den Fingerabdruck der Eingaben.
+
+    Geräte können sich ändern (andere Kamera am selben Pfad, andere
+    Soundserver-Rate), deshalb verfallen Pläne nach MAX_AGE_S.
+    """
+
+    MAX_AGE_S = 3600.0
+
+    def __init__(self):
+        """Initialisiert den (leeren) Cache."""
+        self._plans: Dict[str, PipelinePlan] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(inputs: Dict[str, Any]) -> str:
+        """
+        Fingerabdruck der Planungs-Eingaben.
+
+        Args:
+            inputs: JSON-serialisierbare Eingaben (Reihenfolge egal)
+
+        Returns:
+            Hex-Digest
+        """
+        data = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha1(data.encode('utf-8')).hexdigest()
+
+    def put(self, plan: PipelinePlan) -> None:
+        """Legt den Plan eines Profils ab (ersetzt den alten)."""
+        with self._lock:
+            self._plans[plan.name] = plan
+
+    def get(self, name: str) -> Optional[PipelinePlan]:
+        """Plan eines Profils (auch ungültige, für die Anzeige)."""
+        with self._lock:
+            return self._plans.get(name)
+
+    def find(self, key: str) -> Optional[PipelinePlan]:
+        """
+        Sucht einen gültigen, nicht verfallenen Plan für die Eingaben.
+
+        Args:
+            key: Fingerabdruck (make_key)
+
+        Returns:
+            Plan oder None
+        """
+        now = time.monotonic()
+        with self._lock:
+            for plan in self._plans.values():
+                if plan.key == key and plan.is_valid and now - plan.created_at < self.MAX_AGE_S:
+                    return plan
+        return None
+
+    def is_current(self, name: str, key: Optional[str]) -> bool:
+        """
+        Prüft, ob der Plan eines Profils noch gilt (neu planen unnötig).
+
+        Args:
+            name: Profil-Name
+            key: Fingerabdruck der aktuellen Eingaben (make_key)
+
+        Returns:
+            True wenn der Plan zum Key passt und nicht verfallen ist
+        """
+        with self._lock:
+            plan = self._plans.get(name)
+        return (
+            plan is not None and key is not None and plan.key == key
+            and time.monotonic() - plan.created_at < self.MAX_AGE_S
+        )
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """
+        Verwirft Pläne (z.B. nach Geräte-Änderung).
+
+        Args:
+            name: Einzelnes Profil oder None für alle
+        """
+        with self._lock:
+            if name is None:
+                self._plans.clear()
+            else:
+                self._plans.pop(name, None)
+
+    def names(self) -> List[str]:
+        """Profile mit Plan."""
+        with self._lock:
+            return list(self._plans)
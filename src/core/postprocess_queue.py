@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Post-Processing Queue
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+
+class PostProcessQueue:
+    """
+    Warteschlange für Nachbearbeitung fertiger Aufnahmen.
+
+    Jobs (Remux nach Faststart-MP4, Transcode in niedrigere Bitrate,
+    Vorschaubild) laufen als eigene gst-launch-1.0-Prozesse mit
+    niedrigster CPU- und I/O-Priorität (nice 19, ionice idle) - ein
+    laufender Stream bekommt die CPU immer zuerst. Höchstens max_workers
+    Prozesse laufen gleichzeitig.
+
+    Die Jobliste wird bei jeder Statusänderung gespeichert. Nach einem
+    Neustart werden abgebrochene Jobs von vorne wiederholt; Ausgaben
+    entstehen als '.part' und werden erst nach Erfolg umbenannt.
+
+    Job-Format:
+        {'id', 'kind', 'input', 'output', 'params', 'state',
+         'progress', 'error', 'created'}
+    """
+
+    JOBS_VERSION = 1
+    KINDS = ('remux', 'transcode', 'thumbnail')
+
+    # Dateiendung → (Demuxer, Video-Pad, Audio-Pad)
+    DEMUXERS = {
+        '.mkv': ('matroskademux', 'video_0', 'audio_0'),
+        '.mp4': ('qtdemux', 'video_0', 'audio_0'),
+        '.flv': ('flvdemux', 'video', 'audio'),
+    }
+
+    # progressreport: "progressreport0 (00:00:05): 5 / 60 seconds ( 8.3 %)"
+    PROGRESS_RE = re.compile(r'\(\s*([\d.]+)\s*%\)')
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        jobs_file: str = "postprocess_jobs.json",
+        on_update: Optional[Callable[[Dict[str, Any]], None]] = None
+    ):
+        """
+        Initialisiert PostProcessQueue.
+
+        Args:
+            max_workers: Gleichzeitig laufende Prozesse
+            jobs_file: Dateiname der Jobliste (relativ zum Config-Dir)
+            on_update: Callback(job) bei Status-/Fortschrittsänderung (Worker-Thread)
+        """
+        self.max_workers = max(1, max_workers)
+        self.on_update = on_update
+
+        self.jobs_dir = Path.home() / ".config" / "tuxrtmpilot"
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        self.jobs_file = self.jobs_dir / jobs_file
+
+        # job_id → Job (Einfügereihenfolge = Abarbeitungsreihenfolge)
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self._processes: Dict[str, subprocess.Popen] = {}
+        self._lock = threading.Lock()
+        self._shutting_down = False
+
+        self.load_jobs()
+
+    # ==================== PERSISTENZ ====================
+
+    def load_jobs(self) -> None:
+        """Lädt die Jobliste; abgebrochene Jobs kommen zurück in die Warteschlange."""
+        if not self.jobs_file.exists():
+            return
+
+        try:
+            with open(self.jobs_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"⚠️ Nachbearbeitungs-Jobs nicht lesbar: {e}")
+            return
+
+        if data.get('version') != self.JOBS_VERSION:
+            print("ℹ️ Nachbearbeitungs-Jobs veraltet, werden verworfen")
+            return
+
+        for job in data.get('jobs', []):
+            if job.get('state') == 'running':
+                job['state'] = 'queued'
+                job['progress'] = 0.0
+                self._remove_partial(job)
+            self.jobs[job['id']] = job
+
+        resumed = sum(1 for job in self.jobs.values() if job['state'] == 'queued')
+        if resumed:
+            print(f"🔹 {resumed} Nachbearbeitungs-Job(s) werden fortgesetzt")
+
+    def save_jobs(self) -> bool:
+        """
+        Speichert die Jobliste (atomar über temporäre Datei).
+
+        Returns:
+            True bei Erfolg, False bei Fehler
+        """
+        tmp_file = self.jobs_file.with_suffix('.tmp')
+        try:
+            with self._lock:
+                data = {'version': self.JOBS_VERSION, 'jobs': list(self.jobs.values())}
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
+                os.replace(tmp_file, self.jobs_file)
+            return True
+        except OSError as e:
+            print(f"❌ Nachbearbeitungs-Jobs speichern fehlgeschlagen: {e}")
+            return False
+
+    # ==================== JOBS ====================
+
+    def add_job(
+        self,
+        kind: str,
+        input_path: str,
+        output_path: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Reiht einen Job ein und startet ihn, sobald ein Worker frei ist.
+
+        Args:
+            kind: 'remux', 'transcode' oder 'thumbnail'
+            input_path: Eingabedatei (MKV/MP4/FLV mit H.264 + AAC)
+            output_path: Ausgabedatei (Default aus Eingabename abgeleitet)
+            params: Job-Parameter (transcode: 'bitrate' in kbps, thumbnail: 'width')
+
+        Returns:
+            Job-ID oder None bei ungültigem Job
+        """
+        extension = os.path.splitext(input_path)[1].lower()
+        if kind not in self.KINDS or extension not in self.DEMUXERS:
+            print(f"⚠️ Nachbearbeitung nicht möglich: {kind} für {input_path}")
+            return None
+
+        params = dict(params or {})
+        job = {
+            'id': uuid.uuid4().hex[:12],
+            'kind': kind,
+            'input': input_path,
+            'output': output_path or self._default_output(kind, input_path, params),
+            'params': params,
+            'state': 'queued',
+            'progress': 0.0,
+            'error': None,
+            'created': int(time.time()),
+        }
+
+        with self._lock:
+            self.jobs[job['id']] = job
+        self.save_jobs()
+        self._notify(job)
+        self._schedule()
+        return job['id']
+
+    def enqueue_recording(
+        self,
+        segments: List[str],
+        remux: bool = True,
+        transcode_kbps: int = 0,
+        thumbnail: bool = True
+    ) -> List[str]:
+        """
+        Reiht die Standard-Nachbearbeitung für eine fertige Aufnahme ein.
+
+        Args:
+            segments: Segment-Dateien der Aufnahme
+            remux: Nicht-MP4-Segmente nach Faststart-MP4 umverpacken
+            transcode_kbps: Zusätzliche Kopie mit dieser Video-Bitrate (0 = aus)
+            thumbnail: Vorschaubild vom ersten Segment
+
+        Returns:
+            IDs der angelegten Jobs
+        """
+        job_ids = []
+        for location in segments:
+            if remux and not location.lower().endswith('.mp4'):
+                job_ids.append(self.add_job('remux', location))
+            if transcode_kbps > 0:
+                job_ids.append(self.add_job('transcode', location, params={'bitrate': transcode_kbps}))
+
+        if thumbnail and segments:
+            job_ids.append(self.add_job('thumbnail', segments[0]))
+
+        return [job_id for job_id in job_ids if job_id]
+
+    def get_jobs(self) -> List[Dict[str, Any]]:
+        """Kopie aller Jobs (älteste zuerst)."""
+        with self._lock:
+            return [dict(job) for job in self.jobs.values()]
+
+    def get_active_count(self) -> int:
+        """Anzahl wartender + laufender Jobs."""
+        with self._lock:
+            return sum(1 for job in self.jobs.values() if job['state'] in ('queued', 'running'))
+
+    def clear_finished(self) -> None:
+        """Entfernt erledigte und fehlgeschlagene Jobs aus der Liste."""
+        with self._lock:
+            self.jobs = {
+                job_id: job for job_id, job in self.jobs.items()
+                if job['state'] in ('queued', 'running')
+            }
+        self.save_jobs()
+
+    def start(self) -> None:
+        """Startet wartende Jobs (z.B. nach einem Neustart)."""
+        self._shutting_down = False
+        self._schedule()
+
+    def shutdown(self) -> None:
+        """
+        Beendet laufende Prozesse beim Programmende.
+
+        Die Jobs bleiben als 'running' gespeichert und werden beim
+        nächsten Start von vorne wiederholt.
+        """
+        self._shutting_down = True
+        with self._lock:
+            processes = list(self._processes.values())
+
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    # ==================== WORKER ====================
+
+    def _schedule(self) -> None:
+        """Startet wartende Jobs, solange Worker frei sind."""
+        if self._shutting_down:
+            return
+
+        with self._lock:
+            running = sum(1 for job in self.jobs.values() if job['state'] == 'running')
+            for job in self.jobs.values():
+                if running >= self.max_workers:
+                    break
+                if job['state'] != 'queued':
+                    continue
+                job['state'] = 'running'
+                running += 1
+                threading.Thread(
+                    target=self._run,
+                    args=(job,),
+                    name=f"postprocess-{job['id']}",
+                    daemon=True
+                ).start()
+
+    def _run(self, job: Dict[str, Any]) -> None:
+        """Worker: führt einen Job als Prozess aus und liest den Fortschritt mit."""
+        self.save_jobs()
+        self._notify(job)
+        print(f"🔹 Nachbearbeitung: {job['kind']} {os.path.basename(job['input'])}")
+
+        partial = job['output'] + '.part'
+        error = None
+        try:
+            if not os.path.exists(job['input']):
+                raise FileNotFoundError(f"Eingabe fehlt: {job['input']}")
+
+            process = subprocess.Popen(
+                self._build_command(job, partial),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL,
+                text=True
+            )
+            with self._lock:
+                self._processes[job['id']] = process
+
+            tail: List[str] = []
+            for line in process.stdout:
+                tail = (tail + [line.strip()])[-5:]
+                match = self.PROGRESS_RE.search(line)
+                if match:
+                    job['progress'] = min(100.0, float(match.group(1)))
+                    self._notify(job)
+
+            returncode = process.wait()
+            with self._lock:
+                self._processes.pop(job['id'], None)
+
+            if self._shutting_down:
+                # Abbruch durch Programmende - Job bleibt 'running' und wird fortgesetzt
+                return
+            if returncode != 0:
+                errors = [line for line in tail if line.startswith('ERROR')]
+                error = (errors or tail or [f"Exit-Code {returncode}"])[-1]
+            elif not os.path.exists(partial):
+                error = "Keine Ausgabe erzeugt"
+            else:
+                os.replace(partial, job['output'])
+
+        except OSError as e:
+            error = str(e)
+
+        if error:
+            self._remove_partial(job)
+
+        job['state'] = 'failed' if error else 'done'
+        job['progress'] = job['progress'] if error else 100.0
+        job['error'] = error
+        self.save_jobs()
+        self._notify(job)
+
+        if error:
+            print(f"❌ Nachbearbeitung fehlgeschlagen ({job['kind']}): {error}")
+        else:
+            print(f"✅ Nachbearbeitung fertig: {job['output']}")
+
+        self._schedule()
+
+    def _build_command(self, job: Dict[str, Any], output: str) -> List[str]:
+        """
+        Baut die Kommandozeile für einen Job.
+
+        Jedes Pipeline-Token ist ein eigenes Argument - gst-launch
+        escaped sie selbst, Pfade mit Leerzeichen brauchen kein Quoting.
+
+        Args:
+            job: Job-Dict
+            output: Ziel (temporäre .part-Datei)
+
+        Returns:
+            argv für subprocess
+        """
+        demuxer, video_pad, audio_pad = self.DEMUXERS[os.path.splitext(job['input'])[1].lower()]
+        params = job['params']
+
+        source = [
+            'filesrc', f"location={job['input']}", '!',
+            'progressreport', 'update-freq=1', '!',
+            demuxer, 'name=d',
+        ]
+
+        if job['kind'] == 'thumbnail':
+            pipeline = source + [
+                f'd.{video_pad}', '!', 'queue', '!', 'decodebin', '!',
+                'videoconvert', '!', 'videoscale', '!',
+                f"video/x-raw,width={int(params.get('width', 320))},pixel-aspect-ratio=1/1", '!',
+                'pngenc', 'snapshot=true', '!',
+                'filesink', f'location={output}',
+            ]
+        else:
+            if job['kind'] == 'transcode':
+                video = [
+                    f'd.{video_pad}', '!', 'queue', '!', 'decodebin', '!',
+                    'videoconvert', '!',
+                    'x264enc', f"bitrate={int(params.get('bitrate', 1500))}", 'speed-preset=veryfast', '!',
+                    'video/x-h264,profile=high', '!', 'h264parse', '!', 'mux.',
+                ]
+            else:
+                video = [f'd.{video_pad}', '!', 'queue', '!', 'h264parse', '!', 'mux.']
+
+            audio = []
+            if params.get('audio', True):
+                audio = [f'd.{audio_pad}', '!', 'queue', '!', 'aacparse', '!', 'mux.']
+
+            pipeline = source + video + audio + [
+                'mp4mux', 'name=mux', 'faststart=true', '!',
+                'filesink', f'location={output}',
+            ]
+
+        command = ['gst-launch-1.0', '-e'] + pipeline
+
+        # progressreport schreibt über stdio - zeilenweise statt blockweise puffern
+        if shutil.which('stdbuf'):
+            command = ['stdbuf', '-oL'] + command
+
+        # Idle-I/O-Klasse: Platte gehört zuerst der laufenden Aufnahme
+        if shutil.which('ionice'):
+            command = ['ionice', '-c', '3'] + command
+
+        # Niedrigste CPU-Priorität (statt preexec_fn - unsicher mit Threads)
+        if shutil.which('nice'):
+            command = ['nice', '-n', '19'] + command
+
+        return command
+
+    @staticmethod
+    def _default_output(kind: str, input_path: str, params: Dict[str, Any]) -> str:
+        """Leitet den Ausgabenamen aus der Eingabe ab (neben der Aufnahme)."""
+        base = os.path.splitext(input_path)[0]
+        if kind == 'remux':
+            return f"{base}.mp4"
+        if kind == 'transcode':
+            return f"{base}_{int(params.get('bitrate', 1500))}k.mp4"
+        return f"{base}.png"
+
+    @staticmethod
+    def _remove_partial(job: Dict[str, Any]) -> None:
+        """Löscht eine halbfertige Ausgabe."""
+        try:
+            os.remove(job['output'] + '.part')
+        except OSError:
+            pass
+
+    def _notify(self, job: Dict[str, Any]) -> None:
+        """Meldet einen Job an den Callback (Kopie, Thread-sicher weiterreichbar)."""
+        if self.on_update:
+            self.on_update(dict(job))
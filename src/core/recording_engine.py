@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Recording Engine
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import Gst
+
+import os
+import queue
+import shutil
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class RecordingEngine:
+    """
+    Segmentierte, absturzsichere Aufnahme über splitmuxsink.
+
+    Die Aufnahme wird an Keyframes in Segmente geteilt (max. Dauer
+    und/oder Größe). Jedes abgeschlossene Segment wird in einem eigenen
+    Thread per fsync auf die Platte gebracht - bei Absturz oder
+    Stromausfall geht höchstens das gerade offene Segment verloren.
+
+    Mit fragmentiertem MP4 ist auch das offene Segment bis zum letzten
+    Fragment lesbar (kein moov-Atom am Ende nötig).
+
+    Läuft bereits eine Pipeline (Stream/Preview), wird die Aufnahme als
+    Zweig an deren Roh-tee gehängt (attach_branch) - die Quelle, z.B.
+    die PipeWire-Portal-Session, wird geteilt statt ein zweites Mal
+    geöffnet.
+    """
+
+    BRANCH_NAME = "recbranch"
+
+    SINK_NAME = "recsink"
+
+    # Container → (Muxer, Dateiendung)
+    CONTAINERS = {
+        'mp4': ('mp4mux', 'mp4'),
+        'mkv': ('matroskamux', 'mkv'),
+        'flv': ('flvmux', 'flv'),
+    }
+
+    # Settings-Tab-Format → Container
+    FORMATS = {
+        'MP4 (H.264)': 'mp4',
+        'MKV (H.264)': 'mkv',
+        'FLV': 'flv',
+    }
+
+    # Unter dieser Reserve wird gewarnt (Bytes)
+    LOW_DISK_BYTES = 2 * 1024 * 1024 * 1024
+
+    def __init__(
+        self,
+        segment_minutes: int = 10,
+        segment_mb: int = 0,
+        fragmented_mp4: bool = False,
+        on_segment: Optional[Callable[[str, str], None]] = None
+    ):
+        """
+        Initialisiert RecordingEngine.
+
+        Args:
+            segment_minutes: Maximale Segment-Dauer (0 = keine Zeitgrenze)
+            segment_mb: Maximale Segment-Größe in MB (0 = keine Größengrenze)
+            fragmented_mp4: MP4 fragmentiert schreiben (sonst faststart)
+            on_segment: Callback (event, location) für 'opened'/'closed'/'synced'
+        """
+        self.segment_minutes = segment_minutes
+        self.segment_mb = segment_mb
+        self.fragmented_mp4 = fragmented_mp4
+        self.on_segment = on_segment
+
+        # Abgeschlossene (und gesyncte) Segmente der laufenden Aufnahme
+        self.segments: List[str] = []
+        self.current_segment: Optional[str] = None
+        self.output_dir: Optional[str] = None
+        self.container = 'mkv'
+
+        # Durchsatz-Messung: Bytes abgeschlossener Segmente + letzte Messung
+        self._closed_bytes = 0
+        self._last_sample: Optional[Tuple[float, int]] = None
+
+        self._sync_queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._sync_thread: Optional[threading.Thread] = None
+
+        # Angehängter Zweig: (pipeline, bin, [(tee, tee_pad, ghost_pad)])
+        self._branch: Optional[Tuple[Gst.Pipeline, Gst.Bin, List[Tuple[Gst.Element, Gst.Pad, Gst.Pad]]]] = None
+        self._stopping = False
+        self._final_closed = threading.Event()
+
+    # ==================== PIPELINE ====================
+
+    @classmethod
+    def container_for_format(cls, recording_format: str) -> str:
+        """
+        Übersetzt das Format aus dem Settings-Tab in einen Container.
+
+        Args:
+            recording_format: z.B. 'MP4 (H.264)'
+
+        Returns:
+            'mp4', 'mkv' oder 'flv' (Default: 'mkv')
+        """
+        return cls.FORMATS.get(recording_format, 'mkv')
+
+    def build_sink(self, output_dir: str, container: str = 'mkv', keyframe_requests: bool = True) -> str:
+        """
+        Baut das splitmuxsink-Fragment (Ende der Recording-Pipeline).
+
+        Video wird automatisch verlinkt, Audio über "recsink.audio_0".
+
+        Args:
+            output_dir: Zielverzeichnis
+            container: 'mp4', 'mkv' oder 'flv'
+            keyframe_requests: splitmuxsink fordert Keyframes an der
+                               Zeitgrenze an (nur ohne Größengrenze möglich)
+
+        Returns:
+            Pipeline-Fragment "splitmuxsink name=recsink ..."
+        """
+        if container not in self.CONTAINERS:
+            container = 'mkv'
+        muxer, extension = self.CONTAINERS[container]
+
+        os.makedirs(output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        location = os.path.join(output_dir, f"recording_{timestamp}_%03d.{extension}")
+
+        self.output_dir = output_dir
+        self.container = container
+        self.segments = []
+        self.current_segment = None
+        self._closed_bytes = 0
+        self._last_sample = None
+
+        sink = (
+            f"splitmuxsink name={self.SINK_NAME} "
+            f"location=\"{location}\" "
+            f"muxer-factory={muxer} "
+            f"max-size-time={int(self.segment_minutes * 60 * Gst.SECOND)} "
+            f"max-size-bytes={int(self.segment_mb * 1024 * 1024)}"
+        )
+
+        if keyframe_requests and self.segment_minutes and not self.segment_mb:
+            sink += " send-keyframe-requests=true"
+
+        if container == 'mp4':
+            if self.fragmented_mp4:
+                # moof-Fragmente alle 2s: offenes Segment bleibt lesbar
+                sink += " muxer-properties=\"properties,fragment-duration=(uint)2000\""
+            else:
+                # moov-Atom an den Anfang (sofort abspielbar/streambar)
+                sink += " muxer-properties=\"properties,faststart=(boolean)true\""
+
+        return sink
+
+    def start(self) -> None:
+        """Startet den fsync-Worker (vor PLAYING aufrufen)."""
+        if self._sync_thread and self._sync_thread.is_alive():
+            return
+        self._sync_thread = threading.Thread(
+            target=self._sync_worker, name="recording-fsync", daemon=True
+        )
+        self._sync_thread.start()
+
+    def finish(self, timeout: float = 10.0) -> None:
+        """
+        Wartet bis alle abgeschlossenen Segmente gesynct sind (nach EOS).
+
+        Args:
+            timeout: Maximale Wartezeit in Sekunden
+        """
+        if self._sync_thread is None:
+            return
+        self._sync_queue.put(None)
+        self._sync_thread.join(timeout)
+        self._sync_thread = None
+
+    # ==================== ZWEIG AN LAUFENDER PIPELINE ====================
+
+    def attach_branch(self, pipeline: Gst.Pipeline, description: str, inputs: Dict[str, str]) -> bool:
+        """
+        Hängt die Aufnahme als Zweig an eine laufende Pipeline.
+
+        Args:
+            pipeline: Laufende Pipeline (Stream oder Preview)
+            description: Zweig-Beschreibung (endet mit build_sink())
+            inputs: tee-Name in der Pipeline → Name des ersten Elements im Zweig
+
+        Returns:
+            True wenn alle tees gefunden und verlinkt wurden
+        """
+        tees = {name: pipeline.get_by_name(name) for name in inputs}
+        if not tees or any(tee is None for tee in tees.values()):
+            return False
+
+        branch = Gst.parse_bin_from_description(description, False)
+        branch.set_name(self.BRANCH_NAME)
+
+        links = []
+        for index, (tee_name, element_name) in enumerate(inputs.items()):
+            target = branch.get_by_name(element_name).get_static_pad('sink')
+            ghost = Gst.GhostPad.new(f"sink_{index}", target)
+            branch.add_pad(ghost)
+            links.append((tees[tee_name], ghost))
+
+        pipeline.add(branch)
+        linked = []
+        for tee, ghost in links:
+            tee_pad = self._request_tee_pad(tee)
+            if tee_pad.link(ghost) != Gst.PadLinkReturn.OK:
+                for other_tee, other_pad, _ in linked:
+                    other_tee.release_request_pad(other_pad)
+                tee.release_request_pad(tee_pad)
+                pipeline.remove(branch)
+                return False
+            linked.append((tee, tee_pad, ghost))
+
+        self._branch = (pipeline, branch, linked)
+        self._final_closed.clear()
+        branch.sync_state_with_parent()
+        return True
+
+    def detach_branch(self, timeout: float = 10.0) -> bool:
+        """
+        Löst den Zweig sauber von der laufenden Pipeline.
+
+        Die tee-Pads werden im Leerlauf (IDLE-Probe) getrennt, danach
+        bekommt nur der Zweig ein EOS - der Muxer schließt das letzte
+        Segment, die übrige Pipeline läuft ungestört weiter.
+
+        Args:
+            timeout: Maximale Wartezeit auf das letzte Segment
+
+        Returns:
+            True wenn das letzte Segment rechtzeitig geschlossen wurde
+        """
+        if self._branch is None:
+            return True
+
+        pipeline, branch, links = self._branch
+        self._stopping = True
+
+        def on_idle(pad: Gst.Pad, info: Gst.PadProbeInfo, ghost: Gst.Pad) -> Gst.PadProbeReturn:
+            pad.unlink(ghost)
+            ghost.send_event(Gst.Event.new_eos())
+            return Gst.PadProbeReturn.REMOVE
+
+        for _tee, tee_pad, ghost in links:
+            tee_pad.add_probe(Gst.PadProbeType.IDLE, on_idle, ghost)
+
+        closed = self._final_closed.wait(timeout)
+
+        branch.set_state(Gst.State.NULL)
+        pipeline.remove(branch)
+        for tee, tee_pad, _ghost in links:
+            tee.release_request_pad(tee_pad)
+
+        self._branch = None
+        self._stopping = False
+        return closed
+
+    def is_attached(self) -> bool:
+        """True wenn die Aufnahme als Zweig an einer fremden Pipeline hängt."""
+        return self._branch is not None
+
+    def owns(self, obj: Gst.Object) -> bool:
+        """Prüft ob ein Element (z.B. Message-Quelle) zum Aufnahme-Zweig gehört."""
+        if self._branch is None or obj is None:
+            return False
+        branch = self._branch[1]
+        return obj == branch or obj.has_as_ancestor(branch)
+
+    @staticmethod
+    def _request_tee_pad(tee: Gst.Element) -> Gst.Pad:
+        """Fordert ein neues Src-Pad am tee an (request_pad_simple ab GStreamer 1.20)."""
+        if hasattr(tee, 'request_pad_simple'):
+            return tee.request_pad_simple('src_%u')
+        return tee.get_request_pad('src_%u')
+
+    # ==================== MESSAGES ====================
+
+    def handle_message(self, message: Gst.Message) -> bool:
+        """
+        Verarbeitet Segment-Messages von splitmuxsink (beliebiger Thread).
+
+        Args:
+            message: Bus-Message
+
+        Returns:
+            True wenn es eine splitmuxsink-Message war
+        """
+        if message.type != Gst.MessageType.ELEMENT:
+            return False
+
+        structure = message.get_structure()
+        if structure is None:
+            return False
+
+        name = structure.get_name()
+        if name == 'splitmuxsink-fragment-opened':
+            self.current_segment = structure.get_string('location')
+            self._notify('opened', self.current_segment)
+            return True
+
+        if name == 'splitmuxsink-fragment-closed':
+            location = structure.get_string('location')
+            try:
+                self._closed_bytes += os.path.getsize(location)
+            except (OSError, TypeError):
+                pass
+            self._notify('closed', location)
+            self._sync_queue.put(location)
+            if self._stopping:
+                self._final_closed.set()
+            return True
+
+        return False
+
+    def _notify(self, event: str, location: Optional[str]) -> None:
+        """Meldet ein Segment-Ereignis an den Callback."""
+        if self.on_segment and location:
+            self.on_segment(event, location)
+
+    # ==================== STATISTIK ====================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Tatsächlicher Schreib-Durchsatz und Platten-Reserve.
+
+        Gemessen wird an den Dateigrößen (nicht an der Encoder-Bitrate),
+        der Durchsatz bezieht sich auf den Zeitraum seit dem letzten Aufruf.
+
+        Returns:
+            Dict mit 'recording_bytes', 'recording_mb_s', 'disk_free_bytes',
+            'disk_remaining_min' (None solange kein Durchsatz bekannt ist)
+        """
+        written = self._closed_bytes
+        if self.current_segment:
+            try:
+                written += os.path.getsize(self.current_segment)
+            except OSError:
+                pass
+
+        now = time.monotonic()
+        rate = None
+        if self._last_sample is not None:
+            last_time, last_written = self._last_sample
+            if now > last_time and written >= last_written:
+                rate = (written - last_written) / (now - last_time)
+        self._last_sample = (now, written)
+
+        free = None
+        if self.output_dir:
+            try:
+                free = shutil.disk_usage(self.output_dir).free
+            except OSError:
+                pass
+
+        remaining = None
+        if free is not None and rate:
+            remaining = free / rate / 60
+
+        return {
+            'recording_bytes': written,
+            'recording_mb_s': round(rate / (1024 * 1024), 2) if rate is not None else None,
+            'disk_free_bytes': free,
+            'disk_remaining_min': round(remaining) if remaining is not None else None,
+            'disk_low': free is not None and free < self.LOW_DISK_BYTES,
+        }
+
+    # ==================== FSYNC ====================
+
+    def _sync_worker(self) -> None:
+        """Worker: fsync für jedes abgeschlossene Segment (blockiert nie die Pipeline)."""
+        while True:
+            location = self._sync_queue.get()
+            if location is None:
+                break
+            try:
+                self._fsync(location)
+                self.segments.append(location)
+                self._notify('synced', location)
+            except OSError as e:
+                print(f"⚠️ fsync fehlgeschlagen für {location}: {e}")
+
+    @staticmethod
+    def _fsync(path: str) -> None:
+        """Schreibt Datei und Verzeichniseintrag auf die Platte."""
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+        # Verzeichnis syncen, damit auch der neue Dateieintrag sicher ist
+        dir_fd = os.open(os.path.dirname(path) or '.', os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Replay Buffer
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import Gst
+
+import collections
+import os
+import threading
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+
+class ReplayBuffer:
+    """
+    Hält die letzten N Sekunden des bereits codierten Streams im Speicher.
+
+    Die Encoder-Ausgänge (H.264/HEVC + AAC) werden per tee an appsinks
+    abgezweigt (leaky queue - der Live-Stream wartet nie auf den Ring).
+    Der Ring wird nur GOP-weise von vorne gekürzt, beginnt also immer
+    mit einem Keyframe. Speichern schreibt eine Kopie der Buffer-Liste
+    ohne Re-Encoding in eine eigene kleine Mux-Pipeline (eigener Thread).
+
+    Begrenzung: Dauer (seconds) und Speicher (max_bytes), was zuerst greift.
+    """
+
+    VIDEO_SINK_NAME = "replay_v"
+    AUDIO_SINK_NAME = "replay_a"
+
+    # Container → (Muxer, Dateiendung)
+    CONTAINERS = {
+        'mkv': ('matroskamux', 'mkv'),
+        'mp4': ('mp4mux', 'mp4'),
+    }
+
+    def __init__(self, seconds: float = 30.0, max_bytes: int = 256 * 1024 * 1024):
+        """
+        Initialisiert ReplayBuffer.
+
+        Args:
+            seconds: Länge des Rings
+            max_bytes: Speicher-Obergrenze (Video + Audio)
+        """
+        self.seconds = seconds
+        self.max_bytes = max_bytes
+        self.enabled = True
+
+        # Ring pro Stream: (buffer, is_keyframe)
+        self._rings: Dict[str, Deque[Tuple[Gst.Buffer, bool]]] = {
+            'video': collections.deque(),
+            'audio': collections.deque(),
+        }
+        self._bytes = {'video': 0, 'audio': 0}
+        self._caps: Dict[str, Optional[Gst.Caps]] = {'video': None, 'audio': None}
+        self._lock = threading.Lock()
+
+        self._sinks: List[Tuple[Gst.Element, int]] = []
+
+    # ==================== PIPELINE ====================
+
+    def build_video_tap(self) -> str:
+        """
+        Abzweig für den codierten Video-Stream (hinter dem Encoder).
+
+        Returns:
+            Fragment "tee name=... ! ... " das vor "queue ! mux." eingesetzt wird,
+            oder "" wenn der Replay-Buffer deaktiviert ist
+        """
+        return self._build_tap('vrep', self.VIDEO_SINK_NAME)
+
+    def build_audio_tap(self) -> str:
+        """Abzweig für den codierten Audio-Stream (siehe build_video_tap())."""
+        return self._build_tap('arep', self.AUDIO_SINK_NAME)
+
+    def _build_tap(self, tee: str, sink: str) -> str:
+        """Baut tee + leaky queue + appsink; der Live-Zweig folgt hinter 'tee.'."""
+        if not self.enabled:
+            return ""
+        return (
+            f"tee name={tee} "
+            f"{tee}. ! queue max-size-buffers=0 max-size-bytes=0 max-size-time=2000000000 leaky=downstream ! "
+            f"appsink name={sink} emit-signals=true sync=false async=false "
+            f"{tee}. ! "
+        )
+
+    def attach(self, pipeline: Gst.Pipeline) -> None:
+        """
+        Verbindet die appsinks der Pipeline mit dem Ring.
+
+        Args:
+            pipeline: Pipeline mit 'replay_v' / 'replay_a' (optional)
+        """
+        self.detach()
+        self.clear()
+
+        for kind, name in (('video', self.VIDEO_SINK_NAME), ('audio', self.AUDIO_SINK_NAME)):
+            sink = pipeline.get_by_name(name)
+            if sink is None:
+                continue
+            handler_id = sink.connect('new-sample', self._on_new_sample, kind)
+            self._sinks.append((sink, handler_id))
+
+    def detach(self) -> None:
+        """Trennt die appsinks (Ring bleibt erhalten, speichern weiter möglich)."""
+        for sink, handler_id in self._sinks:
+            sink.disconnect(handler_id)
+        self._sinks = []
+
+    def clear(self) -> None:
+        """Leert den Ring."""
+        with self._lock:
+            for kind in self._rings:
+                self._rings[kind].clear()
+                self._bytes[kind] = 0
+                self._caps[kind] = None
+
+    def get_duration(self) -> float:
+        """Aktuell gepufferte Dauer in Sekunden (Video)."""
+        with self._lock:
+            return self._span_ns(self._rings['video']) / Gst.SECOND
+
+    def get_memory_bytes(self) -> int:
+        """Belegter Speicher (Video + Audio)."""
+        with self._lock:
+            return self._bytes['video'] + self._bytes['audio']
+
+    # ==================== RING ====================
+
+    def _on_new_sample(self, sink: Gst.Element, kind: str) -> Gst.FlowReturn:
+        """appsink new-sample (Streaming-Thread): Buffer in den Ring."""
+        sample = sink.emit('pull-sample')
+        if sample is None:
+            return Gst.FlowReturn.OK
+
+        buffer = sample.get_buffer()
+        keyframe = kind == 'audio' or not buffer.has_flags(Gst.BufferFlags.DELTA_UNIT)
+
+        with self._lock:
+            ring = self._rings[kind]
+            if not ring and not keyframe:
+                # Ring muss mit einem Keyframe beginnen
+                return Gst.FlowReturn.OK
+            self._caps[kind] = sample.get_caps()
+            ring.append((buffer, keyframe))
+            self._bytes[kind] += buffer.get_size()
+            self._trim(kind)
+
+        return Gst.FlowReturn.OK
+
+    def _trim(self, kind: str) -> None:
+        """
+        Kürzt den Ring von vorne - immer bis zum nächsten Keyframe.
+
+        Das Speicherlimit greift nur am Video-Ring (Audio ist klein und
+        wird beim Speichern ohnehin auf den Video-Anfang zugeschnitten).
+        """
+        ring = self._rings[kind]
+        limit_ns = self.seconds * Gst.SECOND
+
+        def over_limit() -> bool:
+            if self._span_ns(ring) > limit_ns:
+                return True
+            return kind == 'video' and self._bytes['video'] + self._bytes['audio'] > self.max_bytes
+
+        while len(ring) > 1 and over_limit():
+            # Nur ganze GOPs entfernen - ohne weiteren Keyframe bleibt der Ring
+            next_key = next((i for i in range(1, len(ring)) if ring[i][1]), None)
+            if next_key is None:
+                break
+            for _ in range(next_key):
+                buffer, _ = ring.popleft()
+                self._bytes[kind] -= buffer.get_size()
+
+    @staticmethod
+    def _span_ns(ring: Deque[Tuple[Gst.Buffer, bool]]) -> int:
+        """Zeitspanne zwischen erstem und letztem Buffer (ns)."""
+        if len(ring) < 2:
+            return 0
+        first, last = ring[0][0].pts, ring[-1][0].pts
+        if first == Gst.CLOCK_TIME_NONE or last == Gst.CLOCK_TIME_NONE:
+            return 0
+        return max(0, last - first)
+
+    # ==================== SPEICHERN ====================
+
+    def save(
+        self,
+        output_dir: str,
+        container: str = 'mkv',
+        on_done: Optional[Callable[[Optional[str], Optional[str]], None]] = None
+    ) -> Optional[str]:
+        """
+        Speichert den aktuellen Ring als Datei (im Hintergrund, ohne Re-Encoding).
+
+        Args:
+            output_dir: Zielverzeichnis
+            container: 'mkv' oder 'mp4'
+            on_done: Callback (filepath, error) aus dem Worker-Thread
+
+        Returns:
+            Ziel-Dateipfad oder None wenn nichts gepuffert ist
+        """
+        with self._lock:
+            video = list(self._rings['video'])
+            audio = list(self._rings['audio'])
+            video_caps, audio_caps = self._caps['video'], self._caps['audio']
+
+        if not video or video_caps is None:
+            return None
+
+        muxer, extension = self.CONTAINERS.get(container, self.CONTAINERS['mkv'])
+        os.makedirs(output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filepath = os.path.join(output_dir, f"replay_{timestamp}.{extension}")
+
+        # Audio ab dem ersten Video-Keyframe
+        start = video[0][0].pts
+        audio = [item for item in audio if item[0].pts != Gst.CLOCK_TIME_NONE and item[0].pts >= start]
+
+        thread = threading.Thread(
+            target=self._write,
+            args=(filepath, muxer, video, video_caps, audio, audio_caps, start, on_done),
+            name="replay-save",
+            daemon=True
+        )
+        thread.start()
+        return filepath
+
+    def _write(
+        self,
+        filepath: str,
+        muxer: str,
+        video: List[Tuple[Gst.Buffer, bool]],
+        video_caps: Gst.Caps,
+        audio: List[Tuple[Gst.Buffer, bool]],
+        audio_caps: Optional[Gst.Caps],
+        start: int,
+        on_done: Optional[Callable[[Optional[str], Optional[str]], None]]
+    ) -> None:
+        """Worker: schiebt die Buffer über appsrc in einen Muxer."""
+        has_audio = bool(audio) and audio_caps is not None
+        parser = 'h265parse' if video_caps.get_structure(0).get_name() == 'video/x-h265' else 'h264parse'
+        pipeline_str = (
+            f"appsrc name=src_v format=time ! {parser} ! queue ! mux. "
+            + (f"appsrc name=src_a format=time ! aacparse ! queue ! mux. " if has_audio else "")
+            + f"{muxer} name=mux ! filesink location=\"{filepath}\""
+        )
+
+        pipeline = None
+        error = None
+        try:
+            pipeline = Gst.parse_launch(pipeline_str)
+            streams = [('src_v', video, video_caps)]
+            if has_audio:
+                streams.append(('src_a', audio, audio_caps))
+
+            pipeline.set_state(Gst.State.PLAYING)
+
+            for name, items, caps in streams:
+                src = pipeline.get_by_name(name)
+                src.set_property('caps', caps)
+                for buffer, _ in items:
+                    src.emit('push-buffer', self._rebase(buffer, start))
+                src.emit('end-of-stream')
+
+            msg = pipeline.get_bus().timed_pop_filtered(
+                30 * Gst.SECOND, Gst.MessageType.EOS | Gst.MessageType.ERROR
+            )
+            if msg is None:
+                error = "Timeout beim Schreiben"
+            elif msg.type == Gst.MessageType.ERROR:
+                error = msg.parse_error()[0].message
+
+        except Exception as e:
+            error = str(e)
+
+        finally:
+            if pipeline:
+                pipeline.set_state(Gst.State.NULL)
+
+        if on_done:
+            on_done(filepath if error is None else None, error)
+
+    @staticmethod
+    def _rebase(buffer: Gst.Buffer, start: int) -> Gst.Buffer:
+        """Kopie mit Timestamps relativ zum Ring-Anfang (Speicher wird geteilt)."""
+        copy = buffer.copy()
+        if copy.pts != Gst.CLOCK_TIME_NONE:
+            copy.pts = max(0, copy.pts - start)
+        if copy.dts != Gst.CLOCK_TIME_NONE:
+            copy.dts = max(0, copy.dts - start)
+        return copy
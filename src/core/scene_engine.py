@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Scene Engine
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import gi
+gi.require_version('Gst', '1.0')
+gi.require_version('GstVideo', '1.0')
+from gi.repository import Gst, GstVideo
+
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+class SceneEngine:
+    """
+    Szenen-Umschaltung über einen compositor - ohne Pipeline-Rebuild.
+
+    Alle Quellen aller Szenen bleiben geöffnet und hängen an eigenen
+    compositor-Pads. Eine Szene ist nur ein Satz Pad-Properties
+    (alpha, zorder, Position, Größe). Umschalten setzt diese Properties
+    zwischen zwei Ausgabe-Frames (Probe im Aggregator-Thread) und
+    fordert danach einen Keyframe an - kein RTMP-Reconnect.
+
+    Szenen-Format:
+        {'desktop': [{'source': 'screen'}],
+         'webcam':  [{'source': '/dev/video0'}]}
+
+    Layer ohne 'width'/'height' füllen den ganzen Frame.
+    """
+
+    COMPOSITOR_NAME = "comp"
+    ENCODER_NAME = "venc"
+
+    def __init__(self, build_source: Callable[[str, int, int, int], str]):
+        """
+        Initialisiert SceneEngine.
+
+        Args:
+            build_source: Callback (device, width, height, fps) → Source-Fragment
+        """
+        self.build_source = build_source
+
+        # Szenen-Name → Liste von Layern
+        self.scenes: Dict[str, List[Dict[str, Any]]] = {}
+        self.active_scene: Optional[str] = None
+
+        # Feed = (device, width, height) → compositor-Pad-Index
+        self._feeds: Dict[Tuple[str, int, int], int] = {}
+        self._output_size = (0, 0)
+
+        self.pipeline: Optional[Gst.Pipeline] = None
+        self._pending_scene: Optional[str] = None
+        self._probe = None
+        self._lock = threading.Lock()
+
+    # ==================== SZENEN ====================
+
+    def set_scenes(self, scenes: Dict[str, List[Dict[str, Any]]], initial: str) -> None:
+        """
+        Setzt die verfügbaren Szenen (wirkt ab dem nächsten Pipeline-Build).
+
+        Args:
+            scenes: Szenen-Name → Layer-Liste
+            initial: Szene beim Start
+        """
+        self.scenes = scenes
+        self.active_scene = initial if initial in scenes else next(iter(scenes), None)
+
+    def set_single_source(self, device: str) -> None:
+        """
+        Nur eine Quelle, keine Umschaltung (klassische Pipeline ohne compositor).
+
+        Args:
+            device: Video-Device
+        """
+        self.set_scenes({'main': [{'source': device}]}, 'main')
+
+    @staticmethod
+    def pip_layout(
+        screen: str,
+        webcam: str,
+        width: int,
+        height: int,
+        scale: float = 0.25,
+        corner: str = 'bottom-right',
+        margin: int = 16
+    ) -> List[Dict[str, Any]]:
+        """
+        Baut eine Bild-in-Bild-Szene: Bildschirm + Webcam in einer Ecke.
+
+        Die Webcam-Größe steht im Layer, dadurch öffnet die Engine die
+        Kamera direkt in einem kleinen nativen Modus (siehe
+        _build_feed_branches) statt Vollbild zu holen und herunterzurechnen.
+
+        Args:
+            screen: Device der Hintergrund-Quelle (meist 'screen')
+            webcam: Device der Webcam
+            width: Ausgabe-Breite
+            height: Ausgabe-Höhe
+            scale: Webcam-Breite relativ zur Ausgabe-Breite
+            corner: 'top-left', 'top-right', 'bottom-left' oder 'bottom-right'
+            margin: Abstand zum Rand in Pixeln
+
+        Returns:
+            Layer-Liste (Hintergrund zuerst)
+        """
+        # Gerade Maße (I420-Chroma-Subsampling), Seitenverhältnis der Ausgabe
+        pip_width = int(width * scale) // 2 * 2
+        pip_height = int(pip_width * height / width) // 2 * 2
+
+        x = margin if 'left' in corner else width - pip_width - margin
+        y = margin if 'top' in corner else height - pip_height - margin
+
+        return [
+            {'source': screen},
+            {'source': webcam, 'width': pip_width, 'height': pip_height, 'x': x, 'y': y},
+        ]
+
+    def has_scene(self, name: str) -> bool:
+        """Prüft ob eine Szene in der laufenden Konfiguration existiert."""
+        return name in self.scenes
+
+    def uses_compositor(self) -> bool:
+        """True wenn mehr als ein Feed existiert (sonst direkter Pfad)."""
+        return len(self._collect_feeds(0, 0)) > 1
+
+    def switch_scene(self, name: str) -> bool:
+        """
+        Schaltet auf eine andere Szene um (live, ohne Rebuild).
+
+        Die Umschaltung wird im compositor-Thread zwischen zwei Frames
+        ausgeführt; danach wird ein Keyframe angefordert.
+
+        Args:
+            name: Szenen-Name
+
+        Returns:
+            True wenn die Szene existiert
+        """
+        if name not in self.scenes:
+            return False
+
+        with self._lock:
+            if self.pipeline is None or not self.uses_compositor():
+                self.active_scene = name
+            else:
+                self._pending_scene = name
+        return True
+
+    # ==================== PIPELINE ====================
+
+    def build_video_stage(self, width: int, height: int, fps: int) -> str:
+        """
+        Baut die komplette Roh-Video-Stage (endet offen nach den Caps).
+
+        Mit einer Quelle: src ! videoconvert ! videoscale ! caps
+        Mit mehreren:     compositor mit einem Pad pro Feed
+
+        Args:
+            width: Ausgabe-Breite
+            height: Ausgabe-Höhe
+            fps: Ausgabe-Framerate
+
+        Returns:
+            Pipeline-Fragment (weitere Zweige folgen mit Leerzeichen getrennt)
+        """
+        self._feeds = self._collect_feeds(width, height)
+        self._output_size = (width, height)
+        output_caps = f"video/x-raw,format=I420,width={width},height={height},framerate={fps}/1"
+
+        if len(self._feeds) <= 1:
+            device = next(iter(self._feeds))[0] if self._feeds else self._first_source()
+            return (
+                f"{self.build_source(device, width, height, fps)} ! "
+                f"videoconvert ! "
+                f"videoscale ! "
+                f"video/x-raw,width={width},height={height},framerate={fps}/1"
+            )
+
+        # compositor mit Pad-Properties der Start-Szene
+        pad_props = " ".join(
+            f"sink_{index}::{prop}={value}"
+            for index, props in self._scene_pad_props(self.active_scene).items()
+            for prop, value in props.items()
+        )
+        stage = (
+            f"compositor name={self.COMPOSITOR_NAME} background=black {pad_props} ! "
+            f"{output_caps}"
+        )
+
+        return stage + " " + self._build_feed_branches(width, height, fps)
+
+    def attach(self, pipeline: Gst.Pipeline) -> None:
+        """
+        Verbindet die Engine mit der laufenden Pipeline.
+
+        Args:
+            pipeline: Pipeline mit compositor (optional) und Encoder 'venc'
+        """
+        self.detach()
+        self.pipeline = pipeline
+
+        compositor = pipeline.get_by_name(self.COMPOSITOR_NAME)
+        if compositor is None:
+            return
+
+        # Frame-Grenze: Probe auf dem compositor-Src-Pad läuft im
+        # Aggregator-Thread nach jedem Ausgabe-Frame
+        src_pad = compositor.get_static_pad('src')
+        self._probe = (src_pad, src_pad.add_probe(Gst.PadProbeType.BUFFER, self._on_frame))
+
+    def detach(self) -> None:
+        """Löst die Engine von der Pipeline."""
+        if self._probe:
+            pad, probe_id = self._probe
+            pad.remove_probe(probe_id)
+        self._probe = None
+        self.pipeline = None
+        with self._lock:
+            if self._pending_scene:
+                self.active_scene = self._pending_scene
+            self._pending_scene = None
+
+    def _on_frame(self, pad: Gst.Pad, info: Gst.PadProbeInfo) -> Gst.PadProbeReturn:
+        """Pad-Probe (Aggregator-Thread): wendet eine anstehende Szene an."""
+        with self._lock:
+            scene = self._pending_scene
+            self._pending_scene = None
+
+        if scene is None:
+            return Gst.PadProbeReturn.OK
+
+        compositor = pad.get_parent_element()
+        for index, props in self._scene_pad_props(scene).items():
+            sink_pad = compositor.get_static_pad(f"sink_{index}")
+            if sink_pad is None:
+                continue
+            for prop, value in props.items():
+                sink_pad.set_property(prop, value)
+
+        self.active_scene = scene
+        self._force_keyframe()
+        print(f"🔹 Szene umgeschaltet: {scene}")
+        return Gst.PadProbeReturn.OK
+
+    def _force_keyframe(self) -> None:
+        """Fordert beim Encoder einen Keyframe an (Upstream-Event)."""
+        if self.pipeline is None:
+            return
+        encoder = self.pipeline.get_by_name(self.ENCODER_NAME)
+        if encoder is None:
+            return
+
+        event = GstVideo.video_event_new_upstream_force_key_unit(Gst.CLOCK_TIME_NONE, True, 0)
+        encoder.get_static_pad('src').send_event(event)
+
+    # ==================== FEEDS ====================
+
+    def _first_source(self) -> str:
+        """Erste Quelle der aktiven Szene (Fallback für Single-Source)."""
+        layers = self.scenes.get(self.active_scene) or []
+        return layers[0]['source'] if layers else 'screen'
+
+    def _collect_feeds(self, width: int, height: int) -> Dict[Tuple[str, int, int], int]:
+        """
+        Sammelt alle Feeds über alle Szenen (jede Quelle × Größe einmal).
+
+        Returns:
+            Dict (device, width, height) → Pad-Index
+        """
+        feeds: Dict[Tuple[str, int, int], int] = {}
+        for layers in self.scenes.values():
+            for layer in layers:
+                key = self._feed_key(layer, width, height)
+                if key not in feeds:
+                    feeds[key] = len(feeds)
+        return feeds
+
+    @staticmethod
+    def _feed_key(layer: Dict[str, Any], width: int, height: int) -> Tuple[str, int, int]:
+        """Feed-Schlüssel eines Layers (Vollbild wenn keine Größe gesetzt)."""
+        return (
+            layer['source'],
+            int(layer.get('width') or width),
+            int(layer.get('height') or height),
+        )
+
+    def _build_feed_branches(self, width: int, height: int, fps: int) -> str:
+        """
+        Baut die Zweige Quelle → compositor-Pad.
+
+        Jede Quelle wird genau einmal geöffnet; braucht sie mehrere
+        Feeds (z.B. Vollbild + PiP), wird sie per tee verteilt.
+        """
+        by_source: Dict[str, List[Tuple[Tuple[str, int, int], int]]] = {}
+        for key, index in self._feeds.items():
+            by_source.setdefault(key[0], []).append((key, index))
+
+        branches = []
+        for source_index, (device, feeds) in enumerate(by_source.items()):
+            # Quelle in der größten benötigten Auflösung öffnen
+            src_width = max(key[1] for key, _ in feeds)
+            src_height = max(key[2] for key, _ in feeds)
+            source = self.build_source(device, src_width, src_height, fps)
+
+            if len(feeds) == 1:
+                (key, index), = feeds
+                branches.append(f"{source} ! {self._feed_tail(key, index)}")
+                continue
+
+            tee = f"vsrc_{source_index}"
+            branches.append(f"{source} ! tee name={tee}")
+            for key, index in feeds:
+                branches.append(f"{tee}. ! {self._feed_tail(key, index)}")
+
+        return " ".join(branches) + " "
+
+    def _feed_tail(self, key: Tuple[str, int, int], index: int) -> str:
+        """
+        Skaliert einen Feed auf Layer-Größe und linkt ihn an den compositor.
+
+        Erst skalieren, dann nach I420 konvertieren: die Konvertierung
+        läuft so auf dem kleinen Bild, und der compositor mischt direkt
+        im Encoder-Format (kein RGBA-Umweg, kein Skalieren im compositor).
+        """
+        _, width, height = key
+        return (
+            f"queue max-size-buffers=2 leaky=downstream ! "
+            f"videoscale ! "
+            f"videoconvert ! "
+            f"video/x-raw,format=I420,width={width},height={height} ! "
+            f"{self.COMPOSITOR_NAME}.sink_{index}"
+        )
+
+    def _scene_pad_props(self, scene: Optional[str]) -> Dict[int, Dict[str, Any]]:
+        """
+        Berechnet die Pad-Properties aller Feeds für eine Szene.
+
+        Feeds, die in der Szene nicht vorkommen, werden unsichtbar
+        (alpha=0 → compositor überspringt sie beim Blending).
+        """
+        props: Dict[int, Dict[str, Any]] = {
+            index: {'alpha': 0.0, 'zorder': 0} for index in self._feeds.values()
+        }
+
+        width, height = self._output_size
+        for zorder, layer in enumerate(self.scenes.get(scene) or [], start=1):
+            index = self._feeds.get(self._feed_key(layer, width, height))
+            if index is None:
+                continue
+            props[index] = {
+                'alpha': float(layer.get('alpha', 1.0)),
+                'zorder': zorder,
+                'xpos': int(layer.get('x', 0)),
+                'ypos': int(layer.get('y', 0)),
+            }
+        return props
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Source Prober
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import Gst
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class SourceProber:
+    """
+    Testet Video-/Audio-Quellen parallel mit harten Timeouts.
+
+    Eine Quelle gilt erst als verfügbar, wenn tatsächlich ein Buffer
+    am Sink ankommt (READY allein sagt nichts über hängende Geräte
+    oder Portale). Ergebnisse werden für eine konfigurierbare TTL
+    gecacht.
+
+    Jeder Probe läuft in einem eigenen Daemon-Thread: ein hängendes
+    Gerät blockiert weder den Aufrufer noch das Beenden des Programms.
+    """
+
+    def __init__(self, timeout: float = 3.0, cache_ttl: float = 30.0):
+        """
+        Initialisiert den Prober.
+
+        Args:
+            timeout: Maximale Zeit pro Probe bis zum ersten Buffer (Sekunden)
+            cache_ttl: Gültigkeit gecachter Ergebnisse (Sekunden, 0 = kein Cache)
+        """
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+
+        # (kind, device) → Ergebnis-Dict
+        self._cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def probe(
+        self,
+        kind: str,
+        device: str,
+        source: str,
+        use_cache: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Testet eine einzelne Quelle.
+
+        Args:
+            kind: 'video' oder 'audio'
+            device: Device-String (Cache-Schlüssel)
+            source: GStreamer-Source-Fragment (z.B. "v4l2src device=/dev/video0")
+            use_cache: False erzwingt einen neuen Test
+
+        Returns:
+            Ergebnis-Dict (siehe probe_many())
+        """
+        return self.probe_many([(kind, device, source)], use_cache)[(kind, device)]
+
+    def probe_many(
+        self,
+        probes: List[Tuple[str, str, str]],
+        use_cache: bool = True
+    ) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Testet mehrere Quellen gleichzeitig.
+
+        Die Gesamtdauer ist durch den langsamsten Probe begrenzt,
+        also höchstens timeout + 1s Teardown-Reserve.
+
+        Args:
+            probes: Liste von (kind, device, source)-Tupeln
+            use_cache: False erzwingt neue Tests
+
+        Returns:
+            Dict (kind, device) → {
+                'device', 'kind', 'ok', 'ttff_ms', 'error', 'checked_at'
+            }
+        """
+        results: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        workers = []
+
+        for kind, device, source in probes:
+            key = (kind, device)
+            cached = self._get_cached(key) if use_cache else None
+            if cached is not None:
+                results[key] = cached
+                continue
+
+            slot: Dict[str, Any] = {}
+            thread = threading.Thread(
+                target=self._run_probe,
+                args=(kind, device, source, slot),
+                name=f"probe-{kind}-{device}",
+                daemon=True
+            )
+            thread.start()
+            workers.append((key, thread, slot))
+
+        deadline = time.monotonic() + self.timeout + 1.0
+        for key, thread, slot in workers:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+            if thread.is_alive() or not slot:
+                # Gerät hängt (z.B. im Teardown) → als fehlgeschlagen werten
+                slot = self._make_result(key[0], key[1], False, None, "Timeout (Gerät reagiert nicht)")
+
+            results[key] = slot
+            with self._lock:
+                self._cache[key] = slot
+
+        return results
+
+    def invalidate(self, device: Optional[str] = None) -> None:
+        """
+        Verwirft gecachte Ergebnisse.
+
+        Args:
+            device: Nur dieses Device oder None für alle
+        """
+        with self._lock:
+            if device is None:
+                self._cache.clear()
+            else:
+                for key in [k for k in self._cache if k[1] == device]:
+                    del self._cache[key]
+
+    def _get_cached(self, key: Tuple[str, str]) -> Optional[Dict[str, Any]]:
+        """Holt ein noch gültiges Ergebnis aus dem Cache."""
+        if self.cache_ttl <= 0:
+            return None
+        with self._lock:
+            result = self._cache.get(key)
+        if result and time.time() - result['checked_at'] < self.cache_ttl:
+            return result
+        return None
+
+    def _run_probe(self, kind: str, device: str, source: str, slot: Dict[str, Any]) -> None:
+        """
+        Worker: startet Pipeline und wartet auf den ersten Buffer.
+
+        Args:
+            kind: 'video' oder 'audio'
+            device: Device-String
+            source: GStreamer-Source-Fragment
+            slot: Dict, in das das Ergebnis geschrieben wird
+        """
+        pipeline = None
+        first_buffer = threading.Event()
+        # Zeitpunkt des ersten Buffers (im Streaming-Thread gesetzt)
+        first_buffer_at: List[float] = []
+        ttff_ms: Optional[float] = None
+        error: Optional[str] = None
+
+        def on_buffer(pad: Gst.Pad, info: Gst.PadProbeInfo) -> Gst.PadProbeReturn:
+            first_buffer_at.append(time.monotonic())
+            first_buffer.set()
+            return Gst.PadProbeReturn.REMOVE
+
+        try:
+            pipeline = Gst.parse_launch(f"{source} ! fakesink name=probe_sink sync=false")
+            sink_pad = pipeline.get_by_name('probe_sink').get_static_pad('sink')
+            sink_pad.add_probe(Gst.PadProbeType.BUFFER, on_buffer)
+
+            started = time.monotonic()
+            if pipeline.set_state(Gst.State.PLAYING) == Gst.StateChangeReturn.FAILURE:
+                error = "Pipeline konnte nicht gestartet werden"
+            else:
+                bus = pipeline.get_bus()
+                deadline = started + self.timeout
+
+                while not first_buffer.is_set():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        error = f"Kein Buffer innerhalb {self.timeout:.1f}s"
+                        break
+
+                    msg = bus.timed_pop_filtered(
+                        int(min(remaining, 0.05) * Gst.SECOND),
+                        Gst.MessageType.ERROR
+                    )
+                    if msg:
+                        err, _debug = msg.parse_error()
+                        error = err.message
+                        break
+
+                if first_buffer.is_set():
+                    ttff_ms = (first_buffer_at[0] - started) * 1000
+                    error = None
+
+        except Exception as e:
+            error = str(e)
+
+        finally:
+            if pipeline:
+                pipeline.set_state(Gst.State.NULL)
+
+        slot.update(self._make_result(kind, device, error is None, ttff_ms, error))
+
+    @staticmethod
+    def _make_result(
+        kind: str,
+        device: str,
+        ok: bool,
+        ttff_ms: Optional[float],
+        error: Optional[str]
+    ) -> Dict[str, Any]:
+        """Baut ein Ergebnis-Dict."""
+        return {
+            'device': device,
+            'kind': kind,
+            'ok': ok,
+            'ttff_ms': round(ttff_ms, 1) if ttff_ms is not None else None,
+            'error': error,
+            'checked_at': time.time(),
+        }
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - SRT Output
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import Gst
+
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+class SrtOutput:
+    """
+    SRT-Ausgang (MPEG-TS über srtsink) als Alternative zu flvmux/rtmpsink.
+
+    RTMP läuft über TCP: ein verlorenes Paket hält alles dahinter auf
+    (Head-of-Line-Blocking), auf verlustbehafteten Uplinks wächst die
+    Latenz. SRT überträgt per UDP mit gezielter Neuübertragung innerhalb
+    eines festen Latenz-Fensters - was danach noch fehlt, wird verworfen
+    statt den Stream zu stauen.
+
+    Modi:
+    - caller:   verbindet sich zu srt://host:port (Ingest-Server)
+    - listener: wartet auf srt://:port, bis sich die Gegenstelle verbindet
+
+    Der Stream-Key wird (falls gesetzt) als SRT-Stream-ID gesendet.
+    """
+
+    MUX_NAME = "mux"
+    SINK_NAME = "srtsink"
+    QUEUE_NAME = "srtq"
+
+    # Feste PIDs: Pads heißen sink_<PID>, A/V-Sync erkennt sie daran
+    VIDEO_PAD = "sink_65"
+    AUDIO_PAD = "sink_66"
+
+    MODES = ('caller', 'listener')
+
+    # SRT-Vorgabe: Passphrase 10-79 Zeichen
+    PASSPHRASE_LENGTH = (10, 79)
+
+    # srtsink-Statistik → eigene Schlüssel (Zähler, seit Verbindungsaufbau)
+    STATS_FIELDS = {
+        'rtt-ms': 'srt_rtt_ms',
+        'send-rate-mbps': 'srt_send_rate_mbps',
+        'bandwidth-mbps': 'srt_bandwidth_mbps',
+        'negotiated-latency-ms': 'srt_latency_ms',
+        'packets-sent': 'srt_packets_sent',
+        'packets-retransmitted': 'srt_packets_retransmitted',
+        'packets-sent-lost': 'srt_packets_lost',
+        'packets-sent-dropped': 'srt_packets_dropped',
+        'bytes-sent': 'srt_bytes_sent',
+    }
+
+    @staticmethod
+    def is_srt_url(url: str) -> bool:
+        """True wenn die Ziel-URL SRT ist (srt://...)."""
+        return url.strip().lower().startswith('srt://')
+
+    def __init__(self, latency_ms: int = 200, mode: str = 'caller', passphrase: str = ""):
+        """
+        Initialisiert SrtOutput.
+
+        Args:
+            latency_ms: SRT-Latenz (Fenster für Neuübertragungen)
+            mode: 'caller' oder 'listener'
+            passphrase: AES-Passphrase ("" = unverschlüsselt)
+        """
+        self.latency_ms = latency_ms
+        self.mode = mode
+        self.passphrase = passphrase
+
+        self._sink: Optional[Gst.Element] = None
+        self._queue: Optional[Gst.Element] = None
+
+        # Letzte Messung für Raten: (Zeit, gesendet, neu übertragen)
+        self._last_sample: Optional[Tuple[float, int, int]] = None
+
+    def validate(self) -> Optional[str]:
+        """
+        Prüft die Einstellungen vor dem Pipeline-Bau.
+
+        Returns:
+            Fehlermeldung oder None
+        """
+        if self.mode not in self.MODES:
+            return f"Unbekannter SRT-Modus: {self.mode}"
+        low, high = self.PASSPHRASE_LENGTH
+        if self.passphrase and not low <= len(self.passphrase) <= high:
+            return f"SRT-Passphrase muss {low}-{high} Zeichen lang sein"
+        if Gst.ElementFactory.find('srtsink') is None:
+            return "srtsink nicht verfügbar (gst-plugins-bad mit SRT installieren)"
+        return None
+
+    def build_stage(self, url: str, stream_id: str = "") -> str:
+        """
+        Baut Muxer und Sink (Ende der Stream-Pipeline).
+
+        Video und Audio werden über "mux.sink_65"/"mux.sink_66" verlinkt
+        (VIDEO_PAD/AUDIO_PAD).
+
+        Args:
+            url: srt://host:port (listener: srt://:port)
+            stream_id: Optionale Stream-ID (z.B. Stream-Key)
+
+        Returns:
+            Pipeline-Fragment "mpegtsmux name=mux ... ! srtsink ..."
+        """
+        # Ohne Verbindung nicht blockieren: listener wartet sonst im
+        # PAUSED-Zustand auf einen Caller, caller meldet Fehler über den Bus
+        sink = (
+            f"srtsink name={self.SINK_NAME} uri=\"{url}\" mode={self.mode} "
+            f"latency={int(self.latency_ms)} wait-for-connection=false"
+        )
+        if self.passphrase:
+            sink += f" passphrase=\"{self.passphrase}\""
+        if stream_id:
+            sink += f" streamid=\"{stream_id}\""
+
+        # alignment=7: 7 TS-Pakete (1316 Bytes) pro UDP-Datagramm
+        # Queue vor dem Sink: läuft voll, wenn SRT nicht schnell genug senden kann
+        return (
+            f"mpegtsmux name={self.MUX_NAME} alignment=7 ! "
+            f"queue name={self.QUEUE_NAME} max-size-buffers=0 max-size-bytes=0 "
+            f"max-size-time={2 * Gst.SECOND} ! "
+            f"{sink}"
+        )
+
+    def attach(self, pipeline: Gst.Pipeline) -> None:
+        """Merkt sich srtsink und Sende-Queue der Pipeline (für get_stats)."""
+        self._sink = pipeline.get_by_name(self.SINK_NAME)
+        self._queue = pipeline.get_by_name(self.QUEUE_NAME)
+        self._last_sample = None
+
+    def detach(self) -> None:
+        """Gibt die Elemente frei (beim Stoppen der Pipeline)."""
+        self._sink = None
+        self._queue = None
+        self._last_sample = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Liest die SRT-Statistik (Qt-Thread, ~1 Hz).
+
+        Returns:
+            Dict mit 'srt_rtt_ms', 'srt_send_rate_mbps', 'srt_bandwidth_mbps',
+            'srt_latency_ms', Paket-/Byte-Zählern, 'srt_retransmits_per_s'
+            (seit letztem Aufruf), 'srt_send_buffer_ms' (Rückstau vor
+            srtsink) und 'srt_connected'; leer wenn nicht angehängt
+        """
+        if self._sink is None:
+            return {}
+
+        stats: Dict[str, Any] = {'srt_mode': self.mode, 'srt_connected': False}
+        structure = self._caller_stats(self._sink.get_property('stats'))
+        if structure is not None:
+            for field, key in self.STATS_FIELDS.items():
+                if structure.has_field(field):
+                    stats[key] = structure.get_value(field)
+            stats['srt_connected'] = 'srt_packets_sent' in stats
+
+        # Neu übertragene Pakete pro Sekunde (Zähler seit Verbindungsaufbau)
+        now = time.monotonic()
+        sent = int(stats.get('srt_packets_sent', 0))
+        retransmitted = int(stats.get('srt_packets_retransmitted', 0))
+        stats['srt_retransmits_per_s'] = None
+        if self._last_sample is not None:
+            last_time, last_sent, last_retransmitted = self._last_sample
+            elapsed = now - last_time
+            if elapsed > 0 and sent >= last_sent and retransmitted >= last_retransmitted:
+                stats['srt_retransmits_per_s'] = round((retransmitted - last_retransmitted) / elapsed, 1)
+        self._last_sample = (now, sent, retransmitted)
+
+        if self._queue is not None:
+            stats['srt_send_buffer_ms'] = round(
+                self._queue.get_property('current-level-time') / Gst.MSECOND, 1
+            )
+
+        for key in ('srt_rtt_ms', 'srt_send_rate_mbps', 'srt_bandwidth_mbps'):
+            if stats.get(key) is not None:
+                stats[key] = round(float(stats[key]), 2)
+        return stats
+
+    def _caller_stats(self, structure: Optional[Gst.Structure]) -> Optional[Gst.Structure]:
+        """
+        Statistik der (ersten) Verbindung.
+
+        Im listener-Modus liefert srtsink eine Liste 'callers' mit je
+        einer Struktur pro verbundener Gegenstelle.
+        """
+        if structure is None or not structure.has_field('callers'):
+            return structure
+        callers = structure.get_value('callers')
+        if not callers:
+            return None
+        caller = callers[0]
+        return caller if isinstance(caller, Gst.Structure) else None
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Stream Lifecycle
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import gi
+gi.require_version('Gst', '1.0')
+from gi.repository import Gst
+
+from PyQt6.QtCore import QObject, Qt, QTimer, pyqtSignal
+import collections
+import queue
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+class StreamLifecycle(QObject):
+    """
+    Zustandsautomat des Streams mit Worker-Thread für State-Wechsel.
+
+    Zustände:
+        idle → starting → live ⇄ reconnecting
+                  ↓         ↓        ↓
+                stopping ←──┴────────┘ → idle
+
+    Blockierende Aufrufe (pipeline.set_state() - Geräte öffnen/schließen,
+    RTMP-Verbindung) laufen nacheinander im Worker-Thread; das Ergebnis
+    kommt als Callback im Qt-Thread an. Befehle, die während eines
+    Übergangs eintreffen, merkt defer() vor und führt sie aus, sobald
+    wieder ein stabiler Zustand (idle/live) erreicht ist und der Worker
+    nichts mehr zu tun hat - so laufen Start/Stop/Preview/Aufnahme nie
+    gegeneinander.
+
+    Pro Übergang (erster Zwischenzustand → erreichter stabiler Zustand,
+    z.B. 'starting→live', 'reconnecting→live', 'stopping→idle') und pro
+    Worker-Befehl wird die Dauer festgehalten (durations, history).
+    """
+
+    IDLE = "idle"
+    STARTING = "starting"
+    LIVE = "live"
+    RECONNECTING = "reconnecting"
+    STOPPING = "stopping"
+
+    # Erlaubte Übergänge (starting → idle: Fehler vor dem Pipeline-Start)
+    TRANSITIONS = {
+        IDLE: (STARTING,),
+        STARTING: (LIVE, STOPPING, IDLE),
+        LIVE: (RECONNECTING, STOPPING),
+        RECONNECTING: (LIVE, STOPPING),
+        STOPPING: (IDLE,),
+    }
+
+    STABLE_STATES = (IDLE, LIVE)
+
+    # Maximale Wartezeit auf asynchrone State-Wechsel (Preroll)
+    STATE_TIMEOUT_S = 10.0
+
+    HISTORY_SIZE = 50
+
+    state_changed = pyqtSignal(str)
+    # {'transition': 'starting→live', 'ms': ...} bzw. {'command': 'start', 'ms': ..., 'ok': ...}
+    transition_signal = pyqtSignal(dict)
+    # Worker → Qt-Thread (intern)
+    _finished = pyqtSignal(object)
+
+    def __init__(self):
+        """Initialisiert den Automaten und startet den Worker-Thread."""
+        super().__init__()
+        self.state = self.IDLE
+        self._state_since = time.monotonic()
+        # Beginn des aktuellen Übergangs (erster Zustand nach einem stabilen)
+        self._transition_from = self.STARTING
+        self._transition_started = self._state_since
+
+        # Letzte Dauer je Übergang/Befehl (ms) + Verlauf
+        self.durations: Dict[str, float] = {}
+        self.history: Deque[Dict[str, Any]] = collections.deque(maxlen=self.HISTORY_SIZE)
+
+        self._pending = 0
+        self._deferred: List[Callable[[], Any]] = []
+
+        self._finished.connect(self._on_finished, Qt.ConnectionType.QueuedConnection)
+        self._queue: queue.Queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="stream-lifecycle", daemon=True)
+        self._worker.start()
+
+    # ==================== ZUSTAND ====================
+
+    def set_state(self, state: str) -> None:
+        """
+        Wechselt den Zustand (Qt-Thread).
+
+        Args:
+            state: Zielzustand (muss laut TRANSITIONS erlaubt sein)
+
+        Raises:
+            ValueError: bei unerlaubtem Übergang (Programmierfehler)
+        """
+        if state == self.state:
+            return
+        if state not in self.TRANSITIONS[self.state]:
+            raise ValueError(f"Unerlaubter Übergang: {self.state} → {state}")
+
+        now = time.monotonic()
+        if self.state in self.STABLE_STATES:
+            self._transition_from = state
+            self._transition_started = now
+        self.state = state
+        self._state_since = now
+
+        if state in self.STABLE_STATES:
+            name = f"{self._transition_from}→{state}"
+            self._record({'transition': name}, name, (now - self._transition_started) * 1000)
+
+        self.state_changed.emit(state)
+        # Vorgemerktes erst nach dem aktuellen Aufruf (Aufrufer räumt noch auf)
+        QTimer.singleShot(0, self._run_deferred)
+
+    def is_transitioning(self) -> bool:
+        """True während eines Übergangs oder solange der Worker arbeitet."""
+        return self.state not in self.STABLE_STATES or self._pending > 0
+
+    def state_age(self) -> float:
+        """Sekunden im aktuellen Zustand."""
+        return time.monotonic() - self._state_since
+
+    # ==================== BEFEHLE ====================
+
+    def run(
+        self,
+        command: str,
+        pipeline: Gst.Pipeline,
+        target: Gst.State,
+        on_done: Callable[[bool, str], None]
+    ) -> None:
+        """
+        Setzt den State einer Pipeline im Worker-Thread.
+
+        Befehle laufen in Aufruf-Reihenfolge. on_done(ok, fehler) wird im
+        Qt-Thread aufgerufen.
+
+        Args:
+            command: Name für Log/Statistik (z.B. 'start', 'stop')
+            pipeline: Pipeline
+            target: Ziel-State (PLAYING/NULL)
+            on_done: Callback (ok, Fehlermeldung)
+        """
+        self.run_task(command, lambda: self._set_pipeline_state(pipeline, target), on_done)
+
+    def run_task(
+        self,
+        command: str,
+        task: Callable[[], Optional[str]],
+        on_done: Callable[[bool, str], None]
+    ) -> None:
+        """
+        Führt einen blockierenden Schritt im Worker-Thread aus.
+
+        Reiht sich wie run() ein - z.B. Aufnahme-Zweig lösen vor dem
+        State-Wechsel nach NULL.
+
+        Args:
+            command: Name für Log/Statistik
+            task: Schritt; gibt eine Fehlermeldung zurück (None/"" = ok)
+            on_done: Callback im Qt-Thread (ok, Fehlermeldung)
+        """
+        self._pending += 1
+        self._queue.put((command, task, on_done))
+
+    def defer(self, callback: Callable[[], Any]) -> None:
+        """Führt callback aus, sobald kein Übergang mehr läuft (Qt-Thread)."""
+        self._deferred.append(callback)
+        self._run_deferred()
+
+    def shutdown(self, timeout: float = 2.0) -> None:
+        """Beendet den Worker (Programmende); offene Befehle laufen noch ab."""
+        self._queue.put(None)
+        self._worker.join(timeout)
+
+    def _run(self) -> None:
+        """Worker-Thread: führt Befehle nacheinander aus."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            command, task, on_done = item
+            started = time.monotonic()
+            try:
+                error = task() or ""
+            except Exception as e:
+                error = str(e)
+            elapsed_ms = (time.monotonic() - started) * 1000
+            self._finished.emit((command, not error, elapsed_ms, error, on_done))
+
+    def _set_pipeline_state(self, pipeline: Gst.Pipeline, target: Gst.State) -> str:
+        """State-Wechsel inkl. Warten auf asynchrones Preroll (Worker-Thread)."""
+        ret = pipeline.set_state(target)
+        if ret == Gst.StateChangeReturn.ASYNC:
+            ret, _, _ = pipeline.get_state(int(self.STATE_TIMEOUT_S * Gst.SECOND))
+            if ret == Gst.StateChangeReturn.ASYNC:
+                # Preroll hängt (z.B. RTMP-Connect, träges Gerät) - nicht als "live" melden
+                return f"Timeout beim State-Wechsel nach {target.value_nick}"
+        if ret not in (Gst.StateChangeReturn.SUCCESS, Gst.StateChangeReturn.NO_PREROLL):
+            return f"State-Wechsel nach {target.value_nick} fehlgeschlagen"
+        return ""
+
+    def _on_finished(self, result: tuple) -> None:
+        """Ergebnis eines Worker-Befehls (Qt-Thread)."""
+        command, ok, elapsed_ms, error, on_done = result
+        self._pending -= 1
+        self._record({'command': command, 'ok': ok}, command, elapsed_ms)
+        try:
+            on_done(ok, error)
+        finally:
+            self._run_deferred()
+
+    def _run_deferred(self) -> None:
+        """Vorgemerkte Befehle ausführen (einer nach dem anderen, je bis zum nächsten Übergang)."""
+        while self._deferred and not self.is_transitioning():
+            self._deferred.pop(0)()
+
+    def _record(self, entry: Dict[str, Any], name: str, ms: float) -> None:
+        """Hält eine Dauer fest und meldet sie."""
+        entry['ms'] = round(ms, 1)
+        self.durations[name] = entry['ms']
+        self.history.append(entry)
+        print(f"🔹 Lifecycle {name}: {entry['ms']:.0f} ms")
+        self.transition_signal.emit(dict(entry))
@@ -14,9 +14,46 @@ import gi
 gi.require_version('Gst', '1.0')
 from gi.repository import Gst, GLib
 
-from PyQt6.QtCore import QObject, pyqtSignal, QThread
-from typing import Optional, Dict, Any
+from PyQt6.QtCore import QObject, Qt, pyqtSignal, QThread, QTimer
+from typing import Optional, Dict, Any, List, Callable, Iterator
+import contextlib
+import os
 import threading
+import time
+
+try:
+    from src.core.device_manager import DeviceManager
+    from src.core.audio_mixer import AudioMixer
+    from src.core.level_meter import LevelMeter
+    from src.core.bus_dispatcher import BusDispatcher
+    from src.core.av_sync import AVSyncMonitor
+    from src.core.scene_engine import SceneEngine
+    from src.core.overlay_layer import OverlayLayer
+    from src.core.replay_buffer import ReplayBuffer
+    from src.core.recording_engine import RecordingEngine
+    from src.core.postprocess_queue import PostProcessQueue
+    from src.core.srt_output import SrtOutput
+    from src.core.pipeline_plan import PipelinePlan, PipelinePlanCache
+    from src.core.stream_lifecycle import StreamLifecycle
+    from src.utils.config import get_config
+except ModuleNotFoundError:
+    import sys
+    from pathlib import Path
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from src.core.device_manager import DeviceManager
+    from src.core.audio_mixer import AudioMixer
+    from src.core.level_meter import LevelMeter
+    from src.core.bus_dispatcher import BusDispatcher
+    from src.core.av_sync import AVSyncMonitor
+    from src.core.scene_engine import SceneEngine
+    from src.core.overlay_layer import OverlayLayer
+    from src.core.replay_buffer import ReplayBuffer
+    from src.core.recording_engine import RecordingEngine
+    from src.core.postprocess_queue import PostProcessQueue
+    from src.core.srt_output import SrtOutput
+    from src.core.pipeline_plan import PipelinePlan, PipelinePlanCache
+    from src.core.stream_lifecycle import StreamLifecycle
+    from src.utils.config import get_config
 
 
 class GStreamerThread(QThread):
@@ -59,20 +96,55 @@ class StreamManager(QObject):
     Features:
     - Screen Capture (PipeWire) oder Webcam (V4L2)
     - Audio von Mikrofon oder Desktop-Monitor
-    - H.264 Video-Encoding (x264enc)
+    - H.264 Video-Encoding (x264enc), optional HEVC (x265enc, Enhanced RTMP)
     - AAC Audio-Encoding (automatische Encoder-Wahl)
     - RTMP-Streaming zu verschiedenen Plattformen
+    - SRT-Ausgang (MPEG-TS, caller/listener) für Contribution-Links
+    - Start/Stopp/Preview-Wechsel im Worker-Thread (StreamLifecycle),
+      automatische Neuverbindung bei Verbindungsabbruch
 
     Signals:
     - error_signal: Fehler-Nachrichten
     - status_signal: Status-Updates
-    - state_changed_signal: Pipeline-State-Änderungen
+    - state_changed_signal: Zustand des Streams (StreamLifecycle)
+    - levels_signal: Audio-Pegel pro Quelle (feste, niedrige Rate)
+    - recording_signal: Aufnahme gestartet/beendet
+    - recording_stats_signal: Aufnahme-Durchsatz und freier Speicher
+    - postprocess_signal: Status/Fortschritt der Nachbearbeitungs-Jobs
+    - plan_signal: Vorab-Plan eines Profils fertig (oder abgebrochen)
     """
 
     # Qt Signals für Thread-sichere Kommunikation
     error_signal = pyqtSignal(str)
     status_signal = pyqtSignal(str)
-    state_changed_signal = pyqtSignal(str)  # "idle", "starting", "streaming", "stopping"
+    state_changed_signal = pyqtSignal(str)  # "idle", "starting", "live", "reconnecting", "stopping"
+    levels_signal = pyqtSignal(dict)  # {source_id: {'peak': dB, 'rms': dB}}
+    recording_signal = pyqtSignal(bool)  # Aufnahme aktiv/beendet (auch automatisch)
+    recording_stats_signal = pyqtSignal(dict)  # Schreib-Durchsatz + Platten-Reserve (1 Hz)
+    postprocess_signal = pyqtSignal(dict)  # Nachbearbeitungs-Job (Status, Fortschritt)
+    plan_signal = pyqtSignal(str)  # Profil-Name (schedule_plan abgeschlossen)
+    # Bus-Watcher → Qt-Thread: Pipeline endet ('stream'/'preview', Neuverbindung versuchen?)
+    _pipeline_ended = pyqtSignal(str, bool)
+    # Bus-Watcher → Qt-Thread: Fehler im angehängten Aufnahme-Zweig
+    _recording_branch_failed = pyqtSignal()
+    # Bus-Watcher → Qt-Thread: Fehler in der eigenen Recording-Pipeline
+    _recording_failed = pyqtSignal()
+    # Planungs-Worker → Qt-Thread: Geräte abgefragt (Name, Eingaben, Probe) / Plan geprüft
+    _plan_probed = pyqtSignal(str, object, object)
+    _plan_validated = pyqtSignal(object)
+
+    # Roh-tees jeder Pipeline (Aufnahme-Zweige hängen sich hier an)
+    RAW_VIDEO_TEE = "vtee"
+    RAW_AUDIO_TEE = "atee"
+
+    # Beim Beenden: maximale Wartezeit auf das letzte Segment einer laufenden Aufnahme
+    SHUTDOWN_RECORDING_TIMEOUT_S = 5.0
+
+    # Fehler dieser Elemente = Verbindung verloren (Neuverbindung statt Stopp)
+    OUTPUT_SINKS = ('rtmpsink', 'rtmp2sink', 'srtsink')
+
+    # Nach so langer stabiler Verbindung zählen Neuverbindungen wieder von vorn
+    RECONNECT_STABLE_S = 30.0
 
     def __init__(self):
         """Initialisiert StreamManager."""
@@ -82,8 +154,7 @@ class StreamManager(QObject):
         self.pipeline: Optional[Gst.Pipeline] = None
         self.gst_thread: Optional[GStreamerThread] = None
 
-        # Status-Flags
-        self.is_streaming = False
+        # Status-Flags (is_streaming: siehe Property, aus dem Lifecycle)
         self.is_preview_active = False
         self.preview_was_active_before_stream = False
         self.is_recording = False
@@ -93,6 +164,93 @@ class StreamManager(QObject):
         self.current_preview_config: Dict[str, Any] = {}
         self.current_recording_config: Dict[str, Any] = {}
 
+        # Einstellungen (Settings-Tab)
+        self.config = get_config()
+
+        # Geräte-Capabilities (native Modi für v4l2src)
+        self.device_manager = DeviceManager()
+
+        # Audio-Mixer (Quellen + Gain, bleibt über Pipeline-Rebuilds erhalten)
+        self.audio_mixer = AudioMixer(self.device_manager)
+
+        # VU-Meter: level-Messages sammeln, UI-Update mit fester Rate
+        self.level_meter = LevelMeter()
+        self.meter_timer = QTimer(self)
+        self.meter_timer.timeout.connect(self._emit_levels)
+        self.set_metering()
+
+        # A/V-Sync: Skew-Messung am Muxer + Drift-Korrektur
+        self.av_sync = AVSyncMonitor()
+
+        # Szenen: alle Quellen vorgeladen, Umschalten ohne Rebuild
+        self.scene_engine = SceneEngine(self._build_video_src)
+
+        # Statische Overlays (einmal gerendert, live ein-/ausblendbar)
+        self.overlay_layer = OverlayLayer()
+
+        # Replay-Buffer: letzte N Sekunden des codierten Streams im Speicher
+        self.replay_buffer = ReplayBuffer(
+            seconds=float(self.config.get('replay_seconds', 30)),
+            max_bytes=int(self.config.get('replay_max_mb', 256)) * 1024 * 1024
+        )
+        self.replay_buffer.enabled = bool(self.config.get('replay_enabled', True))
+
+        # Aufnahme: Segmente (splitmuxsink) mit fsync pro Segment
+        self.recording_engine = RecordingEngine(on_segment=self._on_recording_segment)
+
+        # Bus-Messages: Element-Messages an Abonnenten, Warnungen/QoS
+        # gezählt und gebündelt an die UI (statt eines Signals pro Message)
+        self.bus_dispatcher = BusDispatcher(self.status_signal.emit)
+        self.bus_dispatcher.subscribe(self.recording_engine.handle_message, consume=False)
+        self.bus_dispatcher.subscribe(self.level_meter.handle_message, prefix=LevelMeter.ELEMENT_PREFIX)
+        self.bus_timer = QTimer(self)
+        self.bus_timer.setInterval(BusDispatcher.FLUSH_INTERVAL_MS)
+        self.bus_timer.timeout.connect(self.bus_dispatcher.flush)
+
+        # SRT-Ausgang (statt RTMP bei Ziel-URL srt://...)
+        self.srt_output = SrtOutput()
+        self._srt_stats: Dict[str, Any] = {}
+
+        # Vorab geplante Pipelines der Profile (Go-Live ohne Planungsarbeit)
+        self.plan_cache = PipelinePlanCache()
+        self._plan_settings: Dict[str, Any] = {}
+
+        # Nachbearbeitung fertiger Aufnahmen (eigene Prozesse, niedrige Priorität)
+        self.postprocess_queue = PostProcessQueue(
+            max_workers=int(self.config.get('postprocess_workers', 1)),
+            on_update=self.postprocess_signal.emit
+        )
+        self.postprocess_queue.start()
+
+        # Periodische Stats-Auswertung (1 Hz)
+        self.stats_timer = QTimer(self)
+        self.stats_timer.setInterval(1000)
+        self.stats_timer.timeout.connect(self._on_stats_tick)
+        self._disk_low_warned = False
+        self._recording_stats: Dict[str, Any] = {}
+
+        # Lebenszyklus: State-Wechsel im Worker, kollidierende Befehle vorgemerkt
+        self.lifecycle = StreamLifecycle()
+        # Mixer-Zweige live anhängen/lösen ebenfalls im Worker (Geräte öffnen, Leerlauf abwarten)
+        self.audio_mixer.run_task = lambda command, task: self.lifecycle.run_task(
+            command, task, self._on_mixer_task_done
+        )
+        self.lifecycle.state_changed.connect(self.state_changed_signal.emit)
+        self._pipeline_ended.connect(self._on_pipeline_ended, Qt.ConnectionType.QueuedConnection)
+        self._recording_branch_failed.connect(
+            self._on_recording_branch_failed, Qt.ConnectionType.QueuedConnection
+        )
+        self._recording_failed.connect(self._on_recording_failed, Qt.ConnectionType.QueuedConnection)
+        self._plan_probed.connect(self._on_plan_probed, Qt.ConnectionType.QueuedConnection)
+        self._plan_validated.connect(self._on_plan_validated, Qt.ConnectionType.QueuedConnection)
+        self._stop_after_start = False
+        # Angehängter Aufnahme-Zweig wird gerade im Worker gelöst
+        self._recording_detaching = False
+        self._reconnect_attempt = 0
+        self.reconnect_timer = QTimer(self)
+        self.reconnect_timer.setSingleShot(True)
+        self.reconnect_timer.timeout.connect(self._on_reconnect_timer)
+
         # Besten verfügbaren AAC-Encoder finden
         self.aac_encoder = self._find_best_aac_encoder()
         print(f"🔹 AAC-Encoder: {self.aac_encoder}")
@@ -122,7 +280,10 @@ class StreamManager(QObject):
         stream_key: str,
         resolution: str = "1280x720",
         bitrate: int = 2500,
-        fps: int = 30
+        fps: int = 30,
+        scenes: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        initial_scene: Optional[str] = None,
+        video_codec: str = 'h264'
     ) -> bool:
         """
         Startet den RTMP-Stream.
@@ -132,29 +293,71 @@ class StreamManager(QObject):
         Args:
             video_source: Video-Quelle ('screen' oder '/dev/videoX')
             audio_source: Audio-Quelle ('default' oder 'monitor')
-            rtmp_url: RTMP-Server-URL (ohne Stream-Key)
-            stream_key: Stream-Schlüssel (wird sicher behandelt)
+            rtmp_url: RTMP-Server-URL (ohne Stream-Key) oder srt://host:port
+            stream_key: Stream-Schlüssel (wird sicher behandelt; bei SRT
+                        optional, wird als Stream-ID gesendet)
             resolution: Auflösung (z.B. "1280x720")
             bitrate: Video-Bitrate in kbps
             fps: Framerate
+            scenes: Optionale Szenen (Name → Layer-Liste, siehe SceneEngine);
+                    alle Quellen werden vorgeladen, switch_scene() schaltet live um
+            initial_scene: Szene beim Start (Default: erste Szene)
+            video_codec: 'h264' oder 'hevc' (RTMP: Enhanced-FLV über eflvmux,
+                         SRT: MPEG-TS); das Ziel muss HEVC annehmen
 
         Returns:
             True bei Erfolg, False bei Fehler
         """
-        if self.is_streaming:
+        if self.is_streaming and self.lifecycle.state != StreamLifecycle.STOPPING:
             self.error_signal.emit("❌ Stream läuft bereits!")
             return False
 
         # Validierung
-        if not rtmp_url or not stream_key:
+        protocol = 'srt' if SrtOutput.is_srt_url(rtmp_url) else 'rtmp'
+        if not rtmp_url or (protocol == 'rtmp' and not stream_key):
             self.error_signal.emit("❌ RTMP-URL und Stream-Key erforderlich!")
             return False
 
-        # Preview läuft? → Stoppen und kombinierte Pipeline starten
-        if self.is_preview_active:
-            print("🔹 Preview läuft - wechsle zu kombinierter Pipeline")
-            self.preview_was_active_before_stream = True
-            self._stop_preview_internal()  # Stoppe Preview ohne Signal
+        if protocol == 'srt':
+            self.srt_output.mode = self._setting('srt_mode', 'caller')
+            self.srt_output.latency_ms = int(self._setting('srt_latency_ms', 200))
+            self.srt_output.passphrase = self.config.get_srt_passphrase()
+            error = self.srt_output.validate()
+            if error:
+                self.error_signal.emit(f"❌ {error}")
+                return False
+
+        error = self._check_video_codec(video_codec, protocol)
+        if error:
+            self.error_signal.emit(f"❌ {error}")
+            return False
+
+        # Eigenständige Aufnahme belegt die Quelle
+        if self.is_recording and not self.recording_engine.is_attached():
+            self.error_signal.emit("❌ Aufnahme läuft - bitte zuerst stoppen!")
+            return False
+
+        # Stopp/Preview-Wechsel läuft noch → Start danach
+        if self.lifecycle.is_transitioning():
+            self.status_signal.emit("⏳ Stream-Start vorgemerkt (vorheriger Vorgang läuft noch)")
+            self.lifecycle.defer(lambda: self.start_stream(
+                video_source, audio_source, rtmp_url, stream_key, resolution,
+                bitrate, fps, scenes, initial_scene, video_codec
+            ))
+            return True
+
+        self.lifecycle.set_state(StreamLifecycle.STARTING)
+        self._stop_after_start = False
+        self._reconnect_attempt = 0
+
+        # Hauptquelle im Mixer setzen (weitere Quellen bleiben erhalten)
+        self.audio_mixer.set_primary_source(audio_source)
+
+        # Szenen (ohne Szenen: nur die gewählte Quelle, kein compositor)
+        if scenes:
+            self.scene_engine.set_scenes(scenes, initial_scene)
+        else:
+            self.scene_engine.set_single_source(video_source)
 
         # Config speichern
         self.current_config = {
@@ -164,90 +367,384 @@ class StreamManager(QObject):
             'stream_key': stream_key,
             'resolution': resolution,
             'bitrate': bitrate,
-            'fps': fps
+            'fps': fps,
+            'protocol': protocol,
+            'video_codec': video_codec
         }
 
+        # Preview läuft? → Im Worker stoppen, dann kombinierte Pipeline starten
+        if self.is_preview_active:
+            print("🔹 Preview läuft - wechsle zu kombinierter Pipeline")
+            self.preview_was_active_before_stream = True
+            self._stop_preview_internal(lambda: self._launch_stream(scenes, initial_scene))
+            return True
+
+        return self._launch_stream(scenes, initial_scene)
+
+    def _launch_stream(
+        self,
+        scenes: Optional[Dict[str, List[Dict[str, Any]]]],
+        initial_scene: Optional[str]
+    ) -> bool:
+        """
+        Baut die Stream-Pipeline und übergibt den Start an den Worker.
+
+        Läuft im Zustand 'starting'; das Ergebnis kommt in _on_stream_started().
+
+        Returns:
+            False wenn die Pipeline nicht gebaut werden konnte
+        """
+        protocol = self.current_config['protocol']
+        stream_key = self.current_config['stream_key']
+
+        # Vorab geprüfter Plan für genau diese Eingaben (Profil)?
+        plan = self.plan_cache.find(
+            PipelinePlanCache.make_key(self._plan_inputs(scenes, initial_scene))
+        )
+
         try:
-            self.state_changed_signal.emit("starting")
             self.status_signal.emit("🔄 Erstelle GStreamer-Pipeline...")
 
-            # Pipeline erstellen (mit tee wenn Preview vorher lief)
+            if plan is not None:
+                # Audio-Rate, Kamera-Modus und Beschreibung stehen schon fest
+                self.audio_mixer.mix_rate = plan.audio_rate
+                self.audio_mixer.resample_quality = int(self._setting('audio_resample_quality', 4))
+                pipeline_str = plan.get_description(self.preview_was_active_before_stream, stream_key)
+                self.status_signal.emit(f"⚡ Profil '{plan.name}': vorab geprüfte Pipeline")
+            else:
+                # Audio-Rate aushandeln (nativ wenn Encoder/Muxer es erlauben)
+                self._negotiate_audio_path(self._stream_muxer())
+
+                # Pipeline erstellen (mit tee wenn Preview vorher lief)
+                if self.preview_was_active_before_stream:
+                    pipeline_str = self._build_combined_pipeline_string()
+                else:
+                    pipeline_str = self._build_pipeline_string()
+
             if self.preview_was_active_before_stream:
-                pipeline_str = self._build_combined_pipeline_string()
                 print("🔹 Nutze kombinierte Pipeline (Stream + Preview)")
-            else:
-                pipeline_str = self._build_pipeline_string()
 
             print(f"🔹 Pipeline: {self._sanitize_pipeline_for_log(pipeline_str)}")
 
             self.pipeline = Gst.parse_launch(pipeline_str)
+            self.audio_mixer.attach(self.pipeline)
+            self.scene_engine.attach(self.pipeline)
+            self.overlay_layer.attach(self.pipeline)
+            self.replay_buffer.attach(self.pipeline)
+            if protocol == 'srt':
+                self.srt_output.attach(self.pipeline)
+            self._attach_av_sync()
 
             # Bus-Watcher für Fehler und EOS einrichten
-            bus = self.pipeline.get_bus()
-            bus.add_signal_watch()
-            bus.connect("message", self._on_bus_message)
+            self._watch_bus(self._on_bus_message, "Warnung")
+            self.meter_timer.start()
+            self.stats_timer.start()
 
             # GStreamer-Thread starten
             self.gst_thread = GStreamerThread()
             self.gst_thread.start()
 
-            # Pipeline starten
+            # Pipeline starten (Geräte öffnen, Verbindung aufbauen: im Worker)
             self.status_signal.emit("🚀 Starte Stream...")
-            ret = self.pipeline.set_state(Gst.State.PLAYING)
-
-            if ret == Gst.StateChangeReturn.FAILURE:
-                self.error_signal.emit("❌ Pipeline konnte nicht gestartet werden!")
-                self._cleanup_pipeline()
-                return False
-
-            self.is_streaming = True
-
-            # Preview ist auch aktiv wenn kombinierte Pipeline
-            if self.preview_was_active_before_stream:
-                self.is_preview_active = True
-                self.status_signal.emit("✅ Stream + Preview laufen!")
-            else:
-                self.status_signal.emit("✅ Stream läuft!")
-
-            self.state_changed_signal.emit("streaming")
+            self.lifecycle.run('start', self.pipeline, Gst.State.PLAYING, self._on_stream_started)
             return True
 
         except Exception as e:
             self.error_signal.emit(f"❌ Fehler beim Stream-Start: {e}")
-            self._cleanup_pipeline()
+            self._abort_start(True, "")
             return False
 
+    def _on_stream_started(self, ok: bool, error: str) -> None:
+        """Ergebnis des Pipeline-Starts aus dem Worker (Qt-Thread)."""
+        if not ok:
+            self.error_signal.emit(f"❌ Pipeline konnte nicht gestartet werden! ({error})")
+            self.lifecycle.run('start_abort', self.pipeline, Gst.State.NULL, self._abort_start)
+            return
+
+        self.lifecycle.set_state(StreamLifecycle.LIVE)
+        took = f" ({self.lifecycle.durations.get('starting→live', 0):.0f} ms)"
+
+        # Preview ist auch aktiv wenn kombinierte Pipeline
+        if self.preview_was_active_before_stream:
+            self.is_preview_active = True
+            self.status_signal.emit(f"✅ Stream + Preview laufen!{took}")
+        else:
+            self.status_signal.emit(f"✅ Stream läuft!{took}")
+
+        # Stopp während des Starts angefordert
+        if self._stop_after_start:
+            self.stop_stream()
+
+    def _abort_start(self, ok: bool, error: str) -> None:
+        """Start fehlgeschlagen: Pipeline abbauen, zurück nach 'idle'."""
+        self._cleanup_pipeline()
+        self.lifecycle.set_state(StreamLifecycle.IDLE)
+
+    @property
+    def is_streaming(self) -> bool:
+        """True solange der Stream nicht 'idle' ist (auch beim Starten/Stoppen)."""
+        return self.lifecycle.state != StreamLifecycle.IDLE
+
     def stop_stream(self) -> bool:
         """
         Stoppt den laufenden Stream.
 
+        Der Abbau läuft im Worker; 'idle' folgt über state_changed_signal.
+        Während des Starts wird der Stopp vorgemerkt.
+
         Returns:
             True bei Erfolg, False bei Fehler
         """
-        if not self.is_streaming:
+        state = self.lifecycle.state
+        if state == StreamLifecycle.IDLE:
             self.error_signal.emit("⚠️ Kein Stream aktiv!")
             return False
 
+        if state == StreamLifecycle.STOPPING:
+            return True
+
+        if state == StreamLifecycle.STARTING:
+            self._stop_after_start = True
+            self.status_signal.emit("⏳ Stopp vorgemerkt (Stream startet noch)")
+            return True
+
         try:
-            self.state_changed_signal.emit("stopping")
+            self.lifecycle.set_state(StreamLifecycle.STOPPING)
+            self.reconnect_timer.stop()
             self.status_signal.emit("🛑 Stoppe Stream...")
 
-            # Pipeline auf NULL setzen
-            if self.pipeline:
-                self.pipeline.set_state(Gst.State.NULL)
+            # Angehängte Aufnahme sauber abschließen (im Worker, vor NULL)
+            self._stop_attached_recording()
 
-            # Cleanup
-            self._cleanup_pipeline()
-
-            self.is_streaming = False
-            self.state_changed_signal.emit("idle")
-            self.status_signal.emit("✅ Stream gestoppt")
+            # Pipeline auf NULL setzen (im Worker)
+            if self.pipeline:
+                self.lifecycle.run('stop', self.pipeline, Gst.State.NULL, self._on_stream_stopped)
+            else:
+                self._on_stream_stopped(True, "")
             return True
 
         except Exception as e:
             self.error_signal.emit(f"❌ Fehler beim Stoppen: {e}")
             return False
 
+    def _on_stream_stopped(self, ok: bool, error: str) -> None:
+        """Pipeline steht (Qt-Thread): aufräumen, zurück nach 'idle'."""
+        if not ok:
+            print(f"⚠️ Pipeline-Stopp: {error}")
+
+        # Cleanup
+        self._cleanup_pipeline()
+
+        self.lifecycle.set_state(StreamLifecycle.IDLE)
+        took = self.lifecycle.durations.get('stopping→idle', 0)
+        self.status_signal.emit(f"✅ Stream gestoppt ({took:.0f} ms)")
+
+    def _on_pipeline_ended(self, kind: str, reconnect: bool) -> None:
+        """
+        Fehler/EOS einer Pipeline (Qt-Thread, über _pipeline_ended).
+
+        Args:
+            kind: 'stream' oder 'preview'
+            reconnect: Verbindungsfehler des Ausgangs → Neuverbindung versuchen
+        """
+        if kind == 'preview':
+            if self.is_preview_active and not self.is_streaming:
+                self.stop_preview()
+            return
+
+        state = self.lifecycle.state
+        if state in (StreamLifecycle.IDLE, StreamLifecycle.STOPPING, StreamLifecycle.RECONNECTING):
+            # Schon auf dem Weg nach unten bzw. Neuverbindung meldet selbst
+            return
+
+        attempts = int(self.config.get('reconnect_attempts', 3))
+        if reconnect and state == StreamLifecycle.LIVE and self._reconnect_attempt < attempts:
+            self._reconnect()
+            return
+
+        self.stop_stream()
+
+    # ==================== NEUVERBINDUNG ====================
+
+    def _reconnect(self) -> None:
+        """Setzt die Pipeline zurück und verbindet nach Backoff neu."""
+        self._reconnect_attempt += 1
+        attempts = int(self.config.get('reconnect_attempts', 3))
+        self.lifecycle.set_state(StreamLifecycle.RECONNECTING)
+        self.status_signal.emit(
+            f"🔁 Verbindung verloren - Neuverbindung {self._reconnect_attempt}/{attempts}..."
+        )
+
+        # Aufnahme vorher abschließen (Neustart würde Segmente überschreiben)
+        self._stop_attached_recording()
+        self.lifecycle.run('reconnect_reset', self.pipeline, Gst.State.NULL, self._on_reconnect_reset)
+
+    def _on_reconnect_reset(self, ok: bool, error: str) -> None:
+        """Pipeline steht: Backoff abwarten (2, 4, 8, ... s)."""
+        if self.lifecycle.state != StreamLifecycle.RECONNECTING:
+            return
+        delay_s = float(self.config.get('reconnect_delay_s', 2)) * 2 ** (self._reconnect_attempt - 1)
+        self.reconnect_timer.start(int(delay_s * 1000))
+
+    def _on_reconnect_timer(self) -> None:
+        """Backoff vorbei: Pipeline im Worker wieder starten."""
+        if self.lifecycle.state != StreamLifecycle.RECONNECTING:
+            return
+        self.lifecycle.run('reconnect', self.pipeline, Gst.State.PLAYING, self._on_reconnected)
+
+    def _on_reconnected(self, ok: bool, error: str) -> None:
+        """Ergebnis einer Neuverbindung (Qt-Thread)."""
+        if self.lifecycle.state != StreamLifecycle.RECONNECTING:
+            return
+
+        if ok:
+            self.lifecycle.set_state(StreamLifecycle.LIVE)
+            took = self.lifecycle.durations.get('reconnecting→live', 0)
+            self.status_signal.emit(f"✅ Stream wieder verbunden ({took / 1000:.1f} s)")
+            return
+
+        if self._reconnect_attempt < int(self.config.get('reconnect_attempts', 3)):
+            self._reconnect()
+            return
+
+        self.error_signal.emit(f"❌ Neuverbindung fehlgeschlagen: {error}")
+        self.stop_stream()
+
+    def _negotiate_audio_path(self, muxer: str = 'flvmux', announce: bool = True) -> None:
+        """
+        Wählt die Audio-Rate: nativ, wenn AAC-Encoder und Muxer sie können.
+
+        Früher wurde immer auf 44.1 kHz resampelt - PipeWire liefert aber
+        48 kHz, also wurde jedes Sample unnötig umgerechnet. Jetzt wird
+        nur resampelt, wenn Encoder oder Container es verlangen.
+
+        Args:
+            muxer: Ziel-Muxer (prüft dessen AAC-Caps)
+            announce: Gewählten Pfad im Stream-Log melden
+        """
+        # Ein pactl-Aufruf für alle Quellen (statt einer pro Quelle und Zweig)
+        self.audio_mixer.load_rates()
+        native_rate = self.audio_mixer.source_rate(self.audio_mixer.get_primary_device())
+
+        candidates = [native_rate] if native_rate else []
+        candidates += [r for r in (48000, 44100) if r != native_rate]
+
+        rate = next(
+            (r for r in candidates if self._audio_rate_supported(r, muxer)),
+            44100
+        )
+
+        self.audio_mixer.mix_rate = rate
+        self.audio_mixer.resample_quality = int(self._setting('audio_resample_quality', 4))
+        if not announce:
+            return
+
+        # Gewählten Pfad im Stream-Log anzeigen
+        resampled = [
+            s['device'] for s in self.audio_mixer.get_sources()
+            if self.audio_mixer.needs_resample(s['device'])
+        ]
+        if native_rate == rate and not resampled:
+            path = f"{rate} Hz nativ → {self.aac_encoder} (ohne Resampling)"
+        elif native_rate == rate:
+            path = (f"{rate} Hz nativ → {self.aac_encoder} "
+                    f"(Resampling nur für: {', '.join(resampled)}, "
+                    f"quality={self.audio_mixer.resample_quality})")
+        else:
+            source_rate = f"{native_rate} Hz" if native_rate else "unbekannte Rate"
+            path = (f"{source_rate} → {rate} Hz (audioresample "
+                    f"quality={self.audio_mixer.resample_quality}) → {self.aac_encoder}")
+
+        self.status_signal.emit(f"🔊 Audio-Pfad: {path}")
+
+    def _audio_rate_supported(self, rate: int, muxer: str) -> bool:
+        """
+        Prüft ob AAC-Encoder und Muxer eine Samplerate akzeptieren.
+
+        Args:
+            rate: Samplerate in Hz
+            muxer: Name der Muxer-Factory
+
+        Returns:
+            True wenn beide Pad-Templates die Rate zulassen
+        """
+        checks = [
+            (self.aac_encoder, f"audio/x-raw,rate={rate}"),
+            (muxer, f"audio/mpeg,mpegversion=4,stream-format=raw,rate={rate}"),
+        ]
+
+        for factory_name, caps_str in checks:
+            factory = Gst.ElementFactory.find(factory_name)
+            if factory is None:
+                return False
+
+            caps = Gst.Caps.from_string(caps_str)
+            sink_templates = [
+                t for t in factory.get_static_pad_templates()
+                if t.direction == Gst.PadDirection.SINK
+            ]
+            if not any(t.get_caps().can_intersect(caps) for t in sink_templates):
+                return False
+
+        return True
+
+    def _build_video_src(self, device: str, width: int, height: int, fps: int) -> str:
+        """
+        Baut den Source-Teil für eine Video-Quelle (Callback der SceneEngine).
+
+        Args:
+            device: 'screen', 'test' oder Device-Pfad
+            width: Benötigte Breite
+            height: Benötigte Höhe
+            fps: Ziel-Framerate
+
+        Returns:
+            Pipeline-Fragment (ohne abschließendes '!')
+        """
+        if device == 'screen':
+            return "pipewiresrc do-timestamp=true"
+        if device == DeviceManager.TEST_SOURCE:
+            return (
+                f"{self.device_manager.get_video_source_element(device)} ! "
+                f"video/x-raw,width={width},height={height},framerate={fps}/1"
+            )
+        return self._build_webcam_src(device, width, height, fps)
+
+    def _build_webcam_src(self, device: str, width: str, height: str, fps: int) -> str:
+        """
+        Baut den Webcam-Source-Teil mit dem günstigsten nativen Modus.
+
+        Ohne festen Modus verhandelt v4l2src oft einen kleinen Modus,
+        den videoscale dann teuer hochskaliert. Mit Capability-Index wird
+        der passende Modus direkt angefordert (MJPEG inkl. Decoder).
+
+        Args:
+            device: Device-Pfad (z.B. '/dev/video0')
+            width: Ziel-Breite
+            height: Ziel-Höhe
+            fps: Ziel-Framerate
+
+        Returns:
+            Pipeline-Fragment (ohne abschließendes '!')
+        """
+        video_src = f"v4l2src device={device}"
+
+        mode = self.device_manager.find_native_mode(device, int(width), int(height), fps)
+        if not mode:
+            return video_src
+
+        print(f"🔹 Nativer Modus: {mode['media']} {mode.get('format') or ''} "
+              f"{mode['width']}x{mode['height']}@{mode['framerate']}")
+
+        video_src += f" ! {self.device_manager.capabilities.mode_to_caps(mode)}"
+        if mode['media'] == 'image/jpeg':
+            video_src += " ! jpegdec"
+
+        # Framerate des Modus kann höher sein als gewünscht
+        if mode['framerate'] != f"{fps}/1":
+            video_src += " ! videorate"
+        return video_src
+
     def _build_pipeline_string(self) -> str:
         """
         Baut die GStreamer-Pipeline-String zusammen (nur Stream).
@@ -258,45 +755,37 @@ class StreamManager(QObject):
         config = self.current_config
         width, height = config['resolution'].split('x')
 
-        # Video-Source
-        if config['video_source'] == 'screen':
-            video_src = "pipewiresrc media-type=video/source/screen"
-        else:
-            video_src = f"v4l2src device={config['video_source']}"
-
-        # Audio-Source
-        if config['audio_source'] == 'monitor':
-            audio_src = "pulsesrc"
-        else:
-            audio_src = "autoaudiosrc"
-
-        # RTMP-Location (URL + Key)
-        rtmp_location = f"{config['rtmp_url']}/{config['stream_key']}"
+        # Video-Stage (direkte Quelle oder compositor mit allen Szenen-Quellen)
+        video_stage = self.scene_engine.build_video_stage(
+            int(width), int(height), config['fps']
+        )
 
         # Pipeline zusammenbauen
         pipeline = (
-            # Video-Branch
-            f"{video_src} ! "
-            f"videoconvert ! "
-            f"videoscale ! "
-            f"video/x-raw,width={width},height={height},framerate={config['fps']}/1 ! "
-            f"x264enc bitrate={config['bitrate']} speed-preset=ultrafast tune=zerolatency ! "
-            f"video/x-h264,profile=baseline ! "
+            # Video-Branch (Overlays vor dem Encoder, tee für Aufnahme-Zweige)
+            f"{video_stage} ! "
+            f"{self.overlay_layer.build_stage()}"
+            f"tee name={self.RAW_VIDEO_TEE} ! queue ! "
+            f"{self._build_video_encoder_stage()}"
+            f"{self.replay_buffer.build_video_tap()}"
             f"queue max-size-buffers=0 max-size-time=0 max-size-bytes=0 ! "
-            f"mux. "
+            f"{self._mux_pad('video')} "
 
-            # Audio-Branch
-            f"{audio_src} ! "
+            # Audio-Branch (Mixer → Encoder, Rate siehe _negotiate_audio_path)
+            f"{self.audio_mixer.build_stage()} ! "
+            f"tee name={self.RAW_AUDIO_TEE} ! queue ! "
             f"audioconvert ! "
-            f"audioresample ! "
-            f"audio/x-raw,rate=44100,channels=2 ! "
+            f"{self.audio_mixer.mix_caps} ! "
             f"{self.aac_encoder} bitrate=128000 ! "
+            f"{self.replay_buffer.build_audio_tap()}"
             f"queue max-size-buffers=0 max-size-time=0 max-size-bytes=0 ! "
-            f"mux. "
+            f"{self._mux_pad('audio')} "
 
-            # Muxer & RTMP Sink
-            f"flvmux name=mux streamable=true ! "
-            f"rtmpsink location=\"{rtmp_location}\""
+            # Audio-Quellen → Mixer
+            f"{self.audio_mixer.build_source_branches()}"
+
+            # Muxer & Sink (RTMP oder SRT)
+            f"{self._build_output_stage()}"
         )
 
         return pipeline
@@ -311,56 +800,78 @@ class StreamManager(QObject):
         config = self.current_config
         width, height = config['resolution'].split('x')
 
-        # Video-Source
-        if config['video_source'] == 'screen':
-            video_src = "pipewiresrc do-timestamp=true"
-        else:
-            video_src = f"v4l2src device={config['video_source']}"
-
-        # Audio-Source
-        if config['audio_source'] == 'monitor':
-            audio_src = "pulsesrc"
-        else:
-            audio_src = "autoaudiosrc"
-
-        # RTMP-Location
-        rtmp_location = f"{config['rtmp_url']}/{config['stream_key']}"
+        # Video-Stage (direkte Quelle oder compositor mit allen Szenen-Quellen)
+        video_stage = self.scene_engine.build_video_stage(
+            int(width), int(height), config['fps']
+        )
 
         # Kombinierte Pipeline mit tee
         pipeline = (
-            # Video-Source → tee aufteilen
-            f"{video_src} ! "
-            f"videoconvert ! "
-            f"videoscale ! "
-            f"video/x-raw,width={width},height={height},framerate={config['fps']}/1 ! "
-            f"tee name=t "
+            # Video-Stage → Overlays → tee aufteilen
+            f"{video_stage} ! "
+            f"{self.overlay_layer.build_stage()}"
+            f"tee name={self.RAW_VIDEO_TEE} "
 
             # Preview-Zweig
-            f"t. ! queue ! autovideosink "
+            f"{self.RAW_VIDEO_TEE}. ! queue ! autovideosink "
 
             # Stream-Zweig
-            f"t. ! queue ! "
-            f"x264enc bitrate={config['bitrate']} speed-preset=ultrafast tune=zerolatency ! "
-            f"video/x-h264,profile=baseline ! "
+            f"{self.RAW_VIDEO_TEE}. ! queue ! "
+            f"{self._build_video_encoder_stage()}"
+            f"{self.replay_buffer.build_video_tap()}"
             f"queue max-size-buffers=0 max-size-time=0 max-size-bytes=0 ! "
-            f"mux. "
+            f"{self._mux_pad('video')} "
 
-            # Audio-Branch
-            f"{audio_src} ! "
+            # Audio-Branch (Mixer → Encoder, Rate siehe _negotiate_audio_path)
+            f"{self.audio_mixer.build_stage()} ! "
+            f"tee name={self.RAW_AUDIO_TEE} ! queue ! "
             f"audioconvert ! "
-            f"audioresample ! "
-            f"audio/x-raw,rate=44100,channels=2 ! "
+            f"{self.audio_mixer.mix_caps} ! "
             f"{self.aac_encoder} bitrate=128000 ! "
+            f"{self.replay_buffer.build_audio_tap()}"
             f"queue max-size-buffers=0 max-size-time=0 max-size-bytes=0 ! "
-            f"mux. "
+            f"{self._mux_pad('audio')} "
 
-            # Muxer & RTMP Sink
-            f"flvmux name=mux streamable=true ! "
-            f"rtmpsink location=\"{rtmp_location}\""
+            # Audio-Quellen → Mixer
+            f"{self.audio_mixer.build_source_branches()}"
+
+            # Muxer & Sink (RTMP oder SRT)
+            f"{self._build_output_stage()}"
         )
 
         return pipeline
 
+    def _build_output_stage(self) -> str:
+        """
+        Baut Muxer und Sink für das Stream-Ziel.
+
+        Returns:
+            "flvmux ! rtmpsink" (URL + Key) oder "mpegtsmux ! srtsink" (SRT)
+        """
+        config = self.current_config
+        if config.get('protocol') == 'srt':
+            return self.srt_output.build_stage(config['rtmp_url'], config['stream_key'])
+
+        rtmp_location = f"{config['rtmp_url']}/{config['stream_key']}"
+        return (
+            f"{self._stream_muxer()} name=mux streamable=true ! "
+            f"rtmpsink location=\"{rtmp_location}\""
+        )
+
+    def _stream_muxer(self) -> str:
+        """Muxer-Factory des Stream-Ziels (SRT: MPEG-TS, RTMP: FLV je nach Codec)."""
+        if self.current_config.get('protocol') == 'srt':
+            return 'mpegtsmux'
+        codec = self.current_config.get('video_codec', 'h264')
+        return self.VIDEO_CODECS.get(codec, self.VIDEO_CODECS['h264'])['flvmux']
+
+    def _mux_pad(self, kind: str) -> str:
+        """Verknüpfungsziel am Muxer ('video'/'audio'); mpegtsmux mit festen PIDs."""
+        if self.current_config.get('protocol') == 'srt':
+            pad = SrtOutput.VIDEO_PAD if kind == 'video' else SrtOutput.AUDIO_PAD
+            return f"mux.{pad}"
+        return "mux."
+
     def _sanitize_pipeline_for_log(self, pipeline: str) -> str:
         """
         Entfernt Stream-Key aus Pipeline-String für Logs.
@@ -373,16 +884,20 @@ class StreamManager(QObject):
         Returns:
             Pipeline-String mit verstecktem Stream-Key
         """
-        if 'stream_key' in self.current_config:
+        if self.current_config.get('stream_key'):
             key = self.current_config['stream_key']
-            return pipeline.replace(key, "***HIDDEN***")
+            pipeline = pipeline.replace(key, "***HIDDEN***")
+        if self.srt_output.passphrase:
+            pipeline = pipeline.replace(self.srt_output.passphrase, "***HIDDEN***")
         return pipeline
 
     def _on_bus_message(self, bus: Gst.Bus, message: Gst.Message) -> bool:
         """
         Callback für GStreamer-Bus-Messages.
 
-        Verarbeitet Fehler, Warnungen, EOS, State-Changes.
+        Verarbeitet Fehler, EOS, State-Changes (Warnungen zählt und
+        meldet der BusDispatcher gebündelt). Stopp bzw. Neuverbindung
+        laufen über _pipeline_ended im Qt-Thread, nie direkt aus dem Watcher.
 
         Args:
             bus: GStreamer-Bus
@@ -393,20 +908,19 @@ class StreamManager(QObject):
         """
         msg_type = message.type
 
+        # Fehler im Aufnahme-Zweig beenden nur die Aufnahme
+        if self._handle_recording_branch_error(message):
+            return True
+
         if msg_type == Gst.MessageType.ERROR:
             err, debug = message.parse_error()
             self.error_signal.emit(f"❌ GStreamer-Fehler: {err.message}")
             print(f"🔹 Debug: {debug}")
-            self.stop_stream()
-
-        elif msg_type == Gst.MessageType.WARNING:
-            warn, debug = message.parse_warning()
-            self.status_signal.emit(f"⚠️ Warnung: {warn.message}")
-            print(f"🔹 Debug: {debug}")
+            self._pipeline_ended.emit('stream', self._is_output_error(message))
 
         elif msg_type == Gst.MessageType.EOS:
             self.status_signal.emit("ℹ️ Stream beendet (EOS)")
-            self.stop_stream()
+            self._pipeline_ended.emit('stream', False)
 
         elif msg_type == Gst.MessageType.STATE_CHANGED:
             if message.src == self.pipeline:
@@ -415,12 +929,241 @@ class StreamManager(QObject):
 
         return True
 
+    def _is_output_error(self, message: Gst.Message) -> bool:
+        """True wenn der Fehler vom Ausgang kommt (Verbindung verloren)."""
+        src = message.src
+        if not isinstance(src, Gst.Element) or src.get_factory() is None:
+            return False
+        return src.get_factory().get_name() in self.OUTPUT_SINKS
+
+    def set_metering(self, level_interval_ms: int = 50, ui_rate_hz: int = 15) -> None:
+        """
+        Konfiguriert die Audio-Pegelmessung.
+
+        Args:
+            level_interval_ms: Messintervall der level-Elemente (wirkt ab nächstem Start)
+            ui_rate_hz: Update-Rate der Pegel an die UI
+        """
+        self.audio_mixer.level_interval_ms = max(10, level_interval_ms)
+        self.meter_timer.setInterval(int(1000 / max(1, ui_rate_hz)))
+
+    def _watch_bus(self, on_message, label: str) -> None:
+        """
+        Hängt den BusDispatcher an die aktuelle Pipeline.
+
+        level-Messages landen direkt im LevelMeter, Segment-Messages in der
+        RecordingEngine, Warnungen/QoS werden gezählt - nur Fehler, EOS und
+        State-Changes der Pipeline erreichen on_message. Der läuft über
+        add_signal_watch() in der GLib-Main-Loop (GStreamerThread), nicht
+        im Qt-Thread: Qt-Zustand nur über Queued-Signals ändern.
+
+        Args:
+            on_message: Bus-Watcher der Pipeline
+            label: Präfix der gebündelten Warnungen
+        """
+        self.bus_dispatcher.attach(self.pipeline, on_message, label)
+        self.bus_timer.start()
+
+    def _unwatch_bus(self) -> None:
+        """Löst den BusDispatcher von der aktuellen Pipeline."""
+        self.bus_timer.stop()
+        self.bus_dispatcher.detach(self.pipeline)
+
+    def _keyframe_distance(self) -> int:
+        """Keyframe-Abstand in Frames (Settings: Keyframe-Intervall in Sekunden)."""
+        fps = int(self.current_config.get('fps', 30))
+        return max(1, fps * int(self._setting('keyframe_interval', 2)))
+
+    # x264-Presets (Settings-Tab zeigt sie mit Zusatztext, z.B. "superfast (Empfohlen)")
+    X264_PRESETS = ('ultrafast', 'superfast', 'veryfast', 'faster', 'fast', 'medium', 'slow')
+
+    # Video-Codecs: Encoder und FLV-Muxer (HEVC nur per Enhanced RTMP)
+    VIDEO_CODECS = {
+        'h264': {'encoder': 'x264enc', 'flvmux': 'flvmux'},
+        'hevc': {'encoder': 'x265enc', 'flvmux': 'eflvmux'},
+    }
+
+    def _check_video_codec(self, codec: str, protocol: str) -> Optional[str]:
+        """
+        Prüft ob Codec und passender Muxer verfügbar sind.
+
+        Returns:
+            Fehlermeldung oder None
+        """
+        if codec not in self.VIDEO_CODECS:
+            return f"Unbekannter Video-Codec: {codec}"
+        elements = self.VIDEO_CODECS[codec]
+        if Gst.ElementFactory.find(elements['encoder']) is None:
+            return f"{elements['encoder']} nicht verfügbar (gst-plugins-bad/ugly installieren)"
+        if protocol == 'rtmp' and Gst.ElementFactory.find(elements['flvmux']) is None:
+            return f"{codec.upper()} über RTMP benötigt {elements['flvmux']} (Enhanced RTMP, GStreamer ≥ 1.26)"
+        return None
+
+    @staticmethod
+    def build_video_encoder(
+        codec: str,
+        bitrate: int,
+        preset: str,
+        key_int_max: int,
+        threads: int = 0,
+        name: str = SceneEngine.ENCODER_NAME
+    ) -> str:
+        """
+        Baut den Encoder-Teil des Stream-Zweigs.
+
+        Args:
+            codec: 'h264' (x264enc, Baseline-Profil) oder 'hevc' (x265enc)
+            bitrate: Video-Bitrate in kbps
+            preset: x264/x265-Preset (gleiche Namen)
+            key_int_max: Keyframe-Abstand in Frames
+            threads: Encoder-Threads (0 = automatisch)
+            name: Element-Name (SceneEngine fordert darüber Keyframes an)
+
+        Returns:
+            Pipeline-Fragment "...enc ... ! " (codierter Stream)
+        """
+        if codec == 'hevc':
+            encoder = (
+                f"x265enc name={name} bitrate={bitrate} speed-preset={preset} "
+                f"tune=zerolatency key-int-max={key_int_max}"
+            )
+            if threads > 0:
+                encoder += f" option-string=\"pools={threads}\""
+            # Parameter-Sets an jedem Keyframe (Einstieg mitten im Stream)
+            return f"{encoder} ! h265parse config-interval=-1 ! "
+
+        encoder = (
+            f"x264enc name={name} bitrate={bitrate} speed-preset={preset} "
+            f"tune=zerolatency key-int-max={key_int_max}"
+        )
+        if threads > 0:
+            encoder += f" threads={threads}"
+        return f"{encoder} ! video/x-h264,profile=baseline ! "
+
+    def _build_video_encoder_stage(self) -> str:
+        """Encoder-Teil mit Codec, Preset und Threads (Settings: Performance)."""
+        preset = str(self._setting('encoder_preset', 'superfast')).split()[0]
+        if preset not in self.X264_PRESETS:
+            preset = 'superfast'
+
+        return self.build_video_encoder(
+            self.current_config.get('video_codec', 'h264'),
+            self.current_config['bitrate'],
+            preset,
+            self._keyframe_distance(),
+            int(self._setting('encoder_threads', 0))
+        )
+
+    def save_replay(self) -> bool:
+        """
+        Speichert die letzten Sekunden des Streams (ohne Re-Encoding).
+
+        Der Live-Stream läuft unverändert weiter; geschrieben wird im
+        Hintergrund. Das Ergebnis kommt über status_signal/error_signal.
+
+        Returns:
+            True wenn das Speichern gestartet wurde
+        """
+        output_dir = os.path.expanduser(self.config.get('recording_path', '~/Videos'))
+        container = 'mp4' if self.config.get('recording_format', '').startswith('MP4') else 'mkv'
+
+        def on_done(filepath: Optional[str], error: Optional[str]) -> None:
+            if error:
+                self.error_signal.emit(f"❌ Replay konnte nicht gespeichert werden: {error}")
+            else:
+                self.status_signal.emit(f"✅ Replay gespeichert: {filepath}")
+
+        duration = self.replay_buffer.get_duration()
+        if self.replay_buffer.save(output_dir, container, on_done) is None:
+            self.error_signal.emit("⚠️ Replay-Buffer ist leer")
+            return False
+
+        self.status_signal.emit(f"⏪ Speichere Replay ({duration:.0f}s)...")
+        return True
+
+    def switch_scene(self, name: str) -> bool:
+        """
+        Schaltet die Szene um - live, ohne Pipeline-Rebuild.
+
+        Args:
+            name: Szenen-Name (aus start_stream(scenes=...))
+
+        Returns:
+            True wenn die Szene existiert
+        """
+        if not self.scene_engine.switch_scene(name):
+            self.error_signal.emit(f"❌ Unbekannte Szene: {name}")
+            return False
+
+        self.status_signal.emit(f"🎬 Szene: {name}")
+        return True
+
+    def _attach_av_sync(self) -> None:
+        """Hängt die A/V-Sync-Messung an den Muxer der Pipeline."""
+        self.av_sync.auto_correct = bool(self.config.get('av_sync_auto', True))
+        self.av_sync.manual_offset_ms = float(self.config.get('av_audio_offset_ms', 0))
+
+        pad_kinds = None
+        if self.current_config.get('protocol') == 'srt':
+            pad_kinds = {SrtOutput.VIDEO_PAD: 'video', SrtOutput.AUDIO_PAD: 'audio'}
+
+        mux = self.pipeline.get_by_name('mux') if self.pipeline else None
+        if mux is None or not self.av_sync.attach(mux, pad_kinds):
+            print("⚠️ A/V-Sync-Messung nicht verfügbar (Muxer-Pads nicht gefunden)")
+
+    def set_audio_offset(self, offset_ms: float) -> None:
+        """
+        Setzt den manuellen Audio-Versatz gegenüber Video (live).
+
+        Args:
+            offset_ms: Versatz in ms (positiv = Audio später)
+        """
+        self.config.set('av_audio_offset_ms', offset_ms)
+        self.av_sync.set_manual_offset(offset_ms)
+
+    def _on_stats_tick(self) -> None:
+        """Timer-Callback (Qt-Thread, 1 Hz): periodische Auswertungen."""
+        if self.lifecycle.state == StreamLifecycle.LIVE:
+            self.av_sync.tick()
+            if self.current_config.get('protocol') == 'srt':
+                self._srt_stats = self.srt_output.get_stats()
+            # Stabil verbunden → Neuverbindungen zählen wieder von vorn
+            if self._reconnect_attempt and self.lifecycle.state_age() > self.RECONNECT_STABLE_S:
+                self._reconnect_attempt = 0
+
+        if self.is_recording:
+            stats = self.recording_engine.get_stats()
+            self._recording_stats = stats
+            self.recording_stats_signal.emit(stats)
+            if stats['disk_low'] and not self._disk_low_warned:
+                self._disk_low_warned = True
+                free_gb = stats['disk_free_bytes'] / (1024 ** 3)
+                self.error_signal.emit(f"⚠️ Wenig Speicherplatz für die Aufnahme: {free_gb:.1f} GB frei")
+        elif not self.is_streaming:
+            self.stats_timer.stop()
+
+    def _emit_levels(self) -> None:
+        """Timer-Callback (Qt-Thread): liefert gesammelte Pegel an die UI."""
+        levels = self.level_meter.flush()
+        if levels:
+            self.levels_signal.emit(levels)
+
     def _cleanup_pipeline(self) -> None:
         """Räumt Pipeline und Thread auf."""
+        self.audio_mixer.detach()
+        self.scene_engine.detach()
+        self.overlay_layer.detach()
+        self.replay_buffer.detach()
+        self.srt_output.detach()
+        self._srt_stats = {}
+        self.av_sync.detach()
+        self.meter_timer.stop()
+        self.stats_timer.stop()
+        self.level_meter.flush()
+
         # Bus-Watcher entfernen
         if self.pipeline:
-            bus = self.pipeline.get_bus()
-            bus.remove_signal_watch()
+            self._unwatch_bus()
 
         # GStreamer-Thread stoppen
         if self.gst_thread and self.gst_thread.isRunning():
@@ -446,12 +1189,390 @@ class StreamManager(QObject):
 
         # TODO: Implementiere Stats-Extraktion aus Pipeline
         # Für Phase 2: Basis-Return
-        return {
+        stats = {
             'is_streaming': True,
             'resolution': self.current_config.get('resolution', 'unknown'),
             'bitrate': self.current_config.get('bitrate', 0),
         }
 
+        # A/V-Sync (Drift seit Stream-Start, aktuelle Korrektur)
+        stats.update(self.av_sync.get_stats())
+
+        # Replay-Buffer (gepufferte Dauer, Speicher)
+        stats['replay_seconds'] = round(self.replay_buffer.get_duration(), 1)
+        stats['replay_memory_mb'] = round(self.replay_buffer.get_memory_bytes() / (1024 * 1024), 1)
+
+        # SRT (RTT, Neuübertragungen, Sendepuffer)
+        stats.update(self._srt_stats)
+
+        # Bus (gezählte Warnungen, QoS-Events, verworfene Buffer)
+        stats.update(self.bus_dispatcher.get_stats())
+
+        # Lebenszyklus (Zustand, Dauer der letzten Übergänge/Befehle in ms)
+        stats['state'] = self.lifecycle.state
+        stats['reconnect_attempt'] = self._reconnect_attempt
+        for name, ms in self.lifecycle.durations.items():
+            stats[f"lifecycle_{name.replace('→', '_to_')}_ms"] = ms
+
+        # Aufnahme (Schreib-Durchsatz, Platten-Reserve)
+        if self.is_recording:
+            stats.update(self._recording_stats)
+        return stats
+
+    # ==================== PIPELINE-PLÄNE (PROFILE) ====================
+
+    # Einstellungen, die in die Pipeline-Beschreibung eingehen
+    PLAN_CONFIG_KEYS = (
+        'encoder_preset', 'encoder_threads', 'keyframe_interval',
+        'audio_resample_quality', 'srt_mode', 'srt_latency_ms',
+    )
+
+    def compile_plan(
+        self,
+        name: str,
+        video_source: str,
+        audio_source: str,
+        rtmp_url: str,
+        stream_key: str,
+        resolution: str = "1280x720",
+        bitrate: int = 2500,
+        fps: int = 30,
+        scenes: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        initial_scene: Optional[str] = None,
+        video_codec: str = 'h264',
+        settings: Optional[Dict[str, Any]] = None,
+        probe: Optional[Dict[str, Any]] = None,
+        validate: bool = True
+    ) -> Optional[PipelinePlan]:
+        """
+        Plant und prüft die Stream-Pipeline eines Profils vorab.
+
+        Erledigt die Planungsarbeit von start_stream() - Audio-Rate
+        aushandeln, nativen Kamera-Modus wählen, Beschreibung bauen - und
+        prüft das Element-Netz mit Gst.parse_launch(), ohne etwas zu
+        starten. Der Plan landet im plan_cache; start_stream() mit
+        denselben Eingaben übernimmt ihn ohne erneute Planung.
+
+        Geräte-Abfragen (probe_plan_devices) und Prüfung (validate_plan)
+        können vorher bzw. danach in einem Worker laufen - im Qt-Thread
+        bleibt dann nur der Bau der Beschreibung.
+
+        Args:
+            name: Profil-Name
+            settings: Encoder-/SRT-Einstellungen des Profils (PLAN_CONFIG_KEYS,
+                      fehlende aus der Config)
+            probe: Ergebnis von probe_plan_devices() (None = hier abfragen)
+            validate: Sofort prüfen und ablegen (False: Aufrufer ruft
+                      validate_plan() und store_plan())
+            Rest: wie start_stream()
+
+        Returns:
+            Plan (bei Fehler mit plan.error) oder None, wenn gerade eine
+            Pipeline läuft (Planen verändert kurz Mixer- und Szenen-Zustand)
+        """
+        if self._planning_blocked():
+            return None
+
+        started = time.monotonic()
+        descriptions: Dict[str, str] = {}
+        video_mode = None
+        error = None
+        encoder = ""
+        plan_rate = self.audio_mixer.mix_rate
+        try:
+            with self._planning(
+                video_source, audio_source, rtmp_url, stream_key, resolution,
+                bitrate, fps, scenes, initial_scene, video_codec, settings, probe
+            ) as protocol:
+                encoder = self._encoder_summary(video_codec, bitrate)
+
+                # Gleiche Prüfungen wie beim Start
+                if protocol == 'srt':
+                    self.srt_output.mode = self._setting('srt_mode', 'caller')
+                    self.srt_output.latency_ms = int(self._setting('srt_latency_ms', 200))
+                    self.srt_output.passphrase = self.config.get_srt_passphrase()
+                    error = self.srt_output.validate()
+                error = error or self._check_video_codec(video_codec, protocol)
+
+                if error is None:
+                    self._negotiate_audio_path(self._stream_muxer(), announce=False)
+                    plan_rate = self.audio_mixer.mix_rate
+                    descriptions = {
+                        'stream': self._build_pipeline_string(),
+                        'combined': self._build_combined_pipeline_string(),
+                    }
+                    if video_source.startswith('/dev/'):
+                        width, height = resolution.split('x')
+                        video_mode = self.device_manager.find_native_mode(
+                            video_source, int(width), int(height), fps
+                        )
+
+                key = PipelinePlanCache.make_key(self._plan_inputs(scenes, initial_scene))
+
+        except Exception as e:
+            error = f"Pipeline ungültig: {e}"
+            key = ""
+
+        plan = PipelinePlan(
+            name, key, descriptions if error is None else {},
+            plan_rate,
+            video_mode=video_mode,
+            encoder=encoder,
+            error=error,
+            compile_ms=(time.monotonic() - started) * 1000 + (probe or {}).get('probe_ms', 0.0)
+        )
+        if validate:
+            self.store_plan(self.validate_plan(plan))
+        return plan
+
+    def schedule_plan(self, name: str, **inputs: Any) -> bool:
+        """
+        Plant ein Profil im Hintergrund (Eingaben wie compile_plan()).
+
+        Profile, deren Plan noch zu den Eingaben passt, werden
+        übersprungen. Sonst laufen Geräte-Abfragen und Prüfung in
+        Worker-Threads; im Qt-Thread bleibt nur der Bau der Beschreibung
+        (Mixer und Szenen werden dafür kurz umgestellt). Das Ende meldet
+        plan_signal.
+
+        Args:
+            name: Profil-Name
+            inputs: Argumente von compile_plan() (ohne probe/validate)
+
+        Returns:
+            True wenn geplant wird (plan_signal folgt), False wenn
+            übersprungen oder gerade eine Pipeline läuft
+        """
+        if self._planning_blocked():
+            return False
+
+        video_sources = [inputs['video_source']] + [
+            layer['source'] for layers in (inputs.get('scenes') or {}).values() for layer in layers
+        ]
+        # Ohne bekannte Kamera-Identität würde plan_key() auf v4l2-ctl warten
+        if all(
+            self.device_manager.capabilities.is_identified(device)
+            for device in video_sources if device.startswith('/dev/')
+        ):
+            if self.plan_cache.is_current(name, self.plan_key(**inputs)):
+                return False
+
+        audio_source = inputs['audio_source']
+        threading.Thread(
+            target=lambda: self._plan_probed.emit(
+                name, inputs, self.probe_plan_devices(video_sources, audio_source)
+            ),
+            name=f"plan-probe-{name}",
+            daemon=True
+        ).start()
+        return True
+
+    def _on_plan_probed(self, name: str, inputs: Dict[str, Any], probe: Dict[str, Any]) -> None:
+        """Baut den Plan mit den abgefragten Geräte-Daten (Qt-Thread), prüft im Worker."""
+        plan = self.compile_plan(name, probe=probe, validate=False, **inputs)
+        if plan is None:
+            # Inzwischen läuft eine Pipeline - Neustart beim Übergang nach "idle"
+            self.plan_signal.emit(name)
+            return
+        threading.Thread(
+            target=lambda: self._plan_validated.emit(self.validate_plan(plan)),
+            name=f"plan-validate-{name}",
+            daemon=True
+        ).start()
+
+    def _on_plan_validated(self, plan: PipelinePlan) -> None:
+        """Legt den geprüften Plan ab (Qt-Thread)."""
+        self.store_plan(plan)
+        self.plan_signal.emit(plan.name)
+
+    def plan_key(
+        self,
+        video_source: str,
+        audio_source: str,
+        rtmp_url: str,
+        stream_key: str,
+        resolution: str = "1280x720",
+        bitrate: int = 2500,
+        fps: int = 30,
+        scenes: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        initial_scene: Optional[str] = None,
+        video_codec: str = 'h264',
+        settings: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """
+        Fingerabdruck, den compile_plan() für diese Eingaben erzeugen würde.
+
+        Ohne Geräte-Abfragen und Pipeline-Bau - zum Überspringen von
+        Profilen, deren Plan noch gilt (PipelinePlanCache.is_current).
+
+        Returns:
+            Key oder None, wenn gerade eine Pipeline läuft
+        """
+        if self._planning_blocked():
+            return None
+        with self._planning(
+            video_source, audio_source, rtmp_url, stream_key, resolution,
+            bitrate, fps, scenes, initial_scene, video_codec, settings
+        ):
+            return PipelinePlanCache.make_key(self._plan_inputs(scenes, initial_scene))
+
+    def probe_plan_devices(self, video_sources: List[str], audio_source: str) -> Dict[str, Any]:
+        """
+        Geräte-Abfragen eines Plans (Worker-Thread, blockiert auf pactl/v4l2).
+
+        Native Audio-Raten aller Quellen des Mixes; Webcams werden in den
+        Capability-Index aufgenommen, damit compile_plan() den Kamera-Modus
+        ohne Enumeration wählt.
+
+        Args:
+            video_sources: Video-Quellen des Profils (inkl. Szenen)
+            audio_source: Hauptquelle des Profils
+
+        Returns:
+            Dict für compile_plan(probe=...) mit 'audio_rates', 'probe_ms'
+        """
+        started = time.monotonic()
+        devices = {audio_source} | {
+            s['device'] for s in self.audio_mixer.get_sources() if s['id'] != AudioMixer.PRIMARY_ID
+        }
+        rates = self.device_manager.get_audio_source_rates(sorted(devices))
+        for device in set(video_sources):
+            if device.startswith('/dev/'):
+                self.device_manager.capabilities.ensure_device(device)
+        return {'audio_rates': rates, 'probe_ms': (time.monotonic() - started) * 1000}
+
+    @staticmethod
+    def validate_plan(plan: PipelinePlan) -> PipelinePlan:
+        """
+        Prüft das Element-Netz eines Plans (beliebiger Thread).
+
+        Gst.parse_launch() prüft, ob alle Elemente vorhanden und die
+        Links möglich sind - es startet nichts.
+        """
+        if plan.error is not None:
+            return plan
+        started = time.monotonic()
+        try:
+            for description in plan.descriptions.values():
+                Gst.parse_launch(description).set_state(Gst.State.NULL)
+        except Exception as e:
+            plan.error = f"Pipeline ungültig: {e}"
+            plan.descriptions = {}
+        plan.compile_ms += (time.monotonic() - started) * 1000
+        return plan
+
+    def store_plan(self, plan: PipelinePlan) -> None:
+        """Legt einen (geprüften) Plan im plan_cache ab."""
+        self.plan_cache.put(plan)
+        print(f"🔹 Profil '{plan.name}': {plan.summary()}")
+
+    def _planning_blocked(self) -> bool:
+        """True solange eine Pipeline läuft oder ein Übergang ansteht."""
+        return self.pipeline is not None or self.is_recording or self.lifecycle.is_transitioning()
+
+    @contextlib.contextmanager
+    def _planning(
+        self,
+        video_source: str,
+        audio_source: str,
+        rtmp_url: str,
+        stream_key: str,
+        resolution: str,
+        bitrate: int,
+        fps: int,
+        scenes: Optional[Dict[str, List[Dict[str, Any]]]],
+        initial_scene: Optional[str],
+        video_codec: str,
+        settings: Optional[Dict[str, Any]],
+        probe: Optional[Dict[str, Any]] = None
+    ) -> Iterator[str]:
+        """
+        Setzt Config, Mixer und Szenen vorübergehend auf die Eingaben eines Profils.
+
+        Yields:
+            Protokoll ('rtmp' oder 'srt')
+        """
+        protocol = 'srt' if SrtOutput.is_srt_url(rtmp_url) else 'rtmp'
+        saved_config = self.current_config
+        had_primary = AudioMixer.PRIMARY_ID in self.audio_mixer.sources
+        saved_primary = self.audio_mixer.get_primary_device()
+        saved_rate = self.audio_mixer.mix_rate
+        self._plan_settings = {
+            key: value for key, value in (settings or {}).items() if key in self.PLAN_CONFIG_KEYS
+        }
+        try:
+            self.current_config = {
+                'video_source': video_source,
+                'audio_source': audio_source,
+                'rtmp_url': rtmp_url,
+                # RTMP startet nie ohne Key, SRT optional (Stream-ID)
+                'stream_key': PipelinePlan.STREAM_KEY_PLACEHOLDER if stream_key or protocol == 'rtmp' else "",
+                'resolution': resolution,
+                'bitrate': bitrate,
+                'fps': fps,
+                'protocol': protocol,
+                'video_codec': video_codec
+            }
+            if probe is not None:
+                self.audio_mixer.known_rates = dict(probe['audio_rates'])
+            self.audio_mixer.set_primary_source(audio_source)
+            if scenes:
+                self.scene_engine.set_scenes(scenes, initial_scene)
+            else:
+                self.scene_engine.set_single_source(video_source)
+            yield protocol
+        finally:
+            self.current_config = saved_config
+            self._plan_settings = {}
+            self.audio_mixer.known_rates = {}
+            if had_primary:
+                self.audio_mixer.set_primary_source(saved_primary)
+            else:
+                self.audio_mixer.remove_source(AudioMixer.PRIMARY_ID)
+            self.audio_mixer.mix_rate = saved_rate
+
+    def _plan_inputs(
+        self,
+        scenes: Optional[Dict[str, List[Dict[str, Any]]]],
+        initial_scene: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Alles, wovon die Pipeline-Beschreibung abhängt (Plan-Fingerabdruck).
+
+        Nicht enthalten: Gains (setzt AudioMixer.attach() live) und der
+        Stream-Key selbst (steht als Platzhalter im Plan).
+        """
+        stream = {k: v for k, v in self.current_config.items() if k != 'stream_key'}
+        video_source = stream.get('video_source', '')
+        camera = None
+        if video_source.startswith('/dev/'):
+            camera = self.device_manager.capabilities.get_identity(video_source)
+
+        return {
+            'stream': stream,
+            'has_stream_key': bool(self.current_config.get('stream_key')),
+            'settings': {key: self._setting(key) for key in self.PLAN_CONFIG_KEYS},
+            'srt_passphrase': self.config.get_srt_passphrase() if stream.get('protocol') == 'srt' else "",
+            'audio_sources': sorted((s['id'], s['device']) for s in self.audio_mixer.get_sources()),
+            'scenes': scenes,
+            'initial_scene': initial_scene,
+            'camera': camera,
+            'replay': self.replay_buffer.enabled,
+            'level_interval_ms': self.audio_mixer.level_interval_ms,
+            'aac_encoder': self.aac_encoder,
+        }
+
+    def _setting(self, key: str, default: Any = None) -> Any:
+        """Einstellung für den Pipeline-Bau (beim Vorplanen gelten die Profil-Werte)."""
+        if key in self._plan_settings:
+            return self._plan_settings[key]
+        return self.config.get(key, default)
+
+    def _encoder_summary(self, codec: str, bitrate: int) -> str:
+        """Encoder-Parameter eines Plans (Anzeige)."""
+        preset = str(self._setting('encoder_preset', 'superfast')).split()[0]
+        return f"{self.VIDEO_CODECS.get(codec, {}).get('encoder', codec)} {bitrate} kbps {preset}"
+
     # ==================== PREVIEW FUNKTIONEN ====================
 
     def start_preview(
@@ -464,6 +1585,7 @@ class StreamManager(QObject):
         Startet lokale Video-Preview in separatem Fenster.
 
         Wenn Stream läuft: Ignoriert (Preview läuft schon via kombinierte Pipeline).
+        Der Start selbst läuft im Worker; während eines Übergangs wird vorgemerkt.
 
         Args:
             video_source: Video-Quelle ('screen' oder '/dev/videoX')
@@ -473,10 +1595,19 @@ class StreamManager(QObject):
         Returns:
             True bei Erfolg, False bei Fehler
         """
+        if self.lifecycle.is_transitioning():
+            self.lifecycle.defer(lambda: self.start_preview(video_source, resolution, fps))
+            return True
+
         if self.is_preview_active:
             self.error_signal.emit("⚠️ Preview läuft bereits!")
             return False
 
+        # Eigenständige Aufnahme belegt die Quelle
+        if self.is_recording and not self.is_streaming:
+            self.error_signal.emit("❌ Aufnahme läuft - bitte zuerst stoppen!")
+            return False
+
         # Wenn Stream läuft: Preview ist schon in kombinierter Pipeline
         if self.is_streaming:
             self.status_signal.emit("ℹ️ Preview läuft bereits im Stream!")
@@ -499,7 +1630,7 @@ class StreamManager(QObject):
                 video_src = "pipewiresrc do-timestamp=true"
                 print("ℹ️ PipeWire-Portal wird für Preview genutzt")
             else:
-                video_src = f"v4l2src device={video_source}"
+                video_src = self._build_webcam_src(video_source, width, height, fps)
 
             # Preview-Pipeline → Separates Fenster
             pipeline_str = (
@@ -507,6 +1638,7 @@ class StreamManager(QObject):
                 f"videoconvert ! "
                 f"videoscale ! "
                 f"video/x-raw,width={width},height={height},framerate={fps}/1 ! "
+                f"tee name={self.RAW_VIDEO_TEE} ! queue ! "
                 f"autovideosink"
             )
 
@@ -514,21 +1646,11 @@ class StreamManager(QObject):
             self.pipeline = Gst.parse_launch(pipeline_str)
 
             # Bus-Watcher
-            bus = self.pipeline.get_bus()
-            bus.add_signal_watch()
-            bus.connect("message", self._on_preview_bus_message)
+            self._watch_bus(self._on_preview_bus_message, "Preview-Warnung")
 
-            # Pipeline starten
+            # Pipeline starten (Kamera/Portal öffnen: im Worker)
             self.status_signal.emit("▶️ Starte Preview...")
-            ret = self.pipeline.set_state(Gst.State.PLAYING)
-
-            if ret == Gst.StateChangeReturn.FAILURE:
-                self.error_signal.emit("❌ Preview konnte nicht gestartet werden!")
-                self._cleanup_pipeline()
-                return False
-
-            self.is_preview_active = True
-            self.status_signal.emit("✅ Preview aktiv (Separates Fenster)!")
+            self.lifecycle.run('preview_start', self.pipeline, Gst.State.PLAYING, self._on_preview_started)
             return True
 
         except Exception as e:
@@ -536,24 +1658,53 @@ class StreamManager(QObject):
             self._cleanup_pipeline()
             return False
 
-    def _stop_preview_internal(self) -> None:
-        """Stoppt Preview ohne Signale (intern)."""
-        if self.pipeline:
-            self.pipeline.set_state(Gst.State.NULL)
-            bus = self.pipeline.get_bus()
-            bus.remove_signal_watch()
-        self.pipeline = None
+    def _on_preview_started(self, ok: bool, error: str) -> None:
+        """Ergebnis des Preview-Starts aus dem Worker (Qt-Thread)."""
+        if not ok:
+            self.error_signal.emit(f"❌ Preview konnte nicht gestartet werden! ({error})")
+            self.lifecycle.run(
+                'preview_abort', self.pipeline, Gst.State.NULL,
+                lambda ok, error: self._cleanup_pipeline()
+            )
+            return
+
+        self.is_preview_active = True
+        took = self.lifecycle.durations.get('preview_start', 0)
+        self.status_signal.emit(f"✅ Preview aktiv (Separates Fenster)! ({took:.0f} ms)")
+
+    def _stop_preview_internal(self, on_stopped: Callable[[], None]) -> None:
+        """
+        Stoppt Preview ohne Signale (intern), State-Wechsel im Worker.
+
+        Args:
+            on_stopped: Wird nach dem Abbau im Qt-Thread aufgerufen
+        """
+        self._stop_attached_recording()
         self.is_preview_active = False
 
+        def done(ok: bool, error: str) -> None:
+            self._cleanup_pipeline()
+            on_stopped()
+
+        if self.pipeline:
+            self.lifecycle.run('preview_stop', self.pipeline, Gst.State.NULL, done)
+        else:
+            done(True, "")
+
     def stop_preview(self) -> bool:
         """
         Stoppt die laufende Preview.
 
         Wenn Stream läuft: Wird ignoriert (Preview läuft in kombinierter Pipeline).
+        Der Abbau läuft im Worker; während eines Übergangs wird vorgemerkt.
 
         Returns:
             True bei Erfolg, False bei Fehler
         """
+        if self.lifecycle.is_transitioning():
+            self.lifecycle.defer(self.stop_preview)
+            return True
+
         if not self.is_preview_active:
             self.error_signal.emit("⚠️ Keine Preview aktiv!")
             return False
@@ -567,13 +1718,7 @@ class StreamManager(QObject):
 
         try:
             self.status_signal.emit("⏸️ Stoppe Preview...")
-
-            if self.pipeline:
-                self.pipeline.set_state(Gst.State.NULL)
-
-            self._cleanup_pipeline()
-            self.is_preview_active = False
-            self.status_signal.emit("✅ Preview gestoppt")
+            self._stop_preview_internal(lambda: self.status_signal.emit("✅ Preview gestoppt"))
             return True
 
         except Exception as e:
@@ -584,26 +1729,24 @@ class StreamManager(QObject):
         """Callback für Preview-Pipeline-Bus-Messages (wenn nur Preview läuft)."""
         msg_type = message.type
 
+        if self._handle_recording_branch_error(message):
+            return True
+
         if msg_type == Gst.MessageType.ERROR:
             err, debug = message.parse_error()
 
             # Preview-Fenster wurde geschlossen - das ist normal, kein Fehler!
             if "Output window was closed" in err.message:
                 self.status_signal.emit("✅ Preview geschlossen")
-                self.stop_preview()
             else:
                 # Echter Fehler
                 self.error_signal.emit(f"❌ Preview-Fehler: {err.message}")
                 print(f"🔹 Preview Debug: {debug}")
-                self.stop_preview()
-
-        elif msg_type == Gst.MessageType.WARNING:
-            warn, debug = message.parse_warning()
-            self.status_signal.emit(f"⚠️ Preview-Warnung: {warn.message}")
+            self._pipeline_ended.emit('preview', False)
 
         elif msg_type == Gst.MessageType.EOS:
             self.status_signal.emit("ℹ️ Preview beendet (EOS)")
-            self.stop_preview()
+            self._pipeline_ended.emit('preview', False)
 
         elif msg_type == Gst.MessageType.STATE_CHANGED:
             if message.src == self.pipeline:
@@ -621,46 +1764,55 @@ class StreamManager(QObject):
         resolution: str = "1280x720",
         bitrate: int = 2500,
         fps: int = 30,
-        output_dir: str = "recordings"
+        output_dir: Optional[str] = None
     ) -> bool:
         """
-        Startet lokale Video-Aufnahme (nur Webcam).
+        Startet lokale Aufnahme (Video + Audio), segmentiert mit fsync.
+
+        Container (MP4/MKV/FLV) und Zielverzeichnis kommen aus dem
+        Settings-Tab, sofern output_dir nicht angegeben ist.
+
+        Läuft bereits Stream oder Preview, wird die Aufnahme als Zweig an
+        deren Video-tee gehängt: dieselbe Quelle (auch die PipeWire-Session
+        des Desktops) wird geteilt, kein zweiter Portal-Dialog. Aufgenommen
+        wird dann das Bild der laufenden Pipeline in deren Auflösung.
 
         Args:
-            video_source: Video-Quelle (z.B. '/dev/video0')
+            video_source: Video-Quelle ('screen' oder '/dev/videoX')
             audio_source: Audio-Quelle ('default' oder 'monitor')
             resolution: Auflösung (z.B. "1280x720")
             bitrate: Video-Bitrate in kbps
             fps: Framerate
-            output_dir: Ausgabeverzeichnis für Recordings
+            output_dir: Ausgabeverzeichnis (Default: Aufnahme-Pfad aus den Settings)
 
         Returns:
-            True bei Erfolg, False bei Fehler
+            True wenn gestartet wird (eigene Pipeline: Start im Worker,
+            Ergebnis über recording_signal), False bei Fehler
         """
+        # Pipeline im Übergang → anhängen/starten, sobald sie steht
+        if self.lifecycle.is_transitioning():
+            self.lifecycle.defer(lambda: self.start_recording(
+                video_source, audio_source, resolution, bitrate, fps, output_dir
+            ))
+            return True
+
         if self.is_recording:
             self.error_signal.emit("⚠️ Recording läuft bereits!")
             return False
 
-        if video_source == 'screen':
-            self.error_signal.emit("❌ Desktop-Recording noch nicht verfügbar! Bitte Webcam wählen.")
-            return False
-
-        # Preview läuft? → Stoppen (Gerät würde sonst belegt sein)
-        if self.is_preview_active:
-            print("🔹 Preview läuft - stoppe Preview für Recording")
-            self.stop_preview()
-
-        # Recording-Config speichern
-        import os
-        from datetime import datetime
-
-        # Erstelle Recordings-Ordner
-        os.makedirs(output_dir, exist_ok=True)
+        if output_dir is None:
+            output_dir = self.config.get('recording_path', '~/Videos')
+        output_dir = os.path.expanduser(output_dir)
+        container = RecordingEngine.container_for_format(
+            self.config.get('recording_format', 'MP4 (H.264)')
+        )
 
-        # Dateiname mit Timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"recording_{timestamp}.mkv"
-        filepath = os.path.join(output_dir, filename)
+        # Segmentierung laut Settings (Dateinamen: recording_<Zeit>_000.mkv, ...)
+        engine = self.recording_engine
+        engine.segment_minutes = int(self.config.get('recording_segment_minutes', 10))
+        engine.segment_mb = int(self.config.get('recording_segment_mb', 0))
+        engine.fragmented_mp4 = bool(self.config.get('recording_fragmented_mp4', False))
+        filepath = output_dir
 
         self.current_recording_config = {
             'video_source': video_source,
@@ -668,70 +1820,141 @@ class StreamManager(QObject):
             'resolution': resolution,
             'bitrate': bitrate,
             'fps': fps,
+            'container': container,
             'filepath': filepath
         }
 
+        # Laufende Pipeline (Stream oder Preview) → Quelle teilen
+        host_running = self.pipeline is not None and (self.is_streaming or self.is_preview_active)
+
         try:
+            sink = engine.build_sink(output_dir, container)
+
+            if host_running:
+                # Audio vom Mixer der Pipeline, sonst eigene Quelle im Zweig
+                host_audio = self.pipeline.get_by_name(self.RAW_AUDIO_TEE) is not None
+                audio_src = None if host_audio else self.device_manager.get_audio_source_element(audio_source)
+                branch = self._build_recording_branch(bitrate, fps, sink, audio_src)
+                inputs = {self.RAW_VIDEO_TEE: 'recq'}
+                if host_audio:
+                    inputs[self.RAW_AUDIO_TEE] = 'recaq'
+                return self._attach_recording(branch, inputs, filepath)
+
+            branch = self._build_recording_branch(
+                bitrate, fps, sink, self.device_manager.get_audio_source_element(audio_source)
+            )
+
             self.status_signal.emit("🔄 Erstelle Recording-Pipeline...")
             width, height = resolution.split('x')
 
-            # Video-Source (nur Webcam)
-            video_src = f"v4l2src device={video_source}"
-
-            # Audio-Source
-            if audio_source == 'monitor':
-                audio_src = "pulsesrc"
-            else:
-                audio_src = "autoaudiosrc"
-
-            # Recording-Pipeline (nur Video erstmal - einfacher)
+            # Recording-Pipeline (Video + Audio → splitmuxsink)
             pipeline_str = (
-                # Video-Branch
-                f"{video_src} ! "
+                f"{self._build_video_src(video_source, int(width), int(height), fps)} ! "
                 f"videoconvert ! "
                 f"videoscale ! "
                 f"video/x-raw,width={width},height={height},framerate={fps}/1 ! "
-                f"x264enc bitrate={bitrate} speed-preset=medium ! "
-                f"video/x-h264,profile=high ! "
-                f"h264parse ! "
-                f"matroskamux name=mux ! "
-                f"filesink location=\"{filepath}\""
+                f"{branch}"
             )
 
             print(f"🔹 Recording-Pipeline: {pipeline_str}")
             self.pipeline = Gst.parse_launch(pipeline_str)
 
-            # Bus-Watcher
-            bus = self.pipeline.get_bus()
-            bus.add_signal_watch()
-            bus.connect("message", self._on_recording_bus_message)
+            # Bus-Watcher (Sync-Handler fängt auch Segment-Messages während
+            # stop_recording() ab - timed_pop_filtered verwirft fremde Messages)
+            self._watch_bus(self._on_recording_bus_message, "Recording-Warnung")
+            engine.start()
 
             # GStreamer-Thread starten
             self.gst_thread = GStreamerThread()
             self.gst_thread.start()
 
-            # Pipeline starten
+            # Pipeline im Worker starten (öffnet das Gerät)
             self.status_signal.emit("🎥 Starte Recording...")
-            ret = self.pipeline.set_state(Gst.State.PLAYING)
-
-            if ret == Gst.StateChangeReturn.FAILURE:
-                self.error_signal.emit("❌ Recording konnte nicht gestartet werden!")
-                self._cleanup_pipeline()
-                return False
-
-            self.is_recording = True
-            self.status_signal.emit(f"✅ Recording läuft! → {filepath}")
+            self.lifecycle.run('recording_start', self.pipeline, Gst.State.PLAYING, self._on_recording_started)
             return True
 
         except Exception as e:
             self.error_signal.emit(f"❌ Fehler beim Recording-Start: {e}")
-            self._cleanup_pipeline()
+            if not host_running:
+                self._cleanup_pipeline()
             return False
 
+    def _build_recording_branch(
+        self,
+        bitrate: int,
+        fps: int,
+        sink: str,
+        audio_src: Optional[str] = None
+    ) -> str:
+        """
+        Baut den Aufnahme-Zweig ab Roh-Video/-Audio (eigene Encoder, unabhängig vom Stream).
+
+        Args:
+            bitrate: Video-Bitrate in kbps
+            fps: Framerate (für den Keyframe-Abstand)
+            sink: splitmuxsink-Fragment aus RecordingEngine.build_sink()
+            audio_src: Eigene Audio-Quelle oder None (Audio kommt über 'recaq')
+
+        Returns:
+            Pipeline-Fragment mit den Eingängen 'recq' (Video) und 'recaq' (Audio)
+        """
+        audio_bitrate = int(str(self.config.get('audio_bitrate', '128 kbps')).split()[0]) * 1000
+        audio_head = f"{audio_src} ! " if audio_src else ""
+
+        return (
+            # Video → H.264 → splitmuxsink
+            f"queue name=recq max-size-buffers=0 max-size-bytes=0 max-size-time=3000000000 ! "
+            f"videoconvert ! "
+            f"x264enc bitrate={bitrate} speed-preset=medium "
+            f"key-int-max={fps * int(self.config.get('keyframe_interval', 2))} ! "
+            f"video/x-h264,profile=high ! "
+            f"h264parse ! "
+            f"{sink} "
+
+            # Audio → AAC → splitmuxsink
+            f"{audio_head}"
+            f"queue name=recaq max-size-buffers=0 max-size-bytes=0 max-size-time=3000000000 ! "
+            f"audioconvert ! "
+            f"audioresample ! "
+            f"{self.aac_encoder} bitrate={audio_bitrate} ! "
+            f"aacparse ! "
+            f"{RecordingEngine.SINK_NAME}.audio_0"
+        )
+
+    def _attach_recording(self, branch: str, inputs: Dict[str, str], filepath: str) -> bool:
+        """
+        Hängt den Aufnahme-Zweig an die laufende Stream-/Preview-Pipeline.
+
+        Args:
+            branch: Zweig aus _build_recording_branch()
+            inputs: tee-Name → Eingangs-Element im Zweig
+            filepath: Ausgabeverzeichnis (für Status-Meldungen)
+
+        Returns:
+            True bei Erfolg
+        """
+        if not self.recording_engine.attach_branch(self.pipeline, branch, inputs):
+            self.error_signal.emit("❌ Aufnahme-Zweig konnte nicht angehängt werden!")
+            return False
+
+        self.recording_engine.start()
+        self.is_recording = True
+        self.recording_signal.emit(True)
+        self.stats_timer.start()
+        container = self.current_recording_config.get('container', '')
+        self.status_signal.emit(
+            f"✅ Recording läuft ({container.upper()}, teilt laufende Quelle)! → {filepath}"
+        )
+        return True
+
     def stop_recording(self) -> bool:
         """
         Stoppt die laufende Aufnahme.
 
+        Ein an Stream/Preview angehängter Zweig wird einzeln beendet,
+        die übrige Pipeline läuft weiter. Der Abschluss (EOS, letztes
+        Segment) läuft im Lifecycle-Worker, recording_signal meldet das Ende.
+
         Returns:
             True bei Erfolg, False bei Fehler
         """
@@ -742,44 +1965,248 @@ class StreamManager(QObject):
         try:
             self.status_signal.emit("⏹️ Stoppe Recording...")
 
-            # EOS senden für sauberen Abschluss
-            if self.pipeline:
-                print("🔹 Sende EOS an Pipeline...")
-                self.pipeline.send_event(Gst.Event.new_eos())
-
-                # Warte auf EOS-Verarbeitung (max 10 Sekunden)
-                print("🔹 Warte auf EOS...")
-                bus = self.pipeline.get_bus()
-                msg = bus.timed_pop_filtered(
-                    10 * Gst.SECOND,
-                    Gst.MessageType.EOS | Gst.MessageType.ERROR
-                )
-
-                if msg:
-                    if msg.type == Gst.MessageType.EOS:
-                        print("🔹 EOS empfangen - Datei wird finalisiert...")
-                    elif msg.type == Gst.MessageType.ERROR:
-                        err, debug = msg.parse_error()
-                        print(f"🔹 Fehler beim EOS: {err.message}")
-                else:
-                    print("⚠️ Kein EOS empfangen - Timeout!")
-
-                # Pipeline auf NULL
-                print("🔹 Setze Pipeline auf NULL...")
-                self.pipeline.set_state(Gst.State.NULL)
-
-            # Cleanup
-            self._cleanup_pipeline()
-
-            filepath = self.current_recording_config.get('filepath', 'unknown')
-            self.is_recording = False
-            self.status_signal.emit(f"✅ Recording gespeichert: {filepath}")
+            if self.recording_engine.is_attached():
+                # Nur den Zweig beenden (EOS nur an den Aufnahme-Zweig, im Worker)
+                self._detach_recording_branch('recording_stop')
+                return True
+
+            # EOS, Warten, NULL und letztes Segment im Worker
+            if self._recording_detaching:
+                return True
+            self._recording_detaching = True
+            pipeline = self.pipeline
+            self.lifecycle.run_task(
+                'recording_stop',
+                lambda: self._finalize_recording_pipeline(pipeline),
+                self._on_recording_stopped
+            )
             return True
 
         except Exception as e:
             self.error_signal.emit(f"❌ Fehler beim Recording-Stoppen: {e}")
             return False
 
+    def _on_recording_started(self, ok: bool, error: str) -> None:
+        """Ergebnis des Starts der eigenen Recording-Pipeline (Qt-Thread)."""
+        if not ok:
+            self.error_signal.emit(f"❌ Recording konnte nicht gestartet werden! ({error})")
+            self.lifecycle.run('recording_abort', self.pipeline, Gst.State.NULL, self._abort_recording)
+            return
+
+        container = self.current_recording_config.get('container', '')
+        filepath = self.current_recording_config.get('filepath', 'unknown')
+        self.is_recording = True
+        self.recording_signal.emit(True)
+        self.stats_timer.start()
+        self.status_signal.emit(f"✅ Recording läuft ({container.upper()})! → {filepath}")
+
+    def _abort_recording(self, ok: bool, error: str) -> None:
+        """Start fehlgeschlagen: Pipeline abbauen, Segment-Thread beenden."""
+        self._cleanup_pipeline()
+        self.recording_engine.finish()
+        self.recording_signal.emit(False)
+
+    def _finalize_recording_pipeline(self, pipeline: Optional[Gst.Pipeline], timeout: float = 10.0) -> str:
+        """
+        Schließt die eigene Recording-Pipeline ab (Worker-Thread bzw. beim Beenden).
+
+        EOS senden, auf dessen Verarbeitung warten, Pipeline auf NULL,
+        letztes Segment auf die Platte bringen.
+
+        Args:
+            pipeline: Recording-Pipeline (None = nur Segment-Thread beenden)
+            timeout: Maximale Wartezeit auf das EOS
+
+        Returns:
+            Fehlermeldung oder "" (Aufnahme sauber abgeschlossen)
+        """
+        error = ""
+        if pipeline:
+            print("🔹 Sende EOS an Pipeline...")
+            pipeline.send_event(Gst.Event.new_eos())
+
+            print("🔹 Warte auf EOS...")
+            msg = pipeline.get_bus().timed_pop_filtered(
+                int(timeout * Gst.SECOND),
+                Gst.MessageType.EOS | Gst.MessageType.ERROR
+            )
+            if msg is None:
+                error = "Kein EOS empfangen - Timeout!"
+            elif msg.type == Gst.MessageType.ERROR:
+                err, debug = msg.parse_error()
+                error = f"Fehler beim EOS: {err.message}"
+            else:
+                print("🔹 EOS empfangen - Datei wird finalisiert...")
+
+            print("🔹 Setze Pipeline auf NULL...")
+            pipeline.set_state(Gst.State.NULL)
+
+        self.recording_engine.finish()
+        return error
+
+    def _on_recording_stopped(self, ok: bool, error: str) -> None:
+        """Recording-Pipeline steht (Qt-Thread): aufräumen und melden."""
+        if not ok:
+            print(f"⚠️ {error}")
+        self._cleanup_pipeline()
+        self._finish_recording()
+
+    def _finish_recording_now(self, timeout: float) -> None:
+        """
+        Schließt eine laufende Aufnahme synchron ab (Programmende, kein Worker mehr).
+
+        Args:
+            timeout: Maximale Wartezeit auf das letzte Segment
+        """
+        if not self.is_recording:
+            return
+        # Abschluss schon im Worker gelaufen → nur dessen Callback nachholen
+        if not self._recording_detaching:
+            self._recording_detaching = True
+            if self.recording_engine.is_attached():
+                if not self.recording_engine.detach_branch(timeout=timeout):
+                    print("⚠️ Letztes Segment nicht rechtzeitig geschlossen - Timeout!")
+                self.recording_engine.finish()
+            else:
+                error = self._finalize_recording_pipeline(self.pipeline, timeout)
+                if error:
+                    print(f"⚠️ {error}")
+        self._finish_recording()
+
+    def _finish_recording(self) -> None:
+        """Setzt den Recording-Status zurück und meldet das Ergebnis."""
+        filepath = self.current_recording_config.get('filepath', 'unknown')
+        segments = len(self.recording_engine.segments)
+        self.is_recording = False
+        self._recording_detaching = False
+        self._disk_low_warned = False
+        self._recording_stats = {}
+        self.recording_signal.emit(False)
+        self.status_signal.emit(f"✅ Recording gespeichert: {filepath} ({segments} Segment(e))")
+        self._enqueue_postprocess()
+
+    def _enqueue_postprocess(self) -> None:
+        """Reiht die Nachbearbeitung der gerade beendeten Aufnahme ein (laut Settings)."""
+        segments = [s for s in self.recording_engine.segments if os.path.exists(s)]
+        if not segments:
+            return
+
+        # Fragmentiertes MP4 ebenfalls umverpacken (Faststart statt Fragmente)
+        remux = bool(self.config.get('postprocess_remux', True))
+        if remux and self.config.get('recording_fragmented_mp4', False):
+            for location in [s for s in segments if s.lower().endswith('.mp4')]:
+                base, _ = os.path.splitext(location)
+                self.postprocess_queue.add_job('remux', location, f"{base}_faststart.mp4")
+
+        job_ids = self.postprocess_queue.enqueue_recording(
+            segments,
+            remux=remux,
+            transcode_kbps=int(self.config.get('postprocess_transcode_kbps', 0)),
+            thumbnail=bool(self.config.get('postprocess_thumbnail', True))
+        )
+        if job_ids:
+            self.status_signal.emit(f"🛠️ Nachbearbeitung: {len(job_ids)} Job(s) eingereiht")
+
+    def shutdown(self) -> None:
+        """
+        Beim Programmende: laufende Aufnahme abschließen, Pipeline anhalten,
+        Lifecycle-Worker beenden, Nachbearbeitung anhalten (wird beim
+        nächsten Start fortgesetzt).
+        """
+        self.reconnect_timer.stop()
+        # Offene Befehle (z.B. ein begonnener Aufnahme-Abschluss) dürfen noch ablaufen
+        self.lifecycle.shutdown(timeout=self.SHUTDOWN_RECORDING_TIMEOUT_S)
+        # Laufende Aufnahme abschließen (EOS bzw. Zweig lösen, letztes Segment sichern)
+        self._finish_recording_now(self.SHUTDOWN_RECORDING_TIMEOUT_S)
+        # Kein Event-Loop mehr für Worker-Callbacks → direkt auf NULL
+        if self.pipeline:
+            self.pipeline.set_state(Gst.State.NULL)
+        self.postprocess_queue.shutdown()
+
+    def _stop_attached_recording(self) -> None:
+        """
+        Beendet eine an Stream/Preview angehängte Aufnahme (vor deren Abbau).
+
+        Vor lifecycle.run(..., NULL) aufrufen: der Worker arbeitet in
+        Aufruf-Reihenfolge, der Zweig ist also gelöst, bevor die Pipeline steht.
+        """
+        if self.is_recording and self.recording_engine.is_attached() and not self._recording_detaching:
+            self.status_signal.emit("ℹ️ Aufnahme wird mit der Pipeline beendet")
+            self.stop_recording()
+
+    def _detach_recording_branch(self, command: str, timeout: float = 10.0) -> None:
+        """
+        Löst den Aufnahme-Zweig im Lifecycle-Worker und schließt die Aufnahme ab.
+
+        detach_branch() und finish() blockieren bis zum letzten Segment;
+        _finish_recording() folgt im Qt-Thread. Läuft schon ein Abbau,
+        passiert nichts.
+
+        Args:
+            command: Name für Log/Statistik
+            timeout: Maximale Wartezeit auf das letzte Segment
+        """
+        if self._recording_detaching:
+            return
+        self._recording_detaching = True
+        engine = self.recording_engine
+
+        def detach() -> str:
+            closed = engine.detach_branch(timeout=timeout)
+            engine.finish()
+            return "" if closed else "Letztes Segment nicht rechtzeitig geschlossen - Timeout!"
+
+        def done(ok: bool, error: str) -> None:
+            if not ok:
+                print(f"⚠️ {error}")
+            self._finish_recording()
+
+        self.lifecycle.run_task(command, detach, done)
+
+    def _handle_recording_branch_error(self, message: Gst.Message) -> bool:
+        """
+        Fängt Fehler aus einem angehängten Aufnahme-Zweig ab (Bus-Watcher).
+
+        Der Abbau des Zweigs folgt über _recording_branch_failed im Qt-Thread.
+
+        Returns:
+            True wenn die Message behandelt wurde (Stream/Preview laufen weiter)
+        """
+        if message.type != Gst.MessageType.ERROR or not self.recording_engine.owns(message.src):
+            return False
+
+        err, debug = message.parse_error()
+        self.error_signal.emit(f"❌ Recording-Fehler: {err.message}")
+        print(f"🔹 Recording Debug: {debug}")
+        self._recording_branch_failed.emit()
+        return True
+
+    def _on_recording_branch_failed(self) -> None:
+        """Fehlerhaften Aufnahme-Zweig abbauen (über _recording_branch_failed, Abbau im Worker)."""
+        # Schon vom Benutzer oder mit der Pipeline beendet
+        if not self.is_recording or not self.recording_engine.is_attached():
+            return
+        self._detach_recording_branch('recording_failed', timeout=2.0)
+
+    def _on_recording_failed(self) -> None:
+        """Fehlerhafte Recording-Pipeline beenden (über _recording_failed, Abschluss im Worker)."""
+        if not self.is_recording or self.recording_engine.is_attached() or self._recording_detaching:
+            return
+        self.stop_recording()
+
+    def _on_mixer_task_done(self, ok: bool, error: str) -> None:
+        """Ergebnis einer Live-Änderung am Mixer (Qt-Thread)."""
+        if not ok:
+            print(f"⚠️ Mixer: {error}")
+
+    def _on_recording_segment(self, event: str, location: str) -> None:
+        """Callback der RecordingEngine: Segment-Grenzen ins Log."""
+        name = os.path.basename(location)
+        if event == 'opened':
+            self.status_signal.emit(f"📼 Neues Segment: {name}")
+        elif event == 'synced':
+            self.status_signal.emit(f"💾 Segment gesichert: {name}")
+
     def _on_recording_bus_message(self, bus: Gst.Bus, message: Gst.Message) -> bool:
         """Callback für Recording-Pipeline-Bus-Messages."""
         msg_type = message.type
@@ -788,11 +2215,8 @@ class StreamManager(QObject):
             err, debug = message.parse_error()
             self.error_signal.emit(f"❌ Recording-Fehler: {err.message}")
             print(f"🔹 Recording Debug: {debug}")
-            self.stop_recording()
-
-        elif msg_type == Gst.MessageType.WARNING:
-            warn, debug = message.parse_warning()
-            self.status_signal.emit(f"⚠️ Recording-Warnung: {warn.message}")
+            # Abbau im Qt-Thread (der Watcher läuft in der GLib-Main-Loop)
+            self._recording_failed.emit()
 
         elif msg_type == Gst.MessageType.EOS:
             self.status_signal.emit("ℹ️ Recording beendet (EOS)")
@@ -807,9 +2231,8 @@ class StreamManager(QObject):
 
     def __del__(self):
         """Destruktor - stellt sicher dass Pipeline sauber beendet wird."""
-        if self.is_streaming:
-            self.stop_stream()
-        elif self.is_preview_active:
-            self.stop_preview()
-        elif self.is_recording:
-            self.stop_recording()
+        if self.is_recording and not self.recording_engine.is_attached():
+            self._finish_recording_now(self.SHUTDOWN_RECORDING_TIMEOUT_S)
+        elif self.pipeline:
+            # Worker-Callbacks kämen nicht mehr an → direkt auf NULL
+            self.pipeline.set_state(Gst.State.NULL)
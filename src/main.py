@@ -52,6 +52,9 @@ def check_gstreamer_plugins() -> bool:
         'videoscale',      # Video Scaling
         'audioconvert',    # Audio Conversion
         'audioresample',   # Audio Resampling
+        'audiomixer',      # Audio-Mix mehrerer Quellen
+        'volume',          # Gain pro Audio-Quelle
+        'compositor',      # Szenen (vorgeladene Quellen)
     ]
 
     # AAC Audio Encoder - mehrere Optionen (prüfe mindestens einen)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Log View
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import collections
+from typing import Deque
+
+from PyQt6.QtWidgets import QPlainTextEdit
+from PyQt6.QtCore import QTimer
+
+
+class LogView(QPlainTextEdit):
+    """
+    Begrenzte Log-Anzeige mit gebündelten Updates.
+
+    - Höchstens MAX_LINES Zeilen (älteste fallen raus, Speicher bleibt konstant)
+    - Neue Zeilen werden gesammelt und FLUSH_INTERVAL_MS-weise in einem
+      Rutsch eingefügt - eine Meldungsflut kostet ein Update pro Intervall
+      statt eines pro Zeile
+    - Mehr als MAX_PENDING Zeilen pro Intervall werden verworfen (mit
+      Hinweis), die vollständige Historie steht in der Log-Datei
+    - Auto-Scroll nur, wenn der Benutzer ohnehin am Ende steht
+    """
+
+    MAX_LINES = 2000
+    MAX_PENDING = 500
+    FLUSH_INTERVAL_MS = 100
+
+    def __init__(self, parent=None):
+        """Initialisiert LogView."""
+        super().__init__(parent)
+        self.setReadOnly(True)
+        self.setMaximumBlockCount(self.MAX_LINES)
+        self.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+
+        self._pending: Deque[str] = collections.deque(maxlen=self.MAX_PENDING)
+        self._dropped = 0
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self.flush)
+
+    def add_line(self, line: str) -> None:
+        """
+        Merkt eine Zeile für das nächste Update vor.
+
+        Args:
+            line: Fertig formatierte Zeile
+        """
+        if len(self._pending) == self.MAX_PENDING:
+            self._dropped += 1
+        self._pending.append(line)
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def flush(self) -> None:
+        """Fügt alle vorgemerkten Zeilen in einem Schritt ein."""
+        if not self._pending:
+            return
+
+        lines = list(self._pending)
+        self._pending.clear()
+        if self._dropped:
+            lines.insert(0, f"… {self._dropped} Meldungen übersprungen (siehe Log-Datei)")
+            self._dropped = 0
+
+        scrollbar = self.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 4
+
+        self.appendPlainText("\n".join(lines))
+
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
@@ -133,3 +133,10 @@ class MainWindow(QMainWindow):
         """
         self.status_bar.showMessage(error)
         # TODO: QMessageBox für kritische Fehler (Phase 5)
+
+    def closeEvent(self, event) -> None:
+        """Beim Schließen: Hintergrund-Jobs anhalten (werden beim nächsten Start fortgesetzt)."""
+        self.stream_manager.shutdown()
+        # Verzögert vorgemerkte Einstellungen sofort schreiben
+        self.stream_manager.config.flush()
+        super().closeEvent(event)
@@ -50,6 +50,10 @@ class SettingsTab(QWidget):
         performance_group = self._create_performance_settings()
         main_layout.addWidget(performance_group)
 
+        # SRT-Ausgang
+        srt_group = self._create_srt_settings()
+        main_layout.addWidget(srt_group)
+
         # Erweiterte Einstellungen
         advanced_group = self._create_advanced_settings()
         main_layout.addWidget(advanced_group)
@@ -108,6 +112,53 @@ class SettingsTab(QWidget):
 
         layout.addLayout(format_layout)
 
+        # Segmentierung (splitmuxsink, Rollover an Keyframes)
+        segment_layout = QHBoxLayout()
+        segment_layout.addWidget(QLabel("Segment-Länge (Min):"))
+
+        self.segment_minutes = QSpinBox()
+        self.segment_minutes.setRange(0, 240)
+        self.segment_minutes.setValue(10)
+        self.segment_minutes.setSpecialValueText("Aus")
+        segment_layout.addWidget(self.segment_minutes)
+
+        segment_layout.addWidget(QLabel("Max. Größe (MB):"))
+        self.segment_mb = QSpinBox()
+        self.segment_mb.setRange(0, 100000)
+        self.segment_mb.setSingleStep(512)
+        self.segment_mb.setValue(0)
+        self.segment_mb.setSpecialValueText("Unbegrenzt")
+        segment_layout.addWidget(self.segment_mb)
+
+        layout.addLayout(segment_layout)
+
+        self.fragmented_mp4 = QCheckBox("🧩 Fragmentiertes MP4 (auch nach Absturz lesbar)")
+        layout.addWidget(self.fragmented_mp4)
+
+        # Nachbearbeitung nach Aufnahme-Ende (Hintergrund, niedrige Priorität)
+        post_layout = QHBoxLayout()
+        self.postprocess_remux = QCheckBox("🔁 Als MP4 umverpacken")
+        post_layout.addWidget(self.postprocess_remux)
+
+        self.postprocess_thumbnail = QCheckBox("🖼️ Vorschaubild")
+        post_layout.addWidget(self.postprocess_thumbnail)
+
+        post_layout.addWidget(QLabel("Kopie (kbps):"))
+        self.postprocess_transcode = QSpinBox()
+        self.postprocess_transcode.setRange(0, 20000)
+        self.postprocess_transcode.setSingleStep(250)
+        self.postprocess_transcode.setValue(0)
+        self.postprocess_transcode.setSpecialValueText("Aus")
+        post_layout.addWidget(self.postprocess_transcode)
+
+        post_layout.addWidget(QLabel("Parallel:"))
+        self.postprocess_workers = QSpinBox()
+        self.postprocess_workers.setRange(1, 4)
+        self.postprocess_workers.setValue(1)
+        post_layout.addWidget(self.postprocess_workers)
+
+        layout.addLayout(post_layout)
+
         # Auto-Aufnahme
         self.auto_record = QCheckBox("📼 Automatisch bei Stream-Start aufnehmen")
         layout.addWidget(self.auto_record)
@@ -158,6 +209,45 @@ class SettingsTab(QWidget):
 
         return group
 
+    def _create_srt_settings(self) -> QGroupBox:
+        """Erstellt SRT-Einstellungen (gelten bei Ziel-URL srt://...)."""
+        group = QGroupBox("📡 SRT-Ausgang (srt://...)")
+        layout = QVBoxLayout()
+        group.setLayout(layout)
+
+        # Modus
+        mode_layout = QHBoxLayout()
+        mode_layout.addWidget(QLabel("Modus:"))
+
+        self.srt_mode = QComboBox()
+        self.srt_mode.addItem("Caller (zum Server verbinden)", 'caller')
+        self.srt_mode.addItem("Listener (auf Gegenstelle warten)", 'listener')
+        mode_layout.addWidget(self.srt_mode)
+
+        layout.addLayout(mode_layout)
+
+        # Latenz
+        latency_layout = QHBoxLayout()
+        latency_layout.addWidget(QLabel("SRT-Latenz (ms):"))
+
+        self.srt_latency = QSpinBox()
+        self.srt_latency.setRange(20, 8000)
+        self.srt_latency.setSingleStep(20)
+        self.srt_latency.setValue(200)
+        self.srt_latency.setToolTip(
+            "Fenster für Neuübertragungen - etwa 4× RTT, bei Paketverlust mehr"
+        )
+        latency_layout.addWidget(self.srt_latency)
+
+        layout.addLayout(latency_layout)
+
+        # Passphrase: Secret, daher wie Stream-Keys nur aus .env
+        passphrase_label = QLabel("🔒 Verschlüsselung: SRT_PASSPHRASE in .env setzen (10-79 Zeichen)")
+        passphrase_label.setStyleSheet("color: #999;")
+        layout.addWidget(passphrase_label)
+
+        return group
+
     def _create_advanced_settings(self) -> QGroupBox:
         """Erstellt erweiterte Einstellungen."""
         group = QGroupBox("🔧 Erweiterte Einstellungen")
@@ -186,6 +276,36 @@ class SettingsTab(QWidget):
 
         layout.addLayout(audio_layout)
 
+        # Resampler-Qualität (nur relevant wenn resampelt werden muss)
+        resample_layout = QHBoxLayout()
+        resample_layout.addWidget(QLabel("Resampler-Qualität (0-10):"))
+
+        self.resample_quality = QSpinBox()
+        self.resample_quality.setRange(0, 10)
+        self.resample_quality.setValue(4)
+        self.resample_quality.setToolTip(
+            "Nur aktiv wenn die Quelle nicht nativ mit der Encoder-Rate liefert"
+        )
+        resample_layout.addWidget(self.resample_quality)
+
+        layout.addLayout(resample_layout)
+
+        # A/V-Sync
+        offset_layout = QHBoxLayout()
+        offset_layout.addWidget(QLabel("Audio-Versatz (ms, + = später):"))
+
+        self.av_audio_offset = QSpinBox()
+        self.av_audio_offset.setRange(-1000, 1000)
+        self.av_audio_offset.setSingleStep(10)
+        self.av_audio_offset.setValue(0)
+        offset_layout.addWidget(self.av_audio_offset)
+
+        layout.addLayout(offset_layout)
+
+        self.av_sync_auto = QCheckBox("🔄 A/V-Drift automatisch korrigieren")
+        self.av_sync_auto.setChecked(True)
+        layout.addWidget(self.av_sync_auto)
+
         # Low-Latency
         self.low_latency = QCheckBox("⚡ Low-Latency-Modus (zerolatency tune)")
         self.low_latency.setChecked(True)
@@ -220,6 +340,28 @@ class SettingsTab(QWidget):
             self.config.get('auto_record', False)
         )
 
+        self.segment_minutes.setValue(
+            self.config.get('recording_segment_minutes', 10)
+        )
+        self.segment_mb.setValue(
+            self.config.get('recording_segment_mb', 0)
+        )
+        self.fragmented_mp4.setChecked(
+            self.config.get('recording_fragmented_mp4', False)
+        )
+        self.postprocess_remux.setChecked(
+            self.config.get('postprocess_remux', True)
+        )
+        self.postprocess_thumbnail.setChecked(
+            self.config.get('postprocess_thumbnail', True)
+        )
+        self.postprocess_transcode.setValue(
+            self.config.get('postprocess_transcode_kbps', 0)
+        )
+        self.postprocess_workers.setValue(
+            self.config.get('postprocess_workers', 1)
+        )
+
         # Performance
         encoder_preset = self.config.get('encoder_preset', 'superfast (Empfohlen)')
         self.encoder_preset.setCurrentText(encoder_preset)
@@ -228,6 +370,13 @@ class SettingsTab(QWidget):
             self.config.get('encoder_threads', 0)
         )
 
+        # SRT
+        index = self.srt_mode.findData(self.config.get('srt_mode', 'caller'))
+        self.srt_mode.setCurrentIndex(max(0, index))
+        self.srt_latency.setValue(
+            self.config.get('srt_latency_ms', 200)
+        )
+
         # Erweitert
         self.keyframe_interval.setValue(
             self.config.get('keyframe_interval', 2)
@@ -236,6 +385,17 @@ class SettingsTab(QWidget):
         audio_bitrate = self.config.get('audio_bitrate', '128 kbps')
         self.audio_bitrate.setCurrentText(audio_bitrate)
 
+        self.resample_quality.setValue(
+            self.config.get('audio_resample_quality', 4)
+        )
+
+        self.av_audio_offset.setValue(
+            int(self.config.get('av_audio_offset_ms', 0))
+        )
+        self.av_sync_auto.setChecked(
+            self.config.get('av_sync_auto', True)
+        )
+
         self.low_latency.setChecked(
             self.config.get('low_latency', True)
         )
@@ -250,14 +410,28 @@ class SettingsTab(QWidget):
         self.config.set('recording_path', self.recording_path.text())
         self.config.set('recording_format', self.recording_format.currentText())
         self.config.set('auto_record', self.auto_record.isChecked())
+        self.config.set('recording_segment_minutes', self.segment_minutes.value())
+        self.config.set('recording_segment_mb', self.segment_mb.value())
+        self.config.set('recording_fragmented_mp4', self.fragmented_mp4.isChecked())
+        self.config.set('postprocess_remux', self.postprocess_remux.isChecked())
+        self.config.set('postprocess_thumbnail', self.postprocess_thumbnail.isChecked())
+        self.config.set('postprocess_transcode_kbps', self.postprocess_transcode.value())
+        self.config.set('postprocess_workers', self.postprocess_workers.value())
 
         # Performance
         self.config.set('encoder_preset', self.encoder_preset.currentText())
         self.config.set('encoder_threads', self.encoder_threads.value())
 
+        # SRT
+        self.config.set('srt_mode', self.srt_mode.currentData())
+        self.config.set('srt_latency_ms', self.srt_latency.value())
+
         # Erweitert
         self.config.set('keyframe_interval', self.keyframe_interval.value())
         self.config.set('audio_bitrate', self.audio_bitrate.currentText())
+        self.config.set('audio_resample_quality', self.resample_quality.value())
+        self.config.set('av_audio_offset_ms', self.av_audio_offset.value())
+        self.config.set('av_sync_auto', self.av_sync_auto.isChecked())
         self.config.set('low_latency', self.low_latency.isChecked())
         self.config.set('verbose_logging', self.verbose_logging.isChecked())
 
@@ -270,10 +444,22 @@ class SettingsTab(QWidget):
         self.recording_path.setText('~/Videos')
         self.recording_format.setCurrentText('MP4 (H.264)')
         self.auto_record.setChecked(False)
+        self.segment_minutes.setValue(10)
+        self.segment_mb.setValue(0)
+        self.fragmented_mp4.setChecked(False)
+        self.postprocess_remux.setChecked(True)
+        self.postprocess_thumbnail.setChecked(True)
+        self.postprocess_transcode.setValue(0)
+        self.postprocess_workers.setValue(1)
         self.encoder_preset.setCurrentText('superfast (Empfohlen)')
         self.encoder_threads.setValue(0)
+        self.srt_mode.setCurrentIndex(0)
+        self.srt_latency.setValue(200)
         self.keyframe_interval.setValue(2)
         self.audio_bitrate.setCurrentText('128 kbps')
+        self.resample_quality.setValue(4)
+        self.av_audio_offset.setValue(0)
+        self.av_sync_auto.setChecked(True)
         self.low_latency.setChecked(True)
         self.verbose_logging.setChecked(False)
 
@@ -13,21 +13,33 @@ the Free Software Foundation, either version 3 of the License, or
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
     QLabel, QComboBox, QLineEdit, QPushButton, QSlider,
-    QCheckBox, QTextEdit, QGroupBox, QSizePolicy
+    QCheckBox, QGroupBox, QSizePolicy, QProgressBar,
+    QFileDialog, QInputDialog
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QFont, QPixmap, QPainter, QColor
+from PyQt6.QtCore import Qt, pyqtSignal, QTimer
+from PyQt6.QtGui import QFont, QPixmap, QPainter, QColor, QKeySequence, QShortcut
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 
 # Import Manager
 try:
     from src.core.device_manager import DeviceManager
+    from src.core.audio_mixer import AudioMixer
+    from src.core.srt_output import SrtOutput
+    from src.ui.log_view import LogView
     from src.utils.config import get_config
+    from src.utils.log_file import get_log_file
 except ModuleNotFoundError:
     import sys
     from pathlib import Path
     sys.path.insert(0, str(Path(__file__).parent.parent.parent))
     from src.core.device_manager import DeviceManager
+    from src.core.audio_mixer import AudioMixer
+    from src.core.srt_output import SrtOutput
+    from src.ui.log_view import LogView
     from src.utils.config import get_config
+    from src.utils.log_file import get_log_file
 
 
 # Stream-Services mit RTMP-URLs
@@ -41,6 +53,14 @@ STREAM_SERVICES = {
     "Restream.io": "rtmp://live.restream.io/live",
 }
 
+# Standard-Auflösungen (Screen Capture ist beliebig skalierbar)
+DEFAULT_RESOLUTIONS = [
+    "1920x1080 (Full HD)",
+    "1280x720 (HD)",
+    "854x480 (SD)",
+    "640x360 (Low)",
+]
+
 
 class StreamTab(QWidget):
     """
@@ -56,6 +76,10 @@ class StreamTab(QWidget):
     Phase 4: Mit StreamManager verbunden
     """
 
+    # VU-Meter-Farben (grün = ok, rot = Übersteuerung)
+    LEVEL_STYLE_OK = "QProgressBar::chunk { background-color: #388e3c; }"
+    LEVEL_STYLE_CLIP = "QProgressBar::chunk { background-color: #d32f2f; }"
+
     def __init__(self, stream_manager):
         """
         Initialisiert Stream-Tab.
@@ -69,11 +93,21 @@ class StreamTab(QWidget):
         self.stream_manager = stream_manager
         self.device_manager = DeviceManager()
         self.config = get_config()
+        self.log_file = get_log_file()
 
-        # State
+        # State (stream_state: Zustand aus dem StreamLifecycle)
         self.is_streaming = False
+        self.stream_state = "idle"
         self.is_preview_active = False
 
+        # VU-Meter pro Audio-Quelle (source_id → QProgressBar)
+        self.level_bars = {}
+        self._clipping = {}
+
+        # Profile, deren Pipeline-Plan noch vorab erstellt wird
+        self._plan_queue: List[str] = []
+        self._plan_pending: Optional[str] = None  # Profil, das gerade geplant wird
+
         # UI aufbauen
         self._setup_ui()
         self._apply_dark_style()
@@ -81,6 +115,9 @@ class StreamTab(QWidget):
         self._connect_signals()
         self._connect_stream_manager()
 
+        # Pipeline-Pläne der Profile vorab erstellen (nach dem ersten Zeichnen)
+        self._schedule_plan_compile()
+
         print("✅ StreamTab mit StreamManager initialisiert")
 
     def _setup_ui(self) -> None:
@@ -94,6 +131,10 @@ class StreamTab(QWidget):
         left_widget.setLayout(left_layout)
         left_widget.setMaximumWidth(400)
 
+        # 0. Stream-Profile
+        profile_group = self._create_profile_group()
+        left_layout.addWidget(profile_group)
+
         # 1. Geräteauswahl
         device_group = self._create_device_group()
         left_layout.addWidget(device_group)
@@ -102,7 +143,11 @@ class StreamTab(QWidget):
         stream_group = self._create_stream_config_group()
         left_layout.addWidget(stream_group)
 
-        # 3. Stream-Controls
+        # 3. Overlays (Logo, Titel)
+        overlay_group = self._create_overlay_group()
+        left_layout.addWidget(overlay_group)
+
+        # 4. Stream-Controls
         controls_group = self._create_controls_group()
         left_layout.addWidget(controls_group)
 
@@ -125,6 +170,40 @@ class StreamTab(QWidget):
         main_layout.addWidget(left_widget)
         main_layout.addWidget(right_widget)
 
+    def _create_profile_group(self) -> QGroupBox:
+        """Erstellt Profil-Auswahl (komplettes Quellen-/Encoder-/Ziel-Setup)."""
+        group = QGroupBox("🗂️ Stream-Profil")
+        layout = QGridLayout()
+        group.setLayout(layout)
+
+        profile_layout = QHBoxLayout()
+        self.profile_combo = QComboBox()
+        self.profile_combo.setToolTip(
+            "Gespeichertes Setup (Quellen, Encoder, Ziel) - die Pipeline\n"
+            "wird im Leerlauf vorab geprüft, LIVE GEHEN startet ohne Planung"
+        )
+        profile_layout.addWidget(self.profile_combo, stretch=1)
+
+        self.profile_save_button = QPushButton("💾")
+        self.profile_save_button.setToolTip("Aktuelle Einstellungen als Profil speichern")
+        self.profile_save_button.setMaximumWidth(40)
+        profile_layout.addWidget(self.profile_save_button)
+
+        self.profile_delete_button = QPushButton("🗑️")
+        self.profile_delete_button.setToolTip("Profil löschen")
+        self.profile_delete_button.setMaximumWidth(40)
+        profile_layout.addWidget(self.profile_delete_button)
+
+        layout.addLayout(profile_layout, 0, 0)
+
+        # Status des vorab erstellten Pipeline-Plans
+        self.plan_label = QLabel("")
+        self.plan_label.setStyleSheet("color: #888888;")
+        self.plan_label.setWordWrap(True)
+        layout.addWidget(self.plan_label, 1, 0)
+
+        return group
+
     def _create_device_group(self) -> QGroupBox:
         """Erstellt Geräteauswahl-Gruppe."""
         group = QGroupBox("🎥 Geräteauswahl")
@@ -145,6 +224,20 @@ class StreamTab(QWidget):
         self.scene_desktop_btn.clicked.connect(lambda: self._select_scene('desktop'))
         scene_layout.addWidget(self.scene_desktop_btn)
 
+        self.scene_pip_btn = QPushButton("🖼️ Bild-in-Bild")
+        self.scene_pip_btn.setCheckable(True)
+        self.scene_pip_btn.setToolTip("Desktop mit Webcam in der Ecke")
+        self.scene_pip_btn.clicked.connect(lambda: self._select_scene('pip'))
+        scene_layout.addWidget(self.scene_pip_btn)
+
+        # Szenen vorladen: beide Quellen laufen, Umschalten live ohne Rebuild
+        self.preload_scenes_checkbox = QCheckBox("⚡ Vorladen")
+        self.preload_scenes_checkbox.setToolTip(
+            "Webcam und Desktop gleichzeitig öffnen - Szenenwechsel während\n"
+            "des Streams ohne Neustart (höhere CPU-Last)"
+        )
+        scene_layout.addWidget(self.preload_scenes_checkbox)
+
         layout.addLayout(scene_layout, 0, 1)
 
         # Video-Quelle (erweitert)
@@ -169,11 +262,12 @@ class StreamTab(QWidget):
         layout.addWidget(QLabel("🔊 Lautstärke:"), 3, 0)
         volume_layout = QHBoxLayout()
         self.volume_slider = QSlider(Qt.Orientation.Horizontal)
-        self.volume_slider.setRange(0, 100)
-        self.volume_slider.setValue(70)
-        self.volume_label = QLabel("70%")
+        self.volume_slider.setRange(0, 150)  # > 100% = Verstärkung
+        self.volume_slider.setValue(100)
+        self.volume_label = QLabel("100%")
         volume_layout.addWidget(self.volume_slider)
         volume_layout.addWidget(self.volume_label)
+        volume_layout.addWidget(self._create_level_bar(AudioMixer.PRIMARY_ID))
         layout.addLayout(volume_layout, 3, 1)
 
         # Mute Button
@@ -181,6 +275,30 @@ class StreamTab(QWidget):
         self.mute_button.setCheckable(True)
         layout.addWidget(self.mute_button, 4, 1)
 
+        # Weitere Audio-Quellen mischen (Mikrofon + Desktop + ...)
+        layout.addWidget(QLabel("➕ Mischen:"), 5, 0)
+        extra_layout = QHBoxLayout()
+        self.extra_audio_combo = QComboBox()
+        for source in audio_sources:
+            self.extra_audio_combo.addItem(source['name'], source['device'])
+        extra_layout.addWidget(self.extra_audio_combo)
+
+        self.add_audio_button = QPushButton("➕")
+        self.add_audio_button.setToolTip("Audio-Quelle zum Mix hinzufügen (auch live)")
+        self.add_audio_button.setMaximumWidth(40)
+        extra_layout.addWidget(self.add_audio_button)
+        layout.addLayout(extra_layout, 5, 1)
+
+        # Zeilen der zusätzlichen Quellen (Slider + Mute pro Quelle)
+        self.extra_audio_layout = QVBoxLayout()
+        layout.addLayout(self.extra_audio_layout, 6, 0, 1, 2)
+
+        # Master-Pegel (gesamter Mix)
+        layout.addWidget(QLabel("📊 Master:"), 7, 0)
+        master_bar = self._create_level_bar('master')
+        master_bar.setMaximumWidth(16777215)
+        layout.addWidget(master_bar, 7, 1)
+
         return group
 
     def _create_stream_config_group(self) -> QGroupBox:
@@ -198,7 +316,7 @@ class StreamTab(QWidget):
         # RTMP URL
         layout.addWidget(QLabel("RTMP-URL:"), 1, 0)
         self.rtmp_url_edit = QLineEdit()
-        self.rtmp_url_edit.setPlaceholderText("rtmp://...")
+        self.rtmp_url_edit.setPlaceholderText("rtmp://... oder srt://host:port")
         layout.addWidget(self.rtmp_url_edit, 1, 1)
 
         # Stream Key
@@ -215,12 +333,7 @@ class StreamTab(QWidget):
         # Quality-Einstellungen
         layout.addWidget(QLabel("Auflösung:"), 4, 0)
         self.resolution_combo = QComboBox()
-        self.resolution_combo.addItems([
-            "1920x1080 (Full HD)",
-            "1280x720 (HD)",
-            "854x480 (SD)",
-            "640x360 (Low)"
-        ])
+        self.resolution_combo.addItems(DEFAULT_RESOLUTIONS)
         self.resolution_combo.setCurrentText("1280x720 (HD)")
         layout.addWidget(self.resolution_combo, 4, 1)
 
@@ -235,6 +348,37 @@ class StreamTab(QWidget):
         self.bitrate_combo.setCurrentText("2500 kbps (Mittel)")
         layout.addWidget(self.bitrate_combo, 5, 1)
 
+        # Video-Codec (pro Plattform gespeichert)
+        layout.addWidget(QLabel("Video-Codec:"), 6, 0)
+        self.codec_combo = QComboBox()
+        self.codec_combo.addItem("H.264 (kompatibel)", 'h264')
+        self.codec_combo.addItem("HEVC / H.265 (Enhanced RTMP, weniger Bitrate)", 'hevc')
+        self.codec_combo.setToolTip(
+            "HEVC nur wählen, wenn das Ziel es annimmt - wird pro Plattform gespeichert"
+        )
+        layout.addWidget(self.codec_combo, 6, 1)
+
+        return group
+
+    def _create_overlay_group(self) -> QGroupBox:
+        """Erstellt Overlay-Gruppe (Logo + Titel, live schaltbar)."""
+        group = QGroupBox("🏷️ Overlays")
+        layout = QGridLayout()
+        group.setLayout(layout)
+
+        # Logo (Bilddatei, oben links)
+        self.logo_checkbox = QCheckBox("Logo")
+        layout.addWidget(self.logo_checkbox, 0, 0)
+        self.logo_button = QPushButton("📂 Bild wählen...")
+        layout.addWidget(self.logo_button, 0, 1)
+
+        # Titel (Bauchbinde, unten)
+        self.title_checkbox = QCheckBox("Titel")
+        layout.addWidget(self.title_checkbox, 1, 0)
+        self.title_edit = QLineEdit()
+        self.title_edit.setPlaceholderText("Text der Bauchbinde")
+        layout.addWidget(self.title_edit, 1, 1)
+
         return group
 
     def _create_controls_group(self) -> QGroupBox:
@@ -272,6 +416,29 @@ class StreamTab(QWidget):
         self.record_stop_button.setEnabled(False)
         layout.addWidget(self.record_stop_button)
 
+        # Aufnahme-Durchsatz + freier Speicher (nur während der Aufnahme)
+        self.recording_stats_label = QLabel("")
+        self.recording_stats_label.setStyleSheet("color: #888888;")
+        self.recording_stats_label.setVisible(False)
+        layout.addWidget(self.recording_stats_label)
+
+        # Nachbearbeitung (laufende Jobs mit Fortschritt)
+        self.postprocess_label = QLabel("")
+        self.postprocess_label.setStyleSheet("color: #888888;")
+        self.postprocess_label.setWordWrap(True)
+        self.postprocess_label.setVisible(False)
+        layout.addWidget(self.postprocess_label)
+
+        # Replay speichern (letzte Sekunden des Streams, auch per Hotkey)
+        hotkey = self.config.get('replay_hotkey', 'Ctrl+Shift+R')
+        self.replay_button = QPushButton(f"⏪ Replay speichern ({hotkey})")
+        self.replay_button.setMinimumHeight(40)
+        self.replay_button.setEnabled(False)
+        layout.addWidget(self.replay_button)
+
+        self.replay_shortcut = QShortcut(QKeySequence(hotkey), self)
+        self.replay_shortcut.setContext(Qt.ShortcutContext.ApplicationShortcut)
+
         return group
 
     def _create_preview_group(self) -> QGroupBox:
@@ -307,9 +474,8 @@ class StreamTab(QWidget):
         layout = QVBoxLayout()
         group.setLayout(layout)
 
-        # Log-TextEdit
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
+        # Log-Anzeige (begrenzt, gebündelte Updates)
+        self.log_text = LogView()
         self.log_text.setMaximumHeight(150)
         self.log_text.setPlaceholderText("Ereignisse werden hier angezeigt...")
         layout.addWidget(self.log_text)
@@ -404,7 +570,7 @@ class StreamTab(QWidget):
             QCheckBox::indicator:checked {
                 background: #0078d4;
             }
-            QTextEdit {
+            QPlainTextEdit {
                 background-color: #2b2b2b;
                 color: #ffffff;
                 border: 1px solid #555555;
@@ -433,11 +599,27 @@ class StreamTab(QWidget):
                 self.audio_combo.setCurrentIndex(i)
                 break
 
+        # Hauptquelle im Audio-Mixer setzen
+        self._on_audio_source_changed()
+
+        # Szenen vorladen
+        self.preload_scenes_checkbox.setChecked(self.config.get('preload_scenes', False))
+
+        # Overlays
+        self.logo_path = self.config.get('overlay_logo_path', '')
+        self.title_edit.setText(self.config.get('overlay_title_text', ''))
+        self.logo_checkbox.setChecked(self.config.get('overlay_logo_visible', False))
+        self.title_checkbox.setChecked(self.config.get('overlay_title_visible', False))
+
+        # Auflösungen passend zur gewählten Quelle anbieten
+        self._update_resolution_options()
+
         # Plattform und URL
         platform = self.config.get('platform', 'Benutzerdefiniert')
         if platform in STREAM_SERVICES:
             self.platform_combo.setCurrentText(platform)
             self.rtmp_url_edit.setText(STREAM_SERVICES[platform])
+        self._select_codec_for_platform(self.platform_combo.currentText())
 
         # Auflösung und Bitrate
         resolution = self.config.get('resolution', '1280x720')
@@ -452,6 +634,12 @@ class StreamTab(QWidget):
                 self.bitrate_combo.setCurrentIndex(i)
                 break
 
+        # Overlays einmalig rendern (passend zur Auflösung)
+        self._render_overlays()
+
+        # Profile (Auswahl ohne erneutes Übernehmen)
+        self._load_profiles(self.config.get('active_profile', ''))
+
         self.add_log("Konfiguration geladen")
 
     def _connect_signals(self) -> None:
@@ -459,6 +647,14 @@ class StreamTab(QWidget):
         # Plattform-Wechsel → RTMP-URL automatisch setzen
         self.platform_combo.currentTextChanged.connect(self._on_platform_changed)
 
+        # Codec-Wahl → für die aktuelle Plattform merken
+        self.codec_combo.currentIndexChanged.connect(self._on_codec_changed)
+
+        # Stream-Profile
+        self.profile_combo.currentIndexChanged.connect(self._on_profile_selected)
+        self.profile_save_button.clicked.connect(self._on_save_profile)
+        self.profile_delete_button.clicked.connect(self._on_delete_profile)
+
         # Key anzeigen Toggle
         self.show_key_checkbox.stateChanged.connect(self._toggle_key_visibility)
 
@@ -468,6 +664,10 @@ class StreamTab(QWidget):
         # Mute-Button
         self.mute_button.toggled.connect(self._on_mute_toggled)
 
+        # Audio-Mix: Hauptquelle wechseln / Quellen hinzufügen
+        self.audio_combo.currentIndexChanged.connect(self._on_audio_source_changed)
+        self.add_audio_button.clicked.connect(self._on_add_audio_source)
+
         # Stream-Buttons
         self.start_button.clicked.connect(self._on_start_stream)
         self.stop_button.clicked.connect(self._on_stop_stream)
@@ -477,12 +677,34 @@ class StreamTab(QWidget):
         self.record_button.clicked.connect(self._on_start_recording)
         self.record_stop_button.clicked.connect(self._on_stop_recording)
 
+        # Replay-Buffer
+        self.replay_button.clicked.connect(self._on_save_replay)
+        self.replay_shortcut.activated.connect(self._on_save_replay)
+
+        # Overlays: Sichtbarkeit live, Inhalt neu rendern nur bei Änderung
+        self.logo_button.clicked.connect(self._on_choose_logo)
+        self.logo_checkbox.toggled.connect(
+            lambda checked: self.stream_manager.overlay_layer.set_visible('logo', checked)
+        )
+        self.title_checkbox.toggled.connect(
+            lambda checked: self.stream_manager.overlay_layer.set_visible('title', checked)
+        )
+        self.title_edit.editingFinished.connect(self._render_overlays)
+        self.resolution_combo.currentIndexChanged.connect(self._render_overlays)
+        self.logo_checkbox.toggled.connect(self._save_config)
+        self.title_checkbox.toggled.connect(self._save_config)
+        self.title_edit.editingFinished.connect(self._save_config)
+
+        # Video-Quelle → nur native Auflösungen anbieten
+        self.video_combo.currentIndexChanged.connect(self._update_resolution_options)
+
         # Config speichern bei Änderungen
         self.video_combo.currentIndexChanged.connect(self._save_config)
         self.audio_combo.currentIndexChanged.connect(self._save_config)
         self.platform_combo.currentIndexChanged.connect(self._save_config)
         self.resolution_combo.currentIndexChanged.connect(self._save_config)
         self.bitrate_combo.currentIndexChanged.connect(self._save_config)
+        self.preload_scenes_checkbox.toggled.connect(self._save_config)
 
     def _on_platform_changed(self, platform: str) -> None:
         """
@@ -501,6 +723,234 @@ class StreamTab(QWidget):
                 self.rtmp_url_edit.setEnabled(True)
                 self.add_log("Benutzerdefinierte RTMP-URL")
 
+            self._select_codec_for_platform(platform)
+
+    def _select_codec_for_platform(self, platform: str) -> None:
+        """Wählt den für die Plattform gespeicherten Codec (Default: H.264)."""
+        codec = self.config.get('destination_codecs', {}).get(platform, 'h264')
+        index = self.codec_combo.findData(codec)
+        self.codec_combo.blockSignals(True)
+        self.codec_combo.setCurrentIndex(max(0, index))
+        self.codec_combo.blockSignals(False)
+
+    def _on_codec_changed(self) -> None:
+        """Merkt den Codec für die aktuelle Plattform."""
+        codecs = dict(self.config.get('destination_codecs', {}))
+        codecs[self.platform_combo.currentText()] = self.codec_combo.currentData()
+        self.config.set('destination_codecs', codecs)
+        self.config.save_config()
+        self.add_log(f"Video-Codec: {self.codec_combo.currentText()}")
+
+    # ==================== PROFILE ====================
+
+    def _load_profiles(self, selected: str = "") -> None:
+        """Befüllt die Profil-Auswahl (ohne das Profil anzuwenden)."""
+        self.profile_combo.blockSignals(True)
+        self.profile_combo.clear()
+        self.profile_combo.addItem("– kein Profil –", "")
+        for name in sorted(self.config.get_profiles()):
+            self.profile_combo.addItem(name, name)
+        self.profile_combo.setCurrentIndex(max(0, self.profile_combo.findData(selected)))
+        self.profile_combo.blockSignals(False)
+
+        self.profile_delete_button.setEnabled(bool(self.profile_combo.currentData()))
+        self._update_plan_label()
+
+    def _on_profile_selected(self) -> None:
+        """Übernimmt das gewählte Profil in Config und Oberfläche."""
+        name = self.profile_combo.currentData()
+        self.profile_delete_button.setEnabled(bool(name))
+        if not name:
+            self.config.set('active_profile', '')
+            self.config.save_config()
+            self._update_plan_label()
+            return
+
+        profile = self.config.apply_profile(name)
+        if profile is None:
+            return
+        self._apply_profile_to_ui(profile)
+        self.add_log(f"🗂️ Profil: {name}")
+        self._update_plan_label()
+
+    def _apply_profile_to_ui(self, profile: Dict[str, Any]) -> None:
+        """Setzt Quellen, Ziel und Qualität aus einem Profil."""
+        for combo, key in ((self.video_combo, 'video_source'), (self.audio_combo, 'audio_source')):
+            index = combo.findData(profile.get(key))
+            if index >= 0:
+                combo.setCurrentIndex(index)
+
+        platform = profile.get('platform', 'Benutzerdefiniert')
+        if platform in STREAM_SERVICES:
+            self.platform_combo.setCurrentText(platform)
+            if platform == "Benutzerdefiniert":
+                self.rtmp_url_edit.setText(profile.get('rtmp_url', ''))
+        self._select_codec_for_platform(self.platform_combo.currentText())
+
+        resolution = profile.get('resolution')
+        for i in range(self.resolution_combo.count()):
+            if self.resolution_combo.itemText(i).startswith(f"{resolution} "):
+                self.resolution_combo.setCurrentIndex(i)
+                break
+
+        bitrate = profile.get('bitrate')
+        for i in range(self.bitrate_combo.count()):
+            if self.bitrate_combo.itemText(i).startswith(f"{bitrate} "):
+                self.bitrate_combo.setCurrentIndex(i)
+                break
+
+    def _profile_settings(self) -> Dict[str, Any]:
+        """Aktuelles Setup als Profil-Einstellungen (ohne Stream-Key)."""
+        config = self._get_stream_config()
+        settings = {key: config[key] for key in (
+            'video_source', 'audio_source', 'rtmp_url', 'resolution', 'bitrate', 'fps', 'video_codec'
+        )}
+        settings['platform'] = self.platform_combo.currentText()
+        for key in self.stream_manager.PLAN_CONFIG_KEYS:
+            if self.config.get(key) is not None:
+                settings[key] = self.config.get(key)
+        return settings
+
+    def _on_save_profile(self) -> None:
+        """Speichert die aktuellen Einstellungen als (neues) Profil."""
+        name, ok = QInputDialog.getText(
+            self, "Profil speichern", "Profil-Name (z.B. \"Twitch 1080p60\"):",
+            text=self.profile_combo.currentData() or ""
+        )
+        name = name.strip()
+        if not ok or not name:
+            return
+
+        self.config.save_profile(name, self._profile_settings())
+        self.config.set('active_profile', name)
+        self.config.save_config()
+        self._load_profiles(name)
+        self.add_log(f"💾 Profil gespeichert: {name}")
+        self._schedule_plan_compile([name])
+
+    def _on_delete_profile(self) -> None:
+        """Löscht das gewählte Profil."""
+        name = self.profile_combo.currentData()
+        if not name or not self.config.delete_profile(name):
+            return
+        self.stream_manager.plan_cache.invalidate(name)
+        self._load_profiles()
+        self.add_log(f"🗑️ Profil gelöscht: {name}")
+
+    def _schedule_plan_compile(self, names: Optional[List[str]] = None) -> None:
+        """
+        Erstellt die Pipeline-Pläne der Profile im Leerlauf.
+
+        Ein Profil nach dem anderen; Geräte-Abfragen und Prüfung laufen
+        im StreamManager im Hintergrund (schedule_plan), unveränderte
+        Profile werden übersprungen.
+
+        Args:
+            names: Profile (None = alle)
+        """
+        pending = not self._plan_queue and self._plan_pending is None
+        for name in (names if names is not None else sorted(self.config.get_profiles())):
+            if name not in self._plan_queue:
+                self._plan_queue.append(name)
+        if pending and self._plan_queue:
+            QTimer.singleShot(0, self._compile_next_plan)
+
+    def _compile_next_plan(self) -> None:
+        """Plant das nächste Profil der Warteschlange (nur ohne laufende Pipeline)."""
+        if not self._plan_queue:
+            return
+        if self.is_streaming or self.is_preview_active or self.stream_manager.is_recording:
+            # Wird beim Übergang nach "idle" erneut angestoßen
+            self._plan_queue.clear()
+            return
+
+        name = self._plan_queue.pop(0)
+        profile = self.config.get_profiles().get(name)
+        if profile is not None:
+            video_source = profile.get('video_source', 'screen')
+            platform = profile.get('platform', 'Benutzerdefiniert')
+            resolution = profile.get('resolution', '1280x720')
+            rtmp_url = STREAM_SERVICES.get(platform) or profile.get('rtmp_url', '')
+            scheduled = self.stream_manager.schedule_plan(
+                name,
+                video_source=video_source,
+                audio_source=profile.get('audio_source', 'default'),
+                rtmp_url=rtmp_url,
+                stream_key=self._get_stream_key(platform),
+                resolution=resolution,
+                bitrate=int(profile.get('bitrate', 2500)),
+                fps=int(profile.get('fps', 30)),
+                scenes=self._build_scenes(resolution, video_source),
+                initial_scene=self._get_initial_scene(video_source),
+                video_codec=profile.get('video_codec', 'h264'),
+                settings=profile
+            )
+            if scheduled:
+                # Weiter in _on_plan_ready (Geräte-Abfragen laufen im Hintergrund)
+                self._plan_pending = name
+                return
+
+        if self._plan_queue:
+            QTimer.singleShot(0, self._compile_next_plan)
+
+    def _on_plan_ready(self, name: str) -> None:
+        """Plan eines Profils fertig: Anzeige aktualisieren, nächstes Profil planen."""
+        self._plan_pending = None
+        if name == self.profile_combo.currentData():
+            self._update_plan_label()
+        if self._plan_queue:
+            QTimer.singleShot(0, self._compile_next_plan)
+
+    def _update_plan_label(self) -> None:
+        """Zeigt den Plan-Status des gewählten Profils."""
+        name = self.profile_combo.currentData()
+        if not name:
+            self.plan_label.setText("")
+            return
+        plan = self.stream_manager.plan_cache.get(name)
+        if plan is None:
+            self.plan_label.setText("⏳ Pipeline wird im Leerlauf vorab geprüft")
+        else:
+            self.plan_label.setText(f"{plan.summary()} · {plan.encoder}")
+
+    def _get_stream_key(self, platform: str) -> str:
+        """Stream-Key aus dem Eingabefeld, sonst aus .env (<PLATTFORM>_STREAM_KEY)."""
+        return self.stream_key_edit.text().strip() or self.config.get_stream_key(platform) or ""
+
+    def _update_resolution_options(self) -> None:
+        """
+        Befüllt die Auflösungs-Auswahl passend zur Video-Quelle.
+
+        Webcams bieten nur Auflösungen an, die das Gerät nativ liefert
+        (laut Capability-Index) - so wird nie hochskaliert.
+        """
+        device = self.video_combo.currentData()
+        current = self.resolution_combo.currentText().split()[0] if self.resolution_combo.count() else ""
+
+        native = self.device_manager.get_supported_resolutions(device) if device else []
+        if native:
+            items = [f"{res} (nativ)" for res in native]
+        else:
+            items = DEFAULT_RESOLUTIONS
+
+        self.resolution_combo.blockSignals(True)
+        self.resolution_combo.clear()
+        self.resolution_combo.addItems(items)
+
+        # Bisherige Auswahl beibehalten, sonst größte Auflösung ≤ 1280x720
+        for i, item in enumerate(items):
+            if item.startswith(current + " "):
+                self.resolution_combo.setCurrentIndex(i)
+                break
+        else:
+            for i, item in enumerate(items):
+                width, height = (int(v) for v in item.split()[0].split('x'))
+                if width * height <= 1280 * 720:
+                    self.resolution_combo.setCurrentIndex(i)
+                    break
+
+        self.resolution_combo.blockSignals(False)
+
     def _toggle_key_visibility(self, state: int) -> None:
         """Zeigt/Versteckt Stream-Key."""
         if state == Qt.CheckState.Checked.value:
@@ -511,11 +961,13 @@ class StreamTab(QWidget):
             self.show_key_checkbox.setText("🔓 Key anzeigen")
 
     def _on_volume_changed(self, value: int) -> None:
-        """Aktualisiert Lautstärke-Label."""
+        """Setzt den Gain der Hauptquelle (live, ohne Pipeline-Rebuild)."""
         self.volume_label.setText(f"{value}%")
+        self.stream_manager.audio_mixer.set_volume(AudioMixer.PRIMARY_ID, value / 100)
 
     def _on_mute_toggled(self, checked: bool) -> None:
         """Mute/Unmute Audio."""
+        self.stream_manager.audio_mixer.set_mute(AudioMixer.PRIMARY_ID, checked)
         if checked:
             self.mute_button.setText("🔊 Unmute")
             self.volume_slider.setEnabled(False)
@@ -525,21 +977,152 @@ class StreamTab(QWidget):
             self.volume_slider.setEnabled(True)
             self.add_log("Audio aktiviert")
 
+    def _on_audio_source_changed(self) -> None:
+        """Tauscht die Hauptquelle im Mixer (live, wenn Stream läuft)."""
+        device = self.audio_combo.currentData()
+        if device:
+            self.stream_manager.audio_mixer.set_primary_source(device)
+
+    def _on_add_audio_source(self) -> None:
+        """Fügt die gewählte Quelle zum Audio-Mix hinzu."""
+        device = self.extra_audio_combo.currentData()
+        name = self.extra_audio_combo.currentText()
+        if not device:
+            return
+
+        source_id = self.stream_manager.audio_mixer.add_source(device)
+        self._add_audio_source_row(source_id, name)
+        self.add_log(f"🎤 Audio-Quelle gemischt: {name}")
+
+    def _add_audio_source_row(self, source_id: str, name: str) -> None:
+        """
+        Erstellt eine Zeile mit Gain-Slider und Mute für eine Mix-Quelle.
+
+        Args:
+            source_id: ID der Quelle im AudioMixer
+            name: Anzeigename
+        """
+        mixer = self.stream_manager.audio_mixer
+
+        row = QWidget()
+        row_layout = QHBoxLayout()
+        row_layout.setContentsMargins(0, 0, 0, 0)
+        row.setLayout(row_layout)
+
+        label = QLabel(name)
+        label.setMinimumWidth(120)
+        row_layout.addWidget(label)
+
+        slider = QSlider(Qt.Orientation.Horizontal)
+        slider.setRange(0, 150)
+        slider.setValue(100)
+        value_label = QLabel("100%")
+        row_layout.addWidget(slider)
+        row_layout.addWidget(value_label)
+
+        mute_button = QPushButton("🔇")
+        mute_button.setCheckable(True)
+        mute_button.setMaximumWidth(40)
+        row_layout.addWidget(mute_button)
+
+        row_layout.addWidget(self._create_level_bar(source_id))
+
+        remove_button = QPushButton("✖")
+        remove_button.setMaximumWidth(40)
+        row_layout.addWidget(remove_button)
+
+        def on_volume(value: int) -> None:
+            value_label.setText(f"{value}%")
+            mixer.set_volume(source_id, value / 100)
+
+        def on_remove() -> None:
+            mixer.remove_source(source_id)
+            self.level_bars.pop(source_id, None)
+            self.extra_audio_layout.removeWidget(row)
+            row.deleteLater()
+            self.add_log(f"🎤 Audio-Quelle entfernt: {name}")
+
+        slider.valueChanged.connect(on_volume)
+        mute_button.toggled.connect(lambda checked: mixer.set_mute(source_id, checked))
+        remove_button.clicked.connect(on_remove)
+
+        self.extra_audio_layout.addWidget(row)
+
+    def _create_level_bar(self, source_id: str) -> QProgressBar:
+        """
+        Erstellt ein VU-Meter für eine Audio-Quelle.
+
+        Args:
+            source_id: ID der Quelle im AudioMixer bzw. 'master'
+
+        Returns:
+            QProgressBar (0 = -60 dB, 60 = 0 dBFS)
+        """
+        bar = QProgressBar()
+        bar.setRange(0, 60)
+        bar.setValue(0)
+        bar.setTextVisible(False)
+        bar.setMaximumWidth(80)
+        bar.setMaximumHeight(12)
+        bar.setStyleSheet(self.LEVEL_STYLE_OK)
+        self.level_bars[source_id] = bar
+        return bar
+
+    def _on_levels(self, levels: dict) -> None:
+        """
+        Aktualisiert die VU-Meter (kommt mit fester Rate vom StreamManager).
+
+        Args:
+            levels: Dict source_id → {'peak': dB, 'rms': dB}
+        """
+        for source_id, values in levels.items():
+            bar = self.level_bars.get(source_id)
+            if bar is None:
+                continue
+
+            bar.setValue(int(max(0.0, values['peak'] + 60)))
+
+            # Stylesheet nur bei Zustandswechsel setzen (teuer)
+            clipping = values['peak'] > -1.0
+            if self._clipping.get(source_id) != clipping:
+                self._clipping[source_id] = clipping
+                bar.setStyleSheet(self.LEVEL_STYLE_CLIP if clipping else self.LEVEL_STYLE_OK)
+
     def _select_scene(self, scene_type: str) -> None:
         """
         Wählt eine Szene aus (wie OBS Scenes).
 
         Args:
-            scene_type: 'webcam' oder 'desktop'
+            scene_type: 'webcam', 'desktop' oder 'pip'
         """
-        if scene_type == 'webcam':
+        # Stream läuft mit vorgeladenen Szenen → live umschalten
+        if self.is_streaming:
+            engine = self.stream_manager.scene_engine
+            if engine.has_scene(scene_type):
+                self.stream_manager.switch_scene(scene_type)
+                active = scene_type
+            else:
+                self.add_log("⚠️ Szene nicht vorgeladen - Wechsel erst nach Stream-Neustart")
+                active = engine.active_scene
+            self._set_scene_buttons(active)
+            return
+
+        if scene_type == 'pip':
+            # Bild-in-Bild braucht Desktop + Webcam
+            if self._find_webcam() is None or self.video_combo.findData('screen') < 0:
+                self.add_log("⚠️ Bild-in-Bild benötigt Desktop und Webcam")
+                self.scene_pip_btn.setChecked(False)
+                return
+            self._set_scene_buttons('pip')
+            self.add_log("🖼️ Szene: Bild-in-Bild")
+
+        elif scene_type == 'webcam':
             # Finde erste Webcam
             for i in range(self.video_combo.count()):
                 device = self.video_combo.itemData(i)
                 if device != 'screen':  # Alles außer Screen ist Webcam
                     self.video_combo.setCurrentIndex(i)
-                    self.scene_webcam_btn.setChecked(True)
-                    self.scene_desktop_btn.setChecked(False)
+                    self._set_scene_buttons('webcam')
                     self.add_log("🎥 Szene: Webcam")
                     break
 
@@ -549,17 +1132,134 @@ class StreamTab(QWidget):
                 device = self.video_combo.itemData(i)
                 if device == 'screen':
                     self.video_combo.setCurrentIndex(i)
-                    self.scene_desktop_btn.setChecked(True)
-                    self.scene_webcam_btn.setChecked(False)
+                    self._set_scene_buttons('desktop')
                     self.add_log("🖥️ Szene: Desktop")
                     break
 
+    def _on_choose_logo(self) -> None:
+        """Wählt die Logo-Datei aus."""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Logo wählen", self.logo_path, "Bilder (*.png *.jpg *.jpeg *.svg)"
+        )
+        if not path:
+            return
+
+        self.logo_path = path
+        self.logo_checkbox.setChecked(True)
+        self._render_overlays()
+        self._save_config()
+
+    def _render_overlays(self) -> None:
+        """
+        Rendert Logo und Titel neu (nur bei Inhalts- oder Auflösungsänderung).
+
+        Ein-/Ausblenden läuft dagegen direkt über set_visible().
+        """
+        overlay_layer = self.stream_manager.overlay_layer
+        resolution = self.resolution_combo.currentText().split()[0]
+        width, height = (int(v) for v in resolution.split('x'))
+
+        if self.logo_path:
+            overlay_layer.set_overlay('logo', {
+                'kind': 'image',
+                'path': self.logo_path,
+                'x': 16,
+                'y': 16,
+                'width': width // 8,
+            }, visible=self.logo_checkbox.isChecked())
+
+        title = self.title_edit.text().strip()
+        if title:
+            font_size = max(12, height // 30)
+            overlay_layer.set_overlay('title', {
+                'kind': 'text',
+                'text': title,
+                'x': 0,
+                'y': height - height // 6,
+                'font_size': font_size,
+            }, visible=self.title_checkbox.isChecked())
+        else:
+            overlay_layer.remove_overlay('title')
+
+    def _set_scene_buttons(self, active: Optional[str]) -> None:
+        """Markiert den Button der aktiven Szene."""
+        self.scene_webcam_btn.setChecked(active == 'webcam')
+        self.scene_desktop_btn.setChecked(active == 'desktop')
+        self.scene_pip_btn.setChecked(active == 'pip')
+
+    def _find_webcam(self, current: Optional[str] = None) -> Optional[str]:
+        """Gewählte Webcam oder die erste erkannte (None wenn keine)."""
+        if current is None:
+            current = self.video_combo.currentData()
+        if current and current != 'screen':
+            return current
+        for i in range(self.video_combo.count()):
+            device = self.video_combo.itemData(i)
+            if device != 'screen':
+                return device
+        return None
+
+    def _get_initial_scene(self, video_source: str) -> str:
+        """Szene beim Stream-Start (laut Schnellwahl-Buttons)."""
+        if self.scene_pip_btn.isChecked():
+            return 'pip'
+        return 'desktop' if video_source == 'screen' else 'webcam'
+
+    def _build_scenes(
+        self,
+        resolution: str,
+        video_source: Optional[str] = None
+    ) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Baut die Szenen für den Stream-Start.
+
+        Ohne Vorladen und ohne Bild-in-Bild: None (nur gewählte Quelle,
+        kein compositor). Mit Vorladen werden alle Szenen geöffnet.
+
+        Args:
+            resolution: Ausgabe-Auflösung (z.B. "1280x720")
+            video_source: Video-Quelle (Default: aktuelle Auswahl; Profile)
+
+        Returns:
+            Dict Szenen-Name → Layer-Liste oder None
+        """
+        webcam = self._find_webcam(video_source)
+        if webcam is None or self.video_combo.findData('screen') < 0:
+            return None
+
+        width, height = (int(v) for v in resolution.split('x'))
+        pip = self.stream_manager.scene_engine.pip_layout(
+            'screen', webcam, width, height,
+            scale=float(self.config.get('pip_scale', 0.25)),
+            corner=self.config.get('pip_corner', 'bottom-right')
+        )
+
+        if not self.preload_scenes_checkbox.isChecked():
+            return {'pip': pip} if self.scene_pip_btn.isChecked() else None
+
+        return {
+            'webcam': [{'source': webcam}],
+            'desktop': [{'source': 'screen'}],
+            'pip': pip,
+        }
+
     def _connect_stream_manager(self) -> None:
         """Verbindet StreamManager-Signals mit UI."""
         # StreamManager → UI
         self.stream_manager.status_signal.connect(self.add_log)
         self.stream_manager.error_signal.connect(self.add_log)
         self.stream_manager.state_changed_signal.connect(self._on_stream_state_changed)
+        self.stream_manager.plan_signal.connect(self._on_plan_ready)
+        self.stream_manager.levels_signal.connect(self._on_levels)
+        self.stream_manager.recording_signal.connect(self._on_recording_changed)
+        self.stream_manager.recording_stats_signal.connect(self._on_recording_stats)
+        self.stream_manager.postprocess_signal.connect(self._on_postprocess_update)
+
+        # Pegelmessung konfigurieren (Intervall der level-Elemente, UI-Rate)
+        self.stream_manager.set_metering(
+            self.config.get('level_interval_ms', 50),
+            self.config.get('meter_rate_hz', 15)
+        )
 
         print("✅ StreamManager mit UI verbunden")
 
@@ -568,12 +1268,13 @@ class StreamTab(QWidget):
         Wird aufgerufen wenn Stream-State sich ändert.
 
         Args:
-            state: "idle", "starting", "streaming", "stopping"
+            state: "idle", "starting", "live", "reconnecting", "stopping"
         """
-        if state == "streaming":
-            self.is_streaming = True
-        elif state == "idle":
-            self.is_streaming = False
+        self.stream_state = state
+        self.is_streaming = state != "idle"
+        if state == "idle":
+            # Leerlauf: Pläne der Profile (neu) erstellen
+            self._schedule_plan_compile()
 
         self._update_button_states()
 
@@ -581,13 +1282,14 @@ class StreamTab(QWidget):
         """Wird aufgerufen wenn 'LIVE GEHEN' geklickt."""
         # Validierung
         rtmp_url = self.rtmp_url_edit.text().strip()
-        stream_key = self.stream_key_edit.text().strip()
+        stream_key = self._get_stream_key(self.platform_combo.currentText())
 
         if not rtmp_url:
             self.add_log("❌ Fehler: RTMP-URL fehlt!")
             return
 
-        if not stream_key:
+        # SRT: Stream-Key optional (wird als Stream-ID gesendet)
+        if not stream_key and not SrtOutput.is_srt_url(rtmp_url):
             self.add_log("❌ Fehler: Stream-Key fehlt!")
             return
 
@@ -603,7 +1305,10 @@ class StreamTab(QWidget):
             stream_key=config['stream_key'],
             resolution=config['resolution'],
             bitrate=config['bitrate'],
-            fps=config['fps']
+            fps=config['fps'],
+            scenes=self._build_scenes(config['resolution']),
+            initial_scene=self._get_initial_scene(config['video_source']),
+            video_codec=config['video_codec']
         )
 
         if not success:
@@ -641,14 +1346,23 @@ class StreamTab(QWidget):
             self.is_preview_active = False
             self.preview_button.setText("▶️ Preview starten")
             self.preview_label.setText("🎥 Preview inaktiv\n\nKlicke 'Preview starten' um eine Vorschau zu sehen")
+            self._schedule_plan_compile()
 
     def _update_button_states(self) -> None:
         """Aktualisiert Button-States basierend auf Stream-Status."""
         self.start_button.setEnabled(not self.is_streaming)
-        self.stop_button.setEnabled(self.is_streaming)
+        self.stop_button.setEnabled(self.is_streaming and self.stream_state != "stopping")
+        self.replay_button.setEnabled(
+            self.stream_state == "live" and self.stream_manager.replay_buffer.enabled
+        )
 
+        labels = {
+            "starting": "⏳ STARTET...",
+            "reconnecting": "🔁 VERBINDE NEU...",
+            "stopping": "⏳ STOPPT...",
+        }
         if self.is_streaming:
-            self.start_button.setText("🔴 LIVE")
+            self.start_button.setText(labels.get(self.stream_state, "🔴 LIVE"))
         else:
             self.start_button.setText("🔴 LIVE GEHEN")
 
@@ -671,10 +1385,11 @@ class StreamTab(QWidget):
             'video_source': self.video_combo.currentData(),
             'audio_source': self.audio_combo.currentData(),
             'rtmp_url': self.rtmp_url_edit.text().strip(),
-            'stream_key': self.stream_key_edit.text().strip(),
+            'stream_key': self._get_stream_key(self.platform_combo.currentText()),
             'resolution': resolution,
             'bitrate': bitrate,
             'fps': 30,
+            'video_codec': self.codec_combo.currentData(),
             'volume': self.volume_slider.value() if not self.mute_button.isChecked() else 0,
         }
 
@@ -687,6 +1402,11 @@ class StreamTab(QWidget):
         self.config.set('platform', self.platform_combo.currentText())
         self.config.set('resolution', config['resolution'])
         self.config.set('bitrate', config['bitrate'])
+        self.config.set('preload_scenes', self.preload_scenes_checkbox.isChecked())
+        self.config.set('overlay_logo_path', self.logo_path)
+        self.config.set('overlay_logo_visible', self.logo_checkbox.isChecked())
+        self.config.set('overlay_title_text', self.title_edit.text())
+        self.config.set('overlay_title_visible', self.title_checkbox.isChecked())
 
         # Stream-Key NICHT in Config speichern (nur in .env)!
         # TODO: Verschlüsselte Speicherung über keyring (Phase 4)
@@ -714,6 +1434,54 @@ class StreamTab(QWidget):
             self.record_button.setEnabled(False)
             self.record_stop_button.setEnabled(True)
 
+    def _on_recording_changed(self, active: bool) -> None:
+        """Aufnahme-Status geändert (auch wenn sie mit Stream/Preview endet)."""
+        self.record_button.setEnabled(not active)
+        self.record_stop_button.setEnabled(active)
+        self.recording_stats_label.setVisible(active)
+        if not active:
+            self.recording_stats_label.setText("")
+
+    def _on_recording_stats(self, stats: Dict[str, Any]) -> None:
+        """Zeigt Schreib-Durchsatz und Platten-Reserve der Aufnahme an."""
+        rate = stats['recording_mb_s']
+        text = f"💾 {rate:.1f} MB/s" if rate is not None else "💾 – MB/s"
+        if stats['disk_free_bytes'] is not None:
+            text += f" · {stats['disk_free_bytes'] / (1024 ** 3):.1f} GB frei"
+        if stats['disk_remaining_min'] is not None:
+            text += f" (~{stats['disk_remaining_min']:.0f} min)"
+        color = "#ff5555" if stats['disk_low'] else "#888888"
+        self.recording_stats_label.setStyleSheet(f"color: {color};")
+        self.recording_stats_label.setText(text)
+
+    def _on_postprocess_update(self, job: Dict[str, Any]) -> None:
+        """Zeigt Fortschritt der Nachbearbeitung, meldet fertige/fehlerhafte Jobs."""
+        name = os.path.basename(job['output'])
+        if job['state'] == 'done':
+            self.add_log(f"✅ Nachbearbeitung fertig: {name}")
+        elif job['state'] == 'failed':
+            self.add_log(f"❌ Nachbearbeitung fehlgeschlagen ({name}): {job['error']}")
+
+        jobs = self.stream_manager.postprocess_queue.get_jobs()
+        running = [j for j in jobs if j['state'] == 'running']
+        queued = sum(1 for j in jobs if j['state'] == 'queued')
+
+        lines = [
+            f"🛠️ {j['kind']} {os.path.basename(j['output'])}: {j['progress']:.0f}%"
+            for j in running
+        ]
+        if queued:
+            lines.append(f"⏳ {queued} Job(s) wartend")
+
+        self.postprocess_label.setText("\n".join(lines))
+        self.postprocess_label.setVisible(bool(lines))
+
+    def _on_save_replay(self) -> None:
+        """Handler für Replay speichern (Button oder Hotkey)."""
+        if not self.is_streaming:
+            return
+        self.stream_manager.save_replay()
+
     def _on_stop_recording(self) -> None:
         """Handler für Recording-Stop."""
         self.add_log("⏹️ Aufnahme wird gestoppt...")
@@ -729,17 +1497,15 @@ class StreamTab(QWidget):
         """
         Fügt Log-Nachricht hinzu.
 
+        Die Anzeige übernimmt sie beim nächsten gebündelten Update, die
+        Log-Datei schreibt im Hintergrund-Thread.
+
         Args:
             message: Log-Nachricht
         """
-        from datetime import datetime
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.append(f"[{timestamp}] {message}")
-
-        # Auto-Scroll zu letzter Zeile
-        cursor = self.log_text.textCursor()
-        cursor.movePosition(cursor.MoveOperation.End)
-        self.log_text.setTextCursor(cursor)
+        self.log_text.add_line(f"[{timestamp}] {message}")
+        self.log_file.log(message)
 
     def update_preview(self, pixmap: QPixmap) -> None:
         """
@@ -10,8 +10,11 @@ the Free Software Foundation, either version 3 of the License, or
 (at your option) any later version.
 """
 
+import atexit
 import json
 import os
+import threading
+import time
 from pathlib import Path
 from typing import Any, Dict, Optional
 from dotenv import load_dotenv
@@ -22,7 +25,24 @@ class ConfigManager:
     Verwaltet Konfiguration und Einstellungen für TUXRTMPilot.
     
     Speichert Settings in JSON-Datei und lädt Secrets aus .env
+
+    Speichern läuft verzögert in einem Hintergrund-Thread: save_config()
+    merkt nur vor, mehrere Aufrufe kurz hintereinander (z.B. beim Laden
+    des Stream-Tabs) werden zu einem Schreibvorgang zusammengefasst.
+    Geschrieben wird atomar (temporäre Datei + fsync + rename) und nur,
+    wenn sich der Inhalt seit dem letzten Schreiben geändert hat.
     """
+
+    # Wartezeit nach dem letzten save_config() bis zum Schreiben
+    SAVE_DELAY_S = 0.5
+
+    # Inhalt eines Stream-Profils (Quellen, Encoder, Ziel) - ohne Stream-Key!
+    PROFILE_KEYS = (
+        "video_source", "audio_source", "resolution", "bitrate", "fps",
+        "platform", "rtmp_url", "video_codec",
+        "encoder_preset", "encoder_threads", "keyframe_interval",
+        "srt_mode", "srt_latency_ms",
+    )
     
     DEFAULT_CONFIG = {
         "video_source": "screen",
@@ -33,6 +53,35 @@ class ConfigManager:
         "platform": "Benutzerdefiniert",
         "rtmp_url": "",
         "last_used_device": None,
+        "level_interval_ms": 50,
+        "meter_rate_hz": 15,
+        "audio_resample_quality": 4,
+        "av_sync_auto": True,
+        "av_audio_offset_ms": 0,
+        "preload_scenes": False,
+        "pip_scale": 0.25,
+        "pip_corner": "bottom-right",
+        "overlay_logo_path": "",
+        "overlay_logo_visible": False,
+        "overlay_title_text": "",
+        "overlay_title_visible": False,
+        "replay_enabled": True,
+        "replay_seconds": 30,
+        "replay_max_mb": 256,
+        "replay_hotkey": "Ctrl+Shift+R",
+        "recording_segment_minutes": 10,
+        "recording_segment_mb": 0,
+        "recording_fragmented_mp4": False,
+        "postprocess_remux": True,
+        "postprocess_transcode_kbps": 0,
+        "postprocess_thumbnail": True,
+        "postprocess_workers": 1,
+        "srt_mode": "caller",
+        "srt_latency_ms": 200,
+        "reconnect_attempts": 3,
+        "reconnect_delay_s": 2,
+        "profiles": {},
+        "active_profile": "",
     }
     
     def __init__(self, config_file: str = "tuxrtmpilot_config.json"):
@@ -46,6 +95,17 @@ class ConfigManager:
         self.config_dir.mkdir(parents=True, exist_ok=True)
         self.config_file = self.config_dir / config_file
         self.config: Dict[str, Any] = {}
+
+        # Verzögertes Speichern: Zeitpunkt des letzten Wunsches + zuletzt geschriebener Inhalt
+        self._lock = threading.Lock()
+        self._save_cond = threading.Condition(self._lock)
+        self._save_requested_at: Optional[float] = None
+        self._saved_json: Optional[str] = None
+        # save_config() aufgerufen, aber noch nicht geschrieben (set() allein speichert nie)
+        self._save_pending = False
+        self._writer: Optional[threading.Thread] = None
+        self._write_lock = threading.Lock()
+        atexit.register(self.flush)
         
         # .env aus Projekt-Root laden (für Stream-Keys etc.)
         load_dotenv()
@@ -63,6 +123,7 @@ class ConfigManager:
             try:
                 with open(self.config_file, 'r', encoding='utf-8') as f:
                     self.config = json.load(f)
+                self._saved_json = self._serialize()
                 print(f"✅ Config geladen: {self.config_file}")
             except json.JSONDecodeError as e:
                 print(f"⚠️ Config-Fehler: {e}, verwende Defaults")
@@ -76,19 +137,109 @@ class ConfigManager:
     
     def save_config(self) -> bool:
         """
-        Speichert aktuelle Konfiguration in JSON-Datei.
+        Merkt das Speichern vor (kehrt sofort zurück).
+        
+        Geschrieben wird SAVE_DELAY_S nach dem letzten Aufruf im
+        Hintergrund-Thread; flush() schreibt sofort.
+        
+        Returns:
+            True (Speichern vorgemerkt)
+        """
+        with self._save_cond:
+            self._save_requested_at = time.monotonic()
+            self._save_pending = True
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(
+                    target=self._write_worker, name="config-writer", daemon=True
+                )
+                self._writer.start()
+            self._save_cond.notify()
+        return True
+    
+    def flush(self) -> bool:
+        """
+        Schreibt vorgemerkte Änderungen sofort (z.B. beim Beenden).
+        
+        Nur nach save_config(): Werte, die lediglich per set() geändert
+        wurden (z.B. temporäre Overrides der Benchmarks), bleiben ungespeichert.
+        
+        Returns:
+            True bei Erfolg oder wenn nichts zu schreiben war
+        """
+        with self._save_cond:
+            self._save_requested_at = None
+            self._save_cond.notify()
+        # _write_lock wartet auf einen Schreibvorgang, den der Worker schon begonnen hat
+        with self._write_lock:
+            with self._lock:
+                pending = self._save_pending
+            if not pending:
+                return True
+            return self._write_locked()
+    
+    def _write_worker(self) -> None:
+        """Hintergrund-Thread: schreibt, sobald SAVE_DELAY_S lang Ruhe war."""
+        while True:
+            with self._save_cond:
+                while self._save_requested_at is None:
+                    # Nichts mehr vorgemerkt → Thread endet (nächstes save_config startet neu)
+                    if not self._save_cond.wait(timeout=10):
+                        if self._save_requested_at is None:
+                            self._writer = None
+                            return
+                remaining = self._save_requested_at + self.SAVE_DELAY_S - time.monotonic()
+                if remaining > 0:
+                    self._save_cond.wait(timeout=remaining)
+                    continue
+                self._save_requested_at = None
+            self._write()
+    
+    def _serialize(self) -> str:
+        """JSON-Inhalt der Config (Aufrufer hält ggf. den Lock)."""
+        return json.dumps(self.config, indent=2, ensure_ascii=False)
+    
+    def _write(self) -> bool:
+        """
+        Schreibt die Config atomar, falls sie sich geändert hat.
         
         Returns:
             True bei Erfolg, False bei Fehler
         """
+        with self._write_lock:
+            return self._write_locked()
+    
+    def _write_locked(self) -> bool:
+        """Schreibvorgang (nur unter _write_lock, Worker und flush() nie gleichzeitig)."""
+        with self._lock:
+            content = self._serialize()
+            self._save_pending = False
+            if content == self._saved_json:
+                return True
+        
+        tmp_file = self.config_file.with_suffix('.tmp')
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
-            print(f"✅ Config gespeichert: {self.config_file}")
-            return True
-        except Exception as e:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.config_file)
+            
+            # Verzeichnis-Eintrag (rename) ebenfalls auf die Platte bringen
+            dir_fd = os.open(self.config_dir, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError as e:
             print(f"❌ Config-Speichern fehlgeschlagen: {e}")
+            with self._lock:
+                self._save_pending = True
             return False
+        
+        with self._lock:
+            self._saved_json = content
+        print(f"✅ Config gespeichert: {self.config_file}")
+        return True
     
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -111,7 +262,8 @@ class ConfigManager:
             key: Config-Schlüssel
             value: Neuer Wert
         """
-        self.config[key] = value
+        with self._lock:
+            self.config[key] = value
     
     def get_stream_key(self, platform: str) -> Optional[str]:
         """
@@ -128,6 +280,86 @@ class ConfigManager:
         env_key = f"{platform.upper()}_STREAM_KEY"
         return os.getenv(env_key)
     
+    def get_srt_passphrase(self) -> str:
+        """
+        Holt die SRT-Passphrase aus der Umgebungsvariable SRT_PASSPHRASE.
+
+        SICHERHEIT: Wie Stream-Keys nie in der Config-Datei!
+
+        Returns:
+            Passphrase oder "" (unverschlüsselt)
+        """
+        return os.getenv("SRT_PASSPHRASE", "")
+    
+    def get_profiles(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Gespeicherte Stream-Profile (z.B. "Twitch 1080p60", "Webcam-Talk").
+        
+        Returns:
+            Dict Profil-Name → Einstellungen (Schlüssel aus PROFILE_KEYS)
+        """
+        return dict(self.config.get("profiles", {}))
+    
+    def save_profile(self, name: str, settings: Dict[str, Any]) -> None:
+        """
+        Speichert ein Profil (überschreibt gleichnamige).
+        
+        SICHERHEIT: Nur PROFILE_KEYS werden übernommen - kein Stream-Key!
+        
+        Args:
+            name: Profil-Name
+            settings: Einstellungen (weitere Schlüssel werden ignoriert)
+        """
+        profile = {key: settings[key] for key in self.PROFILE_KEYS if key in settings}
+        with self._lock:
+            profiles = dict(self.config.get("profiles", {}))
+            profiles[name] = profile
+            self.config["profiles"] = profiles
+        self.save_config()
+    
+    def delete_profile(self, name: str) -> bool:
+        """
+        Löscht ein Profil.
+        
+        Returns:
+            True wenn es existierte
+        """
+        with self._lock:
+            profiles = dict(self.config.get("profiles", {}))
+            if profiles.pop(name, None) is None:
+                return False
+            self.config["profiles"] = profiles
+            if self.config.get("active_profile") == name:
+                self.config["active_profile"] = ""
+        self.save_config()
+        return True
+    
+    def apply_profile(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Übernimmt ein Profil in die aktiven Einstellungen.
+        
+        Der Video-Codec landet zusätzlich bei der Plattform des Profils
+        (destination_codecs), damit die Codec-Wahl im Stream-Tab passt.
+        
+        Args:
+            name: Profil-Name
+            
+        Returns:
+            Einstellungen des Profils oder None wenn unbekannt
+        """
+        profile = self.config.get("profiles", {}).get(name)
+        if profile is None:
+            return None
+        with self._lock:
+            self.config.update(profile)
+            if "video_codec" in profile and "platform" in profile:
+                codecs = dict(self.config.get("destination_codecs", {}))
+                codecs[profile["platform"]] = profile["video_codec"]
+                self.config["destination_codecs"] = codecs
+            self.config["active_profile"] = name
+        self.save_config()
+        return dict(profile)
+    
     def reset_to_defaults(self) -> None:
         """Setzt Config auf Default-Werte zurück."""
         self.config = self.DEFAULT_CONFIG.copy()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+TUXRTMPilot - Log File
+Copyright (C) 2025 Heiko Schäfer <contact@tuxhs.de>
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Eine JSON-Zeile pro Meldung (Zeitstempel, Level, Quelle, Text)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'source': getattr(record, 'source', record.name),
+            'message': record.getMessage(),
+        }
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler, der bei voller Queue verwirft statt zu blockieren."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Nur Text weitergeben - keine Objekt-Referenzen in der Queue halten
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+
+class LogFile:
+    """
+    Strukturierte Log-Datei für Post-Mortems (JSON-Lines, rotierend).
+
+    Meldungen landen in einer begrenzten Queue und werden von einem
+    QueueListener-Thread geschrieben - der Qt-Thread wartet nie auf die
+    Platte. Bei Meldungsfluten (z.B. GStreamer-Warnungen) wird verworfen
+    statt zu stauen; die Anzahl steht im nächsten geschriebenen Eintrag.
+
+    Datei: ~/.config/tuxrtmpilot/logs/tuxrtmpilot.jsonl (+ .1, .2, ...)
+    """
+
+    FILE_NAME = "tuxrtmpilot.jsonl"
+    MAX_BYTES = 5 * 1024 * 1024
+    BACKUP_COUNT = 3
+    QUEUE_SIZE = 10000
+
+    def __init__(self, log_dir: Optional[Path] = None):
+        """
+        Initialisiert LogFile und startet den Schreib-Thread.
+
+        Args:
+            log_dir: Verzeichnis (Default: ~/.config/tuxrtmpilot/logs)
+        """
+        self.log_dir = log_dir or Path.home() / ".config" / "tuxrtmpilot" / "logs"
+        self.log_file = self.log_dir / self.FILE_NAME
+
+        self._logger = logging.getLogger("tuxrtmpilot")
+        self._logger.setLevel(logging.DEBUG)
+        self._logger.propagate = False
+
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        self._handler: Optional[_DroppingQueueHandler] = None
+        self._reported_drops = 0
+
+        try:
+            self.log_dir.mkdir(parents=True, exist_ok=True)
+            file_handler = logging.handlers.RotatingFileHandler(
+                self.log_file, maxBytes=self.MAX_BYTES,
+                backupCount=self.BACKUP_COUNT, encoding='utf-8'
+            )
+        except OSError as e:
+            print(f"⚠️ Log-Datei nicht verfügbar: {e}")
+            return
+
+        file_handler.setFormatter(JsonLinesFormatter())
+        log_queue: queue.Queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self._handler = _DroppingQueueHandler(log_queue)
+        self._logger.addHandler(self._handler)
+        self._listener = logging.handlers.QueueListener(log_queue, file_handler)
+        self._listener.start()
+        atexit.register(self.close)
+
+    def log(self, message: str, source: str = "ui", level: Optional[int] = None) -> None:
+        """
+        Schreibt eine Meldung (kehrt sofort zurück).
+
+        Args:
+            message: Meldung
+            source: Herkunft (z.B. 'ui', 'gstreamer')
+            level: logging-Level (Default: aus dem Emoji der Meldung)
+        """
+        if self._handler is None:
+            return
+        if level is None:
+            level = self._guess_level(message)
+
+        dropped = self._handler.dropped
+        if dropped > self._reported_drops:
+            self._logger.warning(
+                f"{dropped - self._reported_drops} Meldungen verworfen (Queue voll)",
+                extra={'source': 'log'}
+            )
+            self._reported_drops = dropped
+
+        self._logger.log(level, message, extra={'source': source})
+
+    @staticmethod
+    def _guess_level(message: str) -> int:
+        """Level aus dem Präfix der UI-Meldungen (❌ Fehler, ⚠️ Warnung)."""
+        if message.startswith("❌"):
+            return logging.ERROR
+        if message.startswith("⚠️"):
+            return logging.WARNING
+        return logging.INFO
+
+    def close(self) -> None:
+        """Schreibt ausstehende Meldungen und beendet den Schreib-Thread."""
+        if self._listener is None:
+            return
+        self._listener.stop()
+        self._listener = None
+        if self._handler is not None:
+            self._logger.removeHandler(self._handler)
+            self._handler = None
+
+
+# Convenience-Funktion für schnellen Zugriff
+_log_file_instance: Optional[LogFile] = None
+
+def get_log_file() -> LogFile:
+    """
+    Gibt Singleton-Instanz der Log-Datei zurück.
+
+    Returns:
+        LogFile-Instanz
+    """
+    global _log_file_instance
+    if _log_file_instance is None:
+        _log_file_instance = LogFile()
+    return _log_file_instance